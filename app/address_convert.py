@@ -0,0 +1,268 @@
+# app/address_convert.py
+#
+# Bulk conversion between the address encodings of a hash160:
+#   hash160 - 40 hex digits
+#   base40  - the 31-symbol address_base40 (ripemd160_to_base40)
+#   base58  - mainnet P2PKH Base58Check (version byte 0x00, verified checksum)
+#   p2wpkh  - bech32 version-0 address with the hash160 as its 20-byte program
+#
+# Every format has a fixed width, so the conversions run on precompiled group tables instead
+# of one symbol per big-integer division: Base40 in groups of three symbols (the 64000-entry
+# table shared with the packed Base40 storage), Base58 in pairs (58^2 = 3364 entries). An
+# address is then a handful of divmods and table lookups, and a batch reuses the same tables.
+#
+# stream_address_conversions turns newline-delimited input chunks into NDJSON batches in
+# constant memory, like app/address_stream.py does for public keys.
+
+import hashlib
+import json
+
+from app.core_logic.base40 import DEFAULT_SYMBOLS, _packing_tables
+from app.crypto.addresses import BASE58_ALPHABET
+from app.crypto.segwit import DEFAULT_HRP, encode_segwit_address, decode_segwit_address
+
+ADDRESS_FORMATS = ('hash160', 'base40', 'base58', 'p2wpkh')
+HASH160_SIZE = 20
+BASE40_ADDRESS_LENGTH = 31
+P2PKH_VERSION = 0x00
+DEFAULT_CONVERT_BATCH_SIZE = 1024
+MAX_ADDRESS_LINE_LENGTH = 256 # Longer lines cannot be an address; rejecting them bounds the buffer
+
+_BASE40_GROUP = 40 ** 3
+_BASE40_GROUPS = 11 # 33 symbols: the 31-symbol address left-padded with two zero digits
+_BASE40_LIMIT = 1 << (8 * HASH160_SIZE)
+
+_BASE58_PAIR = 58 * 58
+_BASE58_QUAD = _BASE58_PAIR * _BASE58_PAIR
+_BASE58_PAIRS = [a + b for a in BASE58_ALPHABET for b in BASE58_ALPHABET]
+_BASE58_PAIR_VALUES = {pair: value for value, pair in enumerate(_BASE58_PAIRS)}
+_BASE58_DIGITS = {char: value for value, char in enumerate(BASE58_ALPHABET)}
+_P2PKH_PAYLOAD_SIZE = 1 + HASH160_SIZE + 4
+
+
+def _checksum(payload: bytes) -> bytes:
+    return hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4]
+
+
+# --- Encoders (hash160 -> text) ---
+
+def _encode_base40(hash160: bytes, symbols: list) -> str:
+    _, groups = _packing_tables(symbols)
+    value = int.from_bytes(hash160, 'big')
+    parts = [None] * _BASE40_GROUPS
+    for i in range(_BASE40_GROUPS - 1, -1, -1):
+        value, group = divmod(value, _BASE40_GROUP)
+        parts[i] = groups[group]
+    return ''.join(parts)[-BASE40_ADDRESS_LENGTH:]
+
+
+def _encode_base58(hash160: bytes) -> str:
+    payload = b'\x00' + hash160 # P2PKH_VERSION
+    value = int.from_bytes(payload + _checksum(payload), 'big')
+    pairs = _BASE58_PAIRS
+    parts = []
+    while value:
+        value, quad = divmod(value, _BASE58_QUAD)
+        high, low = divmod(quad, _BASE58_PAIR)
+        parts.append(pairs[high] + pairs[low])
+    # The version byte is 0x00, so the encoding starts with exactly one '1' per leading zero byte
+    leading = len(payload) - len(payload.lstrip(b'\x00'))
+    return BASE58_ALPHABET[0] * leading + ''.join(reversed(parts)).lstrip(BASE58_ALPHABET[0])
+
+
+def encode_hash160(hash160: bytes, output_format: str, symbols: list = DEFAULT_SYMBOLS,
+                   hrp: str = DEFAULT_HRP) -> str:
+    """Renders a 20-byte hash160 in one of ADDRESS_FORMATS."""
+    if len(hash160) != HASH160_SIZE:
+        raise ValueError("hash160 must be 20 bytes long.")
+    return _encoders([output_format], symbols, hrp)[0][1](hash160)
+
+
+def _encoders(output_formats, symbols: list, hrp: str) -> list:
+    """(format, hash160 -> str) pairs, resolved once per batch."""
+    encoders = {
+        'hash160': bytes.hex,
+        'base40': lambda hash160: _encode_base40(hash160, symbols),
+        'base58': _encode_base58,
+        'p2wpkh': lambda hash160: encode_segwit_address(0, hash160, hrp),
+    }
+    return [(name, encoders[name]) for name in check_formats(output_formats)]
+
+
+# --- Decoders (text -> hash160, validated) ---
+
+def _decode_hash160_hex(address: str) -> bytes:
+    if len(address) != 2 * HASH160_SIZE:
+        raise ValueError("hash160 hex must be 40 characters.")
+    try:
+        return bytes.fromhex(address)
+    except ValueError:
+        raise ValueError("hash160 is not a valid hexadecimal string.")
+
+
+def _decode_base40(address: str, symbols: list) -> bytes:
+    if len(address) != BASE40_ADDRESS_LENGTH:
+        raise ValueError(f"Base40 address must be {BASE40_ADDRESS_LENGTH} symbols, got {len(address)}.")
+    digits, _ = _packing_tables(symbols)
+    padded = symbols[0] * (3 * _BASE40_GROUPS - BASE40_ADDRESS_LENGTH) + address
+    value = 0
+    try:
+        for start in range(0, len(padded), 3):
+            value = (value * _BASE40_GROUP + digits[padded[start]] * 1600
+                     + digits[padded[start + 1]] * 40 + digits[padded[start + 2]])
+    except KeyError as e:
+        raise ValueError(f"Symbol '{e.args[0]}' not found in Base40 symbols list.")
+    if value >= _BASE40_LIMIT:
+        raise ValueError("Base40 address is larger than a hash160.")
+    return value.to_bytes(HASH160_SIZE, 'big')
+
+
+def _decode_base58(address: str) -> bytes:
+    pair_values = _BASE58_PAIR_VALUES
+    try:
+        start = len(address) % 2
+        value = _BASE58_DIGITS[address[0]] if start else 0
+        for i in range(start, len(address), 2):
+            value = value * _BASE58_PAIR + pair_values[address[i:i + 2]]
+    except KeyError:
+        bad = next(char for char in address if char not in _BASE58_DIGITS)
+        raise ValueError(f"Character '{bad}' is not in the Base58 alphabet.")
+    if value >> (8 * _P2PKH_PAYLOAD_SIZE):
+        raise ValueError("Base58Check address does not encode a 25-byte P2PKH payload.")
+    full_payload = value.to_bytes(_P2PKH_PAYLOAD_SIZE, 'big')
+    leading = len(address) - len(address.lstrip(BASE58_ALPHABET[0]))
+    if leading != _P2PKH_PAYLOAD_SIZE - len(full_payload.lstrip(b'\x00')):
+        raise ValueError("Base58Check address does not encode a 25-byte P2PKH payload.")
+    payload, checksum = full_payload[:-4], full_payload[-4:]
+    if _checksum(payload) != checksum:
+        raise ValueError("Base58Check checksum mismatch.")
+    if payload[0] != P2PKH_VERSION:
+        raise ValueError(f"Unsupported Base58Check version byte 0x{payload[0]:02x} (expected P2PKH 0x00).")
+    return payload[1:]
+
+
+def _decode_p2wpkh(address: str, hrp: str) -> bytes:
+    version, program = decode_segwit_address(address, hrp)
+    if version != 0 or len(program) != HASH160_SIZE:
+        raise ValueError("SegWit address is not a P2WPKH (version 0, 20-byte) address.")
+    return program
+
+
+def detect_address_format(address: str, symbols: list = DEFAULT_SYMBOLS, hrp: str = DEFAULT_HRP) -> str:
+    """
+    Guesses the format of one address from its shape; the decoder still validates all of it.
+    The alphabets only overlap between hex and Base58, which differ in length (40 vs 26-34).
+    """
+    if address[:1] in _packing_tables(symbols)[0]:
+        return 'base40'
+    if address[:len(hrp) + 1].lower() == hrp + '1':
+        return 'p2wpkh'
+    if len(address) == 2 * HASH160_SIZE:
+        return 'hash160'
+    return 'base58'
+
+
+def decode_address(address: str, input_format: str = None, symbols: list = DEFAULT_SYMBOLS,
+                   hrp: str = DEFAULT_HRP) -> tuple:
+    """
+    Validates an address and returns (format, hash160). input_format None detects it.
+    Raises ValueError for a malformed address, a wrong width or a bad checksum.
+    """
+    address = address.strip()
+    if input_format is None:
+        input_format = detect_address_format(address, symbols, hrp)
+    elif input_format not in ADDRESS_FORMATS:
+        raise ValueError(f"Unknown address format '{input_format}'. Expected one of: {', '.join(ADDRESS_FORMATS)}.")
+    if input_format == 'hash160':
+        return input_format, _decode_hash160_hex(address)
+    if input_format == 'base40':
+        return input_format, _decode_base40(address, symbols)
+    if input_format == 'base58':
+        return input_format, _decode_base58(address)
+    return input_format, _decode_p2wpkh(address, hrp)
+
+
+def check_formats(formats) -> list:
+    """Validates a list of format names (raises ValueError) and returns it."""
+    formats = list(formats)
+    unknown = [name for name in formats if name not in ADDRESS_FORMATS]
+    if not formats or unknown:
+        raise ValueError(f"Formats must be a non-empty subset of: {', '.join(ADDRESS_FORMATS)}.")
+    return formats
+
+
+def convert_addresses(addresses, output_formats, input_format: str = None, symbols: list = DEFAULT_SYMBOLS,
+                      hrp: str = DEFAULT_HRP) -> list:
+    """
+    Converts a batch of addresses. Each record has the input, its detected (or given) format
+    and one field per output format; invalid addresses get an "error" field instead.
+    """
+    encoders = _encoders(output_formats, symbols, hrp)
+    records = []
+    for address in addresses:
+        record = {"input": address}
+        try:
+            record["format"], hash160 = decode_address(address, input_format, symbols, hrp)
+        except ValueError as ve:
+            record["error"] = str(ve)
+        else:
+            for name, encode in encoders:
+                record[name] = encode(hash160)
+        records.append(record)
+    return records
+
+
+def iter_address_lines(chunks):
+    """
+    Yields the non-empty, stripped lines of a UTF-8 byte stream.
+    Raises ValueError on a line longer than MAX_ADDRESS_LINE_LENGTH bytes.
+    """
+    pending = b''
+    for chunk in chunks:
+        pending += chunk
+        lines = pending.split(b'\n')
+        pending = lines.pop()
+        for line in lines:
+            if len(line) > MAX_ADDRESS_LINE_LENGTH:
+                raise ValueError(f"Input line exceeds {MAX_ADDRESS_LINE_LENGTH} bytes.")
+            text = line.decode('utf-8', errors='replace').strip()
+            if text:
+                yield text
+        if len(pending) > MAX_ADDRESS_LINE_LENGTH:
+            raise ValueError(f"Input line exceeds {MAX_ADDRESS_LINE_LENGTH} bytes.")
+    text = pending.decode('utf-8', errors='replace').strip()
+    if text:
+        yield text
+
+
+def stream_address_conversions(chunks, output_formats, input_format: str = None,
+                               batch_size: int = DEFAULT_CONVERT_BATCH_SIZE, convert=None):
+    """
+    Yields NDJSON text, one batch of conversion records at a time, for the newline-delimited
+    addresses in `chunks`. `convert(addresses)` turns one batch into records (default:
+    convert_addresses with the given formats); callers can run it elsewhere, e.g. on the
+    shared executor. A read error ends the stream with a final {"error": ...} line.
+    """
+    output_formats = check_formats(output_formats)
+    if convert is None:
+        def convert(addresses):
+            return convert_addresses(addresses, output_formats, input_format)
+
+    batch = []
+    try:
+        for address in iter_address_lines(chunks):
+            batch.append(address)
+            if len(batch) >= batch_size:
+                yield _format_ndjson(convert(batch))
+                batch = []
+    except ValueError as ve:
+        if batch:
+            yield _format_ndjson(convert(batch))
+        yield _format_ndjson([{"error": str(ve)}])
+        return
+    if batch:
+        yield _format_ndjson(convert(batch))
+
+
+def _format_ndjson(records: list) -> str:
+    return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
@@ -0,0 +1,239 @@
+# app/address_index.py
+#
+# On-disk index of hash160 values for checking generated addresses against large watch lists
+# without loading them into memory. The file holds a Bloom filter followed by the sorted,
+# de-duplicated 20-byte hash160 values, and is mapped with mmap: the Bloom filter rejects most
+# misses with a few bit probes, and the remaining candidates are confirmed by binary search.
+#
+# Both address encodings reduce to the same hash160, so one index answers lookups for
+# address_base40, address_bitcoin_base58check and raw hash160 hex alike.
+#
+# File layout (all integers big-endian):
+#   magic (8 bytes) | format version (u16) | bloom hashes (u16) | entries (u64) |
+#   bloom bits (u64) | bloom filter (bloom bits / 8 bytes) | entries * hash160 (20 bytes each)
+#
+# Build with: python -m app.cli index build --out watch.idx watchlist.txt
+
+import heapq
+import math
+import mmap
+import os
+import struct
+import tempfile
+
+from app.core_logic.base40 import base40_to_decimal, DEFAULT_SYMBOLS
+from app.crypto.addresses import base58check_decode_bitcoin
+
+INDEX_MAGIC = b'B40ADIDX'
+INDEX_FORMAT_VERSION = 1
+INDEX_HEADER_FORMAT = '>8sHHQQ'
+INDEX_HEADER_SIZE = struct.calcsize(INDEX_HEADER_FORMAT)
+HASH160_SIZE = 20
+DEFAULT_FALSE_POSITIVE_RATE = 0.001
+DEFAULT_SORT_CHUNK_ENTRIES = 1000000 # Entries sorted in memory per run while building (~20 MB)
+
+
+def parse_watch_entry(entry: str, symbols: list = DEFAULT_SYMBOLS) -> bytes:
+    """
+    Returns the hash160 of one watch-list entry: 40 hex digits, a mainnet P2PKH Base58Check
+    address or a Base40 address. Raises ValueError for anything else, including P2SH and
+    testnet addresses, whose payload is a different kind of hash160.
+    """
+    entry = entry.strip()
+    if len(entry) == 2 * HASH160_SIZE:
+        try:
+            return bytes.fromhex(entry)
+        except ValueError:
+            pass
+    if entry and all(char in symbols for char in entry):
+        value = base40_to_decimal(entry, symbols)
+        if value >> (8 * HASH160_SIZE):
+            raise ValueError(f"Base40 address '{entry}' is larger than a hash160.")
+        return value.to_bytes(HASH160_SIZE, 'big')
+    version, payload = base58check_decode_bitcoin(entry)
+    if version != 0x00:
+        raise ValueError(f"Address '{entry}' has version byte 0x{version:02x}; only P2PKH (0x00) is supported.")
+    if len(payload) != HASH160_SIZE:
+        raise ValueError(f"Address '{entry}' does not encode a 20-byte hash160.")
+    return payload
+
+
+def bloom_parameters(entries: int, false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE) -> tuple:
+    """Returns (bits, hashes) for a Bloom filter over `entries` items; bits is a multiple of 8."""
+    if not (0 < false_positive_rate < 1):
+        raise ValueError("false_positive_rate must be between 0 and 1.")
+    entries = max(1, entries)
+    bits = math.ceil(-entries * math.log(false_positive_rate) / (math.log(2) ** 2))
+    bits = max(64, (bits + 7) // 8 * 8)
+    hashes = max(1, round(bits / entries * math.log(2)))
+    return bits, hashes
+
+
+def _bloom_positions(hash160: bytes, bits: int, hashes: int):
+    # hash160 values are already uniformly distributed, so the two base hashes for double
+    # hashing (Kirsch-Mitzenmacher) are simply taken from the value itself.
+    h1 = int.from_bytes(hash160[:8], 'big')
+    h2 = int.from_bytes(hash160[8:16], 'big') | 1
+    return [(h1 + i * h2) % bits for i in range(hashes)]
+
+
+def _sorted_runs(hash160s, run_dir: str, chunk_entries: int) -> list:
+    """Sorts the input in memory-bounded runs written to run_dir. Returns the run file paths."""
+    runs = []
+    chunk = []
+
+    def flush():
+        path = os.path.join(run_dir, f"run-{len(runs)}.bin")
+        with open(path, 'wb') as f:
+            f.write(b''.join(sorted(set(chunk))))
+        runs.append(path)
+        chunk.clear()
+
+    for hash160 in hash160s:
+        if len(hash160) != HASH160_SIZE:
+            raise ValueError("Every index entry must be a 20-byte hash160.")
+        chunk.append(hash160)
+        if len(chunk) >= chunk_entries:
+            flush()
+    if chunk or not runs:
+        flush()
+    return runs
+
+
+def _read_run(path: str):
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(HASH160_SIZE * 4096)
+            if not block:
+                return
+            for offset in range(0, len(block), HASH160_SIZE):
+                yield block[offset:offset + HASH160_SIZE]
+
+
+def build_index(out_path: str, hash160s, false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+                chunk_entries: int = DEFAULT_SORT_CHUNK_ENTRIES) -> dict:
+    """
+    Builds an index file from an iterable of 20-byte hash160 values (any order, duplicates
+    allowed) with an external merge sort, so memory stays bounded for inputs of any size.
+    The file is written atomically. Returns a summary dictionary.
+    """
+    directory = os.path.dirname(os.path.abspath(out_path))
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix='.index-', dir=directory) as work_dir:
+        runs = _sorted_runs(hash160s, work_dir, chunk_entries)
+
+        # Merge the runs into one sorted, de-duplicated record file
+        records_path = os.path.join(work_dir, 'records.bin')
+        entries = 0
+        previous = None
+        with open(records_path, 'wb') as records:
+            for hash160 in heapq.merge(*(_read_run(path) for path in runs)):
+                if hash160 != previous:
+                    records.write(hash160)
+                    entries += 1
+                    previous = hash160
+
+        bits, hashes = bloom_parameters(entries, false_positive_rate)
+        bloom = bytearray(bits // 8)
+        for hash160 in _read_run(records_path):
+            for position in _bloom_positions(hash160, bits, hashes):
+                bloom[position >> 3] |= 1 << (position & 7)
+
+        tmp_path = os.path.join(work_dir, 'index.tmp')
+        with open(tmp_path, 'wb') as out, open(records_path, 'rb') as records:
+            out.write(struct.pack(INDEX_HEADER_FORMAT, INDEX_MAGIC, INDEX_FORMAT_VERSION, hashes, entries, bits))
+            out.write(bloom)
+            while True:
+                block = records.read(1 << 20)
+                if not block:
+                    break
+                out.write(block)
+        os.replace(tmp_path, out_path)
+
+    return {"path": out_path, "entries": entries, "bloom_bits": bits, "bloom_hashes": hashes}
+
+
+class AddressIndex:
+    """A read-only, memory-mapped hash160 index (see the file layout above)."""
+
+    def __init__(self, path: str):
+        try:
+            with open(path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Cannot map address index '{path}': {e}")
+        self.path = path
+
+        if len(self._map) < INDEX_HEADER_SIZE:
+            self.close()
+            raise ValueError(f"Address index '{path}' is truncated.")
+        magic, version, self.bloom_hashes, self.entries, self.bloom_bits = \
+            struct.unpack_from(INDEX_HEADER_FORMAT, self._map, 0)
+        if (magic, version) != (INDEX_MAGIC, INDEX_FORMAT_VERSION):
+            self.close()
+            raise ValueError(f"Address index '{path}' has an unknown format.")
+        self._records_offset = INDEX_HEADER_SIZE + self.bloom_bits // 8
+        if len(self._map) != self._records_offset + self.entries * HASH160_SIZE:
+            self.close()
+            raise ValueError(f"Address index '{path}' has an unexpected size.")
+
+    def __len__(self) -> int:
+        return self.entries
+
+    def __contains__(self, hash160: bytes) -> bool:
+        return self.contains(hash160)
+
+    def _record(self, position: int) -> bytes:
+        offset = self._records_offset + position * HASH160_SIZE
+        return self._map[offset:offset + HASH160_SIZE]
+
+    def might_contain(self, hash160: bytes) -> bool:
+        """Bloom filter check: False means definitely absent."""
+        bloom = self._map
+        for position in _bloom_positions(hash160, self.bloom_bits, self.bloom_hashes):
+            if not bloom[INDEX_HEADER_SIZE + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+
+    def _lower_bound(self, hash160: bytes, low: int = 0) -> int:
+        high = self.entries
+        while low < high:
+            middle = (low + high) // 2
+            if self._record(middle) < hash160:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def contains(self, hash160: bytes) -> bool:
+        """Exact membership: Bloom filter, then an O(log n) binary search over the mapped records."""
+        if len(hash160) != HASH160_SIZE:
+            raise ValueError("hash160 must be 20 bytes long.")
+        if not self.might_contain(hash160):
+            return False
+        position = self._lower_bound(hash160)
+        return position < self.entries and self._record(position) == hash160
+
+    def contains_many(self, hash160s: list) -> list:
+        """
+        Batch membership, one bool per input in input order. Bloom-filter survivors are sorted
+        and searched with a lower bound that only moves forward, so each binary search covers
+        only the part of the file after the previous hit.
+        """
+        results = [False] * len(hash160s)
+        candidates = []
+        for i, hash160 in enumerate(hash160s):
+            if len(hash160) != HASH160_SIZE:
+                raise ValueError("hash160 must be 20 bytes long.")
+            if self.might_contain(hash160):
+                candidates.append((hash160, i))
+        candidates.sort()
+        low = 0
+        for hash160, i in candidates:
+            low = self._lower_bound(hash160, low)
+            if low < self.entries and self._record(low) == hash160:
+                results[i] = True
+        return results
+
+    def close(self):
+        self._map.close()
@@ -0,0 +1,149 @@
+# app/address_stream.py
+#
+# Streaming public key -> address conversion for uploads of arbitrary size. The input is
+# parsed incrementally from byte chunks, keys are converted in batches and the records are
+# yielded as NDJSON text, so memory stays constant however large the upload is.
+#
+# Input formats:
+#   hex - newline-delimited hex public keys (65-byte uncompressed or 33-byte compressed)
+#   raw - concatenated SEC-encoded keys; each key's length follows from its prefix byte
+#         (0x04 -> 65 bytes, 0x02/0x03 -> 33 bytes)
+#
+# The SegWit address fields are opt-in (segwit=True): the P2TR tweak costs a fixed-base
+# multiplication per key, over a hundred times the hashing. When enabled, each batch gets
+# them from segwit_address_fields_many, with one shared inversion.
+
+import json
+
+from app.core_logic.base40 import DEFAULT_SYMBOLS
+from app.crypto.addresses import check_public_key_bytes
+from app.crypto.keys import public_key_from_bytes
+from app.pipeline import build_address_records, segwit_address_fields_many
+
+INPUT_FORMATS = ('hex', 'raw')
+DEFAULT_ADDRESS_BATCH_SIZE = 512
+MAX_HEX_LINE_LENGTH = 256 # Longer lines cannot be a public key; rejecting them bounds the buffer
+
+_RAW_KEY_LENGTHS = {0x04: 65, 0x02: 33, 0x03: 33}
+
+
+def iter_hex_keys(chunks):
+    """
+    Yields one item per non-empty line of newline-delimited hex: the decoded key bytes, or
+    the offending line (str) when it is not valid hex.
+    Raises ValueError on a line longer than MAX_HEX_LINE_LENGTH.
+    """
+    pending = b''
+    for chunk in chunks:
+        pending += chunk
+        lines = pending.split(b'\n')
+        pending = lines.pop()
+        if len(pending) > MAX_HEX_LINE_LENGTH:
+            raise ValueError(f"Input line exceeds {MAX_HEX_LINE_LENGTH} characters.")
+        for line in lines:
+            yield from _decode_hex_line(line)
+    yield from _decode_hex_line(pending)
+
+
+def _decode_hex_line(line: bytes):
+    text = line.strip().decode('ascii', errors='replace')
+    if not text:
+        return
+    if len(text) > MAX_HEX_LINE_LENGTH:
+        raise ValueError(f"Input line exceeds {MAX_HEX_LINE_LENGTH} characters.")
+    try:
+        yield bytes.fromhex(text)
+    except ValueError:
+        yield text
+
+
+def iter_raw_keys(chunks):
+    """
+    Yields the SEC-encoded keys of a concatenated binary stream.
+    Raises ValueError on an unknown prefix byte or a truncated final key, since the stream
+    cannot be resynchronised after either.
+    """
+    pending = bytearray()
+    offset = 0
+    for chunk in chunks:
+        pending += chunk
+        while offset < len(pending):
+            key_length = _RAW_KEY_LENGTHS.get(pending[offset])
+            if key_length is None:
+                raise ValueError(f"Unknown public key prefix byte 0x{pending[offset]:02x} in binary input.")
+            if len(pending) - offset < key_length:
+                break
+            yield bytes(pending[offset:offset + key_length])
+            offset += key_length
+        del pending[:offset]
+        offset = 0
+    if pending:
+        raise ValueError("Binary input ends with a truncated public key.")
+
+
+def address_batch(keys: list, start_index: int, symbols: list = DEFAULT_SYMBOLS, segwit: bool = False) -> list:
+    """
+    Converts a batch of keys (bytes, or the invalid input line as str) into address records,
+    with the SegWit address fields when segwit is True.
+    Invalid keys produce an error record instead of aborting the batch. The valid keys are
+    hashed together (hash160_many), and their SegWit fields computed together.
+    """
+    records = []
+    valid_records, valid_keys, points = [], [], []
+    for offset, key in enumerate(keys):
+        record = {"index": start_index + offset}
+        if isinstance(key, str):
+            record.update({"input": key, "error": "Invalid hex."})
+        else:
+            try:
+                check_public_key_bytes(key)
+                point = public_key_from_bytes(key) if segwit else None
+            except ValueError as ve:
+                record.update({"input": key.hex(), "error": str(ve)})
+            else:
+                valid_records.append(record)
+                valid_keys.append(key)
+                if segwit:
+                    points.append(point)
+        records.append(record)
+    for record, fields in zip(valid_records, build_address_records(valid_keys, symbols)):
+        record.update(fields)
+    if points: # Every valid key has a point when segwit is on
+        for record, fields in zip(valid_records, segwit_address_fields_many(points)):
+            record.update(fields)
+    return records
+
+
+def stream_address_records(chunks, input_format: str = 'hex', batch_size: int = DEFAULT_ADDRESS_BATCH_SIZE,
+                           convert=address_batch):
+    """
+    Yields NDJSON text, one batch of address records at a time, for the keys in `chunks`
+    (an iterable of bytes). `convert(keys, start_index)` turns one batch into records; callers
+    can pass a wrapper that runs it elsewhere (e.g. on the shared executor).
+    A parse error ends the stream with a final {"error": ...} line, after every record
+    parsed before it.
+    """
+    if input_format not in INPUT_FORMATS:
+        raise ValueError(f"Unknown input format '{input_format}'. Expected one of: {', '.join(INPUT_FORMATS)}.")
+    keys = iter_hex_keys(chunks) if input_format == 'hex' else iter_raw_keys(chunks)
+
+    batch = []
+    index = 0
+    try:
+        for key in keys:
+            batch.append(key)
+            if len(batch) >= batch_size:
+                yield _format_ndjson(convert(batch, index))
+                index += len(batch)
+                batch = []
+    except ValueError as ve:
+        if batch:
+            yield _format_ndjson(convert(batch, index))
+        yield _format_ndjson([{"error": str(ve)}])
+        return
+    if batch:
+        yield _format_ndjson(convert(batch, index))
+
+
+def _format_ndjson(records: list) -> str:
+    return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
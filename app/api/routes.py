@@ -1,6 +1,9 @@
-from flask import Blueprint, jsonify, current_app
+from flask import Blueprint, jsonify, current_app, request, send_file, url_for, Response, stream_with_context
+import json
 import sys
 import os
+import threading
+import uuid
 
 # Adjust path to ensure correct imports from 'app' sub-packages
 # This assumes 'app' is the top-level package recognized by Python's import system.
@@ -8,67 +11,446 @@ import os
 # So, imports like 'from crypto.keys import ...' should resolve if 'app' is in sys.path.
 # The sys.path.append in main.py should handle making 'app' findable.
 
-from app.crypto.keys import generate_private_key, derive_public_key
-from app.crypto.addresses import hash_public_key, ripemd160_to_base40, base58check_encode_bitcoin
-from app.core_logic.base40 import decimal_to_base40, DEFAULT_SYMBOLS
+from app.executor import get_crypto_executor, ExecutorTimeout
+from app.keypool import next_keypair_bundle
+from app.pipeline import build_keypair_bundle, parse_private_key
+from app.core_logic.base40 import DEFAULT_SYMBOLS
+from app.storage import get_keypair_store
+from app.crypto.vanity import VanityPattern, VanitySearch
+from app.crypto.curves import DEFAULT_CURVE, get_curve
+from app.crypto.ecdh import PeerTable, PeerTableCache, ecdh_point, ecdh_shared_secret, parse_ecdh_keys
+from app.crypto.precomp import build_table_payload
+from app.address_stream import stream_address_records, address_batch, INPUT_FORMATS
+from app.address_index import AddressIndex, parse_watch_entry
+from app.address_convert import ADDRESS_FORMATS, check_formats, convert_addresses, stream_address_conversions
+from app.jobs import (
+    JobManager, JobQueueFull,
+    DEFAULT_JOB_WORKERS, DEFAULT_JOB_QUEUE_SIZE, DEFAULT_JOB_MAX_ITEMS
+)
 
 api_bp = Blueprint('api', __name__)
 
 @api_bp.route('/generate_keypair_detailed', methods=['GET'])
 def generate_keypair_route():
     try:
-        # 1. Generate private key
-        priv_key_hex = generate_private_key()
-        priv_key_int = int(priv_key_hex, 16)
-
-        # 2. Derive public key and steps
-        pub_key_hex, scalar_mult_steps = derive_public_key(priv_key_hex)
-
-        # 3. Convert private key to Base40
-        #    Using DEFAULT_SYMBOLS from core_logic.base40
-        priv_key_base40 = decimal_to_base40(priv_key_int, DEFAULT_SYMBOLS)
-
-        # 4. Convert public key's X-coordinate to Base40
-        #    Public key is '04' + X(64 hex chars) + Y(64 hex chars)
-        pub_key_x_hex = pub_key_hex[2:2+64]
-        pub_key_x_int = int(pub_key_x_hex, 16)
-        pub_key_x_base40 = decimal_to_base40(pub_key_x_int, DEFAULT_SYMBOLS)
-
-        # --- HASH-DEPENDENT OPERATIONS ---
-        # These will be affected by the hashlib.sha256 issue in the environment
-
-        # 5. Hash public key (SHA256 then RIPEMD160)
-        #    NOTE: hash_public_key will use the environment's (potentially flawed) hashlib
-        hashed_pk_ripemd160_bytes = hash_public_key(pub_key_hex)
-        hashed_pk_ripemd160_hex = hashed_pk_ripemd160_bytes.hex()
-
-        # 6. Convert RIPEMD-160 hash to 31-symbol Base40 string
-        #    Target length 31 as per spec
-        address_b40 = ripemd160_to_base40(hashed_pk_ripemd160_bytes, target_length=31, symbols=DEFAULT_SYMBOLS)
-
-        # 7. Convert RIPEMD-160 hash to Base58Check Bitcoin address
-        #    Using version 0x00 for mainnet P2PKH by default
-        #    NOTE: base58check_encode_bitcoin also uses hashlib for checksum
-        address_btc_b58 = base58check_encode_bitcoin(hashed_pk_ripemd160_bytes, version_byte=0x00)
-
-        # --- END OF HASH-DEPENDENT OPERATIONS ---
-
-        response_data = {
-            "private_key_hex": priv_key_hex,
-            "private_key_base40": priv_key_base40,
-            "public_key_uncompressed_hex": pub_key_hex,
-            "public_key_x_base40": pub_key_x_base40,
-            "hashed_public_key_ripemd160_hex": hashed_pk_ripemd160_hex, # Potentially incorrect
-            "address_base40": address_b40,                             # Potentially incorrect
-            "address_bitcoin_base58check": address_btc_b58,             # Potentially incorrect
-            "scalar_multiplication_steps": scalar_mult_steps
-        }
-
+        # Generate a private key and run the shared pipeline (see app/pipeline.py):
+        # public key + 256 scalar multiplication steps, Base40 conversions, hash160
+        # and the Base40 / Base58Check addresses.
+        # The derivation is CPU-bound, so it runs on the shared executor (see app/executor.py),
+        # unless the keypair pool (app/keypool.py) already has a bundle ready.
+        # ?curve=secp256r1 (or p256) selects another curve; the default is secp256k1.
+        curve = request.args.get('curve')
+        if curve is not None:
+            curve = get_curve(curve).name
+            if curve == DEFAULT_CURVE:
+                curve = None
+        response_data = next_keypair_bundle(current_app, curve)
+        store = get_keypair_store(current_app)
+        if store is not None and curve is None: # The store's schema holds secp256k1 keypairs only
+            store.put(response_data)
         return jsonify(response_data), 200
 
+    except ExecutorTimeout as et:
+        current_app.logger.error(f"Timeout in generate_keypair_detailed: {et}")
+        return jsonify({"error": "Key generation timed out", "details": str(et)}), 504
     except ValueError as ve:
         current_app.logger.error(f"ValueError in generate_keypair_detailed: {ve}")
         return jsonify({"error": "Invalid input or configuration", "details": str(ve)}), 400
     except Exception as e:
         current_app.logger.error(f"Exception in generate_keypair_detailed: {e}", exc_info=True)
         return jsonify({"error": "An unexpected error occurred on the server", "details": str(e)}), 500
+
+# --- Deterministic derivation of a given key ---
+# POST /api/derive {"private_key": "<hex or Base40>", "curve": "secp256k1", "include_steps": true}
+# returns the same bundle as generate_keypair_detailed for that key. With DERIVE_CACHE_SIZE set,
+# the public key and trace are cached (see app/derive_cache.py) and a replay skips the traced
+# multiplication; the remaining encodings are cheap enough to run in the request thread.
+
+def _derive_bundle(private_key_int: int, include_steps: bool, curve) -> dict:
+    curve_name = None if curve.name == DEFAULT_CURVE else curve.name # Names pickle; Curve objects need not
+    executor = get_crypto_executor(current_app)
+    cache = current_app.extensions.get('base40_derive_cache')
+    if cache is None or not include_steps:
+        return executor.call(build_keypair_bundle, private_key_int, include_steps, DEFAULT_SYMBOLS, curve_name)
+    derivation = cache.get(private_key_int, curve.name)
+    if derivation is not None:
+        return build_keypair_bundle(private_key_int, True, DEFAULT_SYMBOLS, curve_name, derivation)
+    bundle = executor.call(build_keypair_bundle, private_key_int, True, DEFAULT_SYMBOLS, curve_name)
+    cache.put(private_key_int, curve.name, bundle["public_key_uncompressed_hex"], bundle["scalar_multiplication_steps"])
+    return bundle
+
+@api_bp.route('/derive', methods=['POST'])
+def derive_route():
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({"error": "Invalid derive request", "details": "The body must be a JSON object."}), 400
+    private_key = payload.get('private_key')
+    include_steps = payload.get('include_steps', True)
+    if not isinstance(private_key, str) or not isinstance(include_steps, bool):
+        return jsonify({"error": "Invalid derive request",
+                        "details": "'private_key' must be a hex or Base40 string and 'include_steps' a boolean."}), 400
+    try:
+        curve = get_curve(payload.get('curve'))
+        private_key_int = curve.validate_private_key(parse_private_key(private_key))
+        return jsonify(_derive_bundle(private_key_int, include_steps, curve)), 200
+    except ExecutorTimeout as et:
+        current_app.logger.error(f"Timeout in derive: {et}")
+        return jsonify({"error": "Key derivation timed out", "details": str(et)}), 504
+    except ValueError as ve:
+        return jsonify({"error": "Invalid derive request", "details": str(ve)}), 400
+
+@api_bp.route('/derive/cache', methods=['GET'])
+def derive_cache_route():
+    cache = current_app.extensions.get('base40_derive_cache')
+    if cache is None:
+        return jsonify({"error": "Derivation cache is not enabled (DERIVE_CACHE_SIZE)."}), 404
+    return jsonify(cache.stats()), 200
+
+# --- Vanity address search (asynchronous) ---
+# Searches run in their own worker processes; the handlers only start, poll and cancel them.
+
+MAX_ACTIVE_VANITY_SEARCHES = 1 # Each search already uses every core
+MAX_VANITY_RESULTS = 10
+MAX_TRACKED_VANITY_SEARCHES = 32 # Finished searches kept for polling
+
+_vanity_searches = {}
+_vanity_lock = threading.Lock()
+
+@api_bp.route('/vanity', methods=['POST'])
+def start_vanity_search_route():
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({"error": "Invalid vanity search request", "details": "The body must be a JSON object."}), 400
+    try:
+        pattern = VanityPattern(payload.get('prefix'), encoding=payload.get('encoding', 'base40'))
+        max_results = min(int(payload.get('max_results', 1)), MAX_VANITY_RESULTS)
+        workers = max(1, min(int(payload.get('workers', os.cpu_count() or 1)), os.cpu_count() or 1))
+        search = VanitySearch(pattern, workers=workers, max_results=max_results)
+    except (TypeError, ValueError) as ve:
+        return jsonify({"error": "Invalid vanity search request", "details": str(ve)}), 400
+
+    with _vanity_lock:
+        active = [s for s in _vanity_searches.values() if s.state == 'running']
+        if len(active) >= MAX_ACTIVE_VANITY_SEARCHES:
+            return jsonify({"error": "Too many vanity searches running, try again later"}), 429
+
+        finished_ids = [search_id for search_id, s in _vanity_searches.items() if s.state != 'running']
+        for search_id in finished_ids[:max(0, len(_vanity_searches) - MAX_TRACKED_VANITY_SEARCHES + 1)]:
+            del _vanity_searches[search_id]
+
+        search_id = uuid.uuid4().hex
+        _vanity_searches[search_id] = search.start()
+
+    return jsonify({"search_id": search_id, **search.status()}), 202
+
+@api_bp.route('/vanity/<search_id>', methods=['GET'])
+def vanity_search_status_route(search_id):
+    search = _vanity_searches.get(search_id)
+    if search is None:
+        return jsonify({"error": "Unknown vanity search"}), 404
+    return jsonify({"search_id": search_id, **search.status()}), 200
+
+@api_bp.route('/vanity/<search_id>', methods=['DELETE'])
+def cancel_vanity_search_route(search_id):
+    search = _vanity_searches.get(search_id)
+    if search is None:
+        return jsonify({"error": "Unknown vanity search"}), 404
+    search.cancel()
+    return jsonify({"search_id": search_id, **search.status()}), 200
+
+# --- Bulk jobs (asynchronous) ---
+# Configured through app.config: JOB_WORKERS, JOB_QUEUE_SIZE, JOB_MAX_ITEMS, JOB_RESULT_DIR.
+# The manager (and its process pool) is created on first use.
+
+_job_manager_lock = threading.Lock()
+
+def get_job_manager() -> JobManager:
+    manager = current_app.extensions.get('base40_jobs')
+    if manager is None:
+        with _job_manager_lock:
+            manager = current_app.extensions.get('base40_jobs')
+            if manager is None:
+                config = current_app.config
+                manager = JobManager(
+                    workers=config.get('JOB_WORKERS', DEFAULT_JOB_WORKERS),
+                    queue_size=config.get('JOB_QUEUE_SIZE', DEFAULT_JOB_QUEUE_SIZE),
+                    max_items=config.get('JOB_MAX_ITEMS', DEFAULT_JOB_MAX_ITEMS),
+                    result_dir=config.get('JOB_RESULT_DIR')
+                )
+                current_app.extensions['base40_jobs'] = manager
+    return manager
+
+def _job_response(job, status_code):
+    body = job.status()
+    body["status_url"] = url_for('api.job_status_route', job_id=job.id)
+    body["result_url"] = url_for('api.job_result_route', job_id=job.id)
+    response = jsonify(body)
+    response.status_code = status_code
+    return response
+
+@api_bp.route('/jobs', methods=['POST'])
+def submit_job_route():
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({"error": "Invalid job request", "details": "The body must be a JSON object."}), 400
+    try:
+        job = get_job_manager().submit(payload.get('type'), payload)
+    except ValueError as ve:
+        return jsonify({"error": "Invalid job request", "details": str(ve)}), 400
+    except JobQueueFull as jqf:
+        response = jsonify({"error": str(jqf)})
+        response.status_code = 429
+        response.headers['Retry-After'] = '5'
+        return response
+    response = _job_response(job, 202)
+    response.headers['Location'] = url_for('api.job_status_route', job_id=job.id)
+    return response
+
+@api_bp.route('/jobs/<job_id>', methods=['GET'])
+def job_status_route(job_id):
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    return _job_response(job, 200)
+
+@api_bp.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job_route(job_id):
+    job = get_job_manager().cancel(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    return _job_response(job, 200)
+
+@api_bp.route('/jobs/<job_id>/result', methods=['GET'])
+def job_result_route(job_id):
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    if job.state != 'completed':
+        return jsonify({"error": "Job result is not available", "state": job.state}), 409
+    return send_file(job.result_path, mimetype='application/x-ndjson', as_attachment=True,
+                     download_name=f"base40_job_{job.id}.ndjson")
+
+# --- Streaming address conversion ---
+# The upload is read from the request stream chunk by chunk and the addresses are streamed
+# back as NDJSON, so multi-gigabyte key lists run in constant memory.
+
+ADDRESS_UPLOAD_CHUNK_SIZE = 64 * 1024
+
+def _end_stream_on_timeout(lines):
+    # The response has already started by the time a batch can time out, so the stream
+    # ends with a final {"error": ...} line instead of a 504
+    try:
+        yield from lines
+    except ExecutorTimeout as et:
+        current_app.logger.error(f"Timeout while streaming addresses: {et}")
+        yield json.dumps({"error": "Address conversion timed out", "details": str(et)}) + "\n"
+
+@api_bp.route('/addresses/bulk', methods=['POST'])
+def bulk_addresses_route():
+    # ?format=hex|raw; binary uploads (application/octet-stream) default to raw.
+    # ?segwit=1 adds the P2WPKH/P2TR fields, at the cost of a fixed-base multiplication per key.
+    default_format = 'raw' if request.mimetype == 'application/octet-stream' else 'hex'
+    input_format = request.args.get('format', default_format)
+    segwit = request.args.get('segwit', '').lower() in ('1', 'true', 'yes')
+    if input_format not in INPUT_FORMATS:
+        return jsonify({"error": "Invalid address request",
+                        "details": f"'format' must be one of: {', '.join(INPUT_FORMATS)}."}), 400
+
+    executor = get_crypto_executor(current_app)
+    upload = request.stream
+
+    def chunks():
+        while True:
+            chunk = upload.read(ADDRESS_UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    def convert(keys, start_index):
+        return executor.call(address_batch, keys, start_index, DEFAULT_SYMBOLS, segwit)
+
+    records = stream_address_records(chunks(), input_format, convert=convert)
+    return Response(stream_with_context(_end_stream_on_timeout(records)), mimetype='application/x-ndjson')
+
+# --- Address format conversion ---
+# POST /api/addresses/convert?to=base58,base40[&from=base40]: a JSON body {"addresses": [...]}
+# is answered with JSON; any other body is read as newline-delimited addresses and streamed
+# back as NDJSON, one record per line (see app/address_convert.py).
+
+MAX_CONVERT_ADDRESSES = 10000
+
+@api_bp.route('/addresses/convert', methods=['POST'])
+def convert_addresses_route():
+    payload = request.get_json(silent=True) if request.is_json else None
+    options = payload if isinstance(payload, dict) else {}
+    to_formats = options.get('to', request.args.get('to', ''))
+    if isinstance(to_formats, str):
+        to_formats = [name.strip() for name in to_formats.split(',') if name.strip()]
+    from_format = options.get('from', request.args.get('from')) or None
+    try:
+        if not isinstance(to_formats, list):
+            raise ValueError("'to' must be a list or a comma-separated string of formats.")
+        check_formats(to_formats)
+        if from_format is not None and from_format not in ADDRESS_FORMATS:
+            raise ValueError(f"'from' must be one of: {', '.join(ADDRESS_FORMATS)}.")
+    except ValueError as ve:
+        return jsonify({"error": "Invalid conversion request", "details": str(ve)}), 400
+
+    executor = get_crypto_executor(current_app)
+
+    if request.is_json:
+        addresses = options.get('addresses')
+        if not isinstance(addresses, list) or not addresses or not all(isinstance(a, str) for a in addresses):
+            return jsonify({"error": "Invalid conversion request",
+                            "details": "'addresses' must be a non-empty list of strings."}), 400
+        if len(addresses) > MAX_CONVERT_ADDRESSES:
+            return jsonify({"error": "Invalid conversion request",
+                            "details": f"At most {MAX_CONVERT_ADDRESSES} addresses per JSON request; "
+                                       "send larger lists as newline-delimited text."}), 400
+        try:
+            results = executor.call(convert_addresses, addresses, to_formats, from_format)
+        except ExecutorTimeout as et:
+            current_app.logger.error(f"Timeout in convert_addresses: {et}")
+            return jsonify({"error": "Address conversion timed out", "details": str(et)}), 504
+        return jsonify({"results": results}), 200
+
+    upload = request.stream
+
+    def chunks():
+        while True:
+            chunk = upload.read(ADDRESS_UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    def convert(addresses):
+        return executor.call(convert_addresses, addresses, to_formats, from_format)
+
+    records = stream_address_conversions(chunks(), to_formats, from_format, convert=convert)
+    return Response(stream_with_context(_end_stream_on_timeout(records)), mimetype='application/x-ndjson')
+
+# --- Watch-list lookups ---
+# Checks addresses against the memory-mapped index at ADDRESS_INDEX_PATH (BASE40_ADDRESS_INDEX),
+# built with `python -m app.cli index build`. The index is mapped once per process.
+
+MAX_LOOKUP_ADDRESSES = 10000
+
+_address_index_lock = threading.Lock()
+
+def get_address_index():
+    index = current_app.extensions.get('base40_address_index')
+    if index is None:
+        path = current_app.config.get('ADDRESS_INDEX_PATH')
+        if not path:
+            return None
+        with _address_index_lock:
+            index = current_app.extensions.get('base40_address_index')
+            if index is None:
+                index = AddressIndex(path)
+                current_app.extensions['base40_address_index'] = index
+    return index
+
+@api_bp.route('/addresses/lookup', methods=['GET', 'POST'])
+def lookup_addresses_route():
+    if request.method == 'GET':
+        addresses = request.args.getlist('address')
+    else:
+        payload = request.get_json(silent=True)
+        addresses = payload.get('addresses') if isinstance(payload, dict) else None
+    if not isinstance(addresses, list) or not addresses or not all(isinstance(a, str) for a in addresses):
+        return jsonify({"error": "Invalid lookup request",
+                        "details": "'addresses' must be a non-empty list of strings."}), 400
+    if len(addresses) > MAX_LOOKUP_ADDRESSES:
+        return jsonify({"error": "Invalid lookup request",
+                        "details": f"At most {MAX_LOOKUP_ADDRESSES} addresses per request."}), 400
+
+    try:
+        index = get_address_index()
+    except ValueError as ve:
+        current_app.logger.error(f"Cannot open address index: {ve}")
+        return jsonify({"error": "Address index unavailable", "details": str(ve)}), 503
+    if index is None:
+        return jsonify({"error": "No address index configured (ADDRESS_INDEX_PATH)."}), 503
+
+    results = []
+    hash160s = []
+    for address in addresses:
+        try:
+            hash160 = parse_watch_entry(address)
+        except ValueError as ve:
+            results.append({"address": address, "error": str(ve)})
+            continue
+        results.append({"address": address, "hash160_hex": hash160.hex()})
+        hash160s.append(hash160)
+    found = iter(index.contains_many(hash160s))
+    for result in results:
+        if "error" not in result:
+            result["found"] = next(found)
+    return jsonify({"results": results, "index_entries": len(index)}), 200
+
+# --- Stored keypairs ---
+
+@api_bp.route('/keypairs/<path:address>', methods=['GET'])
+def stored_keypairs_route(address):
+    store = get_keypair_store(current_app)
+    if store is None:
+        return jsonify({"error": "Keypair storage is not configured (STORAGE_PATH)."}), 503
+    include_steps = request.args.get('include_steps', '').lower() in ('1', 'true', 'yes')
+    keypairs = store.find_by_address(address, include_steps=include_steps)
+    if not keypairs:
+        return jsonify({"error": "No stored keypair for this address"}), 404
+    return jsonify({"address": address, "keypairs": keypairs}), 200
+
+# --- ECDH ---
+# Exchanges with a cached peer table run in the request thread: the point of the per-peer
+# table cache is to be shared by every exchange, and a cached exchange is cheap. Misses (a
+# plain multiplication, or building the table once the peer repeats) go to the executor.
+
+_ecdh_cache_lock = threading.Lock()
+
+def get_ecdh_cache():
+    cache = current_app.extensions.get('base40_ecdh_cache')
+    if cache is None:
+        with _ecdh_cache_lock:
+            cache = current_app.extensions.get('base40_ecdh_cache')
+            if cache is None:
+                cache = PeerTableCache(max_peers=current_app.config['ECDH_CACHE_PEERS'],
+                                       max_bytes=current_app.config['ECDH_CACHE_BYTES'],
+                                       window_bits=current_app.config['ECDH_WINDOW_BITS'],
+                                       build_after=current_app.config['ECDH_BUILD_AFTER'])
+                current_app.extensions['base40_ecdh_cache'] = cache
+    return cache
+
+@api_bp.route('/ecdh', methods=['POST'])
+def ecdh_route():
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({"error": "Invalid ECDH request", "details": "The body must be a JSON object."}), 400
+    private_key, peer_public_key = payload.get('private_key'), payload.get('peer_public_key')
+    if not isinstance(private_key, str) or not isinstance(peer_public_key, str):
+        return jsonify({"error": "Invalid ECDH request",
+                        "details": "'private_key' and 'peer_public_key' must be hex strings."}), 400
+    try:
+        curve = get_curve(payload.get('curve'))
+        private_key_int, peer_point = parse_ecdh_keys(private_key, peer_public_key, curve)
+        cache = get_ecdh_cache()
+        executor = get_crypto_executor(current_app)
+        table = cache.lookup(peer_point, curve)
+        if table is None and cache.wants_table(peer_point, curve):
+            table_payload = executor.call(build_table_payload, peer_point, curve.a, curve.p, cache.window_bits)
+            table = cache.add(PeerTable(peer_point, curve, cache.window_bits, payload=table_payload))
+        if table is None:
+            shared_secret = executor.call(ecdh_shared_secret, private_key_int, peer_public_key, curve.name)
+        else:
+            shared_point = ecdh_point(private_key_int, peer_point, curve, table=table)
+            shared_secret = shared_point[0].to_bytes(curve.field_bytes, 'big')
+    except ExecutorTimeout as et:
+        current_app.logger.error(f"Timeout in ecdh: {et}")
+        return jsonify({"error": "ECDH timed out", "details": str(et)}), 504
+    except ValueError as ve:
+        return jsonify({"error": "Invalid ECDH request", "details": str(ve)}), 400
+    return jsonify({"curve": curve.name, "shared_secret_hex": shared_secret.hex()}), 200
+
+@api_bp.route('/ecdh/cache', methods=['GET'])
+def ecdh_cache_route():
+    return jsonify(get_ecdh_cache().stats()), 200
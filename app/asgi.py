@@ -0,0 +1,194 @@
+# app/asgi.py
+#
+# ASGI front end for the Flask app. Every Flask route is served through asgiref's WSGI
+# adapter, and the two long-lived streaming endpoints are native coroutines on top of the
+# same app: an idle or streaming connection then costs a coroutine instead of a thread,
+# and the CPU-bound pipeline calls go to the app's shared executor (app/executor.py). This
+# makes the SSE step stream and large NDJSON batch downloads cheap to hold open.
+#
+# Serve it with an ASGI server (not a dependency of the package) through the factory, e.g.
+#   uvicorn app.asgi:create_asgi_app --factory --host 0.0.0.0 --port 8000
+#   hypercorn "app.asgi:create_asgi_app()" --bind 0.0.0.0:8000
+# Settings are create_app's (app.config, falling back to the BASE40_* variables).
+
+import asyncio
+import json
+import logging
+from urllib.parse import parse_qs
+
+from asgiref.wsgi import WsgiToAsgi
+
+from app.bulk import generate_chunk
+from app.core_logic.base40 import DEFAULT_SYMBOLS
+from app.executor import ExecutorTimeout, get_crypto_executor
+from app.pipeline import generate_keypair_bundle
+
+MAX_STREAM_BATCH = 1000000 # Largest /api/stream/batch download
+STREAM_BATCH_CHUNK = 64 # Keypairs per executor call while streaming a batch
+MAX_STEP_INTERVAL_MS = 1000
+
+logger = logging.getLogger(__name__)
+
+
+class AsgiApp:
+    """
+    ASGI application: the native streaming endpoints, and the wrapped Flask app for
+    every other path.
+    """
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi = WsgiToAsgi(flask_app)
+        self.executor = get_crypto_executor(flask_app) # Shared with the Flask handlers
+        self.routes = {
+            ('GET', '/api/stream/steps'): self.stream_steps,
+            ('GET', '/api/stream/batch'): self.stream_batch,
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        handler = self.routes.get((scope.get('method'), scope.get('path'))) if scope['type'] == 'http' else None
+        if handler is None:
+            await self.wsgi(scope, receive, send)
+            return
+
+        query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        response = {} # Headers of the response once it has started
+
+        async def tracked_send(message):
+            if message['type'] == 'http.response.start':
+                response.update(message.get('headers', []))
+            await send(message)
+
+        try:
+            await handler(query, tracked_send)
+        except ExecutorTimeout as et:
+            await _send_error(send, response, 504, {"error": "Key generation timed out", "details": str(et)})
+        except ValueError as ve:
+            await _send_error(send, response, 400, {"error": "Invalid input or configuration", "details": str(ve)})
+        except Exception as e:
+            logger.exception("Unhandled error serving %s", scope['path'])
+            await _send_error(send, response, 500, {"error": "An unexpected server error occurred", "details": str(e)})
+
+    async def _lifespan(self, receive, send):
+        # create_app has already started the warm-up; only the executor needs stopping
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    # --- Streaming endpoints ---
+
+    async def stream_steps(self, query, send):
+        """
+        Server-sent events for one fresh keypair: a 'keypair' event with the bundle (without
+        steps), one 'step' event per scalar multiplication step and a final 'end' event.
+        ?interval_ms=N paces the steps for live animation.
+        """
+        interval_ms = _int_param(query, 'interval_ms', 0)
+        if not (0 <= interval_ms <= MAX_STEP_INTERVAL_MS):
+            raise ValueError(f"interval_ms must be between 0 and {MAX_STEP_INTERVAL_MS}.")
+        bundle = await self.executor.call_async(generate_keypair_bundle, True, DEFAULT_SYMBOLS)
+        steps = bundle.pop('scalar_multiplication_steps')
+
+        await start_stream(send, 200, 'text/event-stream', [(b'cache-control', b'no-cache')])
+        await send_chunk(send, sse_event('keypair', bundle))
+        for step in steps:
+            await send_chunk(send, sse_event('step', step))
+            if interval_ms:
+                await asyncio.sleep(interval_ms / 1000)
+        await send_chunk(send, sse_event('end', {"steps": len(steps)}), more=False)
+
+    async def stream_batch(self, query, send):
+        """
+        NDJSON download of ?count=N fresh keypairs (without steps; ?segwit=1 adds the SegWit
+        addresses). Chunks are generated on the executor one ahead of the chunk being sent, so
+        memory stays bounded for any count.
+        """
+        count = _int_param(query, 'count', 100)
+        segwit = query.get('segwit', [''])[0].lower() in ('1', 'true', 'yes')
+        if not (1 <= count <= MAX_STREAM_BATCH):
+            raise ValueError(f"count must be between 1 and {MAX_STREAM_BATCH}.")
+
+        def submit(start):
+            indexes = list(range(start, min(start + STREAM_BATCH_CHUNK, count)))
+            return asyncio.ensure_future(self.executor.call_async(generate_chunk, indexes, False, segwit))
+
+        pending = submit(0)
+        await start_stream(send, 200, 'application/x-ndjson',
+                           [(b'content-disposition', b'attachment;filename=base40_batch.ndjson')])
+        for start in range(0, count, STREAM_BATCH_CHUNK):
+            records = await pending
+            next_start = start + STREAM_BATCH_CHUNK
+            if next_start < count:
+                pending = submit(next_start)
+            lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+            await send_chunk(send, lines.encode('utf-8'), more=next_start < count)
+
+
+# --- ASGI response helpers ---
+
+def _int_param(query: dict, name: str, default: int) -> int:
+    values = query.get(name)
+    if not values:
+        return default
+    try:
+        return int(values[0])
+    except ValueError:
+        raise ValueError(f"'{name}' must be an integer.")
+
+
+def sse_event(event: str, data) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode('utf-8')
+
+
+async def start_stream(send, status: int, content_type: str, headers: list = ()):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', content_type.encode('latin-1'))] + list(headers),
+    })
+
+
+async def send_chunk(send, data: bytes, more: bool = True):
+    await send({'type': 'http.response.body', 'body': data, 'more_body': more})
+
+
+async def send_body(send, status: int, body: bytes, content_type: str, headers: list = ()):
+    await start_stream(send, status, content_type,
+                       [(b'content-length', str(len(body)).encode('latin-1'))] + list(headers))
+    await send_chunk(send, body, more=False)
+
+
+async def send_json(send, status: int, payload):
+    await send_body(send, status, json.dumps(payload, ensure_ascii=False).encode('utf-8'), 'application/json')
+
+
+async def _send_error(send, started_headers: dict, status: int, payload: dict):
+    """
+    Sends an error response, or, when a streaming response has already started (its headers
+    are in `started_headers`), ends that stream with a final 'error' event or NDJSON line.
+    """
+    if not started_headers:
+        await send_json(send, status, payload)
+        return
+    payload = dict(payload, status=status)
+    if started_headers.get(b'content-type') == b'text/event-stream':
+        data = sse_event('error', payload)
+    else:
+        data = (json.dumps(payload, ensure_ascii=False) + "\n").encode('utf-8')
+    await send_chunk(send, data, more=False)
+
+
+def create_asgi_app(config: dict = None, flask_app=None) -> AsgiApp:
+    """Builds the ASGI app around flask_app, or around create_app(config)."""
+    if flask_app is None:
+        from app.main import create_app
+        flask_app = create_app(config)
+    return AsgiApp(flask_app)
@@ -0,0 +1,64 @@
+# app/bench.py
+#
+# Micro-benchmarks for the field backends (app/crypto/field_backend.py). Only the paths that
+# go through the backend are timed: inverse_mod and the traced scalar multiplication.
+# Usage: python -m app.bench [--backend all|python|gmpy2] [--iterations N]
+
+import argparse
+import os
+import time
+
+from app.crypto import field_backend
+from app.crypto.secp256k1_utils import N, Gx, Gy, inverse_mod, scalar_multiplication, P
+
+G_POINT = (Gx, Gy)
+
+
+def _time_call(func, iterations: int) -> float:
+    """Runs func() `iterations` times and returns the mean wall time in seconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def run_benchmarks(backend_names: list, iterations: int = 20) -> list:
+    """
+    Times the field inversion and the detailed scalar multiplication under each backend.
+    The trace-free scalar_multiply does not use the backend and is not timed here.
+    Returns a list of result dictionaries, one per (backend, benchmark) pair.
+    """
+    # The same random scalars are reused for every backend so the timings are comparable
+    scalars = [int.from_bytes(os.urandom(32), 'big') % (N - 1) + 1 for _ in range(iterations)]
+    results = []
+
+    for name in backend_names:
+        with field_backend.use_backend(name):
+            inverse_iter = iter(scalars * 50)
+            inverse_seconds = _time_call(lambda: inverse_mod(next(inverse_iter), P), iterations * 50)
+
+            scalar_iter = iter(scalars)
+            scalar_seconds = _time_call(lambda: scalar_multiplication(next(scalar_iter), G_POINT), iterations)
+
+        results.append({"backend": name, "benchmark": "inverse_mod", "iterations": iterations * 50,
+                        "mean_us": inverse_seconds * 1e6})
+        results.append({"backend": name, "benchmark": "scalar_multiplication", "iterations": iterations,
+                        "mean_us": scalar_seconds * 1e6})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Base40 cryptographic core.")
+    parser.add_argument('--backend', default='all',
+                        help="Field backend to benchmark: 'all' (every installed backend), 'python' or 'gmpy2'.")
+    parser.add_argument('--iterations', type=int, default=20, help="Scalar multiplications per backend.")
+    args = parser.parse_args(argv)
+
+    backend_names = field_backend.available_backends() if args.backend == 'all' else [args.backend]
+    for result in run_benchmarks(backend_names, args.iterations):
+        print(f"{result['backend']:>8}  {result['benchmark']:<24} {result['mean_us']:>12.1f} us/op "
+              f"({result['iterations']} iterations)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+# app/bulk.py
+#
+# Offline bulk generation: shards the keypair pipeline across worker processes and streams
+# the records to an NDJSON or CSV file with bounded memory. Used by `python -m app.cli generate`.
+
+import csv
+import io
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+
+from app.crypto.keys import generate_private_keys
+from app.pipeline import BUNDLE_FIELDS, SEGWIT_FIELDS, build_keypair_bundles
+
+OUTPUT_FORMATS = ('ndjson', 'csv')
+CSV_FIELDS = ['index'] + BUNDLE_FIELDS
+CSV_FIELDS_WITHOUT_SEGWIT = [field for field in CSV_FIELDS if field not in SEGWIT_FIELDS]
+DEFAULT_CHUNK_SIZE = 256 # Keypairs per task sent to a worker process
+IN_FLIGHT_CHUNKS_PER_WORKER = 2 # Bounds memory: at most workers * 2 chunks are pending
+
+
+def generate_chunk(indexes: list, include_steps: bool = False, segwit: bool = False) -> list:
+    """
+    Worker task: runs the pipeline on one fresh key per index, as a batch (build_keypair_bundles).
+    Returns the records in index order. The SegWit address fields (a second fixed-base
+    multiplication per key) are opt-in.
+    """
+    bundles = build_keypair_bundles(generate_private_keys(len(indexes)), include_steps=include_steps, segwit=segwit)
+    return [{"index": index, **bundle} for index, bundle in zip(indexes, bundles)]
+
+
+def csv_fields(segwit: bool = False) -> list:
+    return CSV_FIELDS if segwit else CSV_FIELDS_WITHOUT_SEGWIT
+
+
+def format_records(records: list, output_format: str, segwit: bool = False) -> str:
+    """Serialises records as NDJSON lines or CSV rows (without header)."""
+    if output_format == 'ndjson':
+        return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=csv_fields(segwit), extrasaction='ignore', lineterminator='\n')
+    writer.writerows(records)
+    return buffer.getvalue()
+
+
+def _record_index(line: str, output_format: str):
+    """Extracts the record index from one complete output line, or None for headers/garbage."""
+    if output_format == 'ndjson':
+        try:
+            return int(json.loads(line)["index"])
+        except (ValueError, KeyError, TypeError):
+            return None
+    first_field = line.split(',', 1)[0]
+    return int(first_field) if first_field.isdigit() else None
+
+
+def check_resume_fields(path: str, output_format: str, segwit: bool = False):
+    """
+    Raises ValueError when the file being resumed was written with the other segwit setting:
+    its CSV header must be csv_fields(segwit), and its first NDJSON record must have the SegWit
+    fields exactly when segwit is set. Appending would otherwise mix two record layouts.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        first_line = f.readline()
+    if not first_line.endswith('\n'):
+        return # Empty, or a partial line that scan_completed_indexes truncates away
+    if output_format == 'csv':
+        matches = first_line.rstrip('\r\n').split(',') == csv_fields(segwit)
+    else:
+        try:
+            record = json.loads(first_line)
+        except ValueError:
+            return
+        matches = not isinstance(record, dict) or all(field in record for field in SEGWIT_FIELDS) == segwit
+    if not matches:
+        written_with = "without" if segwit else "with"
+        raise ValueError(f"{path} was written {written_with} the SegWit fields; resume it with the same segwit setting.")
+
+
+def scan_completed_indexes(path: str, count: int, output_format: str) -> bytearray:
+    """
+    Reads an existing (possibly interrupted) output file and returns a bitmap of the indexes
+    already written. A trailing partial line left by an interrupted run is truncated away.
+    The bitmap costs count / 8 bytes, so resuming stays bounded in memory.
+    """
+    completed = bytearray((count + 7) // 8)
+    if not os.path.exists(path):
+        return completed
+
+    with open(path, 'r+b') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        # Find the end of the last complete line
+        position = size
+        while position > 0:
+            step = min(65536, position)
+            f.seek(position - step)
+            block = f.read(step)
+            newline = block.rfind(b'\n')
+            if newline != -1:
+                position = position - step + newline + 1
+                break
+            position -= step
+        if position != size:
+            f.truncate(position)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            index = _record_index(line.rstrip('\n'), output_format)
+            if index is not None and 0 <= index < count:
+                completed[index >> 3] |= 1 << (index & 7)
+    return completed
+
+
+def _missing_index_chunks(count: int, completed: bytearray, chunk_size: int):
+    chunk = []
+    for index in range(count):
+        if not completed[index >> 3] & (1 << (index & 7)):
+            chunk.append(index)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_bulk_generation(out_path: str, count: int, workers: int = None, output_format: str = 'ndjson',
+                        ordered: bool = True, resume: bool = False, include_steps: bool = False,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE, progress_callback=None, watch_index=None,
+                        store=None, segwit: bool = False) -> dict:
+    """
+    Generates `count` keypair records into out_path.
+
+    Work is split into chunks of consecutive indexes that are run on a process pool. At most
+    workers * IN_FLIGHT_CHUNKS_PER_WORKER chunks are pending at any time, so memory use does
+    not grow with `count`. With ordered=True records are written in index order; otherwise
+    each chunk is written as soon as it completes. With resume=True the indexes already present
+    in out_path are skipped and new records are appended; the file must have been written with
+    the same segwit setting.
+
+    progress_callback, if given, is called with (written, count) after every chunk.
+    watch_index, an optional AddressIndex (app/address_index.py), is checked for every record;
+    matching records get "watch_hit": true (ndjson only) and are counted in the summary.
+    store, an optional KeypairStore (app/storage.py), receives every record as well; it is
+    flushed before returning.
+    segwit adds the SegWit address fields (and CSV columns); they roughly double the cost per key.
+    Returns a summary dictionary.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{output_format}'. Expected one of: {', '.join(OUTPUT_FORMATS)}.")
+    if count < 0:
+        raise ValueError("count must be non-negative.")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+    if include_steps and output_format == 'csv':
+        raise ValueError("Scalar multiplication steps can only be written in the ndjson format.")
+    workers = max(1, workers or os.cpu_count() or 1)
+
+    if resume:
+        check_resume_fields(out_path, output_format, segwit)
+        completed = scan_completed_indexes(out_path, count, output_format)
+    else:
+        completed = bytearray((count + 7) // 8)
+    already_written = sum(bin(byte).count('1') for byte in completed)
+
+    write_header = output_format == 'csv' and (not resume or not os.path.exists(out_path) or os.path.getsize(out_path) == 0)
+    written = already_written
+    watch_hits = 0
+    chunks = _missing_index_chunks(count, completed, chunk_size)
+    max_in_flight = workers * IN_FLIGHT_CHUNKS_PER_WORKER
+
+    with open(out_path, 'a' if resume else 'w', encoding='utf-8', newline='') as out, \
+            ProcessPoolExecutor(max_workers=workers) as executor:
+        if write_header:
+            out.write(",".join(csv_fields(segwit)) + "\n")
+
+        def flush(records):
+            nonlocal written, watch_hits
+            if watch_index is not None:
+                hits = watch_index.contains_many(
+                    [bytes.fromhex(record["hashed_public_key_ripemd160_hex"]) for record in records])
+                for record, hit in zip(records, hits):
+                    if hit:
+                        record["watch_hit"] = True
+                        watch_hits += 1
+            out.write(format_records(records, output_format, segwit))
+            out.flush()
+            if store is not None:
+                store.put_many(records)
+            written += len(records)
+            if progress_callback:
+                progress_callback(written, count)
+
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(generate_chunk, chunk, include_steps, segwit))
+            while len(pending) >= max_in_flight:
+                if ordered:
+                    flush(pending.popleft().result())
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pending.remove(future)
+                        flush(future.result())
+        if ordered:
+            while pending:
+                flush(pending.popleft().result())
+        else:
+            for future in as_completed(pending):
+                flush(future.result())
+
+    if store is not None:
+        store.flush()
+    return {"path": out_path, "count": count, "written": written - already_written,
+            "skipped": already_written, "format": output_format, "workers": workers, "watch_hits": watch_hits}
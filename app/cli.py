@@ -0,0 +1,350 @@
+# app/cli.py
+#
+# Command-line entry point for the offline tools.
+# Usage: python -m app.cli <command> [options]   (python -m app.cli --help for the list)
+
+import argparse
+import json
+import sys
+import time
+
+
+def _cmd_vanity(args) -> int:
+    from app.crypto.vanity import VanityPattern, VanitySearch
+
+    pattern = VanityPattern(args.prefix, encoding=args.encoding)
+    search = VanitySearch(pattern, workers=args.workers, batch_size=args.batch_size, max_results=args.count)
+    deadline = time.monotonic() + args.timeout if args.timeout else None
+
+    search.start()
+    try:
+        while not search.wait(timeout=args.progress_interval):
+            status = search.status()
+            print(f"[vanity] {status['keys_checked']} keys checked, {status['keys_per_second']:.0f} keys/s, "
+                  f"{len(status['results'])}/{args.count} found", file=sys.stderr)
+            if deadline is not None and time.monotonic() >= deadline:
+                print("[vanity] timeout reached, cancelling", file=sys.stderr)
+                search.cancel()
+    except KeyboardInterrupt:
+        print("[vanity] interrupted, cancelling", file=sys.stderr)
+        search.cancel()
+        search.wait()
+
+    status = search.status()
+    for result in status['results']:
+        print(json.dumps(result, ensure_ascii=False))
+    print(f"[vanity] {status['state']}: {status['keys_checked']} keys in {status['elapsed_seconds']}s "
+          f"({status['keys_per_second']:.0f} keys/s)", file=sys.stderr)
+    return 0 if status['results'] else 1
+
+
+def _cmd_generate(args) -> int:
+    from app.bulk import run_bulk_generation
+
+    started_at = time.monotonic()
+    last_report = [started_at]
+
+    def report_progress(written, count):
+        now = time.monotonic()
+        if now - last_report[0] >= args.progress_interval or written == count:
+            last_report[0] = now
+            print(f"[generate] {written}/{count} records, {written / max(now - started_at, 1e-9):.0f} records/s",
+                  file=sys.stderr)
+
+    watch_index = None
+    if args.watch_index:
+        from app.address_index import AddressIndex
+        watch_index = AddressIndex(args.watch_index)
+    store = None
+    if args.sqlite:
+        from app.storage import KeypairStore
+        store = KeypairStore(args.sqlite, store_steps=args.include_steps)
+    try:
+        summary = run_bulk_generation(
+            args.out, args.count, workers=args.workers, output_format=args.format,
+            ordered=not args.unordered, resume=args.resume, include_steps=args.include_steps, segwit=args.segwit,
+            chunk_size=args.chunk_size, progress_callback=report_progress, watch_index=watch_index,
+            store=store
+        )
+    finally:
+        if watch_index is not None:
+            watch_index.close()
+        if store is not None:
+            store.close()
+    elapsed = time.monotonic() - started_at
+    print(f"[generate] wrote {summary['written']} records to {summary['path']} "
+          f"({summary['skipped']} already present) in {elapsed:.1f}s", file=sys.stderr)
+    if watch_index is not None:
+        print(f"[generate] {summary['watch_hits']} records matched the watch index", file=sys.stderr)
+    return 0
+
+
+def _cmd_precompute(args) -> int:
+    from app.crypto.precomp import FixedBaseTable, default_table_path, write_table
+
+    path = args.path or default_table_path()
+    started_at = time.monotonic()
+    write_table(path)
+    FixedBaseTable.open(path).close() # Validate what was written
+    print(f"[precompute] wrote {path} in {time.monotonic() - started_at:.2f}s", file=sys.stderr)
+    return 0
+
+
+def _iter_watch_lines(paths):
+    for path in paths:
+        if path == '-':
+            yield from sys.stdin
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from f
+
+
+def _cmd_index_build(args) -> int:
+    from app.address_index import build_index, parse_watch_entry
+
+    invalid = [0]
+
+    def hash160s():
+        for line in _iter_watch_lines(args.inputs):
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            try:
+                yield parse_watch_entry(line)
+            except ValueError as ve:
+                invalid[0] += 1
+                if invalid[0] <= 10:
+                    print(f"[index] skipping invalid entry: {ve}", file=sys.stderr)
+
+    started_at = time.monotonic()
+    summary = build_index(args.out, hash160s(), false_positive_rate=args.fp_rate)
+    print(f"[index] wrote {summary['entries']} entries to {summary['path']} ({invalid[0]} invalid skipped, "
+          f"bloom: {summary['bloom_bits']} bits, {summary['bloom_hashes']} hashes) "
+          f"in {time.monotonic() - started_at:.1f}s", file=sys.stderr)
+    return 0
+
+
+def _cmd_index_query(args) -> int:
+    from app.address_index import AddressIndex, parse_watch_entry
+
+    index = AddressIndex(args.index)
+    try:
+        entries = [entry.strip() for entry in (args.entries or _iter_watch_lines(['-'])) if entry.strip()]
+        found = index.contains_many([parse_watch_entry(entry) for entry in entries])
+    finally:
+        index.close()
+    for entry, hit in zip(entries, found):
+        print(json.dumps({"address": entry, "found": hit}, ensure_ascii=False))
+    return 0 if any(found) else 1
+
+
+def _cmd_hd(args) -> int:
+    from app.crypto.bip32 import HDNode, HDWallet, parse_path
+    from app.pipeline import build_address_record
+
+    if bool(args.seed) == bool(args.xkey):
+        raise ValueError("Pass exactly one of --seed or --xkey.")
+    root = HDNode.from_seed(bytes.fromhex(args.seed)) if args.seed else HDNode.from_extended_key(args.xkey)
+    wallet = HDWallet(root)
+    parent = wallet.derive(args.path)
+    print(json.dumps({"path": args.path, "xpub": parent.to_xpub(),
+                      "xprv": parent.to_xprv() if parent.is_private else None}), file=sys.stderr)
+    parent_indexes = parse_path(args.path)
+    for child in wallet.derive_public_range(parent_indexes, args.start, args.count):
+        record = {"path": f"{args.path}/{child.child_number}"}
+        record.update(build_address_record(child.public_key, segwit=True))
+        print(json.dumps(record, ensure_ascii=False))
+    return 0
+
+
+def _cmd_dlog(args) -> int:
+    from app.crypto.dlog import BsgsSolver, KangarooSolver
+
+    common = dict(workers=args.workers, curve=args.curve, checkpoint_path=args.checkpoint,
+                  checkpoint_interval=args.checkpoint_interval)
+    low, high = int(args.low, 0), int(args.high, 0)
+    if args.method == 'bsgs':
+        solver = BsgsSolver(args.pubkey, low, high, baby_steps=args.baby_steps, table_path=args.table, **common)
+    else:
+        solver = KangarooSolver(args.pubkey, low, high, herd_size=args.herd_size, dp_bits=args.dp_bits, **common)
+    deadline = time.monotonic() + args.timeout if args.timeout else None
+
+    solver.start()
+    try:
+        while not solver.wait(timeout=args.progress_interval):
+            status = solver.status()
+            print(f"[dlog] {status['method']}: {status['ops']} ops, {status['ops_per_second']:.0f} ops/s, "
+                  f"progress {status['progress'] * 100:.1f}%", file=sys.stderr)
+            if deadline is not None and time.monotonic() >= deadline:
+                print("[dlog] timeout reached, cancelling", file=sys.stderr)
+                solver.cancel()
+    except KeyboardInterrupt:
+        print("[dlog] interrupted, cancelling", file=sys.stderr)
+        solver.cancel()
+        solver.wait()
+
+    status = solver.status()
+    print(json.dumps(status))
+    if status['error']:
+        print(f"error: {status['error']}", file=sys.stderr)
+    return 0 if status['state'] == 'found' else 1
+
+
+def _cmd_scan_coordinator(args) -> int:
+    from app.distributed import ScanCoordinator, load_targets, run_worker_processes
+
+    coordinator = ScanCoordinator(load_targets(_iter_watch_lines(args.targets)), int(args.start, 0), int(args.end, 0),
+                                  lease_size=args.lease_size, lease_timeout=args.lease_timeout,
+                                  checkpoint_path=args.checkpoint, stop_on_match=args.stop_on_match,
+                                  logger=lambda text: print(f"[scan] {text}", file=sys.stderr))
+    host, port = coordinator.serve(args.host, args.port)
+    print(f"[scan] coordinator listening on {host}:{port}, {coordinator.lease_count} leases", file=sys.stderr)
+    if args.local_workers:
+        import threading
+        threading.Thread(target=run_worker_processes, args=(host, port, args.local_workers), daemon=True).start()
+    try:
+        while not coordinator.wait(timeout=args.progress_interval):
+            status = coordinator.status()
+            print(f"[scan] {status['leases_completed']}/{status['leases']} leases, {status['keys_scanned']} keys, "
+                  f"{status['keys_per_second']:.0f} keys/s, {status['workers_active']} workers, "
+                  f"{len(status['matches'])} matches", file=sys.stderr)
+    except KeyboardInterrupt:
+        print("[scan] interrupted, checkpointing", file=sys.stderr)
+        coordinator.stop()
+    status = coordinator.status()
+    # Give workers a moment to receive "done" before the server goes away
+    time.sleep(min(1.0, args.progress_interval))
+    coordinator.close()
+    for match in status['matches']:
+        print(json.dumps(match, ensure_ascii=False))
+    print(f"[scan] {status['state']}: {status['keys_scanned']} keys in {status['elapsed_seconds']}s", file=sys.stderr)
+    return 0 if status['matches'] else 1
+
+
+def _cmd_scan_worker(args) -> int:
+    from app.distributed import run_worker_processes
+
+    host, _, port = args.connect.rpartition(':')
+    if not host or not port.isdigit():
+        raise ValueError("--connect must be host:port.")
+    run_worker_processes(host, int(port), args.processes, args.batch_size)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m app.cli', description="Base40 offline tools.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    vanity = subparsers.add_parser('vanity', help="Search for addresses starting with a given prefix.")
+    vanity.add_argument('--prefix', action='append', required=True,
+                        help="Address prefix to search for (repeat for several prefixes).")
+    vanity.add_argument('--encoding', choices=['base40', 'base58'], default='base40',
+                        help="Match against address_base40 (default) or the Base58Check address.")
+    vanity.add_argument('--workers', type=int, default=None, help="Worker processes (default: all cores).")
+    vanity.add_argument('--count', type=int, default=1, help="Stop after this many matches.")
+    vanity.add_argument('--batch-size', type=int, default=256, help="Points normalised per shared inversion.")
+    vanity.add_argument('--timeout', type=float, default=None, help="Give up after this many seconds.")
+    vanity.add_argument('--progress-interval', type=float, default=2.0, help="Seconds between progress lines.")
+    vanity.set_defaults(handler=_cmd_vanity)
+
+    generate = subparsers.add_parser('generate', help="Generate keypairs and addresses in bulk.")
+    generate.add_argument('--count', type=int, required=True, help="Number of keypairs to generate.")
+    generate.add_argument('--out', required=True, help="Output file path.")
+    generate.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson', help="Output format.")
+    generate.add_argument('--workers', type=int, default=None, help="Worker processes (default: all cores).")
+    generate.add_argument('--unordered', action='store_true',
+                          help="Write chunks as soon as they finish instead of in index order.")
+    generate.add_argument('--resume', action='store_true',
+                          help="Keep the records already in --out and only generate the missing indexes.")
+    generate.add_argument('--include-steps', action='store_true',
+                          help="Include the 256 scalar multiplication steps (ndjson only, much slower).")
+    generate.add_argument('--segwit', action='store_true',
+                          help="Add the P2WPKH and P2TR address fields (about twice the work per key).")
+    generate.add_argument('--chunk-size', type=int, default=256, help="Keypairs per worker task.")
+    generate.add_argument('--progress-interval', type=float, default=2.0, help="Seconds between progress lines.")
+    generate.add_argument('--watch-index', default=None,
+                          help="Address index (see `index build`); matching records get \"watch_hit\": true.")
+    generate.add_argument('--sqlite', default=None,
+                          help="Also store every record in this SQLite database (WAL mode, batched inserts).")
+    generate.set_defaults(handler=_cmd_generate)
+
+    precompute = subparsers.add_parser('precompute', help="(Re)build the shared fixed-base precomputation table.")
+    precompute.add_argument('--path', default=None,
+                            help="Table file (default: $BASE40_PRECOMP_PATH or ~/.cache/base40/...).")
+    precompute.set_defaults(handler=_cmd_precompute)
+
+    hd = subparsers.add_parser('hd', help="Derive BIP32 child addresses from a seed or an extended key.")
+    hd.add_argument('--seed', default=None, help="BIP32 seed as hex (16-64 bytes).")
+    hd.add_argument('--xkey', default=None, help="xprv or xpub to derive from (instead of --seed).")
+    hd.add_argument('--path', default="m/44'/0'/0'/0", help="Parent path of the derived children.")
+    hd.add_argument('--start', type=int, default=0, help="First child index.")
+    hd.add_argument('--count', type=int, default=10, help="Number of (non-hardened) children.")
+    hd.set_defaults(handler=_cmd_hd)
+
+    dlog = subparsers.add_parser('dlog', help="Recover a private key known to lie in [low, high] from its public key.")
+    dlog.add_argument('--pubkey', required=True, help="SEC-encoded public key (hex, compressed or uncompressed).")
+    dlog.add_argument('--low', required=True, help="Lower bound of the key (decimal or 0x-prefixed hex).")
+    dlog.add_argument('--high', required=True, help="Upper bound of the key, inclusive.")
+    dlog.add_argument('--method', choices=['bsgs', 'kangaroo'], default='kangaroo',
+                      help="Baby-step giant-step (memory ~ sqrt of the interval) or Pollard kangaroo (default).")
+    dlog.add_argument('--curve', default=None, help="Curve name (default: secp256k1).")
+    dlog.add_argument('--workers', type=int, default=None, help="Worker processes (default: all cores).")
+    dlog.add_argument('--checkpoint', default=None, help="Checkpoint file; an existing one is resumed.")
+    dlog.add_argument('--checkpoint-interval', type=float, default=30.0, help="Seconds between checkpoints.")
+    dlog.add_argument('--baby-steps', type=int, default=None, help="BSGS: baby steps m (default: ~sqrt(W)/2).")
+    dlog.add_argument('--table', default=None, help="BSGS: baby-step table file to reuse (default: temporary).")
+    dlog.add_argument('--herd-size', type=int, default=128, help="Kangaroo: kangaroos per worker.")
+    dlog.add_argument('--dp-bits', type=int, default=None, help="Kangaroo: distinguished-point bits (default: auto).")
+    dlog.add_argument('--timeout', type=float, default=None, help="Give up (checkpointing) after this many seconds.")
+    dlog.add_argument('--progress-interval', type=float, default=2.0, help="Seconds between progress lines.")
+    dlog.set_defaults(handler=_cmd_dlog)
+
+    scan = subparsers.add_parser('scan', help="Scan a key range for target addresses across worker processes/hosts.")
+    scan_commands = scan.add_subparsers(dest='scan_command', required=True)
+    scan_coordinator = scan_commands.add_parser('coordinator', help="Split the range into leases and serve them.")
+    scan_coordinator.add_argument('--targets', nargs='+', required=True,
+                                  help="Files with one hash160 hex, Base40 or Base58Check address per line; '-' for stdin.")
+    scan_coordinator.add_argument('--start', required=True, help="First private key (decimal or 0x-prefixed hex).")
+    scan_coordinator.add_argument('--end', required=True, help="End of the range (exclusive).")
+    scan_coordinator.add_argument('--lease-size', type=int, default=1 << 20, help="Keys per lease.")
+    scan_coordinator.add_argument('--lease-timeout', type=float, default=60.0,
+                                  help="Seconds without a heartbeat before a lease is reissued.")
+    scan_coordinator.add_argument('--checkpoint', default=None, help="Checkpoint file; an existing one is resumed.")
+    scan_coordinator.add_argument('--stop-on-match', action='store_true', help="Stop at the first match.")
+    scan_coordinator.add_argument('--host', default='127.0.0.1', help="Address to listen on (no authentication!).")
+    scan_coordinator.add_argument('--port', type=int, default=7340, help="Port to listen on.")
+    scan_coordinator.add_argument('--local-workers', type=int, default=0, help="Also run this many local workers.")
+    scan_coordinator.add_argument('--progress-interval', type=float, default=5.0, help="Seconds between progress lines.")
+    scan_coordinator.set_defaults(handler=_cmd_scan_coordinator)
+    scan_worker = scan_commands.add_parser('worker', help="Scan leases from a coordinator.")
+    scan_worker.add_argument('--connect', required=True, help="Coordinator host:port.")
+    scan_worker.add_argument('--processes', type=int, default=None, help="Worker processes (default: all cores).")
+    scan_worker.add_argument('--batch-size', type=int, default=256, help="Points normalised per shared inversion.")
+    scan_worker.set_defaults(handler=_cmd_scan_worker)
+
+    index = subparsers.add_parser('index', help="Build or query an on-disk address index for watch lists.")
+    index_commands = index.add_subparsers(dest='index_command', required=True)
+    index_build = index_commands.add_parser('build', help="Build an index from watch-list files.")
+    index_build.add_argument('inputs', nargs='+',
+                             help="Files with one address (Base40, Base58Check) or hash160 hex per line; '-' for stdin.")
+    index_build.add_argument('--out', required=True, help="Index file to write.")
+    index_build.add_argument('--fp-rate', type=float, default=0.001, help="Bloom filter false-positive rate.")
+    index_build.set_defaults(handler=_cmd_index_build)
+    index_query = index_commands.add_parser('query', help="Check addresses against an index.")
+    index_query.add_argument('--index', required=True, help="Index file.")
+    index_query.add_argument('entries', nargs='*', help="Addresses or hash160 hex (default: read stdin).")
+    index_query.set_defaults(handler=_cmd_index_query)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except ValueError as ve:
+        print(f"error: {ve}", file=sys.stderr)
+        return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
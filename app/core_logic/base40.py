@@ -101,6 +101,101 @@ def base40_to_decimal(base40_string: str, symbols: list = DEFAULT_SYMBOLS) -> in
 
     return decimal_value
 
+# --- Packed binary storage ---
+# The default symbols are 2-3 bytes each in UTF-8, so a 31-symbol address takes 60+ bytes as
+# text. Since 40^3 = 64000 < 65536, three Base40 digits fit in one big-endian uint16
+# (d0 * 1600 + d1 * 40 + d2). Strings are left-padded with symbols[0] (digit 0) to a multiple
+# of 3, which does not change their numerical value: packed values of the same width compare,
+# byte by byte, in the same order as the numbers they encode, so they can be sorted and
+# compared without decoding. A 31-symbol address packs into 22 bytes.
+
+PACKED_GROUP_SYMBOLS = 3
+PACKED_GROUP_BYTES = 2
+PACKED_GROUP_LIMIT = 40 ** PACKED_GROUP_SYMBOLS # Largest valid group value + 1
+
+_packed_tables = {}
+
+def _packing_tables(symbols: list) -> tuple:
+    """Returns (symbol -> digit map, group value -> 3-symbol string list) for a symbols list, cached."""
+    key = tuple(symbols)
+    tables = _packed_tables.get(key)
+    if tables is None:
+        if len(symbols) != 40:
+            raise ValueError("Symbols list must contain exactly 40 symbols.")
+        digits = {symbol: index for index, symbol in enumerate(symbols)}
+        groups = [a + b + c for a in symbols for b in symbols for c in symbols]
+        tables = _packed_tables[key] = (digits, groups)
+    return tables
+
+def packed_size(length: int) -> int:
+    """Bytes needed to pack a Base40 string of `length` symbols."""
+    return -(-length // PACKED_GROUP_SYMBOLS) * PACKED_GROUP_BYTES
+
+def pack_base40(base40_string: str, symbols: list = DEFAULT_SYMBOLS, length: int = None) -> bytes:
+    """
+    Packs a Base40 string into 2 bytes per 3 symbols.
+    Args:
+        base40_string: The Base40 string to pack.
+        symbols: Base40 symbols list.
+        length: Optional fixed width in symbols; the string is left-padded with symbols[0] to it,
+                so values of different lengths pack to the same, comparable width.
+    Returns:
+        packed_size(length or len(base40_string)) bytes.
+    """
+    if not isinstance(base40_string, str):
+        raise TypeError("Input 'base40_string' must be a string.")
+    digits, _ = _packing_tables(symbols)
+    width = len(base40_string) if length is None else length
+    if len(base40_string) > width:
+        raise ValueError(f"Base40 string has {len(base40_string)} symbols; the packed width is {width}.")
+    padded = base40_string.rjust(packed_size(width) // PACKED_GROUP_BYTES * PACKED_GROUP_SYMBOLS, symbols[0])
+
+    packed = bytearray()
+    for start in range(0, len(padded), PACKED_GROUP_SYMBOLS):
+        try:
+            value = (digits[padded[start]] * 1600 + digits[padded[start + 1]] * 40 + digits[padded[start + 2]])
+        except KeyError as e:
+            raise ValueError(f"Symbol '{e.args[0]}' not found in Base40 symbols list.")
+        packed += value.to_bytes(PACKED_GROUP_BYTES, 'big')
+    return bytes(packed)
+
+def unpack_base40(packed: bytes, length: int = None, symbols: list = DEFAULT_SYMBOLS) -> str:
+    """
+    Unpacks bytes produced by pack_base40. With `length`, returns the last `length` symbols
+    (dropping the padding); otherwise every symbol, including the padding.
+    """
+    if len(packed) % PACKED_GROUP_BYTES:
+        raise ValueError("Packed Base40 data must have an even number of bytes.")
+    _, groups = _packing_tables(symbols)
+    parts = []
+    for start in range(0, len(packed), PACKED_GROUP_BYTES):
+        value = (packed[start] << 8) | packed[start + 1]
+        if value >= PACKED_GROUP_LIMIT:
+            raise ValueError(f"Invalid packed Base40 group 0x{value:04x}.")
+        parts.append(groups[value])
+    text = "".join(parts)
+    if length is None:
+        return text
+    if length > len(text) or any(symbol != symbols[0] for symbol in text[:len(text) - length]):
+        raise ValueError(f"Packed Base40 value does not fit in {length} symbols.")
+    return text[len(text) - length:]
+
+def pack_base40_many(base40_strings, length: int, symbols: list = DEFAULT_SYMBOLS) -> bytes:
+    """
+    Packs many Base40 strings into one buffer of fixed-width records (packed_size(length)
+    bytes each), e.g. for an index file. Sorting the records as bytes sorts them numerically.
+    """
+    return b"".join(pack_base40(value, symbols, length) for value in base40_strings)
+
+def unpack_base40_many(packed: bytes, length: int, symbols: list = DEFAULT_SYMBOLS) -> list:
+    """Splits a buffer built by pack_base40_many back into its Base40 strings."""
+    record_size = packed_size(length)
+    if record_size == 0 or len(packed) % record_size:
+        raise ValueError(f"Packed buffer size is not a multiple of the {record_size}-byte record size.")
+    view = memoryview(packed)
+    return [unpack_base40(view[start:start + record_size], length, symbols)
+            for start in range(0, len(packed), record_size)]
+
 # Example Usage (primarily for testing or direct execution)
 if __name__ == '__main__':
     print(f"Default symbols (count: {len(DEFAULT_SYMBOLS)}): {DEFAULT_SYMBOLS}")
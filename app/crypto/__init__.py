@@ -8,10 +8,26 @@ from .secp256k1_utils import (
     point_doubling,
     scalar_multiplication
 )
+from .field_backend import (
+    get_backend as get_field_backend,
+    set_backend as set_field_backend,
+    available_backends as available_field_backends
+)
+from .curves import Curve, CURVES, SECP256K1, SECP256R1, get_curve
 from .keys import (
     generate_private_key,
+    generate_private_keys,
     derive_public_key
 )
 
+from .hash160 import NATIVE_RIPEMD160, ripemd160, hash160_many
+from .segwit import (
+    encode_segwit_address,
+    decode_segwit_address,
+    is_valid_segwit_address,
+    p2wpkh_address,
+    p2tr_address
+)
+
 # Exports from addresses.py
 from .addresses import hash_public_key, ripemd160_to_base40, base58check_encode_bitcoin, base58_encode
@@ -7,6 +7,7 @@ import os
 # Assuming the project root (/app) is in sys.path via test execution context or PYTHONPATH
 
 from app.core_logic.base40 import decimal_to_base40, DEFAULT_SYMBOLS, base40_to_decimal
+from app.crypto.hash160 import hash160
 
 # Base58 alphabet (Bitcoin's alphabet)
 BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
@@ -32,12 +33,28 @@ def hash_public_key(public_key_hex: str) -> bytes:
     if not public_key_hex.startswith('04') or len(public_key_hex) != 130: # 2 (04) + 64 (x) + 64 (y)
         raise ValueError("Public key must be an uncompressed hex string starting with '04' and be 130 chars long.")
 
-    public_key_bytes = bytes.fromhex(public_key_hex)
-    sha256_hash = hashlib.sha256(public_key_bytes).digest()
+    return hash_public_key_bytes(bytes.fromhex(public_key_hex))
 
-    ripemd160 = hashlib.new('ripemd160')
-    ripemd160.update(sha256_hash)
-    return ripemd160.digest()
+def check_public_key_bytes(public_key_bytes: bytes) -> None:
+    """
+    Checks the SEC encoding of a public key: 65 bytes starting with 0x04 or 33 bytes starting
+    with 0x02/0x03. Raises ValueError otherwise. Whether it is a point on the curve is not checked.
+    """
+    if not ((len(public_key_bytes) == 65 and public_key_bytes[0] == 0x04) or
+            (len(public_key_bytes) == 33 and public_key_bytes[0] in (0x02, 0x03))):
+        raise ValueError("Public key must be 65 bytes starting with 0x04 or 33 bytes starting with 0x02/0x03.")
+
+def hash_public_key_bytes(public_key_bytes: bytes) -> bytes:
+    """
+    Hashes a raw SEC-encoded public key using SHA-256 then RIPEMD-160 (H160).
+    Skips the hex round trip of hash_public_key, for bulk paths that already hold bytes.
+    Args:
+        public_key_bytes: 65-byte uncompressed (0x04) or 33-byte compressed (0x02/0x03) public key.
+    Returns:
+        20-byte RIPEMD-160 hash (see hash160.py; works without native RIPEMD-160 in hashlib).
+    """
+    check_public_key_bytes(public_key_bytes)
+    return hash160(public_key_bytes)
 
 def ripemd160_to_base40(ripemd_hash_bytes: bytes, target_length: int = 31, symbols: list = DEFAULT_SYMBOLS) -> str:
     """
@@ -90,8 +107,10 @@ def base58check_encode_bitcoin(ripemd_hash_bytes: bytes, version_byte: int = 0x0
     if len(ripemd_hash_bytes) != 20:
         raise ValueError("RIPEMD-160 hash must be 20 bytes long.")
 
-    versioned_payload = bytes([version_byte]) + ripemd_hash_bytes
+    return base58check_encode(bytes([version_byte]) + ripemd_hash_bytes)
 
+def base58check_encode(versioned_payload: bytes) -> str:
+    """Appends the 4-byte double-SHA-256 checksum to a payload and Base58-encodes it."""
     checksum_hash1 = hashlib.sha256(versioned_payload).digest()
     checksum_hash2 = hashlib.sha256(checksum_hash1).digest()
     checksum = checksum_hash2[:4]
@@ -100,6 +119,38 @@ def base58check_encode_bitcoin(ripemd_hash_bytes: bytes, version_byte: int = 0x0
 
     return base58_encode(full_payload)
 
+def base58_decode(encoded: str) -> bytes:
+    """Decodes a Base58 string into bytes (leading '1's become leading zero bytes)."""
+    num = 0
+    for char in encoded:
+        index = BASE58_ALPHABET.find(char)
+        if index == -1:
+            raise ValueError(f"Character '{char}' is not in the Base58 alphabet.")
+        num = num * 58 + index
+
+    leading_zeros = len(encoded) - len(encoded.lstrip(BASE58_ALPHABET[0]))
+    body = num.to_bytes((num.bit_length() + 7) // 8, 'big') if num else b''
+    return b'\x00' * leading_zeros + body
+
+def base58check_decode(encoded: str) -> bytes:
+    """Decodes a Base58Check string, verifies its checksum and returns the versioned payload."""
+    full_payload = base58_decode(encoded)
+    if len(full_payload) < 5:
+        raise ValueError("Base58Check data is too short.")
+    versioned_payload, checksum = full_payload[:-4], full_payload[-4:]
+    if hashlib.sha256(hashlib.sha256(versioned_payload).digest()).digest()[:4] != checksum:
+        raise ValueError("Base58Check checksum mismatch.")
+    return versioned_payload
+
+def base58check_decode_bitcoin(address: str) -> tuple:
+    """
+    Decodes a Base58Check address and verifies its checksum.
+    Returns:
+        (version_byte, payload) - e.g. (0x00, 20-byte RIPEMD-160 hash) for a P2PKH address.
+    """
+    versioned_payload = base58check_decode(address)
+    return versioned_payload[0], versioned_payload[1:]
+
 # Self-tests would normally be here, but are omitted from execution due to known hashlib issue
 # if __name__ == '__main__':
 #    print("Self-tests for addresses.py would run here.")
@@ -0,0 +1,237 @@
+# app/crypto/bip32.py
+#
+# BIP32 hierarchical deterministic keys: master key from a seed, hardened and non-hardened
+# child derivation, and xprv/xpub serialisation (Base58Check, mainnet versions).
+#
+# HDWallet keeps an LRU cache of derived nodes keyed by path, so deriving m/44'/0'/0'/0/0..n
+# computes the account chain once and every further address costs one child derivation.
+# derive_public_children derives a run of non-hardened children together: each child point
+# is IL_i * G + K_parent, computed in Jacobian coordinates (fixed-base table, then one mixed
+# addition of the shared parent point) and normalised with one batch inversion.
+
+import hashlib
+import hmac
+from collections import OrderedDict
+
+from app.crypto.secp256k1_utils import N, POINT_INFINITY, scalar_multiply, jacobian_add_affine, batch_to_affine
+from app.crypto.keys import public_key_to_bytes, public_key_from_bytes
+from app.crypto.addresses import hash_public_key_bytes, base58check_encode, base58check_decode
+from app.crypto.precomp import get_fixed_base_table
+
+HARDENED = 0x80000000
+XPRV_VERSION = bytes.fromhex('0488ade4')
+XPUB_VERSION = bytes.fromhex('0488b21e')
+MASTER_HMAC_KEY = b'Bitcoin seed'
+DEFAULT_NODE_CACHE_SIZE = 1024
+
+
+class HDNode:
+    """One node of a BIP32 tree. private_key is None for public-only (xpub) nodes."""
+
+    def __init__(self, chain_code: bytes, private_key: int = None, public_point: tuple = None,
+                 depth: int = 0, parent_fingerprint: bytes = b'\x00' * 4, child_number: int = 0):
+        if private_key is None and public_point is None:
+            raise ValueError("An HD node needs a private key or a public point.")
+        if private_key is not None and not (1 <= private_key < N):
+            raise ValueError("HD node private key is out of the valid range [1, N-1].")
+        self.chain_code = chain_code
+        self.private_key = private_key
+        self._public_point = public_point
+        self.depth = depth
+        self.parent_fingerprint = parent_fingerprint
+        self.child_number = child_number
+
+    @classmethod
+    def from_seed(cls, seed: bytes):
+        """Derives the master node from a 16-64 byte seed."""
+        if not (16 <= len(seed) <= 64):
+            raise ValueError("BIP32 seeds must be between 16 and 64 bytes long.")
+        digest = hmac.new(MASTER_HMAC_KEY, seed, hashlib.sha512).digest()
+        master_key = int.from_bytes(digest[:32], 'big')
+        if not (1 <= master_key < N):
+            raise ValueError("Seed produces an invalid master key; use another seed.")
+        return cls(digest[32:], private_key=master_key)
+
+    @classmethod
+    def from_extended_key(cls, extended_key: str):
+        """Parses an xprv or xpub string."""
+        data = base58check_decode(extended_key)
+        if len(data) != 78:
+            raise ValueError("Extended keys must decode to 78 bytes.")
+        version, depth, parent_fingerprint = data[:4], data[4], data[5:9]
+        child_number = int.from_bytes(data[9:13], 'big')
+        chain_code, key_data = data[13:45], data[45:]
+        if depth == 0 and (parent_fingerprint != b'\x00' * 4 or child_number != 0):
+            raise ValueError("Master extended key with a parent fingerprint or child number.")
+        if version == XPRV_VERSION:
+            if key_data[0] != 0:
+                raise ValueError("Private extended key data must start with 0x00.")
+            return cls(chain_code, private_key=int.from_bytes(key_data[1:], 'big'), depth=depth,
+                       parent_fingerprint=parent_fingerprint, child_number=child_number)
+        if version == XPUB_VERSION:
+            return cls(chain_code, public_point=public_key_from_bytes(key_data), depth=depth,
+                       parent_fingerprint=parent_fingerprint, child_number=child_number)
+        raise ValueError(f"Unknown extended key version {version.hex()}.")
+
+    @property
+    def public_point(self) -> tuple:
+        if self._public_point is None:
+            self._public_point = scalar_multiply(self.private_key)
+        return self._public_point
+
+    @property
+    def public_key(self) -> bytes:
+        """The compressed SEC public key."""
+        return public_key_to_bytes(self.public_point, compressed=True)
+
+    @property
+    def fingerprint(self) -> bytes:
+        return hash_public_key_bytes(self.public_key)[:4]
+
+    @property
+    def is_private(self) -> bool:
+        return self.private_key is not None
+
+    def neuter(self):
+        """Returns the public-only counterpart of this node."""
+        return HDNode(self.chain_code, public_point=self.public_point, depth=self.depth,
+                      parent_fingerprint=self.parent_fingerprint, child_number=self.child_number)
+
+    def _tweak(self, index: int) -> tuple:
+        if not (0 <= index < 2 ** 32):
+            raise ValueError("Child index must be in [0, 2^32 - 1].")
+        if index >= HARDENED:
+            if not self.is_private:
+                raise ValueError("Hardened children cannot be derived from a public key.")
+            data = b'\x00' + self.private_key.to_bytes(32, 'big')
+        else:
+            data = self.public_key
+        digest = hmac.new(self.chain_code, data + index.to_bytes(4, 'big'), hashlib.sha512).digest()
+        tweak = int.from_bytes(digest[:32], 'big')
+        if tweak >= N:
+            # Probability below 2^-127; BIP32 says to skip to the next index
+            raise ValueError(f"Child {index} is invalid (IL >= n); use the next index.")
+        return tweak, digest[32:]
+
+    def child(self, index: int):
+        """Derives child `index` (index >= HARDENED for hardened children)."""
+        tweak, chain_code = self._tweak(index)
+        if self.is_private:
+            child_key = (tweak + self.private_key) % N
+            if child_key == 0:
+                raise ValueError(f"Child {index} is invalid (zero key); use the next index.")
+            return HDNode(chain_code, private_key=child_key, depth=self.depth + 1,
+                          parent_fingerprint=self.fingerprint, child_number=index)
+        child_point = derive_public_points([tweak], self.public_point)[0]
+        return HDNode(chain_code, public_point=child_point, depth=self.depth + 1,
+                      parent_fingerprint=self.fingerprint, child_number=index)
+
+    def _serialize(self, version: bytes, key_data: bytes) -> str:
+        if self.depth > 255:
+            raise ValueError("Extended keys cannot encode a depth above 255.")
+        return base58check_encode(version + bytes([self.depth]) + self.parent_fingerprint +
+                                  self.child_number.to_bytes(4, 'big') + self.chain_code + key_data)
+
+    def to_xprv(self) -> str:
+        if not self.is_private:
+            raise ValueError("A public-only node has no xprv.")
+        return self._serialize(XPRV_VERSION, b'\x00' + self.private_key.to_bytes(32, 'big'))
+
+    def to_xpub(self) -> str:
+        return self._serialize(XPUB_VERSION, self.public_key)
+
+
+def parse_path(path: str) -> tuple:
+    """Parses "m/44'/0'/0'/0/5" (h or H also mark hardened indexes) into a tuple of indexes."""
+    parts = path.strip().split('/')
+    if parts[0] not in ('m', 'M'):
+        raise ValueError("Derivation paths must start with 'm'.")
+    indexes = []
+    for part in parts[1:]:
+        hardened = part[-1:] in ("'", 'h', 'H')
+        number = part[:-1] if hardened else part
+        if not number.isdigit() or int(number) >= HARDENED:
+            raise ValueError(f"Invalid path component '{part}'.")
+        indexes.append(int(number) + (HARDENED if hardened else 0))
+    return tuple(indexes)
+
+
+def derive_public_points(tweaks: list, parent_point: tuple) -> list:
+    """Computes tweak_i * G + parent_point for every tweak with a single shared inversion."""
+    table = get_fixed_base_table()
+    points = [jacobian_add_affine(table.multiply_jacobian(tweak), parent_point) for tweak in tweaks]
+    affine = batch_to_affine(points)
+    if POINT_INFINITY in affine:
+        raise ValueError("A child key is the point at infinity; use the next index.")
+    return affine
+
+
+def derive_public_children(parent: HDNode, start: int, count: int) -> list:
+    """
+    Derives the non-hardened children start..start+count-1 of `parent` as public-only nodes,
+    sharing one field inversion across the whole run.
+    """
+    if not (0 <= start and start + count <= HARDENED):
+        raise ValueError("Batched public derivation only covers non-hardened indexes.")
+    tweaks, chain_codes = [], []
+    for index in range(start, start + count):
+        tweak, chain_code = parent._tweak(index)
+        tweaks.append(tweak)
+        chain_codes.append(chain_code)
+    fingerprint = parent.fingerprint
+    return [HDNode(chain_code, public_point=point, depth=parent.depth + 1,
+                   parent_fingerprint=fingerprint, child_number=start + offset)
+            for offset, (chain_code, point) in enumerate(zip(chain_codes, derive_public_points(tweaks, parent.public_point)))]
+
+
+class HDWallet:
+    """A BIP32 tree rooted at one master node, with an LRU cache of derived nodes."""
+
+    def __init__(self, master: HDNode, cache_size: int = DEFAULT_NODE_CACHE_SIZE):
+        self.master = master
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @classmethod
+    def from_seed(cls, seed: bytes, cache_size: int = DEFAULT_NODE_CACHE_SIZE):
+        return cls(HDNode.from_seed(seed), cache_size)
+
+    def _cached(self, indexes: tuple):
+        node = self._cache.get(indexes)
+        if node is not None:
+            self._cache.move_to_end(indexes)
+        return node
+
+    def _remember(self, indexes: tuple, node: HDNode):
+        if self.cache_size > 0:
+            self._cache[indexes] = node
+            self._cache.move_to_end(indexes)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def derive(self, path) -> HDNode:
+        """Derives the node at `path` (a string such as "m/44'/0'/0'/0/0" or a tuple of indexes)."""
+        indexes = parse_path(path) if isinstance(path, str) else tuple(path)
+        # Start from the deepest cached ancestor
+        depth = len(indexes)
+        node = self.master
+        while depth > 0:
+            cached = self._cached(indexes[:depth])
+            if cached is not None:
+                node = cached
+                break
+            depth -= 1
+        if depth == len(indexes) and depth > 0:
+            self.cache_hits += 1
+            return node
+        self.cache_misses += 1
+        for level in range(depth, len(indexes)):
+            node = node.child(indexes[level])
+            self._remember(indexes[:level + 1], node)
+        return node
+
+    def derive_public_range(self, parent_path, start: int, count: int) -> list:
+        """Public-only children start..start+count-1 of the node at parent_path (batched)."""
+        return derive_public_children(self.derive(parent_path), start, count)
@@ -0,0 +1,158 @@
+# app/crypto/curves.py
+#
+# Curve context objects. A Curve bundles the domain parameters (p, a, b, G, n, h) of one short
+# Weierstrass curve y^2 = x^3 + ax + b over F_p and binds the generic point arithmetic of
+# secp256k1_utils to them, so the same engine serves secp256k1 and the NIST curves.
+#
+# Per-curve caches are built lazily, on first use: the fixed-base table for k * G (mapped from
+# its own file, see precomp.py) and the curve identifiers used for dispatch. Jacobian doubling
+# picks its formula from a (a == 0 for secp256k1, a == -3 for P-256; see jacobian_double).
+
+import threading
+
+from app.core_logic.base40 import DEFAULT_SYMBOLS
+from app.crypto import secp256k1_utils as ec
+from app.crypto.secp256k1_utils import POINT_INFINITY
+
+DEFAULT_CURVE = 'secp256k1'
+
+
+class Curve:
+    """Domain parameters of one curve plus its lazily built caches."""
+
+    def __init__(self, name: str, p: int, a: int, b: int, Gx: int, Gy: int, n: int, h: int = 1, aliases: tuple = ()):
+        self.name = name
+        self.p = p
+        self.a = a % p
+        self.b = b % p
+        self.G = (Gx, Gy)
+        self.n = n
+        self.h = h
+        self.aliases = aliases
+        self.field_bytes = (p.bit_length() + 7) // 8
+        self._table = None
+        self._table_lock = threading.Lock()
+        if not ec.is_on_curve(Gx, Gy, self.a, self.b, p):
+            raise ValueError(f"Generator of curve '{name}' is not on the curve.")
+
+    def __repr__(self):
+        return f"Curve({self.name!r})"
+
+    @property
+    def a_is_zero(self) -> bool:
+        return self.a == 0
+
+    @property
+    def a_is_minus_3(self) -> bool:
+        return self.a == self.p - 3
+
+    # --- Validation ---
+
+    def is_on_curve(self, point) -> bool:
+        if point == POINT_INFINITY:
+            return True
+        return ec.is_on_curve(point[0], point[1], self.a, self.b, self.p)
+
+    def validate_private_key(self, k: int) -> int:
+        if not isinstance(k, int):
+            raise TypeError("Private key must be an integer.")
+        if not (1 <= k < self.n):
+            raise ValueError(f"Private key integer value is out of the valid range [1, N-1] for {self.name}. Got {k}")
+        return k
+
+    # --- Affine and Jacobian arithmetic bound to this curve ---
+
+    def add(self, p1, p2):
+        return ec.point_addition(p1, p2, self.a, self.b, self.p)
+
+    def double(self, point):
+        return ec.point_doubling(point, self.a, self.b, self.p)
+
+    def jacobian_double(self, point):
+        return ec.jacobian_double(point, self.a, self.p)
+
+    def jacobian_add_affine(self, point, q):
+        return ec.jacobian_add_affine(point, q, self.a, self.p)
+
+    def inverse(self, value: int) -> int:
+        return ec.inverse_mod(value, self.p)
+
+    def batch_inverse(self, values: list) -> list:
+        return ec.batch_inverse(values, self.p)
+
+    def batch_to_affine(self, points: list) -> list:
+        return ec.batch_to_affine(points, self.p)
+
+    # --- Scalar multiplication ---
+
+    def fixed_base_table(self):
+        """The curve's k * G table, mapped (or built) on first use and shared by every caller."""
+        if self._table is None:
+            with self._table_lock:
+                if self._table is None:
+                    from app.crypto import precomp # Lazy: building a table is expensive
+                    if self.name == DEFAULT_CURVE:
+                        self._table = precomp.get_fixed_base_table()
+                    else:
+                        self._table = precomp.FixedBaseTable.load_or_create(
+                            precomp.default_table_path(self.name), self.G, self.a, self.b, self.p, self.n)
+        return self._table
+
+    def reset_table(self):
+        """
+        Drops the cached table without closing it, like precomp.reset_fixed_base_table: a
+        thread still multiplying with it keeps it mapped until garbage collection.
+        """
+        with self._table_lock:
+            self._table = None
+
+    def multiply_generator(self, k: int):
+        """k * G without a trace, via the fixed-base table."""
+        self.validate_private_key(k)
+        return self.fixed_base_table().multiply(k)
+
+    def multiply(self, k: int, point):
+        """k * point without a trace (Jacobian double-and-add, one inversion)."""
+        if point == self.G:
+            return self.multiply_generator(k)
+        return ec.scalar_multiply(k, point, self.a, self.p)
+
+    def scalar_multiplication(self, k: int, symbols: list = DEFAULT_SYMBOLS):
+        """k * G with the per-step trace used by the visualisation (see secp256k1_utils)."""
+        return ec.scalar_multiplication(k, self.G, symbols, self.a, self.b, self.p, self.n)
+
+
+SECP256K1 = Curve(
+    'secp256k1',
+    p=ec.P, a=ec.A, b=ec.B, Gx=ec.Gx, Gy=ec.Gy, n=ec.N, h=1,
+)
+
+SECP256R1 = Curve(
+    'secp256r1',
+    p=0xFFFFFFFF00000001000000000000000000000000FFFFFFFFFFFFFFFFFFFFFFFF,
+    a=-3,
+    b=0x5AC635D8AA3A93E7B3EBBD55769886BC651D06B0CC53B0F63BCE3C3E27D2604B,
+    Gx=0x6B17D1F2E12C4247F8BCE6E563A440F277037D812DEB33A0F4A13945D898C296,
+    Gy=0x4FE342E2FE1A7F9B8EE7EB4A7C0F9E162BCE33576B315ECECBB6406837BF51F5,
+    n=0xFFFFFFFF00000000FFFFFFFFFFFFFFFFBCE6FAADA7179E84F3B9CAC2FC632551,
+    h=1,
+    aliases=('p256', 'p-256', 'prime256v1'),
+)
+
+CURVES = {curve.name: curve for curve in (SECP256K1, SECP256R1)}
+_CURVE_NAMES = {alias: curve for curve in CURVES.values() for alias in (curve.name,) + curve.aliases}
+
+
+def get_curve(curve=None) -> Curve:
+    """
+    Resolves a curve selector: a Curve, a name or alias (case-insensitive), or None for the
+    default secp256k1. Raises ValueError for unknown names.
+    """
+    if curve is None:
+        return SECP256K1
+    if isinstance(curve, Curve):
+        return curve
+    resolved = _CURVE_NAMES.get(str(curve).strip().lower())
+    if resolved is None:
+        raise ValueError(f"Unknown curve '{curve}'. Supported curves: {', '.join(sorted(CURVES))}.")
+    return resolved
@@ -0,0 +1,699 @@
+# app/crypto/dlog.py
+#
+# Bounded-interval discrete logarithms: given Q = k * G with k known to lie in [low, high],
+# find k. Intended for key-recovery exercises and for auditing keys drawn from a weak range.
+# Both solvers first shift the problem to Q' = Q - low * G, with k' = k - low in [0, W).
+#
+# Baby-step giant-step (BsgsSolver): O(sqrt(W)) memory and time. The baby steps j * G
+# (1 <= j <= m) are stored in a hashed table file (BabyStepTable) that every worker maps with
+# mmap; a slot holds the low 64 bits of x(jG) and j. Since x(jG) == x(-jG), one lookup matches
+# both +j and -j, so giant step i checks the 2m + 1 keys around 2m * i + m. Giant steps are
+# split into chunks handed out to worker processes; completed chunks are checkpointed.
+#
+# Pollard kangaroo (KangarooSolver): O(sqrt(W)) time, memory proportional to the number of
+# distinguished points. Each worker moves a herd of tame kangaroos (started at known multiples
+# of G) and wild ones (started at Q' plus a known offset) with pseudo-random jumps chosen by x,
+# advancing the whole herd with one shared inversion per step. Points whose x has dp_bits low
+# zero bits are reported to the parent; a tame and a wild kangaroo reporting the same point
+# give k', as do two wild ones on opposite points (same x). Two kangaroos of the same kind at
+# the same distance have merged trails, and the later one is restarted. The checkpoint keeps
+# the distinguished points, which stay valid for new herds.
+#
+# Both solvers report their rate (giant steps or jumps per second) through status().
+#
+# Usage: python -m app.cli dlog --pubkey <hex> --low <int> --high <int> --method kangaroo
+
+import json
+import math
+import mmap
+import multiprocessing
+import os
+import queue
+import random
+import shutil
+import struct
+import tempfile
+import threading
+import time
+
+from app.crypto.curves import get_curve
+from app.crypto.keys import public_key_from_bytes, public_key_to_bytes
+from app.crypto.precomp import curve_digest, write_atomically
+from app.crypto.secp256k1_utils import POINT_INFINITY, to_jacobian, batch_inverse
+
+BSGS_TABLE_MAGIC = b'B40BSGST'
+BSGS_TABLE_FORMAT_VERSION = 1
+BSGS_HEADER_FORMAT = '>8sHHQQ32s' # magic, version, reserved, baby steps, capacity (slots), curve digest
+BSGS_HEADER_SIZE = struct.calcsize(BSGS_HEADER_FORMAT)
+BSGS_SLOT_FORMAT = '>QI' # x fingerprint (low 64 bits of x), j (0 = empty slot)
+BSGS_SLOT_SIZE = struct.calcsize(BSGS_SLOT_FORMAT)
+FINGERPRINT_MASK = (1 << 64) - 1
+
+CHECKPOINT_FORMAT_VERSION = 1
+DEFAULT_BABY_STEPS_LIMIT = 1 << 22 # ~100 MB table
+DEFAULT_CHUNK_GIANT_STEPS = 4096
+DEFAULT_HERD_SIZE = 128
+DEFAULT_JUMP_COUNT = 32
+DEFAULT_CHECKPOINT_INTERVAL = 30.0
+POINT_BATCH_SIZE = 256 # Points normalised per shared inversion
+
+
+def _negate(point, p):
+    return POINT_INFINITY if point == POINT_INFINITY else (point[0], (-point[1]) % p)
+
+
+def _shifted_target(public_point, low: int, curve):
+    """Q - low * G (the target of the shifted search), possibly the point at infinity."""
+    if low == 0:
+        return public_point
+    return curve.add(public_point, _negate(curve.multiply_generator(low), curve.p))
+
+
+def _check_interval(public_point, low: int, high: int, curve):
+    if not curve.is_on_curve(public_point) or public_point == POINT_INFINITY:
+        raise ValueError("Public key is not a point on the curve.")
+    if not (0 <= low <= high < curve.n):
+        raise ValueError("The interval must satisfy 0 <= low <= high < n.")
+
+
+# --- Baby-step table ---
+
+class BabyStepTable:
+    """Open-addressing hash table of x(jG) -> j for 1 <= j <= baby_steps, backed by a mapped file."""
+
+    def __init__(self, buffer, baby_steps: int, capacity: int, source: str = None):
+        self._buffer = buffer
+        self.baby_steps = baby_steps
+        self.capacity = capacity
+        self.source = source
+
+    @staticmethod
+    def capacity_for(baby_steps: int) -> int:
+        """Power-of-two slot count keeping the load factor at or below 1/2."""
+        return 1 << max(4, (2 * baby_steps - 1).bit_length())
+
+    @classmethod
+    def build(cls, path: str, baby_steps: int, curve=None) -> None:
+        """Computes the baby steps and writes the table to path atomically."""
+        curve = get_curve(curve)
+        if not (1 <= baby_steps < (1 << 32)):
+            raise ValueError("baby_steps must be between 1 and 2^32 - 1.")
+        capacity = cls.capacity_for(baby_steps)
+        mask = capacity - 1
+        slots = bytearray(capacity * BSGS_SLOT_SIZE)
+        j = 1
+        current = to_jacobian(curve.G)
+        while j <= baby_steps:
+            batch = []
+            for _ in range(min(POINT_BATCH_SIZE, baby_steps - j + 1)):
+                batch.append(current)
+                current = curve.jacobian_add_affine(current, curve.G)
+            for point in curve.batch_to_affine(batch):
+                fingerprint = point[0] & FINGERPRINT_MASK
+                slot = fingerprint & mask
+                while struct.unpack_from('>I', slots, slot * BSGS_SLOT_SIZE + 8)[0]:
+                    slot = (slot + 1) & mask
+                struct.pack_into(BSGS_SLOT_FORMAT, slots, slot * BSGS_SLOT_SIZE, fingerprint, j)
+                j += 1
+        header = struct.pack(BSGS_HEADER_FORMAT, BSGS_TABLE_MAGIC, BSGS_TABLE_FORMAT_VERSION, 0, baby_steps, capacity,
+                             curve_digest(curve.p, curve.a, curve.b, curve.G, curve.n))
+        write_atomically(path, header + bytes(slots), prefix='.dlog-')
+
+    @classmethod
+    def open(cls, path: str, curve=None):
+        """Maps an existing table. Raises ValueError if it is invalid or built for another curve."""
+        curve = get_curve(curve)
+        try:
+            with open(path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Cannot map baby-step table '{path}': {e}")
+        if len(mapped) < BSGS_HEADER_SIZE:
+            mapped.close()
+            raise ValueError(f"Baby-step table '{path}' is truncated.")
+        magic, version, _, baby_steps, capacity, digest = struct.unpack_from(BSGS_HEADER_FORMAT, mapped, 0)
+        expected_digest = curve_digest(curve.p, curve.a, curve.b, curve.G, curve.n)
+        if (magic, version, digest) != (BSGS_TABLE_MAGIC, BSGS_TABLE_FORMAT_VERSION, expected_digest) or \
+                len(mapped) != BSGS_HEADER_SIZE + capacity * BSGS_SLOT_SIZE:
+            mapped.close()
+            raise ValueError(f"Baby-step table '{path}' is stale or corrupt (format, curve or size differ).")
+        return cls(mapped, baby_steps, capacity, source=path)
+
+    @classmethod
+    def load_or_create(cls, path: str, baby_steps: int, curve=None):
+        """Maps the table at path, (re)building it when missing, invalid or of another size."""
+        try:
+            table = cls.open(path, curve)
+            if table.baby_steps == baby_steps:
+                return table
+            table.close()
+        except ValueError:
+            pass
+        cls.build(path, baby_steps, curve)
+        return cls.open(path, curve)
+
+    @property
+    def nbytes(self) -> int:
+        return self.capacity * BSGS_SLOT_SIZE
+
+    def lookup(self, x: int) -> list:
+        """Returns every j whose slot fingerprint matches x (candidates for x(jG) == x)."""
+        fingerprint = x & FINGERPRINT_MASK
+        mask = self.capacity - 1
+        slot = fingerprint & mask
+        matches = []
+        while True:
+            stored, j = struct.unpack_from(BSGS_SLOT_FORMAT, self._buffer, BSGS_HEADER_SIZE + slot * BSGS_SLOT_SIZE)
+            if not j:
+                return matches
+            if stored == fingerprint:
+                matches.append(j)
+            slot = (slot + 1) & mask
+
+    def close(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+
+def bsgs_scan(table: BabyStepTable, target, giant_start: int, giant_end: int, curve=None,
+              counter=None, stop_event=None):
+    """
+    Runs giant steps giant_start..giant_end-1 against the shifted target Q' and returns k'
+    (with k' * G == Q'), or None. Giant step i checks the keys 2m * i + m +/- j, 0 <= j <= m.
+    """
+    curve = get_curve(curve)
+    m = table.baby_steps
+    stride = 2 * m
+    center = stride * giant_start + m
+    current = to_jacobian(curve.add(target, _negate(curve.multiply_generator(center), curve.p)))
+    minus_stride = _negate(curve.multiply_generator(stride), curve.p)
+    i = giant_start
+    while i < giant_end:
+        if stop_event is not None and stop_event.is_set():
+            return None
+        batch = []
+        for _ in range(min(POINT_BATCH_SIZE, giant_end - i)):
+            batch.append(current)
+            current = curve.jacobian_add_affine(current, minus_stride)
+        for offset, point in enumerate(curve.batch_to_affine(batch)):
+            center = stride * (i + offset) + m
+            if point == POINT_INFINITY:
+                candidates = [center]
+            else:
+                candidates = [center + sign * j for j in table.lookup(point[0]) for sign in (1, -1)]
+            for candidate in candidates:
+                # Fingerprints are 64 bits, so a match is confirmed with one multiplication
+                if 0 < candidate < curve.n and curve.multiply_generator(candidate) == target:
+                    return candidate
+        i += len(batch)
+        if counter is not None:
+            with counter.get_lock():
+                counter.value += len(batch)
+    return None
+
+
+def _bsgs_worker(curve_name, table_path, target, low, tasks, stop_event, result_queue, counter):
+    """Worker process: scans giant-step chunks from the task queue until it is drained."""
+    table = None
+    try:
+        curve = get_curve(curve_name)
+        table = BabyStepTable.open(table_path, curve)
+        while not stop_event.is_set():
+            task = tasks.get()
+            if task is None:
+                return
+            chunk, giant_start, giant_end = task
+            found = bsgs_scan(table, target, giant_start, giant_end, curve, counter, stop_event)
+            if stop_event.is_set() and found is None:
+                return
+            result_queue.put(('done', chunk, None if found is None else low + found))
+    except Exception as e:
+        result_queue.put(('error', None, str(e)))
+    finally:
+        if table is not None:
+            table.close()
+
+
+# --- Kangaroo ---
+
+def kangaroo_jumps(width: int, kangaroos: int, count: int = DEFAULT_JUMP_COUNT, seed: int = None) -> list:
+    """
+    Jump distances with mean ~ kangaroos * sqrt(width) / 4 (the optimum for parallel kangaroos),
+    drawn from a seeded generator so that checkpointed trails can be continued.
+    """
+    mean = max(1, kangaroos * math.isqrt(width) // 4)
+    rng = random.Random(seed)
+    return [rng.randint(1, 2 * mean) for _ in range(count)]
+
+
+def default_dp_bits(width: int, kangaroos: int) -> int:
+    """Distinguished-point bits: about eight points per kangaroo over the expected run."""
+    per_kangaroo = 2 * math.isqrt(width) // max(1, kangaroos)
+    return max(0, per_kangaroo.bit_length() - 4)
+
+
+def _kangaroo_worker(curve_name, target, width, jumps, dp_bits, herd_size, worker_index,
+                     stop_event, result_queue, control, counter):
+    """
+    Worker process: moves herd_size kangaroos (half tame, half wild) until stopped, reporting
+    distinguished points as ('dps', worker_index, [(x, distance, kind), ...]). The parent sends
+    the x of a distinguished point back on `control` when two kangaroos of the same kind met
+    there; the kangaroo that reported it is then restarted (both would share one path forever).
+    """
+    try:
+        curve = get_curve(curve_name)
+        p = curve.p
+        rng = random.SystemRandom()
+        jump_points = [curve.multiply_generator(distance) for distance in jumps]
+        jump_mask = len(jumps) - 1
+        dp_mask = (1 << dp_bits) - 1
+
+        def spawn(kind):
+            while True:
+                distance = rng.randrange(width) + 1
+                point = curve.multiply_generator(distance)
+                if kind == 'wild':
+                    point = curve.add(target, point)
+                if point != POINT_INFINITY:
+                    return point, distance
+
+        kinds = ['tame' if index % 2 == 0 else 'wild' for index in range(herd_size)]
+        herd = [spawn(kind) for kind in kinds]
+        points = [point for point, _ in herd]
+        distances = [distance for _, distance in herd]
+        last_dp = {}
+
+        while not stop_event.is_set():
+            while True:
+                try:
+                    x = control.get_nowait()
+                except queue.Empty:
+                    break
+                index = last_dp.pop(x, None)
+                if index is not None:
+                    points[index], distances[index] = spawn(kinds[index])
+
+            indexes = [point[0] & jump_mask for point in points]
+            dx = [(jump_points[j][0] - point[0]) % p for j, point in zip(indexes, points)]
+            for index, value in enumerate(dx):
+                if value == 0: # Landed on +/- a jump point: restart instead of doubling
+                    points[index], distances[index] = spawn(kinds[index])
+                    indexes[index] = points[index][0] & jump_mask
+                    dx[index] = (jump_points[indexes[index]][0] - points[index][0]) % p or 1
+            inverses = batch_inverse(dx, p)
+            found = []
+            for index, (j, inverse) in enumerate(zip(indexes, inverses)):
+                x1, y1 = points[index]
+                x2, y2 = jump_points[j]
+                if x1 == x2:
+                    continue # Restarted above onto a jump point's x; skip this round
+                s = ((y2 - y1) * inverse) % p
+                x3 = (s * s - x1 - x2) % p
+                points[index] = (x3, (s * (x1 - x3) - y1) % p)
+                distances[index] += jumps[j]
+                if x3 & dp_mask == 0:
+                    found.append((x3, distances[index], kinds[index]))
+                    last_dp[x3] = index
+            if found:
+                result_queue.put(('dps', worker_index, found))
+            with counter.get_lock():
+                counter.value += herd_size
+            if len(last_dp) > 64 * herd_size:
+                last_dp.clear()
+    except Exception as e:
+        result_queue.put(('error', worker_index, str(e)))
+
+
+# --- Solvers ---
+
+class _ParallelSolver:
+    """
+    Shared driver: worker processes, a collector thread in the parent, periodic checkpoints
+    and the status report. States: pending -> running -> found | exhausted | cancelled | failed.
+    """
+    method = None
+
+    def __init__(self, public_key, low: int, high: int, workers: int = None, curve=None,
+                 checkpoint_path: str = None, checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL, mp_context=None):
+        self.curve = get_curve(curve)
+        if isinstance(public_key, (bytes, str)):
+            public_key = public_key_from_bytes(bytes.fromhex(public_key) if isinstance(public_key, str) else public_key,
+                                               self.curve)
+        _check_interval(public_key, low, high, self.curve)
+        self.public_point = public_key
+        self.low = low
+        self.high = high
+        self.width = high - low + 1
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self.target = _shifted_target(public_key, low, self.curve)
+        # 'spawn' keeps workers safe to start from threaded servers (forking a threaded process is not)
+        self._mp = mp_context or multiprocessing.get_context('spawn')
+
+        self.state = 'pending'
+        self.result = None
+        self.error = None
+        self._processes = []
+        self._counters = []
+        self._stop_event = self._mp.Event()
+        self._result_queue = self._mp.Queue()
+        self._collector = None
+        self._finished = threading.Event()
+        self._lock = threading.Lock()
+        self._started_at = None
+        self._finished_at = None
+        self._previous_ops = 0 # From the checkpoint being resumed
+        self._previous_seconds = 0.0
+
+    # Subclass hooks
+    def _prepare(self): ...
+    def _spawn_workers(self): ...
+    def _handle(self, message): ...
+    def _checkpoint_state(self) -> dict: ...
+    def _restore(self, state: dict): ...
+    def _extra_status(self) -> dict: ...
+
+    def _identity(self) -> dict:
+        return {
+            "format": CHECKPOINT_FORMAT_VERSION,
+            "method": self.method,
+            "curve": self.curve.name,
+            "public_key": public_key_to_bytes(self.public_point, compressed=True).hex(),
+            "low": self.low,
+            "high": self.high,
+        }
+
+    def _load_checkpoint(self):
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return
+        with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if any(state.get(key) != value for key, value in self._identity().items()):
+            raise ValueError(f"Checkpoint '{self.checkpoint_path}' belongs to a different search.")
+        self._previous_ops = state.get("ops", 0)
+        self._previous_seconds = state.get("elapsed_seconds", 0.0)
+        self._restore(state)
+
+    def save_checkpoint(self):
+        if not self.checkpoint_path:
+            return
+        with self._lock:
+            state = self._identity()
+            state.update(self._checkpoint_state())
+            state["ops"] = self.ops()
+            state["elapsed_seconds"] = round(self.elapsed(), 3)
+            state["state"] = self.state
+            state["result"] = self.result
+        write_atomically(self.checkpoint_path, json.dumps(state).encode('utf-8'), prefix='.dlog-')
+
+    def start(self):
+        if self.state != 'pending':
+            raise RuntimeError("A solver can only be started once.")
+        self._started_at = time.monotonic()
+        self._load_checkpoint()
+        self.state = 'running'
+        if self.target == POINT_INFINITY: # k == low
+            self._finish('found', self.low)
+            return self
+        if not self._prepare():
+            self._finish('exhausted')
+            return self
+        self._spawn_workers()
+        self._collector = threading.Thread(target=self._collect, name=f'dlog-{self.method}-collector', daemon=True)
+        self._collector.start()
+        return self
+
+    def _new_counter(self):
+        counter = self._mp.Value('Q', 0)
+        self._counters.append(counter)
+        return counter
+
+    def _collect(self):
+        next_checkpoint = time.monotonic() + self.checkpoint_interval
+        while not self._stop_event.is_set():
+            try:
+                message = self._result_queue.get(timeout=0.2)
+            except queue.Empty:
+                message = None
+            if message is not None:
+                if message[0] == 'error':
+                    with self._lock:
+                        self.error = message[2]
+                    self._finish('failed')
+                else:
+                    self._handle(message)
+            if self.checkpoint_path and time.monotonic() >= next_checkpoint:
+                self.save_checkpoint()
+                next_checkpoint = time.monotonic() + self.checkpoint_interval
+        self._shutdown_workers()
+
+    def _finish(self, final_state: str, result: int = None):
+        with self._lock:
+            if self.state == 'running':
+                self.state = final_state
+                if result is not None:
+                    self.result = result
+                self._finished_at = time.monotonic()
+        self._stop_event.set()
+        if self._collector is None: # Finished before any worker started
+            self._finished.set()
+            self.save_checkpoint()
+
+    def _shutdown_workers(self):
+        for process in self._processes:
+            process.join(timeout=2)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self.save_checkpoint()
+        self._cleanup()
+        self._finished.set()
+
+    def _cleanup(self):
+        pass
+
+    def cancel(self):
+        """Stops the workers; a checkpoint (if configured) is written so the search can resume."""
+        if self.state == 'pending':
+            self.state = 'cancelled'
+            self._finished.set()
+            return
+        self._finish('cancelled')
+
+    def wait(self, timeout: float = None) -> bool:
+        """Waits for the search to finish. Returns True if it has finished."""
+        if self.state == 'pending':
+            return False
+        return self._finished.wait(timeout)
+
+    def ops(self) -> int:
+        return self._previous_ops + sum(counter.value for counter in self._counters)
+
+    def elapsed(self) -> float:
+        if self._started_at is None:
+            return self._previous_seconds
+        return self._previous_seconds + (self._finished_at or time.monotonic()) - self._started_at
+
+    def status(self) -> dict:
+        ops = self.ops()
+        session_ops = ops - self._previous_ops
+        session_seconds = self.elapsed() - self._previous_seconds
+        body = {
+            "method": self.method,
+            "state": self.state,
+            "curve": self.curve.name,
+            "low": self.low,
+            "high": self.high,
+            "workers": self.workers,
+            "ops": ops,
+            "elapsed_seconds": round(self.elapsed(), 3),
+            "ops_per_second": round(session_ops / session_seconds, 1) if session_seconds > 0 else 0.0,
+            "private_key_hex": format(self.result, '064x') if self.result is not None else None,
+            "error": self.error,
+        }
+        body.update(self._extra_status())
+        return body
+
+
+class BsgsSolver(_ParallelSolver):
+    """
+    Baby-step giant-step over [low, high]. baby_steps defaults to ~sqrt(W)/2 (capped at
+    DEFAULT_BABY_STEPS_LIMIT). table_path keeps the baby-step table for reuse by later searches
+    with the same baby_steps (any key, any interval); without it a temporary file is used.
+    """
+    method = 'bsgs'
+
+    def __init__(self, public_key, low: int, high: int, baby_steps: int = None, table_path: str = None,
+                 chunk_giant_steps: int = DEFAULT_CHUNK_GIANT_STEPS, **kwargs):
+        super().__init__(public_key, low, high, **kwargs)
+        if baby_steps is None:
+            baby_steps = min(DEFAULT_BABY_STEPS_LIMIT, max(1, math.isqrt(self.width) // 2))
+        if chunk_giant_steps < 1:
+            raise ValueError("chunk_giant_steps must be at least 1.")
+        self.baby_steps = baby_steps
+        self.table_path = table_path
+        self.chunk_giant_steps = chunk_giant_steps
+        self.giant_steps = -(-self.width // (2 * baby_steps))
+        self.chunks = -(-self.giant_steps // chunk_giant_steps)
+        self.completed_chunks = set()
+        self._temp_dir = None
+        self._tasks = None
+
+    def _checkpoint_state(self) -> dict:
+        return {"baby_steps": self.baby_steps, "chunk_giant_steps": self.chunk_giant_steps,
+                "completed_chunks": sorted(self.completed_chunks)}
+
+    def _restore(self, state: dict):
+        if (state.get("baby_steps"), state.get("chunk_giant_steps")) != (self.baby_steps, self.chunk_giant_steps):
+            raise ValueError(f"Checkpoint '{self.checkpoint_path}' uses other baby_steps / chunk_giant_steps.")
+        self.completed_chunks = set(state.get("completed_chunks", []))
+
+    def _prepare(self) -> bool:
+        pending = [chunk for chunk in range(self.chunks) if chunk not in self.completed_chunks]
+        if not pending:
+            return False
+        if self.table_path is None:
+            self._temp_dir = tempfile.mkdtemp(prefix='base40-bsgs-')
+            self.table_path = os.path.join(self._temp_dir, 'baby_steps.bin')
+        BabyStepTable.load_or_create(self.table_path, self.baby_steps, self.curve).close()
+        self._tasks = self._mp.Queue()
+        for chunk in pending:
+            start = chunk * self.chunk_giant_steps
+            self._tasks.put((chunk, start, min(start + self.chunk_giant_steps, self.giant_steps)))
+        for _ in range(self.workers):
+            self._tasks.put(None)
+        return True
+
+    def _spawn_workers(self):
+        for _ in range(self.workers):
+            process = self._mp.Process(
+                target=_bsgs_worker,
+                args=(self.curve.name, self.table_path, self.target, self.low, self._tasks,
+                      self._stop_event, self._result_queue, self._new_counter()),
+                daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+
+    def _handle(self, message):
+        _, chunk, found = message
+        with self._lock:
+            self.completed_chunks.add(chunk)
+            done = len(self.completed_chunks) == self.chunks
+        if found is not None and self.low <= found <= self.high:
+            self._finish('found', found)
+        elif done:
+            self._finish('exhausted')
+
+    def _cleanup(self):
+        if self._tasks is not None:
+            self._tasks.cancel_join_thread() # Chunks left after a find or cancel are never read
+        if self._temp_dir:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+
+    def _extra_status(self) -> dict:
+        return {
+            "baby_steps": self.baby_steps,
+            "giant_steps": self.giant_steps,
+            "chunks_done": len(self.completed_chunks),
+            "chunks": self.chunks,
+            "progress": round(len(self.completed_chunks) / self.chunks, 4),
+        }
+
+
+class KangarooSolver(_ParallelSolver):
+    """
+    Parallel Pollard kangaroo over [low, high] with distinguished points. Runs until the key is
+    found or the solver is cancelled; the expected work is about 2 * sqrt(W) jumps plus
+    2^dp_bits jumps per kangaroo.
+    """
+    method = 'kangaroo'
+
+    def __init__(self, public_key, low: int, high: int, herd_size: int = DEFAULT_HERD_SIZE, dp_bits: int = None,
+                 jump_count: int = DEFAULT_JUMP_COUNT, seed: int = None, **kwargs):
+        super().__init__(public_key, low, high, **kwargs)
+        if herd_size < 2:
+            raise ValueError("herd_size must be at least 2 (one tame and one wild kangaroo).")
+        if jump_count < 2 or jump_count & (jump_count - 1):
+            raise ValueError("jump_count must be a power of two of at least 2.")
+        kangaroos = herd_size * self.workers
+        self.herd_size = herd_size
+        self.dp_bits = default_dp_bits(self.width, kangaroos) if dp_bits is None else dp_bits
+        self.seed = int.from_bytes(os.urandom(8), 'big') if seed is None else seed
+        self.jumps = kangaroo_jumps(self.width, kangaroos, jump_count, self.seed)
+        self.distinguished = {} # x -> (kind, distance)
+        self.collisions = 0
+        self._controls = []
+
+    def _checkpoint_state(self) -> dict:
+        return {"dp_bits": self.dp_bits, "jumps": self.jumps,
+                "distinguished": {format(x, 'x'): [kind, format(distance, 'x')]
+                                  for x, (kind, distance) in self.distinguished.items()}}
+
+    def _restore(self, state: dict):
+        # The stored points are only useful with the same jumps and distinguishing rule
+        self.dp_bits = state["dp_bits"]
+        self.jumps = state["jumps"]
+        self.distinguished = {int(x, 16): (kind, int(distance, 16))
+                              for x, (kind, distance) in state.get("distinguished", {}).items()}
+
+    def _prepare(self) -> bool:
+        return True
+
+    def _spawn_workers(self):
+        for worker_index in range(self.workers):
+            control = self._mp.Queue()
+            process = self._mp.Process(
+                target=_kangaroo_worker,
+                args=(self.curve.name, self.target, self.width, self.jumps, self.dp_bits, self.herd_size, worker_index,
+                      self._stop_event, self._result_queue, control, self._new_counter()),
+                daemon=True
+            )
+            process.start()
+            self._controls.append(control)
+            self._processes.append(process)
+
+    def _candidates(self, first, second):
+        (kind_a, distance_a), (kind_b, distance_b) = first, second
+        tame, wild = (distance_a, distance_b) if kind_a == 'tame' else (distance_b, distance_a)
+        n = self.curve.n
+        # Same point: tame = k' + wild; same x, opposite point: tame = -(k' + wild)
+        return [(tame - wild) % n, (-tame - wild) % n]
+
+    def _handle(self, message):
+        _, worker_index, points = message
+        for x, distance, kind in points:
+            with self._lock:
+                previous = self.distinguished.get(x)
+                if previous is None:
+                    self.distinguished[x] = (kind, distance)
+                    continue
+            if previous[0] == kind:
+                if previous[1] == distance:
+                    self._controls[worker_index].put(x) # Two trails merged; restart the newcomer
+                    continue
+                # Same x, opposite points. Tame pairs say nothing about k'; wild pairs give
+                # k' + d1 = -(k' + d2), so k' = -(d1 + d2) / 2 (n is odd)
+                if kind == 'tame':
+                    continue
+                n = self.curve.n
+                candidates = [(-(previous[1] + distance) * pow(2, -1, n)) % n]
+            else:
+                self.collisions += 1
+                candidates = self._candidates(previous, (kind, distance))
+            for k in candidates:
+                if k < self.width and self.curve.multiply_generator(self.low + k) == self.public_point:
+                    self._finish('found', self.low + k)
+                    return
+
+    def _extra_status(self) -> dict:
+        expected = 2 * math.isqrt(self.width) + self.herd_size * self.workers * (1 << self.dp_bits)
+        return {
+            "herd_size": self.herd_size,
+            "dp_bits": self.dp_bits,
+            "distinguished_points": len(self.distinguished),
+            "tame_wild_collisions": self.collisions,
+            "expected_ops": expected,
+            "progress": round(min(1.0, self.ops() / expected), 4),
+        }
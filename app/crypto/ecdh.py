@@ -0,0 +1,239 @@
+# app/crypto/ecdh.py
+#
+# Elliptic-curve Diffie-Hellman against long-lived peers. A plain exchange is a full
+# variable-base multiplication d * Q (256 doublings plus additions). For peers we talk to
+# repeatedly, PeerTableCache keeps a windowed table of Q (entry d * 2^(w*i) * Q for every
+# window i and digit d, the same layout as the fixed-base table in precomp.py), so later
+# exchanges with that peer cost one mixed addition per window and no doublings.
+#
+# Building a table costs far more than one plain multiplication, so a peer only gets one once
+# it repeats: its first build_after - 1 exchanges are plain multiplications, counted in a
+# small LRU of recently seen peers. One-off peers therefore never evict the hot ones.
+#
+# Tables are kept in an LRU bounded both by number of peers and by bytes; the least recently
+# used peers are evicted first. The shared secret is the x-coordinate of d * Q (SEC 1 ECDH).
+
+import threading
+from collections import OrderedDict
+
+from app.crypto.curves import get_curve
+from app.crypto.keys import public_key_from_bytes, public_key_to_bytes
+from app.crypto.precomp import build_table_payload
+from app.crypto.secp256k1_utils import POINT_INFINITY, jacobian_add_affine, from_jacobian
+
+DEFAULT_ECDH_WINDOW_BITS = 6
+DEFAULT_ECDH_CACHE_PEERS = 256
+DEFAULT_ECDH_CACHE_BYTES = 32 * 1024 * 1024
+DEFAULT_ECDH_BUILD_AFTER = 2 # Exchanges with a peer before its table is built
+SEEN_PEERS_PER_TABLE = 4 # Size of the seen-peers LRU, per cached table
+
+
+class PeerTable:
+    """Windowed precomputation for one peer point, stored as packed (x, y) coordinates."""
+
+    def __init__(self, point: tuple, curve, window_bits: int = DEFAULT_ECDH_WINDOW_BITS, payload: bytes = None):
+        # payload: build_table_payload(point, curve.a, curve.p, window_bits) when computed elsewhere
+        self.point = point
+        self.curve = curve
+        self.window_bits = window_bits
+        self.entries_per_window = (1 << window_bits) - 1
+        self.coordinate_size = curve.field_bytes
+        self._payload = payload if payload is not None else build_table_payload(point, curve.a, curve.p, window_bits)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._payload)
+
+    def multiply(self, k: int):
+        """k * point with one table lookup and mixed addition per window of k."""
+        size = self.coordinate_size
+        entry_size = 2 * size
+        a, p = self.curve.a, self.curve.p
+        payload = self._payload
+        mask = self.entries_per_window
+        result = POINT_INFINITY
+        offset = 0 # Index of the current window's first entry
+        while k:
+            digit = k & mask
+            if digit:
+                start = (offset + digit - 1) * entry_size
+                entry = (int.from_bytes(payload[start:start + size], 'big'),
+                         int.from_bytes(payload[start + size:start + entry_size], 'big'))
+                result = jacobian_add_affine(result, entry, a, p)
+            k >>= self.window_bits
+            offset += mask
+        return from_jacobian(result, p)
+
+
+class PeerTableCache:
+    """
+    Thread-safe LRU of PeerTables keyed by (curve, compressed peer key), capped at max_peers
+    tables and max_bytes of table data. A table larger than max_bytes is never cached.
+    A peer's table is only built once the peer has missed build_after times (1 = right away).
+    """
+
+    def __init__(self, max_peers: int = DEFAULT_ECDH_CACHE_PEERS, max_bytes: int = DEFAULT_ECDH_CACHE_BYTES,
+                 window_bits: int = DEFAULT_ECDH_WINDOW_BITS, build_after: int = DEFAULT_ECDH_BUILD_AFTER):
+        if not (1 <= window_bits <= 8):
+            raise ValueError("window_bits must be between 1 and 8.")
+        if build_after < 1:
+            raise ValueError("build_after must be at least 1.")
+        self.max_peers = max_peers
+        self.max_bytes = max_bytes
+        self.window_bits = window_bits
+        self.build_after = build_after
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.builds = 0
+        self._tables = OrderedDict()
+        self._seen = OrderedDict() # key -> misses, for peers without a table
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(point: tuple, curve) -> tuple:
+        return curve.name, public_key_to_bytes(point, compressed=True)
+
+    def lookup(self, point: tuple, curve=None) -> PeerTable:
+        """Returns the cached table for point, or None. A miss counts one exchange with the peer."""
+        curve = get_curve(curve)
+        key = self._key(point, curve)
+        with self._lock:
+            table = self._tables.get(key)
+            if table is not None:
+                self._tables.move_to_end(key)
+                self.hits += 1
+                return table
+            self.misses += 1
+            self._seen[key] = self._seen.pop(key, 0) + 1
+            while len(self._seen) > max(1, SEEN_PEERS_PER_TABLE * self.max_peers):
+                self._seen.popitem(last=False)
+            return None
+
+    def wants_table(self, point: tuple, curve=None) -> bool:
+        """True when a peer without a table has missed at least build_after times."""
+        if self.max_peers < 1:
+            return False
+        key = self._key(point, get_curve(curve))
+        with self._lock:
+            return self._seen.get(key, 0) >= self.build_after
+
+    def get(self, point: tuple, curve=None) -> PeerTable:
+        """
+        Returns the table for point, building it on the calling thread once the peer is due
+        for one (see wants_table), or None while exchanges with it stay plain multiplications.
+        """
+        curve = get_curve(curve)
+        table = self.lookup(point, curve)
+        if table is None and self.wants_table(point, curve):
+            # Built outside the lock so exchanges with cached peers are not blocked meanwhile
+            table = self.add(PeerTable(point, curve, self.window_bits))
+        return table
+
+    def add(self, table: PeerTable) -> PeerTable:
+        """Caches a table built for this cache's window_bits and returns it."""
+        if table.window_bits != self.window_bits:
+            raise ValueError("Table window_bits does not match the cache.")
+        key = self._key(table.point, table.curve)
+        with self._lock:
+            self.builds += 1
+            self._seen.pop(key, None)
+            if self.max_peers < 1 or table.nbytes > self.max_bytes:
+                return table
+            previous = self._tables.pop(key, None)
+            if previous is not None: # Built concurrently by another thread
+                self._bytes -= previous.nbytes
+            self._tables[key] = table
+            self._bytes += table.nbytes
+            while len(self._tables) > self.max_peers or self._bytes > self.max_bytes:
+                _, evicted = self._tables.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+        return table
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+            self._seen.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            peers, nbytes = len(self._tables), self._bytes
+        lookups = self.hits + self.misses
+        return {
+            "peers": peers,
+            "bytes": nbytes,
+            "max_peers": self.max_peers,
+            "max_bytes": self.max_bytes,
+            "window_bits": self.window_bits,
+            "build_after": self.build_after,
+            "tables_built": self.builds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+        }
+
+
+def ecdh_point(private_key: int, peer_point: tuple, curve=None, cache: PeerTableCache = None,
+               table: PeerTable = None) -> tuple:
+    """
+    private_key * peer_point, through `table` or the cache's table for the peer when there is
+    one, and a plain multiplication otherwise.
+    """
+    curve = get_curve(curve)
+    curve.validate_private_key(private_key)
+    if not curve.is_on_curve(peer_point) or peer_point == POINT_INFINITY:
+        raise ValueError("Peer public key is not a point on the curve.")
+    if table is None and cache is not None:
+        table = cache.get(peer_point, curve)
+    if table is None:
+        shared = curve.multiply(private_key, peer_point)
+    else:
+        shared = table.multiply(private_key)
+    if shared == POINT_INFINITY: # Only possible for points outside the prime-order group
+        raise ValueError("ECDH produced the point at infinity.")
+    return shared
+
+
+def parse_ecdh_keys(private_key, peer_public_key, curve=None) -> tuple:
+    """
+    Returns (d, Q) for ecdh_point from the forms ecdh_shared_secret accepts.
+    Raises ValueError for malformed keys or a peer key that is not on the curve.
+    """
+    curve = get_curve(curve)
+    if isinstance(private_key, str):
+        if len(private_key) != 64:
+            raise ValueError("Private key must be a 64-character hex string.")
+        try:
+            private_key = int(private_key, 16)
+        except ValueError:
+            raise ValueError("Private key is not a valid hexadecimal string.")
+    if isinstance(peer_public_key, str):
+        try:
+            peer_public_key = bytes.fromhex(peer_public_key)
+        except ValueError:
+            raise ValueError("Peer public key is not a valid hexadecimal string.")
+    return private_key, public_key_from_bytes(peer_public_key, curve)
+
+
+def ecdh_shared_secret(private_key, peer_public_key, curve=None, cache: PeerTableCache = None,
+                       table: PeerTable = None) -> bytes:
+    """
+    Computes the ECDH shared secret (the x-coordinate of d * Q, big-endian).
+    Args:
+        private_key: d, as an integer or a 64-character hex string.
+        peer_public_key: Q, SEC-encoded (bytes or hex; compressed or uncompressed).
+        curve: Curve selector (default secp256k1).
+        cache: Optional PeerTableCache for repeated exchanges with the same peers.
+        table: Optional PeerTable of Q, used instead of the cache.
+    Raises:
+        ValueError: For malformed or out-of-range keys.
+    """
+    curve = get_curve(curve)
+    private_key, peer_point = parse_ecdh_keys(private_key, peer_public_key, curve)
+    shared = ecdh_point(private_key, peer_point, curve, cache, table)
+    return shared[0].to_bytes(curve.field_bytes, 'big')
+
@@ -0,0 +1,120 @@
+# app/crypto/field_backend.py
+
+import os
+from contextlib import contextmanager
+
+# Big-integer backends for the prime-field arithmetic used by secp256k1_utils.
+# The backend is chosen once at import time from the BASE40_FIELD_BACKEND environment
+# variable ('auto', 'python' or 'gmpy2'). 'auto' (the default) uses gmpy2 when it is
+# installed and falls back to plain Python integers otherwise.
+#
+# Scope: the backend serves inverse_mod and the traced affine arithmetic (point_addition,
+# point_doubling, scalar_multiplication), where one inversion per step dominates. The
+# trace-free paths (the Jacobian helpers, batch_inverse, the fixed-base tables in
+# precomp.py) use plain Python integers whatever the setting, since a call into the backend
+# per field operation would cost more there than it saves.
+
+FIELD_BACKEND_ENV_VAR = 'BASE40_FIELD_BACKEND'
+
+
+class PythonFieldBackend:
+    """Field arithmetic on built-in Python integers."""
+    name = 'python'
+
+    def mul(self, a: int, b: int, p: int) -> int:
+        return (a * b) % p
+
+    def inverse(self, k: int, p: int) -> int:
+        # pow(k, -1, p) uses the extended Euclidean algorithm, which is considerably
+        # faster than the Fermat exponentiation pow(k, p - 2, p) for 256-bit moduli.
+        return pow(k, -1, p)
+
+
+class Gmpy2FieldBackend:
+    """
+    Field inversion via GMP's invert (gmpy2). Multiplication stays on Python integers:
+    at 256 bits, converting both operands to mpz and back costs more than the product saves.
+    """
+    name = 'gmpy2'
+
+    def __init__(self):
+        import gmpy2 # Optional dependency, only imported when this backend is requested
+        self._invert = gmpy2.invert
+
+    def mul(self, a: int, b: int, p: int) -> int:
+        return (a * b) % p
+
+    def inverse(self, k: int, p: int) -> int:
+        return int(self._invert(k, p))
+
+
+_BACKEND_CLASSES = {
+    PythonFieldBackend.name: PythonFieldBackend,
+    Gmpy2FieldBackend.name: Gmpy2FieldBackend,
+}
+
+
+def available_backends() -> list:
+    """Returns the names of the backends that can be instantiated in this environment."""
+    names = []
+    for name, backend_class in _BACKEND_CLASSES.items():
+        try:
+            backend_class()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def create_backend(name: str = None):
+    """
+    Instantiates a field backend by name.
+    Args:
+        name: 'python', 'gmpy2' or 'auto'. Defaults to the BASE40_FIELD_BACKEND
+              environment variable, or 'auto' if it is not set.
+    Raises:
+        ValueError: If the name is unknown or the requested backend is not installed.
+    """
+    if name is None:
+        name = os.environ.get(FIELD_BACKEND_ENV_VAR, 'auto')
+    name = name.strip().lower()
+
+    if name == 'auto':
+        try:
+            return Gmpy2FieldBackend()
+        except ImportError:
+            return PythonFieldBackend()
+
+    if name not in _BACKEND_CLASSES:
+        raise ValueError(f"Unknown field backend '{name}'. Expected one of: auto, {', '.join(_BACKEND_CLASSES)}.")
+    try:
+        return _BACKEND_CLASSES[name]()
+    except ImportError:
+        raise ValueError(f"Field backend '{name}' was requested but its dependency is not installed.")
+
+
+_active_backend = create_backend()
+
+
+def get_backend():
+    """Returns the field backend currently used by the curve arithmetic."""
+    return _active_backend
+
+
+def set_backend(name: str):
+    """Switches the process-wide field backend. Returns the newly active backend."""
+    global _active_backend
+    _active_backend = create_backend(name)
+    return _active_backend
+
+
+@contextmanager
+def use_backend(name: str):
+    """Temporarily switches the field backend (used by the benchmarks)."""
+    global _active_backend
+    previous = _active_backend
+    _active_backend = create_backend(name)
+    try:
+        yield _active_backend
+    finally:
+        _active_backend = previous
@@ -0,0 +1,176 @@
+# app/crypto/hash160.py
+#
+# HASH160 = RIPEMD-160(SHA-256(data)), the public-key hash behind every address in the app.
+# SHA-256 is always available from hashlib, but RIPEMD-160 is not: OpenSSL 3 moved it to the
+# legacy provider, and many builds ship without it. Native support is probed once at import
+# (NATIVE_RIPEMD160); without it we fall back to the pure-Python RIPEMD-160 below.
+#
+# The fallback is tuned for the one input size that matters here, the 32-byte SHA-256 digest:
+# such a message plus padding fits in a single 64-byte block whose last eight words are
+# constants, so _compress_32 takes the eight data words as arguments and has the padding words
+# folded in as literals. Both compression functions are generated at import with all 160 steps
+# unrolled and the five working variables renamed instead of shuffled, so a step is a few
+# arithmetic operations on locals with no list indexing or tuple rotation.
+#
+# hash160_many(buffers) hashes a batch with the per-call setup (method lookups, the native
+# RIPEMD-160 prototype) done once for the whole batch.
+
+import hashlib
+import struct
+
+RIPEMD160_EMPTY_DIGEST = bytes.fromhex('9c1185a5c5e9fc54612808977ee8f548b2258d31')
+
+_INITIAL_STATE = (0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476, 0xC3D2E1F0)
+
+# Message word order, rotation amounts and constants of the left and right lines, per step
+_R_LEFT = (
+    0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15,
+    7, 4, 13, 1, 10, 6, 15, 3, 12, 0, 9, 5, 2, 14, 11, 8,
+    3, 10, 14, 4, 9, 15, 8, 1, 2, 7, 0, 6, 13, 11, 5, 12,
+    1, 9, 11, 10, 0, 8, 12, 4, 13, 3, 7, 15, 14, 5, 6, 2,
+    4, 0, 5, 9, 7, 12, 2, 10, 14, 1, 3, 8, 11, 6, 15, 13,
+)
+_R_RIGHT = (
+    5, 14, 7, 0, 9, 2, 11, 4, 13, 6, 15, 8, 1, 10, 3, 12,
+    6, 11, 3, 7, 0, 13, 5, 10, 14, 15, 8, 12, 4, 9, 1, 2,
+    15, 5, 1, 3, 7, 14, 6, 9, 11, 8, 12, 2, 10, 0, 4, 13,
+    8, 6, 4, 1, 3, 11, 15, 0, 5, 12, 2, 13, 9, 7, 10, 14,
+    12, 15, 10, 4, 1, 5, 8, 7, 6, 2, 13, 14, 0, 3, 9, 11,
+)
+_S_LEFT = (
+    11, 14, 15, 12, 5, 8, 7, 9, 11, 13, 14, 15, 6, 7, 9, 8,
+    7, 6, 8, 13, 11, 9, 7, 15, 7, 12, 15, 9, 11, 7, 13, 12,
+    11, 13, 6, 7, 14, 9, 13, 15, 14, 8, 13, 6, 5, 12, 7, 5,
+    11, 12, 14, 15, 14, 15, 9, 8, 9, 14, 5, 6, 8, 6, 5, 12,
+    9, 15, 5, 11, 6, 8, 13, 12, 5, 12, 13, 14, 11, 8, 5, 6,
+)
+_S_RIGHT = (
+    8, 9, 9, 11, 13, 15, 15, 5, 7, 7, 8, 11, 14, 14, 12, 6,
+    9, 13, 15, 7, 12, 8, 9, 11, 7, 7, 12, 7, 6, 15, 13, 11,
+    9, 7, 15, 11, 8, 6, 6, 14, 12, 13, 5, 14, 13, 13, 7, 5,
+    15, 5, 8, 11, 14, 14, 6, 14, 6, 9, 12, 9, 12, 5, 15, 8,
+    8, 5, 12, 9, 12, 5, 14, 6, 8, 13, 6, 5, 15, 13, 11, 11,
+)
+_K_LEFT = (0x00000000, 0x5A827999, 0x6ED9EBA1, 0x8F1BBCDC, 0xA953FD4E)
+_K_RIGHT = (0x50A28BE6, 0x5C4DD124, 0x6D703EF3, 0x7A6D76E9, 0x00000000)
+
+# The five boolean functions, written without ~ so intermediate values stay non-negative.
+# The left line uses them in order f1..f5, the right line in reverse.
+_FUNCTIONS = (
+    '({x} ^ {y} ^ {z})',
+    '({z} ^ ({x} & ({y} ^ {z})))',
+    '(({x} | ({y} ^ 0xFFFFFFFF)) ^ {z})',
+    '({y} ^ ({z} & ({x} ^ {y})))',
+    '({x} ^ ({y} | ({z} ^ 0xFFFFFFFF)))',
+)
+
+
+def _line_source(prefix: str, order: tuple, shifts: tuple, constants: tuple, function_order: tuple, word) -> list:
+    """Unrolled statements of one line; returns them with the final names of (A, B, C, D, E)."""
+    names = [f'{prefix}{v}' for v in 'abcde']
+    lines = []
+    for step in range(80):
+        a, b, c, d, e = names
+        rnd = step // 16
+        f = _FUNCTIONS[function_order[rnd]].format(x=b, y=c, z=d)
+        terms = [a, f]
+        x = word(order[step])
+        if x != '0':
+            terms.append(x)
+        if constants[rnd]:
+            terms.append(hex(constants[rnd]))
+        s = shifts[step]
+        lines.append(f'    t = ({" + ".join(terms)}) & 0xFFFFFFFF')
+        lines.append(f'    {a} = (((t << {s}) | (t >> {32 - s})) + {e}) & 0xFFFFFFFF')
+        lines.append(f'    {c} = (({c} << 10) | ({c} >> 22)) & 0xFFFFFFFF')
+        # New (A, B, C, D, E) = (E, T, B, rol10(C), D); T was written into A's variable
+        names = [e, a, b, c, d]
+    return lines, names
+
+
+def _build_compress(name: str, arguments: list, word) -> callable:
+    """Generates a compression function `name(h0, ..., h4, *arguments)` returning the new state."""
+    body = [f'def {name}(h0, h1, h2, h3, h4, {", ".join(arguments)}):',
+            '    la = ra = h0; lb = rb = h1; lc = rc = h2; ld = rd = h3; le = re = h4']
+    left, (al, bl, cl, dl, el) = _line_source('l', _R_LEFT, _S_LEFT, _K_LEFT, (0, 1, 2, 3, 4), word)
+    right, (ar, br, cr, dr, er) = _line_source('r', _R_RIGHT, _S_RIGHT, _K_RIGHT, (4, 3, 2, 1, 0), word)
+    body += left + right
+    body.append(f'    return ((h1 + {cl} + {dr}) & 0xFFFFFFFF, (h2 + {dl} + {er}) & 0xFFFFFFFF, '
+                f'(h3 + {el} + {ar}) & 0xFFFFFFFF, (h4 + {al} + {br}) & 0xFFFFFFFF, '
+                f'(h0 + {bl} + {cr}) & 0xFFFFFFFF)')
+    namespace = {}
+    exec('\n'.join(body), namespace)
+    return namespace[name]
+
+
+# General block: all sixteen message words are arguments
+_compress = _build_compress('_compress', [f'x{i}' for i in range(16)], lambda i: f'x{i}')
+
+# Single block of a 32-byte message: words 0-7 are data, word 8 holds the 0x80 padding byte,
+# word 14 the bit length (256) and the rest are zero, so only x0..x7 are arguments
+_PADDING_WORDS_32 = {8: '0x80', 9: '0', 10: '0', 11: '0', 12: '0', 13: '0', 14: '0x100', 15: '0'}
+_compress_32 = _build_compress('_compress_32', [f'x{i}' for i in range(8)],
+                               lambda i: _PADDING_WORDS_32.get(i, f'x{i}'))
+
+_BLOCK_WORDS = struct.Struct('<16I')
+_DIGEST_WORDS_32 = struct.Struct('<8I')
+_STATE_WORDS = struct.Struct('<5I')
+
+
+def python_ripemd160(data: bytes) -> bytes:
+    """RIPEMD-160 of data in pure Python (any length; 32-byte inputs take the single-block path)."""
+    data = bytes(data)
+    if len(data) == 32:
+        return _STATE_WORDS.pack(*_compress_32(*_INITIAL_STATE, *_DIGEST_WORDS_32.unpack(data)))
+    padded = data + b'\x80' + b'\x00' * ((55 - len(data)) % 64) + (8 * len(data)).to_bytes(8, 'little')
+    state = _INITIAL_STATE
+    for offset in range(0, len(padded), 64):
+        state = _compress(*state, *_BLOCK_WORDS.unpack_from(padded, offset))
+    return _STATE_WORDS.pack(*state)
+
+
+def _detect_native_ripemd160() -> bool:
+    """True when hashlib provides a working RIPEMD-160 (checked against the empty-string digest)."""
+    try:
+        return hashlib.new('ripemd160', b'').digest() == RIPEMD160_EMPTY_DIGEST
+    except (ValueError, TypeError): # Unsupported digest type (e.g. OpenSSL 3 without legacy provider)
+        return False
+
+
+NATIVE_RIPEMD160 = _detect_native_ripemd160()
+
+
+def ripemd160(data: bytes) -> bytes:
+    """RIPEMD-160 of data, through hashlib when available and the pure-Python fallback otherwise."""
+    if NATIVE_RIPEMD160:
+        return hashlib.new('ripemd160', data).digest()
+    return python_ripemd160(data)
+
+
+def hash160(data: bytes) -> bytes:
+    """RIPEMD-160(SHA-256(data)), 20 bytes."""
+    return ripemd160(hashlib.sha256(data).digest())
+
+
+def hash160_many(buffers, native: bool = None) -> list:
+    """
+    HASH160 of every buffer in `buffers`, in order.
+    `native` forces (True) or avoids (False) hashlib's RIPEMD-160; by default it follows
+    NATIVE_RIPEMD160. Raises ValueError when native is forced but unavailable.
+    """
+    if native is None:
+        native = NATIVE_RIPEMD160
+    elif native and not NATIVE_RIPEMD160:
+        raise ValueError("Native RIPEMD-160 is not available in this environment.")
+    sha256 = hashlib.sha256
+    if native:
+        prototype = hashlib.new('ripemd160') # Copying a fresh object skips the name lookup of hashlib.new
+        digests = []
+        for buffer in buffers:
+            ripemd = prototype.copy()
+            ripemd.update(sha256(buffer).digest())
+            digests.append(ripemd.digest())
+        return digests
+    compress, initial = _compress_32, _INITIAL_STATE
+    unpack, pack = _DIGEST_WORDS_32.unpack, _STATE_WORDS.pack
+    return [pack(*compress(*initial, *unpack(sha256(buffer).digest()))) for buffer in buffers]
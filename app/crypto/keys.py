@@ -2,34 +2,155 @@
 
 import os
 import sys
+import threading
 
 # Assuming the project root (/app) is in sys.path via test execution context or PYTHONPATH
 
-from app.crypto.secp256k1_utils import N, Gx, Gy, scalar_multiplication, POINT_INFINITY
+from app.crypto.secp256k1_utils import N, Gx, Gy, POINT_INFINITY
+from app.crypto.curves import get_curve
 # No, Gx, Gy are defaults in scalar_multiplication. We need G_POINT as (Gx, Gy)
 G_POINT = (Gx, Gy)
 
 
+# --- Batched key generation ---
+# Bulk paths need thousands of keys per second. Instead of one os.urandom(32) syscall per key,
+# EntropyPool reads the OS CSPRNG in large chunks and hands out 32-byte candidates, rejecting
+# those outside [1, N-1] (probability ~2^-128). Every byte is used at most once, and a forked
+# child discards the inherited buffer, so parent and child never hand out the same key.
+
+ENTROPY_CHUNK_SIZE = 32 * 256 # Bytes per os.urandom call
+PRIVATE_KEY_SIZE = 32
+
+
+class EntropyPool:
+    """Buffered, thread-safe and fork-safe reader of os.urandom."""
+
+    def __init__(self, chunk_size: int = ENTROPY_CHUNK_SIZE):
+        if chunk_size < PRIVATE_KEY_SIZE:
+            raise ValueError(f"chunk_size must be at least {PRIVATE_KEY_SIZE} bytes.")
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._buffer = b''
+        self._position = 0
+        self._pid = os.getpid()
+
+    def read(self, size: int) -> bytes:
+        """Returns `size` fresh bytes from the OS CSPRNG."""
+        with self._lock:
+            if self._pid != os.getpid(): # Forked without the at-fork hook (e.g. os.fork in C code)
+                self._reset()
+            if size > len(self._buffer) - self._position:
+                # Refill; the unused tail is dropped rather than kept, which is harmless
+                self._buffer = os.urandom(max(self.chunk_size, size))
+                self._position = 0
+            data = self._buffer[self._position:self._position + size]
+            self._position += size
+            return data
+
+    def private_key(self, n: int = N) -> int:
+        """Returns one private key as an integer in [1, n-1] (n: the curve order, default secp256k1)."""
+        while True:
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._reset()
+                position = self._position
+                if position + PRIVATE_KEY_SIZE > len(self._buffer):
+                    self._buffer = os.urandom(self.chunk_size)
+                    position = 0
+                self._position = position + PRIVATE_KEY_SIZE
+                candidate = int.from_bytes(self._buffer[position:position + PRIVATE_KEY_SIZE], 'big')
+            if 1 <= candidate < n:
+                return candidate
+
+    def private_keys(self, count: int, n: int = N) -> list:
+        """Returns `count` private keys as integers in [1, n-1], by rejection sampling."""
+        keys = []
+        while len(keys) < count:
+            block = self.read(PRIVATE_KEY_SIZE * (count - len(keys)))
+            for offset in range(0, len(block), PRIVATE_KEY_SIZE):
+                candidate = int.from_bytes(block[offset:offset + PRIVATE_KEY_SIZE], 'big')
+                if 1 <= candidate < n:
+                    keys.append(candidate)
+        return keys
+
+
+_entropy_pool = EntropyPool()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_entropy_pool._reset)
+
+
+def generate_private_keys(count: int, as_bytes: bool = False, curve=None) -> list:
+    """
+    Generates `count` private keys valid for SECP256k1 (or `curve`) from the shared entropy pool.
+    Returns integers (default) or 32-byte big-endian strings, skipping any hex formatting.
+    """
+    if count < 0:
+        raise ValueError("count must be non-negative.")
+    keys = _entropy_pool.private_keys(count, get_curve(curve).n)
+    if as_bytes:
+        return [key.to_bytes(PRIVATE_KEY_SIZE, 'big') for key in keys]
+    return keys
+
+def generate_private_key_int(curve=None) -> int:
+    """Generates one private key as an integer in [1, N-1] of secp256k1 (or `curve`)."""
+    if curve is None:
+        return _entropy_pool.private_key()
+    return _entropy_pool.private_key(get_curve(curve).n)
+
 def generate_private_key() -> str:
     """
     Generates a cryptographically secure 256-bit private key valid for SECP256k1.
     Returns the private key as a 64-character hexadecimal string.
     A private key is an integer k such that 1 <= k < N.
     """
-    while True:
-        # Generate 32 random bytes (256 bits)
-        random_bytes = os.urandom(32)
-        private_key_int = int.from_bytes(random_bytes, 'big')
-        # Ensure the key is within the valid range [1, N-1]
-        if 1 <= private_key_int < N:
-            return format(private_key_int, '064x') # Pad with leading zeros to ensure 64 chars
-
-def derive_public_key(private_key_hex: str) -> tuple:
+    return format(generate_private_key_int(), '064x') # Pad with leading zeros to ensure 64 chars
+
+def public_key_to_bytes(public_key_point: tuple, compressed: bool = False) -> bytes:
+    """
+    Serialises an affine public key point in SEC format.
+    Returns 65 bytes ('04' + x + y) or, if compressed, 33 bytes ('02'/'03' + x).
+    """
+    if public_key_point == POINT_INFINITY:
+        raise ValueError("The point at infinity has no public key encoding.")
+    x, y = public_key_point
+    if compressed:
+        return bytes([0x02 | (y & 1)]) + x.to_bytes(32, 'big')
+    return b'\x04' + x.to_bytes(32, 'big') + y.to_bytes(32, 'big')
+
+def public_key_from_bytes(public_key_bytes: bytes, curve=None) -> tuple:
+    """
+    Parses a SEC-encoded public key (65-byte uncompressed or 33-byte compressed) into an affine
+    point, recovering y for compressed keys. Raises ValueError if the point is not on the curve
+    (secp256k1, or `curve`).
+    """
+    curve = get_curve(curve)
+    p = curve.p
+    if len(public_key_bytes) == 65 and public_key_bytes[0] == 0x04:
+        point = (int.from_bytes(public_key_bytes[1:33], 'big'), int.from_bytes(public_key_bytes[33:], 'big'))
+    elif len(public_key_bytes) == 33 and public_key_bytes[0] in (0x02, 0x03):
+        x = int.from_bytes(public_key_bytes[1:], 'big')
+        # p % 4 == 3 for secp256k1 and P-256, so this is a square root when one exists
+        y = pow((x * x * x + curve.a * x + curve.b) % p, (p + 1) // 4, p)
+        if y & 1 != public_key_bytes[0] & 1:
+            y = p - y
+        point = (x, y)
+    else:
+        raise ValueError("Public key must be 65 bytes starting with 0x04 or 33 bytes starting with 0x02/0x03.")
+    if not (point[0] < p and point[1] < p and curve.is_on_curve(point)):
+        raise ValueError("Public key is not a point on the curve.")
+    return point
+
+def derive_public_key(private_key_hex: str, curve=None) -> tuple:
     """
     Derives the public key from a given private key.
 
     Args:
         private_key_hex: The private key as a 64-character hexadecimal string.
+        curve: Curve selector (a Curve, or a name such as 'secp256r1'); default secp256k1.
 
     Returns:
         A tuple containing:
@@ -46,10 +167,11 @@ def derive_public_key(private_key_hex: str) -> tuple:
     except ValueError:
         raise ValueError("Private key is not a valid hexadecimal string.")
 
-    if not (1 <= private_key_int < N):
+    curve = get_curve(curve)
+    if not (1 <= private_key_int < curve.n):
         raise ValueError(f"Private key integer value is out of the valid range [1, N-1]. Got {private_key_int}")
 
-    public_key_point, steps = scalar_multiplication(private_key_int, G_POINT)
+    public_key_point, steps = curve.scalar_multiplication(private_key_int)
 
     if public_key_point == POINT_INFINITY:
         # This should theoretically not happen for valid private keys 1 <= k < N
@@ -0,0 +1,222 @@
+# app/crypto/precomp.py
+#
+# Fixed-base precomputation for k * G, stored in a versioned, checksummed binary file that
+# every process maps with mmap. WSGI workers therefore share one copy of the table through
+# the page cache instead of each rebuilding and holding its own.
+#
+# Table layout: for window w (0..31) and digit d (1..255) the entry is d * 2^(8w) * G, so
+# k * G is the sum of one entry per byte of k (at most 32 mixed additions, no doublings).
+#
+# File layout (all integers big-endian):
+#   magic (8 bytes) | format version (u16) | window bits (u8) | reserved (u8) |
+#   windows (u16) | entries per window (u16) | curve digest (32) | payload SHA-256 (32) |
+#   payload: windows * entries * (x: 32 bytes, y: 32 bytes)
+
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+
+from app.crypto.secp256k1_utils import (
+    P, A, B, Gx, Gy, N, POINT_INFINITY,
+    to_jacobian, jacobian_add_affine, batch_to_affine, from_jacobian
+)
+
+PRECOMP_PATH_ENV_VAR = 'BASE40_PRECOMP_PATH'
+TABLE_MAGIC = b'B40FBTAB'
+TABLE_FORMAT_VERSION = 1
+WINDOW_BITS = 8
+WINDOWS = 256 // WINDOW_BITS
+ENTRIES_PER_WINDOW = (1 << WINDOW_BITS) - 1 # Digit 0 (the point at infinity) is not stored
+ENTRY_SIZE = 64
+HEADER_FORMAT = '>8sHBBHH32s32s'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+PAYLOAD_SIZE = WINDOWS * ENTRIES_PER_WINDOW * ENTRY_SIZE
+
+
+def curve_digest(p=P, a=A, b=B, G=(Gx, Gy), n=N) -> bytes:
+    """Identifies the curve a table was built for; a mismatch makes the file stale."""
+    material = b''.join(value.to_bytes(32, 'big') for value in (p, a, b, G[0], G[1], n))
+    return hashlib.sha256(material).digest()
+
+
+def default_table_path(curve_name: str = 'secp256k1') -> str:
+    """
+    BASE40_PRECOMP_PATH, or a file in the user's cache directory. Tables of other curves
+    live next to the secp256k1 one, named after the curve.
+    """
+    file_name = f'{curve_name}_fixed_base_w{WINDOW_BITS}_v{TABLE_FORMAT_VERSION}.bin'
+    configured = os.environ.get(PRECOMP_PATH_ENV_VAR)
+    if configured:
+        return configured if curve_name == 'secp256k1' else os.path.join(os.path.dirname(os.path.abspath(configured)), file_name)
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'base40', file_name)
+
+
+def build_table_payload(G=(Gx, Gy), a=A, p=P, window_bits: int = WINDOW_BITS) -> bytes:
+    """
+    Computes every table entry and returns the serialised payload. window_bits other than
+    WINDOW_BITS give the smaller tables used for variable bases (see ecdh.py).
+    """
+    windows = -(-256 // window_bits)
+    entries_per_window = (1 << window_bits) - 1
+    chunks = []
+    window_base = G # 2^(window_bits * w) * G, affine
+    for _ in range(windows):
+        jacobian_entries = []
+        current = to_jacobian(window_base)
+        for _ in range(entries_per_window):
+            jacobian_entries.append(current)
+            current = jacobian_add_affine(current, window_base, a, p)
+        # One shared inversion per window; `current` is now 2^window_bits * window_base
+        for x, y in batch_to_affine(jacobian_entries, p):
+            chunks.append(x.to_bytes(32, 'big'))
+            chunks.append(y.to_bytes(32, 'big'))
+        window_base = from_jacobian(current, p)
+    return b''.join(chunks)
+
+
+def write_atomically(path: str, data: bytes, prefix: str = '.tmp-') -> None:
+    """
+    Writes data to path through a temporary file in the same directory and a rename, so
+    readers see either the old file or the complete new one. Also used by the checkpoint
+    and table writers in app/crypto/dlog.py and app/distributed.py.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=prefix, dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_table(path: str, G=(Gx, Gy), a=A, b=B, p=P, n=N) -> None:
+    """
+    Builds the table and writes it to path atomically (see write_atomically), so
+    concurrent workers regenerating the same file never observe a partial table.
+    """
+    payload = build_table_payload(G, a, p)
+    header = struct.pack(HEADER_FORMAT, TABLE_MAGIC, TABLE_FORMAT_VERSION, WINDOW_BITS, 0,
+                         WINDOWS, ENTRIES_PER_WINDOW, curve_digest(p, a, b, G, n), hashlib.sha256(payload).digest())
+    write_atomically(path, header + payload, prefix='.precomp-')
+
+
+class FixedBaseTable:
+    """
+    A fixed-base table backed by a read-only buffer (normally an mmap of the table file).
+    Entries are decoded lazily, on access.
+    """
+
+    def __init__(self, buffer, source: str = None, a=A, p=P):
+        self._buffer = buffer
+        self.source = source # File path, or None for an in-memory table
+        self.a = a
+        self.p = p
+
+    @classmethod
+    def open(cls, path: str, G=(Gx, Gy), a=A, b=B, p=P, n=N):
+        """
+        Maps an existing table file. Raises ValueError if it is missing, truncated,
+        from another format version or curve, or fails its checksum.
+        """
+        try:
+            with open(path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Cannot map precomputation table '{path}': {e}")
+
+        if len(mapped) != HEADER_SIZE + PAYLOAD_SIZE:
+            mapped.close()
+            raise ValueError(f"Precomputation table '{path}' has an unexpected size.")
+        magic, version, window_bits, _, windows, entries, digest, checksum = struct.unpack_from(HEADER_FORMAT, mapped, 0)
+        expected = (TABLE_MAGIC, TABLE_FORMAT_VERSION, WINDOW_BITS, WINDOWS, ENTRIES_PER_WINDOW, curve_digest(p, a, b, G, n))
+        if (magic, version, window_bits, windows, entries, digest) != expected:
+            mapped.close()
+            raise ValueError(f"Precomputation table '{path}' is stale (format, parameters or curve differ).")
+        if hashlib.sha256(memoryview(mapped)[HEADER_SIZE:]).digest() != checksum:
+            mapped.close()
+            raise ValueError(f"Precomputation table '{path}' failed its checksum.")
+        return cls(mapped, source=path, a=a, p=p)
+
+    @classmethod
+    def load_or_create(cls, path: str = None, G=(Gx, Gy), a=A, b=B, p=P, n=N):
+        """
+        Maps the table at path (default: default_table_path()), regenerating the file first
+        when it is missing or stale. If the file cannot be written, the table is built in memory.
+        The curve parameters default to secp256k1.
+        """
+        path = path or default_table_path()
+        try:
+            return cls.open(path, G, a, b, p, n)
+        except ValueError:
+            pass
+        try:
+            write_table(path, G, a, b, p, n)
+            return cls.open(path, G, a, b, p, n)
+        except (OSError, ValueError):
+            # Read-only location: fall back to a private in-memory table
+            return cls(build_table_payload(G, a, p), a=a, p=p)
+
+    def entry(self, window: int, digit: int) -> tuple:
+        """Returns digit * 2^(8 * window) * G as an affine point (digit in 1..255)."""
+        offset = HEADER_SIZE if self.source else 0
+        offset += (window * ENTRIES_PER_WINDOW + digit - 1) * ENTRY_SIZE
+        raw = self._buffer[offset:offset + ENTRY_SIZE]
+        return (int.from_bytes(raw[:32], 'big'), int.from_bytes(raw[32:], 'big'))
+
+    def multiply(self, k: int):
+        """Computes k * G for 0 < k < 2^256 using one table lookup per byte of k."""
+        return from_jacobian(self.multiply_jacobian(k), self.p)
+
+    def multiply_jacobian(self, k: int):
+        """
+        Like multiply, but returns Jacobian coordinates, so callers computing many products
+        can normalise them together with batch_to_affine (one inversion for the batch).
+        """
+        if not isinstance(k, int) or not (0 < k < (1 << 256)):
+            raise ValueError("Scalar 'k' must be an integer in [1, 2^256 - 1].")
+        result = POINT_INFINITY
+        window = 0
+        while k:
+            digit = k & ENTRIES_PER_WINDOW
+            if digit:
+                result = jacobian_add_affine(result, self.entry(window, digit), self.a, self.p)
+            k >>= WINDOW_BITS
+            window += 1
+        return result
+
+    def close(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+
+_table = None
+_table_lock = threading.Lock()
+
+
+def get_fixed_base_table() -> FixedBaseTable:
+    """Returns the process-wide generator table, mapping (or regenerating) it on first use."""
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                _table = FixedBaseTable.load_or_create()
+    return _table
+
+
+def reset_fixed_base_table():
+    """
+    Drops the process-wide table, e.g. after BASE40_PRECOMP_PATH changed. The old map is not
+    closed here: threads may still be multiplying with it, so it is closed by garbage
+    collection once the last of them lets go.
+    """
+    global _table
+    with _table_lock:
+        _table = None
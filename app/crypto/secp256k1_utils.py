@@ -6,6 +6,7 @@ import os
 # Assuming the project root (/app) is in sys.path via test execution context or PYTHONPATH
 
 from app.core_logic.base40 import number_to_angle, angle_to_symbol, DEFAULT_SYMBOLS
+from app.crypto import field_backend
 
 # SECP256k1 Curve Parameters
 P = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F
@@ -19,13 +20,11 @@ N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
 POINT_INFINITY = None
 
 def inverse_mod(k, p):
-    """Computes the modular multiplicative inverse of k modulo p using Fermat's Little Theorem."""
-    if k == 0:
+    """Computes the modular multiplicative inverse of k modulo p using the active field backend."""
+    if k % p == 0:
         raise ZeroDivisionError('division by zero')
-    if k < 0:
-        # k % p can be negative in Python if k < 0
-        return pow(k % p, p - 2, p)
-    return pow(k, p - 2, p)
+    # Normalise negative k first; the backends expect 0 < k < p
+    return field_backend.get_backend().inverse(k % p, p)
 
 def is_on_curve(x, y, a=A, b=B, p=P):
     """Checks if a point (x, y) is on the curve y^2 = x^3 + ax + b (mod p)."""
@@ -52,14 +51,15 @@ def point_addition(p1, p2, a=A, b=B, p=P):
 
     # Standard point addition
     # slope (s) = (y2 - y1) * (x2 - x1)^-1 mod p
+    field = field_backend.get_backend()
     s_num = (y2 - y1) % p
     s_den = inverse_mod((x2 - x1) % p, p)
-    s = (s_num * s_den) % p
+    s = field.mul(s_num, s_den, p)
 
     # x3 = (s^2 - x1 - x2) mod p
-    x3 = (s * s - x1 - x2) % p
+    x3 = (field.mul(s, s, p) - x1 - x2) % p
     # y3 = (s * (x1 - x3) - y1) mod p
-    y3 = (s * (x1 - x3) - y1) % p
+    y3 = (field.mul(s, (x1 - x3) % p, p) - y1) % p
 
     return (x3, y3)
 
@@ -74,24 +74,26 @@ def point_doubling(pt, a=A, b=B, p=P):
         return POINT_INFINITY
 
     # slope (s) = (3*x1^2 + a) * (2*y1)^-1 mod p
-    s_num = (3 * x1 * x1 + a) % p
+    field = field_backend.get_backend()
+    s_num = (3 * field.mul(x1, x1, p) + a) % p
     s_den = inverse_mod((2 * y1) % p, p)
-    s = (s_num * s_den) % p
+    s = field.mul(s_num, s_den, p)
 
     # x3 = (s^2 - 2*x1) mod p
-    x3 = (s * s - 2 * x1) % p
+    x3 = (field.mul(s, s, p) - 2 * x1) % p
     # y3 = (s * (x1 - x3) - y1) mod p
-    y3 = (s * (x1 - x3) - y1) % p
+    y3 = (field.mul(s, (x1 - x3) % p, p) - y1) % p
 
     return (x3, y3)
 
-def scalar_multiplication(k: int, G=(Gx, Gy), symbols: list = DEFAULT_SYMBOLS, a=A, b=B, p=P):
+def scalar_multiplication(k: int, G=(Gx, Gy), symbols: list = DEFAULT_SYMBOLS, a=A, b=B, p=P, n=N):
     """
     Performs scalar multiplication (k * G) on the elliptic curve using the double-and-add algorithm.
     Records detailed steps for visualization.
     k: private key as an integer.
     G: generator point.
     symbols: Base40 symbols list.
+    a, b, p, n: curve parameters (default secp256k1; see curves.py for the other curves).
     Returns a tuple: (final_public_key_point, steps_details_list)
     Each step detail is a dictionary:
     {
@@ -107,7 +109,7 @@ def scalar_multiplication(k: int, G=(Gx, Gy), symbols: list = DEFAULT_SYMBOLS, a
     """
     if not isinstance(k, int):
         raise TypeError("Scalar 'k' (private key) must be an integer.")
-    if k <= 0 or k >= N: # Private key must be in [1, N-1]
+    if k <= 0 or k >= n: # Private key must be in [1, n-1] for the curve's group order
         raise ValueError(f"Scalar 'k' must be between 1 and N-1. Got: {k}")
 
     final_result_point = POINT_INFINITY
@@ -164,6 +166,168 @@ def scalar_multiplication(k: int, G=(Gx, Gy), symbols: list = DEFAULT_SYMBOLS, a
     return final_result_point, steps_details_final
 
 
+# --- Jacobian coordinates and batch helpers ---
+# The detailed scalar_multiplication above normalises every intermediate point because each
+# step is visualised. Bulk paths (vanity search, batch generation) do not need the trace, so
+# they work in Jacobian coordinates (X, Y, Z) ~ (X/Z^2, Y/Z^3) and pay for a single inversion
+# per batch. The point at infinity is POINT_INFINITY in both representations.
+
+def to_jacobian(pt):
+    """Converts an affine point to Jacobian coordinates."""
+    if pt == POINT_INFINITY:
+        return POINT_INFINITY
+    return (pt[0], pt[1], 1)
+
+def jacobian_double(pt, a=A, p=P):
+    """
+    Doubles a point given in Jacobian coordinates. The slope numerator m = 3x^2 + a*z^4 skips
+    the a-term when a == 0 (secp256k1) and is computed as 3(x - z^2)(x + z^2) when a == -3
+    (the NIST curves), saving the z^4 products.
+    """
+    if pt == POINT_INFINITY:
+        return POINT_INFINITY
+    x1, y1, z1 = pt
+    if y1 == 0:
+        return POINT_INFINITY
+
+    y1_sq = (y1 * y1) % p
+    s = (4 * x1 * y1_sq) % p
+    if a == 0:
+        m = (3 * x1 * x1) % p
+    elif a == p - 3:
+        z1_sq = (z1 * z1) % p
+        m = (3 * (x1 - z1_sq) * (x1 + z1_sq)) % p
+    else:
+        z1_sq = (z1 * z1) % p
+        m = (3 * x1 * x1 + a * z1_sq * z1_sq) % p
+    x3 = (m * m - 2 * s) % p
+    y3 = (m * (s - x3) - 8 * y1_sq * y1_sq) % p
+    z3 = (2 * y1 * z1) % p
+    return (x3, y3, z3)
+
+def jacobian_add_affine(pt, q, a=A, p=P):
+    """Adds an affine point q to a point given in Jacobian coordinates (mixed addition)."""
+    if q == POINT_INFINITY:
+        return pt
+    if pt == POINT_INFINITY:
+        return to_jacobian(q)
+    x1, y1, z1 = pt
+    x2, y2 = q
+
+    z1_sq = (z1 * z1) % p
+    u2 = (x2 * z1_sq) % p
+    s2 = (y2 * z1 * z1_sq) % p
+    h = (u2 - x1) % p
+    r = (s2 - y1) % p
+    if h == 0:
+        if r == 0:
+            return jacobian_double(pt, a, p)
+        return POINT_INFINITY # pt + (-pt)
+
+    h_sq = (h * h) % p
+    h_cu = (h * h_sq) % p
+    v = (x1 * h_sq) % p
+    x3 = (r * r - h_cu - 2 * v) % p
+    y3 = (r * (v - x3) - y1 * h_cu) % p
+    z3 = (z1 * h) % p
+    return (x3, y3, z3)
+
+def jacobian_add(pt1, pt2, a=A, p=P):
+    """Adds two points given in Jacobian coordinates."""
+    if pt1 == POINT_INFINITY:
+        return pt2
+    if pt2 == POINT_INFINITY:
+        return pt1
+    x1, y1, z1 = pt1
+    x2, y2, z2 = pt2
+
+    z1_sq = (z1 * z1) % p
+    z2_sq = (z2 * z2) % p
+    u1 = (x1 * z2_sq) % p
+    u2 = (x2 * z1_sq) % p
+    s1 = (y1 * z2 * z2_sq) % p
+    s2 = (y2 * z1 * z1_sq) % p
+    h = (u2 - u1) % p
+    r = (s2 - s1) % p
+    if h == 0:
+        if r == 0:
+            return jacobian_double(pt1, a, p)
+        return POINT_INFINITY
+
+    h_sq = (h * h) % p
+    h_cu = (h * h_sq) % p
+    v = (u1 * h_sq) % p
+    x3 = (r * r - h_cu - 2 * v) % p
+    y3 = (r * (v - x3) - s1 * h_cu) % p
+    z3 = (z1 * z2 * h) % p
+    return (x3, y3, z3)
+
+def batch_inverse(values: list, p=P) -> list:
+    """
+    Inverts every (non-zero) value modulo p with a single field inversion (Montgomery's trick).
+    Returns the inverses in the same order as the input.
+    """
+    if not values:
+        return []
+    prefix_products = []
+    accumulator = 1
+    for value in values:
+        if value % p == 0:
+            raise ZeroDivisionError('division by zero')
+        accumulator = (accumulator * value) % p
+        prefix_products.append(accumulator)
+
+    inverse_accumulator = inverse_mod(accumulator, p)
+    inverses = [0] * len(values)
+    for index in range(len(values) - 1, 0, -1):
+        inverses[index] = (inverse_accumulator * prefix_products[index - 1]) % p
+        inverse_accumulator = (inverse_accumulator * values[index]) % p
+    inverses[0] = inverse_accumulator
+    return inverses
+
+def from_jacobian(pt, p=P):
+    """Converts a Jacobian point back to affine coordinates."""
+    if pt == POINT_INFINITY:
+        return POINT_INFINITY
+    return batch_to_affine([pt], p)[0]
+
+def batch_to_affine(points: list, p=P) -> list:
+    """Normalises a list of Jacobian points to affine coordinates using one shared inversion."""
+    finite_indexes = [index for index, pt in enumerate(points) if pt != POINT_INFINITY]
+    z_inverses = batch_inverse([points[index][2] for index in finite_indexes], p)
+
+    affine_points = [POINT_INFINITY] * len(points)
+    for index, z_inv in zip(finite_indexes, z_inverses):
+        x, y, _ = points[index]
+        z_inv_sq = (z_inv * z_inv) % p
+        affine_points[index] = ((x * z_inv_sq) % p, (y * z_inv_sq * z_inv) % p)
+    return affine_points
+
+def scalar_multiply(k: int, G=(Gx, Gy), a=A, p=P):
+    """
+    Computes k * G without recording the intermediate steps.
+    For the secp256k1 generator this uses the shared fixed-base table (see precomp.py);
+    other points use Jacobian double-and-add with a single inversion at the end. Either
+    way it is much faster than scalar_multiplication when no visualisation trace is needed.
+    Returns the affine result point.
+    """
+    if not isinstance(k, int):
+        raise TypeError("Scalar 'k' must be an integer.")
+    if k <= 0:
+        raise ValueError(f"Scalar 'k' must be positive. Got: {k}")
+
+    if G == (Gx, Gy) and a == A and p == P and k < (1 << 256):
+        from app.crypto.precomp import get_fixed_base_table # Lazy: precomp imports this module
+        return get_fixed_base_table().multiply(k)
+
+    result = POINT_INFINITY
+    for i in range(k.bit_length() - 1, -1, -1):
+        result = jacobian_double(result, a, p)
+        if (k >> i) & 1:
+            result = jacobian_add_affine(result, G, a, p)
+    return from_jacobian(result, p)
+
+
 if __name__ == '__main__':
     # Test SECP256k1 operations
     assert is_on_curve(Gx, Gy)
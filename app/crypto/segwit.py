@@ -0,0 +1,232 @@
+# app/crypto/segwit.py
+#
+# SegWit addresses: bech32 (BIP173) for witness version 0 and bech32m (BIP350) for versions
+# 1-16, with P2WPKH (v0, hash160 of the compressed public key) and P2TR (v1, BIP341 key-path
+# output key, no script tree) built from secp256k1 public key points.
+#
+# The BCH checksum is table-driven: the generator XOR for the five bits shifted out of the
+# 30-bit state is looked up in a 32-entry table instead of testing each bit, and the state
+# after the human-readable part is computed once per hrp and reused. The witness program is
+# regrouped from 8-bit to 5-bit values with one integer conversion rather than a bit loop.
+# The *_addresses / *_many helpers share that setup across a whole batch; p2tr_addresses also
+# normalises every tweaked point with a single shared inversion.
+
+import hashlib
+from functools import lru_cache
+
+from app.crypto.hash160 import hash160, hash160_many
+from app.crypto.keys import public_key_to_bytes
+from app.crypto.secp256k1_utils import P, N, POINT_INFINITY, jacobian_add_affine, batch_to_affine
+
+BECH32_CHARSET = 'qpzry9x8gf2tvdw0s3jn54khce6mua7l'
+BECH32 = 'bech32'
+BECH32M = 'bech32m'
+_SPEC_CONSTANTS = {BECH32: 1, BECH32M: 0x2BC830A3}
+_CONSTANT_SPECS = {constant: spec for spec, constant in _SPEC_CONSTANTS.items()}
+_GENERATORS = (0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3)
+
+# _POLYMOD_TABLE[top] is the XOR of the generators selected by the 5 bits shifted out
+_POLYMOD_TABLE = tuple(
+    _GENERATORS[0] * (top & 1) ^ _GENERATORS[1] * (top >> 1 & 1) ^ _GENERATORS[2] * (top >> 2 & 1)
+    ^ _GENERATORS[3] * (top >> 3 & 1) ^ _GENERATORS[4] * (top >> 4 & 1)
+    for top in range(32)
+)
+_CHARSET_VALUES = {char: value for value, char in enumerate(BECH32_CHARSET)}
+
+MAX_BECH32_LENGTH = 90
+DEFAULT_HRP = 'bc' # Bitcoin mainnet ('tb' testnet, 'bcrt' regtest)
+TAPTWEAK_TAG = b'TapTweak'
+
+
+def bech32_polymod(values, checksum: int = 1) -> int:
+    """The BCH checksum state after feeding `values` (5-bit integers) into `checksum`."""
+    table = _POLYMOD_TABLE
+    for value in values:
+        checksum = ((checksum & 0x1FFFFFF) << 5) ^ value ^ table[checksum >> 25]
+    return checksum
+
+
+@lru_cache(maxsize=16)
+def _hrp_checksum(hrp: str) -> int:
+    """Checksum state after the expanded hrp (high bits, separator 0, low bits)."""
+    return bech32_polymod([ord(char) >> 5 for char in hrp] + [0] + [ord(char) & 31 for char in hrp])
+
+
+def bech32_encode(hrp: str, data: list, spec: str = BECH32) -> str:
+    """Encodes 5-bit `data` under `hrp` with a bech32 or bech32m checksum."""
+    checksum = bech32_polymod(data + [0, 0, 0, 0, 0, 0], _hrp_checksum(hrp)) ^ _SPEC_CONSTANTS[spec]
+    charset = BECH32_CHARSET
+    return (hrp + '1' + ''.join([charset[value] for value in data])
+            + ''.join([charset[(checksum >> shift) & 31] for shift in (25, 20, 15, 10, 5, 0)]))
+
+
+def bech32_decode(text: str) -> tuple:
+    """
+    Returns (hrp, data, spec) for a bech32 or bech32m string, data without the checksum.
+    Raises ValueError for invalid characters, mixed case, bad length or a wrong checksum.
+    """
+    if any(ord(char) < 33 or ord(char) > 126 for char in text):
+        raise ValueError("Bech32 string contains invalid characters.")
+    if text.lower() != text and text.upper() != text:
+        raise ValueError("Bech32 string mixes upper and lower case.")
+    text = text.lower()
+    separator = text.rfind('1')
+    if separator < 1 or separator + 7 > len(text) or len(text) > MAX_BECH32_LENGTH:
+        raise ValueError("Bech32 string has an invalid length or separator position.")
+    hrp = text[:separator]
+    try:
+        data = [_CHARSET_VALUES[char] for char in text[separator + 1:]]
+    except KeyError:
+        raise ValueError("Bech32 data part contains a character outside the charset.")
+    spec = _CONSTANT_SPECS.get(bech32_polymod(data, _hrp_checksum(hrp)))
+    if spec is None:
+        raise ValueError("Bech32 checksum is invalid.")
+    return hrp, data[:-6], spec
+
+
+def _to_5bit(program: bytes) -> list:
+    """Regroups bytes into 5-bit values, zero-padding the last group."""
+    bits = 8 * len(program)
+    padding = -bits % 5
+    value = int.from_bytes(program, 'big') << padding
+    groups = (bits + padding) // 5
+    return [(value >> (5 * (groups - 1 - i))) & 31 for i in range(groups)]
+
+
+def _from_5bit(data: list) -> bytes:
+    """Inverse of _to_5bit; the padding must be under 5 bits and zero."""
+    value = 0
+    for group in data:
+        value = (value << 5) | group
+    padding = (5 * len(data)) % 8
+    if padding >= 5 or value & ((1 << padding) - 1):
+        raise ValueError("Invalid padding in witness program.")
+    return (value >> padding).to_bytes(5 * len(data) // 8, 'big')
+
+
+def _check_program(version: int, program: bytes):
+    if not (0 <= version <= 16):
+        raise ValueError("Witness version must be between 0 and 16.")
+    if not (2 <= len(program) <= 40):
+        raise ValueError("Witness program must be 2 to 40 bytes.")
+    if version == 0 and len(program) not in (20, 32):
+        raise ValueError("Version 0 witness programs must be 20 or 32 bytes.")
+
+
+def encode_segwit_address(version: int, program: bytes, hrp: str = DEFAULT_HRP) -> str:
+    """Encodes a witness program (bech32 for version 0, bech32m otherwise)."""
+    _check_program(version, program)
+    return bech32_encode(hrp, [version] + _to_5bit(program), BECH32 if version == 0 else BECH32M)
+
+
+def decode_segwit_address(address: str, hrp: str = DEFAULT_HRP) -> tuple:
+    """
+    Returns (version, program) for a SegWit address under `hrp`.
+    Raises ValueError for any malformed address, including the wrong checksum variant.
+    """
+    decoded_hrp, data, spec = bech32_decode(address)
+    if decoded_hrp != hrp:
+        raise ValueError(f"Address has prefix '{decoded_hrp}', expected '{hrp}'.")
+    if not data:
+        raise ValueError("Address has no witness version.")
+    version = data[0]
+    program = _from_5bit(data[1:])
+    _check_program(version, program)
+    if spec != (BECH32 if version == 0 else BECH32M):
+        raise ValueError(f"Witness version {version} requires a {BECH32 if version == 0 else BECH32M} checksum.")
+    return version, program
+
+
+def is_valid_segwit_address(address: str, hrp: str = DEFAULT_HRP) -> bool:
+    try:
+        decode_segwit_address(address, hrp)
+    except ValueError:
+        return False
+    return True
+
+
+# --- Batch encoding, decoding and validation ---
+
+def encode_segwit_addresses(version: int, programs, hrp: str = DEFAULT_HRP) -> list:
+    """encode_segwit_address for every program, with the hrp state and spec resolved once."""
+    spec_constant = _SPEC_CONSTANTS[BECH32 if version == 0 else BECH32M]
+    hrp_checksum = _hrp_checksum(hrp)
+    prefix = hrp + '1'
+    charset = BECH32_CHARSET
+    addresses = []
+    for program in programs:
+        _check_program(version, program)
+        data = [version] + _to_5bit(program)
+        checksum = bech32_polymod(data + [0, 0, 0, 0, 0, 0], hrp_checksum) ^ spec_constant
+        addresses.append(prefix + ''.join([charset[value] for value in data])
+                         + ''.join([charset[(checksum >> shift) & 31] for shift in (25, 20, 15, 10, 5, 0)]))
+    return addresses
+
+
+def decode_segwit_addresses(addresses, hrp: str = DEFAULT_HRP) -> list:
+    """(version, program) for each address, or None for the invalid ones."""
+    results = []
+    for address in addresses:
+        try:
+            results.append(decode_segwit_address(address, hrp))
+        except ValueError:
+            results.append(None)
+    return results
+
+
+def validate_segwit_addresses(addresses, hrp: str = DEFAULT_HRP) -> list:
+    """One boolean per address."""
+    return [result is not None for result in decode_segwit_addresses(addresses, hrp)]
+
+
+# --- P2WPKH and P2TR from public key points ---
+
+def p2wpkh_address(point: tuple, hrp: str = DEFAULT_HRP) -> str:
+    """P2WPKH address: version 0, hash160 of the compressed public key."""
+    return encode_segwit_address(0, hash160(public_key_to_bytes(point, compressed=True)), hrp)
+
+
+def p2wpkh_addresses(points, hrp: str = DEFAULT_HRP) -> list:
+    return encode_segwit_addresses(0, hash160_many([public_key_to_bytes(point, compressed=True) for point in points]),
+                                   hrp)
+
+
+def tagged_hash(tag: bytes, data: bytes) -> bytes:
+    """BIP340 tagged hash: SHA256(SHA256(tag) || SHA256(tag) || data)."""
+    tag_hash = hashlib.sha256(tag).digest()
+    return hashlib.sha256(tag_hash + tag_hash + data).digest()
+
+
+def _taproot_tweak_jacobian(point: tuple):
+    """Q = P + int(TapTweak(x(P))) * G in Jacobian coordinates, P taken with even y (BIP341)."""
+    if point == POINT_INFINITY:
+        raise ValueError("The point at infinity has no taproot output key.")
+    x, y = point
+    if y & 1:
+        point = (x, P - y)
+    tweak = int.from_bytes(tagged_hash(TAPTWEAK_TAG, x.to_bytes(32, 'big')), 'big')
+    if tweak >= N:
+        raise ValueError("Taproot tweak is out of range.") # Probability about 2^-128
+    from app.crypto.precomp import get_fixed_base_table # Lazy, like curves.fixed_base_table
+    return jacobian_add_affine(get_fixed_base_table().multiply_jacobian(tweak), point)
+
+
+def taproot_output_keys(points) -> list:
+    """The 32-byte x-only output keys for key-path-only taproot outputs, one inversion for all."""
+    tweaked = batch_to_affine([_taproot_tweak_jacobian(point) for point in points])
+    if POINT_INFINITY in tweaked:
+        raise ValueError("Taproot output key is the point at infinity.")
+    return [output[0].to_bytes(32, 'big') for output in tweaked]
+
+
+def taproot_output_key(point: tuple) -> bytes:
+    return taproot_output_keys([point])[0]
+
+
+def p2tr_address(point: tuple, hrp: str = DEFAULT_HRP) -> str:
+    """P2TR address: version 1, the tweaked x-only output key (no script tree)."""
+    return encode_segwit_address(1, taproot_output_key(point), hrp)
+
+
+def p2tr_addresses(points, hrp: str = DEFAULT_HRP) -> list:
+    return encode_segwit_addresses(1, taproot_output_keys(points), hrp)
@@ -0,0 +1,269 @@
+# app/crypto/vanity.py
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+from app.core_logic.base40 import DEFAULT_SYMBOLS
+from app.crypto.secp256k1_utils import N, Gx, Gy, scalar_multiply, to_jacobian, jacobian_add_affine, batch_to_affine
+from app.crypto.keys import generate_private_key_int, public_key_to_bytes
+from app.crypto.addresses import ripemd160_to_base40, base58check_encode_bitcoin, BASE58_ALPHABET
+from app.crypto.hash160 import hash160_many
+
+G_POINT = (Gx, Gy)
+BASE40_ADDRESS_LENGTH = 31 # Width of address_base40, see ripemd160_to_base40
+HASH160_LIMIT = 1 << 160
+DEFAULT_BATCH_SIZE = 256 # Points normalised per shared inversion
+
+
+class VanityPattern:
+    """
+    One or more address prefixes compiled for fast matching against hash160 values.
+
+    address_base40 is the fixed-width (31 symbols, left-padded) Base40 rendering of the
+    160-bit hash, so every Base40 prefix corresponds to a contiguous integer range of hashes.
+    Base40 prefixes are therefore matched with integer comparisons and no encoding at all.
+    Base58 prefixes are matched against the encoded P2PKH address.
+    """
+    ENCODINGS = ('base40', 'base58')
+
+    def __init__(self, prefixes, encoding: str = 'base40', symbols: list = DEFAULT_SYMBOLS):
+        if isinstance(prefixes, str):
+            prefixes = [prefixes]
+        prefixes = list(prefixes or [])
+        if not prefixes or not all(isinstance(prefix, str) and prefix for prefix in prefixes):
+            raise ValueError("At least one non-empty prefix string is required.")
+        if encoding not in self.ENCODINGS:
+            raise ValueError(f"Unknown encoding '{encoding}'. Expected one of: {', '.join(self.ENCODINGS)}.")
+
+        self.prefixes = prefixes
+        self.encoding = encoding
+        self.symbols = list(symbols)
+        self._ranges = []
+        self._base58_prefixes = ()
+
+        if encoding == 'base40':
+            symbol_indexes = {symbol: index for index, symbol in enumerate(self.symbols)}
+            self._ranges = sorted(self._compile_base40(prefix, symbol_indexes) for prefix in prefixes)
+        else:
+            for prefix in prefixes:
+                invalid = [char for char in prefix if char not in BASE58_ALPHABET]
+                if invalid:
+                    raise ValueError(f"Prefix '{prefix}' contains characters outside the Base58 alphabet: {''.join(invalid)}")
+                if not prefix.startswith('1'):
+                    raise ValueError(f"Prefix '{prefix}' can never match: P2PKH mainnet addresses start with '1'.")
+            self._base58_prefixes = tuple(prefixes)
+
+    def _compile_base40(self, prefix: str, symbol_indexes: dict) -> tuple:
+        if len(prefix) > BASE40_ADDRESS_LENGTH:
+            raise ValueError(f"Prefix '{prefix}' is longer than the {BASE40_ADDRESS_LENGTH}-symbol Base40 address.")
+        value = 0
+        for symbol in prefix:
+            if symbol not in symbol_indexes:
+                raise ValueError(f"Symbol '{symbol}' not found in Base40 symbols list.")
+            value = value * 40 + symbol_indexes[symbol]
+
+        scale = 40 ** (BASE40_ADDRESS_LENGTH - len(prefix))
+        low = value * scale
+        if low >= HASH160_LIMIT:
+            raise ValueError(f"Prefix '{prefix}' can never match: {BASE40_ADDRESS_LENGTH}-symbol Base40 addresses "
+                             f"start with '{self.symbols[0]}' or '{self.symbols[1]}'.")
+        return (low, min(low + scale, HASH160_LIMIT))
+
+    def matches(self, hash160_bytes: bytes) -> bool:
+        """Returns True if the address derived from this hash160 starts with one of the prefixes."""
+        if self.encoding == 'base40':
+            value = int.from_bytes(hash160_bytes, 'big')
+            for low, high in self._ranges:
+                if low <= value < high:
+                    return True
+            return False
+        return base58check_encode_bitcoin(hash160_bytes).startswith(self._base58_prefixes)
+
+    def match_probability(self):
+        """Probability that a random key matches (Base40 only; None for Base58)."""
+        if self.encoding != 'base40':
+            return None
+        return sum(high - low for low, high in self._ranges) / HASH160_LIMIT
+
+
+def iter_point_batches(start_key: int, batch_size: int = DEFAULT_BATCH_SIZE):
+    """
+    Yields (first_key, affine_points) for the consecutive keys start_key, start_key + 1, ...
+    Each point is derived from the previous one by a Jacobian addition of G, and every batch is
+    normalised to affine coordinates with a single shared inversion. Stops before reaching N.
+    """
+    current = to_jacobian(scalar_multiply(start_key, G_POINT))
+    key = start_key
+    while key + batch_size < N:
+        jacobian_points = []
+        for _ in range(batch_size):
+            jacobian_points.append(current)
+            current = jacobian_add_affine(current, G_POINT)
+        yield key, batch_to_affine(jacobian_points)
+        key += batch_size
+
+
+def scan_keys(start_key: int, count: int, pattern: VanityPattern, batch_size: int = DEFAULT_BATCH_SIZE) -> list:
+    """
+    Checks `count` consecutive keys from start_key in the current process.
+    Returns a list of (private_key_int, hash160_bytes) tuples for the keys that match.
+    """
+    matches = []
+    checked = 0
+    for first_key, points in iter_point_batches(start_key, batch_size):
+        hashes = hash160_many([public_key_to_bytes(point) for point in points[:count - checked]])
+        for offset, hash160_bytes in enumerate(hashes):
+            if pattern.matches(hash160_bytes):
+                matches.append((first_key + offset, hash160_bytes))
+        checked += len(points)
+        if checked >= count:
+            break
+    return matches
+
+
+def _worker_main(pattern, batch_size, stop_event, result_queue, counter):
+    """Worker process: scans from random starting keys until the stop event is set."""
+    while not stop_event.is_set():
+        start_key = generate_private_key_int()
+        for first_key, points in iter_point_batches(start_key, batch_size):
+            if stop_event.is_set():
+                return
+            for offset, hash160_bytes in enumerate(hash160_many([public_key_to_bytes(point) for point in points])):
+                if pattern.matches(hash160_bytes):
+                    result_queue.put((first_key + offset, hash160_bytes))
+            with counter.get_lock():
+                counter.value += len(points)
+
+
+def build_vanity_result(private_key_int: int, hash160_bytes: bytes, symbols: list = DEFAULT_SYMBOLS) -> dict:
+    """Builds the result record reported for a matching key."""
+    return {
+        "private_key_hex": format(private_key_int, '064x'),
+        "hashed_public_key_ripemd160_hex": hash160_bytes.hex(),
+        "address_base40": ripemd160_to_base40(hash160_bytes, target_length=BASE40_ADDRESS_LENGTH, symbols=symbols),
+        "address_bitcoin_base58check": base58check_encode_bitcoin(hash160_bytes, version_byte=0x00),
+    }
+
+
+class VanitySearch:
+    """
+    A multiprocess vanity-address search.
+
+    Each worker process starts from a random key and steps through consecutive keys with
+    incremental point additions (see iter_point_batches). Matches are collected by a
+    background thread in the parent process; the search stops once `max_results` matches
+    were found or cancel() is called.
+    """
+
+    def __init__(self, pattern: VanityPattern, workers: int = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 max_results: int = 1, mp_context=None):
+        if max_results < 1:
+            raise ValueError("max_results must be at least 1.")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        self.pattern = pattern
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.batch_size = batch_size
+        self.max_results = max_results
+        # 'spawn' keeps workers safe to start from threaded servers (forking a threaded process is not)
+        self._mp = mp_context or multiprocessing.get_context('spawn')
+
+        self.state = 'pending' # pending -> running -> completed | cancelled
+        self.results = []
+        self._processes = []
+        self._counters = []
+        self._stop_event = self._mp.Event()
+        self._result_queue = self._mp.Queue()
+        self._collector = None
+        self._finished = threading.Event()
+        self._lock = threading.Lock()
+        self._started_at = None
+        self._finished_at = None
+
+    def start(self):
+        if self.state != 'pending':
+            raise RuntimeError("A vanity search can only be started once.")
+        self._started_at = time.monotonic()
+        for _ in range(self.workers):
+            counter = self._mp.Value('Q', 0)
+            process = self._mp.Process(
+                target=_worker_main,
+                args=(self.pattern, self.batch_size, self._stop_event, self._result_queue, counter),
+                daemon=True
+            )
+            process.start()
+            self._counters.append(counter)
+            self._processes.append(process)
+        self.state = 'running'
+        self._collector = threading.Thread(target=self._collect, name='vanity-collector', daemon=True)
+        self._collector.start()
+        return self
+
+    def _collect(self):
+        while not self._stop_event.is_set():
+            try:
+                private_key_int, hash160_bytes = self._result_queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            with self._lock:
+                if len(self.results) < self.max_results:
+                    self.results.append(build_vanity_result(private_key_int, hash160_bytes, self.pattern.symbols))
+                if len(self.results) >= self.max_results:
+                    self._stop('completed')
+        self._shutdown_workers()
+
+    def _stop(self, final_state: str):
+        if self.state == 'running':
+            self.state = final_state
+            self._finished_at = time.monotonic()
+        self._stop_event.set()
+
+    def _shutdown_workers(self):
+        for process in self._processes:
+            process.join(timeout=2)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self._finished.set()
+
+    def cancel(self):
+        """Requests the workers to stop; results found so far are kept."""
+        with self._lock:
+            if self.state == 'pending':
+                self.state = 'cancelled'
+                self._finished.set()
+                return
+            self._stop('cancelled')
+
+    def wait(self, timeout: float = None) -> bool:
+        """Waits for the search to finish. Returns True if it has finished."""
+        if self.state == 'pending':
+            return False
+        return self._finished.wait(timeout)
+
+    def keys_checked(self) -> int:
+        return sum(counter.value for counter in self._counters)
+
+    def status(self) -> dict:
+        """Progress snapshot: state, keys checked, throughput and the matches found so far."""
+        keys_checked = self.keys_checked()
+        if self._started_at is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self._finished_at or time.monotonic()) - self._started_at
+        with self._lock:
+            results = list(self.results)
+        return {
+            "state": self.state,
+            "prefixes": self.pattern.prefixes,
+            "encoding": self.pattern.encoding,
+            "workers": self.workers,
+            "keys_checked": keys_checked,
+            "elapsed_seconds": round(elapsed, 3),
+            "keys_per_second": round(keys_checked / elapsed, 1) if elapsed > 0 else 0.0,
+            "match_probability": self.pattern.match_probability(),
+            "results": results,
+        }
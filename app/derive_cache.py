@@ -0,0 +1,104 @@
+# app/derive_cache.py
+#
+# Opt-in cache for POST /api/derive. Re-deriving a known private key (QA runs, replaying a
+# visualisation) repeats the full traced scalar multiplication; the cache keeps the public
+# key and the 256-step trace so a replay only redoes the cheap encodings in build_keypair_bundle.
+#
+# Entries are keyed by a keyed BLAKE2b digest of (curve, scalar) under a random per-process
+# salt, so the scalars themselves are never used as dictionary keys. The traces do record the
+# key's bits, which is why the cache is off by default, lives only in process memory, and
+# every entry expires after `ttl` seconds. Size is bounded with LRU eviction.
+# Enable with BASE40_DERIVE_CACHE_SIZE=N (DERIVE_CACHE_SIZE); TTL: BASE40_DERIVE_CACHE_TTL (DERIVE_CACHE_TTL).
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_DERIVE_CACHE_TTL = 300.0
+
+
+class DerivationCache:
+    """Thread-safe LRU of (public_key_hex, steps) with a fixed time-to-live per entry."""
+
+    def __init__(self, max_entries: int, ttl: float = DEFAULT_DERIVE_CACHE_TTL, clock=time.monotonic):
+        if max_entries < 1 or ttl <= 0:
+            raise ValueError("Derivation cache size and TTL must be positive.")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._salt = os.urandom(16)
+        self._entries = OrderedDict() # digest -> (expires_at, public_key_hex, steps)
+        self._lock = threading.Lock()
+
+    def _digest(self, private_key_int: int, curve_name: str) -> bytes:
+        material = curve_name.encode('ascii') + b':' + private_key_int.to_bytes(32, 'big')
+        return hashlib.blake2b(material, key=self._salt, digest_size=16).digest()
+
+    def get(self, private_key_int: int, curve_name: str):
+        """Returns (public_key_hex, steps) for the key, or None on a miss or an expired entry."""
+        digest = self._digest(private_key_int, curve_name)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None and entry[0] <= self.clock():
+                del self._entries[digest]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def put(self, private_key_int: int, curve_name: str, public_key_hex: str, steps: list):
+        digest = self._digest(private_key_int, curve_name)
+        with self._lock:
+            now = self.clock()
+            self._entries.pop(digest, None)
+            self._entries[digest] = (now + self.ttl, public_key_hex, steps)
+            # Expired entries are dropped from the LRU end first, then the least recently used
+            while self._entries:
+                oldest = next(iter(self._entries.values()))
+                if oldest[0] <= now:
+                    self._entries.popitem(last=False)
+                    self.expirations += 1
+                elif len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+                else:
+                    break
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = len(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+def create_derivation_cache(app):
+    """The app's cache from DERIVE_CACHE_SIZE / DERIVE_CACHE_TTL, or None when the size is 0."""
+    size = app.config.get('DERIVE_CACHE_SIZE', 0)
+    if not size:
+        return None
+    cache = DerivationCache(size, app.config.get('DERIVE_CACHE_TTL', DEFAULT_DERIVE_CACHE_TTL))
+    app.extensions['base40_derive_cache'] = cache
+    return cache
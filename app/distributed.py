@@ -0,0 +1,452 @@
+# app/distributed.py
+#
+# Distributed key-range scanning. A coordinator splits the scalar interval [start, end) into
+# fixed-size leases; workers (processes on this host or others) take a lease, derive its keys
+# incrementally (one point addition per key, one shared inversion per batch), hash each public
+# key and match the hash160 against the target set. Matching keys are reported to the coordinator.
+#
+# Workers heartbeat their position while scanning. A lease whose worker has not been heard from
+# for lease_timeout seconds is reissued from the last reported position, so a crashed worker
+# costs at most one heartbeat interval of work. The coordinator checkpoints completed leases,
+# the progress of open ones and the matches, and resumes from the checkpoint after a restart.
+#
+# Protocol: newline-delimited JSON over TCP, one request and one reply per line:
+#   {"op": "targets"}                                       -> {"hash160s": [hex, ...]}
+#   {"op": "lease", "worker": id}                           -> {"lease": {...}} | {"wait": s} | {"done": true}
+#   {"op": "heartbeat", "lease": i, "token": t, "next": k}  -> {"ok": true, "cancel": bool}
+#   {"op": "match", "lease": i, "private_key_hex": hex}     -> {"ok": true}
+#   {"op": "complete", "lease": i, "token": t}              -> {"ok": true}
+#   {"op": "status"}                                        -> coordinator status
+# There is no authentication: bind the coordinator to localhost or a trusted network only.
+#
+# Usage:
+#   python -m app.cli scan coordinator --targets watch.txt --start 0x1 --end 0x100000000 --checkpoint scan.json
+#   python -m app.cli scan worker --connect 127.0.0.1:7340 --processes 8
+
+import hashlib
+import json
+import multiprocessing
+import os
+import socket
+import socketserver
+import threading
+import time
+import uuid
+from collections import deque
+
+from app.address_index import parse_watch_entry
+from app.crypto.addresses import hash_public_key_bytes
+from app.crypto.hash160 import hash160_many
+from app.crypto.keys import public_key_to_bytes
+from app.crypto.precomp import write_atomically
+from app.crypto.secp256k1_utils import N, Gx, Gy, to_jacobian, jacobian_add_affine, batch_to_affine, scalar_multiply
+from app.crypto.vanity import build_vanity_result
+
+G_POINT = (Gx, Gy)
+DEFAULT_SCAN_PORT = 7340
+DEFAULT_LEASE_SIZE = 1 << 20
+DEFAULT_LEASE_TIMEOUT = 60.0
+DEFAULT_HEARTBEAT_INTERVAL = 5.0
+DEFAULT_SCAN_BATCH_SIZE = 256 # Points normalised per shared inversion
+CHECKPOINT_FORMAT_VERSION = 1
+
+
+def load_targets(entries) -> set:
+    """Parses hash160 hex, address_base40 or P2PKH Base58Check entries into a set of 20-byte hash160s."""
+    return {parse_watch_entry(entry) for entry in entries if entry.strip()}
+
+
+def targets_digest(targets) -> str:
+    digest = hashlib.sha256()
+    for hash160 in sorted(targets):
+        digest.update(hash160)
+    return digest.hexdigest()
+
+
+def scan_range(start: int, end: int, targets, batch_size: int = DEFAULT_SCAN_BATCH_SIZE, on_batch=None) -> list:
+    """
+    Derives the keys start..end-1 incrementally and returns the (private_key_int, hash160) pairs
+    whose hash160 (of the uncompressed public key, as in the pipeline) is in `targets`.
+    on_batch(next_key) is called after every batch; returning False stops the scan early.
+    """
+    if not (1 <= start <= end <= N):
+        raise ValueError("The scan range must lie within [1, N).")
+    matches = []
+    key = start
+    current = to_jacobian(scalar_multiply(start, G_POINT)) if start < end else None
+    while key < end:
+        jacobian_points = []
+        for _ in range(min(batch_size, end - key)):
+            jacobian_points.append(current)
+            current = jacobian_add_affine(current, G_POINT)
+        public_keys = [public_key_to_bytes(point) for point in batch_to_affine(jacobian_points)]
+        for offset, hash160 in enumerate(hash160_many(public_keys)):
+            if hash160 in targets:
+                matches.append((key + offset, hash160))
+        key += len(jacobian_points)
+        if on_batch is not None and on_batch(key) is False:
+            break
+    return matches
+
+
+# --- Coordinator ---
+
+class ScanCoordinator:
+    """
+    Hands out leases of [start, end), tracks their progress and collects matches.
+    handle() implements the protocol independently of the transport; serve() exposes it over TCP.
+    """
+
+    def __init__(self, targets, start: int, end: int, lease_size: int = DEFAULT_LEASE_SIZE,
+                 lease_timeout: float = DEFAULT_LEASE_TIMEOUT, checkpoint_path: str = None,
+                 stop_on_match: bool = False, logger=None):
+        if not (1 <= start < end <= N):
+            raise ValueError("The scan interval must satisfy 1 <= start < end <= N.")
+        if lease_size < 1:
+            raise ValueError("lease_size must be at least 1.")
+        self.targets = set(targets)
+        if not self.targets:
+            raise ValueError("At least one target is required.")
+        self.start = start
+        self.end = end
+        self.lease_size = lease_size
+        self.lease_count = -(-(end - start) // lease_size)
+        self.lease_timeout = lease_timeout
+        self.checkpoint_path = checkpoint_path
+        self.stop_on_match = stop_on_match
+        self.logger = logger
+        self.targets_digest = targets_digest(self.targets)
+
+        self.matches = []
+        self.keys_scanned = 0
+        self.state = 'running' # running -> completed | stopped
+        self._next_lease = 0 # Leases below this have been issued at least once
+        self._completed = set() # Completed lease numbers at or above _completed_floor
+        self._completed_floor = 0 # Every lease below this is completed
+        self._reissue = deque() # Issued but unfinished leases waiting for a worker
+        self._progress = {} # Lease -> next key to scan, for leases issued and not completed
+        self._active = {} # Lease -> {"worker", "token", "deadline"}
+        self._workers = {} # Worker id -> last time heard from
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._server = None
+        self._started_at = time.monotonic()
+        self._previous_seconds = 0.0
+        self._previous_keys = 0
+        self._load_checkpoint()
+
+    # --- Lease bookkeeping ---
+
+    def lease_bounds(self, lease: int) -> tuple:
+        lease_start = self.start + lease * self.lease_size
+        return lease_start, min(lease_start + self.lease_size, self.end)
+
+    def _is_completed(self, lease: int) -> bool:
+        return lease < self._completed_floor or lease in self._completed
+
+    def _mark_completed(self, lease: int):
+        self._completed.add(lease)
+        while self._completed_floor in self._completed:
+            self._completed.discard(self._completed_floor)
+            self._completed_floor += 1
+        self._progress.pop(lease, None)
+        self._active.pop(lease, None)
+        if self._completed_floor >= self.lease_count and self.state == 'running':
+            self.state = 'completed'
+            self._done.set()
+
+    def _expire_leases(self, now: float):
+        for lease, holder in list(self._active.items()):
+            if holder["deadline"] <= now:
+                del self._active[lease]
+                self._reissue.append(lease)
+                if self.logger:
+                    self.logger(f"lease {lease} of worker {holder['worker']} timed out; reissuing")
+
+    def _issue(self, worker: str, now: float):
+        while self._reissue:
+            lease = self._reissue.popleft()
+            if not self._is_completed(lease) and lease not in self._active:
+                break
+        else:
+            if self._next_lease >= self.lease_count:
+                return None
+            lease = self._next_lease
+            self._next_lease += 1
+            self._progress[lease] = self.lease_bounds(lease)[0]
+        token = uuid.uuid4().hex
+        self._active[lease] = {"worker": worker, "token": token, "deadline": now + self.lease_timeout}
+        return {"lease": lease, "token": token, "start": self._progress[lease], "end": self.lease_bounds(lease)[1]}
+
+    def _holder(self, message: dict):
+        holder = self._active.get(message.get("lease"))
+        if holder is None or holder["token"] != message.get("token"):
+            return None
+        return holder
+
+    # --- Protocol ---
+
+    def handle(self, message: dict) -> dict:
+        op = message.get("op")
+        now = time.monotonic()
+        if op == "targets":
+            return {"hash160s": [hash160.hex() for hash160 in sorted(self.targets)], "digest": self.targets_digest}
+        if op == "status":
+            return self.status()
+        with self._lock:
+            worker = str(message.get("worker", ''))
+            if worker:
+                self._workers[worker] = now
+            self._expire_leases(now)
+
+            if op == "lease":
+                if self.state != 'running':
+                    return {"done": True}
+                lease = self._issue(worker, now)
+                if lease is None:
+                    # Everything is issued; wait in case an active lease is reissued
+                    return {"wait": min(1.0, self.lease_timeout / 3)}
+                return {"lease": lease, "heartbeat_interval": min(DEFAULT_HEARTBEAT_INTERVAL, self.lease_timeout / 3)}
+
+            if op == "heartbeat":
+                holder = self._holder(message)
+                if holder is None or self.state != 'running':
+                    return {"ok": True, "cancel": True}
+                holder["deadline"] = now + self.lease_timeout
+                self._advance(message["lease"], int(message["next"]))
+                return {"ok": True, "cancel": False}
+
+            if op == "match":
+                private_key = int(message["private_key_hex"], 16)
+                lease_start, lease_end = self.lease_bounds(int(message["lease"]))
+                if not (lease_start <= private_key < lease_end):
+                    return {"error": "Match outside its lease."}
+                hash160 = hash_public_key_bytes(public_key_to_bytes(scalar_multiply(private_key, G_POINT)))
+                if hash160.hex() != message.get("hash160_hex"):
+                    return {"error": "Reported hash160 does not match the private key."}
+                if hash160 in self.targets and all(m["private_key_hex"] != message["private_key_hex"] for m in self.matches):
+                    self.matches.append(build_vanity_result(private_key, hash160))
+                    if self.logger:
+                        self.logger(f"match: key {message['private_key_hex']} -> {hash160.hex()}")
+                    if self.stop_on_match:
+                        self.state = 'stopped'
+                        self._done.set()
+                    self._save_checkpoint()
+                return {"ok": True}
+
+            if op == "complete":
+                lease = message.get("lease")
+                if self._holder(message) is not None and not self._is_completed(lease):
+                    self._advance(lease, self.lease_bounds(lease)[1])
+                    self._mark_completed(lease)
+                    self._save_checkpoint()
+                return {"ok": True}
+
+        return {"error": f"Unknown op '{op}'."}
+
+    def _advance(self, lease: int, next_key: int):
+        previous = self._progress.get(lease)
+        if previous is not None and next_key > previous:
+            self.keys_scanned += min(next_key, self.lease_bounds(lease)[1]) - previous
+            self._progress[lease] = next_key
+
+    # --- Checkpoints ---
+
+    def _checkpoint_identity(self) -> dict:
+        return {"format": CHECKPOINT_FORMAT_VERSION, "start": self.start, "end": self.end,
+                "lease_size": self.lease_size, "targets_digest": self.targets_digest}
+
+    def _save_checkpoint(self):
+        if not self.checkpoint_path:
+            return
+        state = self._checkpoint_identity()
+        state.update({
+            "next_lease": self._next_lease,
+            "completed_floor": self._completed_floor,
+            "completed": sorted(self._completed),
+            "progress": {str(lease): next_key for lease, next_key in self._progress.items()},
+            "matches": self.matches,
+            "keys_scanned": self.keys_scanned,
+            "elapsed_seconds": round(self.elapsed(), 3),
+            "state": self.state,
+        })
+        write_atomically(self.checkpoint_path, json.dumps(state).encode('utf-8'), prefix='.scan-')
+
+    def _load_checkpoint(self):
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return
+        with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if any(state.get(key) != value for key, value in self._checkpoint_identity().items()):
+            raise ValueError(f"Checkpoint '{self.checkpoint_path}' belongs to a different scan.")
+        self._next_lease = state["next_lease"]
+        self._completed_floor = state["completed_floor"]
+        self._completed = set(state["completed"])
+        # Leases that were open when the checkpoint was written resume from their last position
+        self._progress = {int(lease): next_key for lease, next_key in state["progress"].items()}
+        self._reissue.extend(sorted(self._progress))
+        self.matches = state["matches"]
+        self.keys_scanned = self._previous_keys = state["keys_scanned"]
+        self._previous_seconds = state["elapsed_seconds"]
+        if self._completed_floor >= self.lease_count or (self.stop_on_match and self.matches):
+            self.state = 'completed' if self._completed_floor >= self.lease_count else 'stopped'
+            self._done.set()
+
+    # --- Serving ---
+
+    def serve(self, host: str = '127.0.0.1', port: int = DEFAULT_SCAN_PORT) -> tuple:
+        """Starts the TCP server in a background thread. Returns the bound (host, port)."""
+        coordinator = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    try:
+                        reply = coordinator.handle(json.loads(line))
+                    except (ValueError, KeyError, TypeError) as e:
+                        reply = {"error": f"Invalid request: {e}"}
+                    self.wfile.write(json.dumps(reply).encode('utf-8') + b'\n')
+
+        class Server(socketserver.ThreadingTCPServer):
+            daemon_threads = True
+            allow_reuse_address = True
+
+        self._server = Server((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name='scan-coordinator', daemon=True).start()
+        return self._server.server_address
+
+    def wait(self, timeout: float = None) -> bool:
+        """Waits until every lease is completed (or a match stopped the scan)."""
+        return self._done.wait(timeout)
+
+    def stop(self):
+        with self._lock:
+            if self.state == 'running':
+                self.state = 'stopped'
+            self._save_checkpoint()
+        self._done.set()
+
+    def close(self):
+        with self._lock:
+            self._save_checkpoint()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def elapsed(self) -> float:
+        return self._previous_seconds + time.monotonic() - self._started_at
+
+    def status(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            completed = self._completed_floor + len(self._completed)
+            session_seconds = now - self._started_at
+            return {
+                "state": self.state,
+                "start": self.start,
+                "end": self.end,
+                "leases": self.lease_count,
+                "leases_completed": completed,
+                "leases_active": len(self._active),
+                "keys_scanned": self.keys_scanned,
+                "keys_per_second": round((self.keys_scanned - self._previous_keys) / session_seconds, 1)
+                                   if session_seconds > 0 else 0.0,
+                "progress": round(self.keys_scanned / (self.end - self.start), 6),
+                "elapsed_seconds": round(self.elapsed(), 3),
+                "workers_seen": len(self._workers),
+                "workers_active": sum(1 for seen in self._workers.values() if now - seen < self.lease_timeout),
+                "matches": list(self.matches),
+            }
+
+
+# --- Worker ---
+
+class _Connection:
+    """A blocking JSON-lines client connection to the coordinator."""
+
+    def __init__(self, host: str, port: int, timeout: float = 30.0):
+        self._socket = socket.create_connection((host, port), timeout=timeout)
+        self._reader = self._socket.makefile('rb')
+
+    def request(self, message: dict) -> dict:
+        self._socket.sendall(json.dumps(message).encode('utf-8') + b'\n')
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("The coordinator closed the connection.")
+        reply = json.loads(line)
+        if "error" in reply:
+            raise ValueError(f"Coordinator error: {reply['error']}")
+        return reply
+
+    def close(self):
+        self._reader.close()
+        self._socket.close()
+
+
+def run_worker(host: str, port: int = DEFAULT_SCAN_PORT, worker_id: str = None,
+               batch_size: int = DEFAULT_SCAN_BATCH_SIZE, max_leases: int = None) -> dict:
+    """
+    Takes leases from the coordinator until it reports the scan as done (or max_leases were
+    scanned). Returns {"worker", "leases", "keys", "matches"} for this worker.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+    connection = _Connection(host, port)
+    stats = {"worker": worker_id, "leases": 0, "keys": 0, "matches": 0}
+    try:
+        targets = {bytes.fromhex(hash160) for hash160 in connection.request({"op": "targets"})["hash160s"]}
+        while max_leases is None or stats["leases"] < max_leases:
+            reply = connection.request({"op": "lease", "worker": worker_id})
+            if reply.get("done"):
+                break
+            if "wait" in reply:
+                time.sleep(reply["wait"])
+                continue
+            lease = reply["lease"]
+            interval = reply["heartbeat_interval"]
+            last_beat = [time.monotonic()]
+            cancelled = [False]
+
+            def heartbeat(next_key):
+                if time.monotonic() - last_beat[0] < interval:
+                    return True
+                last_beat[0] = time.monotonic()
+                beat = connection.request({"op": "heartbeat", "worker": worker_id, "lease": lease["lease"],
+                                           "token": lease["token"], "next": next_key})
+                cancelled[0] = beat["cancel"]
+                return not cancelled[0]
+
+            matches = scan_range(lease["start"], lease["end"], targets, batch_size, on_batch=heartbeat)
+            for private_key, hash160 in matches:
+                connection.request({"op": "match", "worker": worker_id, "lease": lease["lease"],
+                                    "private_key_hex": format(private_key, '064x'), "hash160_hex": hash160.hex()})
+            stats["matches"] += len(matches)
+            if cancelled[0]:
+                continue
+            connection.request({"op": "complete", "worker": worker_id, "lease": lease["lease"], "token": lease["token"]})
+            stats["leases"] += 1
+            stats["keys"] += lease["end"] - lease["start"]
+    finally:
+        connection.close()
+    return stats
+
+
+def _worker_process_main(host, port, batch_size):
+    try:
+        run_worker(host, port, batch_size=batch_size)
+    except (ConnectionError, OSError):
+        pass # Coordinator gone: nothing left to do
+
+
+def run_worker_processes(host: str, port: int = DEFAULT_SCAN_PORT, processes: int = None,
+                         batch_size: int = DEFAULT_SCAN_BATCH_SIZE) -> int:
+    """Runs one worker per process (default: one per core) and waits for all of them."""
+    processes = max(1, processes or os.cpu_count() or 1)
+    context = multiprocessing.get_context('spawn')
+    workers = [context.Process(target=_worker_process_main, args=(host, port, batch_size), daemon=True)
+               for _ in range(processes)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+    return processes
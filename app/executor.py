@@ -0,0 +1,168 @@
+# app/executor.py
+#
+# Request-level offload of CPU-heavy pipeline calls. With a threaded WSGI server every
+# derivation executed on a request thread holds the GIL, so concurrent requests serialise
+# and tail latency grows with load. CryptoExecutor sends those calls to a shared process
+# pool instead; request threads just wait on the result (I/O-like) and stay responsive.
+
+import asyncio
+import functools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+
+DEFAULT_EXECUTOR_WORKERS = 0 # 0 = run inline on the request thread (previous behaviour)
+DEFAULT_EXECUTOR_TIMEOUT = 30.0 # Seconds per call
+PENDING_CALLS_PER_WORKER = 4 # Default bound on submitted but unfinished calls
+
+
+class ExecutorTimeout(Exception):
+    """Raised when an offloaded call does not finish within its timeout."""
+
+
+class ExecutorBusy(ExecutorTimeout):
+    """
+    Raised, without submitting, while max_pending calls are still unfinished. A subclass of
+    ExecutorTimeout so the routes answer it the same way.
+    """
+
+
+class CryptoExecutor:
+    """
+    Runs callables on a shared process pool with a per-call timeout.
+    With max_workers=0 calls run inline, which keeps tests and small deployments simple.
+    The pool is created lazily on the first call.
+
+    A timeout only stops the wait: a call that is already running on a worker cannot be
+    cancelled and keeps its process until it finishes. So that repeated timeouts cannot queue
+    up unbounded work behind such calls, at most max_pending calls (default
+    PENDING_CALLS_PER_WORKER per worker) may be unfinished at once; further calls raise
+    ExecutorBusy immediately.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_EXECUTOR_WORKERS, timeout: float = DEFAULT_EXECUTOR_TIMEOUT,
+                 mp_context=None, max_pending: int = None):
+        if max_workers < 0:
+            raise ValueError("max_workers must be non-negative.")
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_pending = max_pending if max_pending is not None else max_workers * PENDING_CALLS_PER_WORKER
+        self._pending = 0
+        self._pending_lock = threading.Lock() # Separate: done callbacks can run inside shutdown()
+        # 'spawn' because the pool is created from a threaded server process
+        self._mp = mp_context or multiprocessing.get_context('spawn')
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @property
+    def offloading(self) -> bool:
+        return self.max_workers > 0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self._mp)
+        return self._pool
+
+    def _submit(self, fn, *args, **kwargs):
+        with self._pending_lock:
+            if self._pending >= self.max_pending:
+                raise ExecutorBusy(f"{self._pending} offloaded calls are still running; try again later.")
+            self._pending += 1
+        try:
+            future = self._get_pool().submit(fn, *args, **kwargs)
+        except BaseException:
+            self._call_done(None)
+            raise
+        future.add_done_callback(self._call_done)
+        return future
+
+    def _call_done(self, future):
+        with self._pending_lock:
+            self._pending -= 1
+
+    def call(self, fn, *args, timeout: float = None, **kwargs):
+        """
+        Runs fn(*args, **kwargs) and returns its result. fn and its arguments must be picklable
+        (module-level functions) when offloading. Exceptions raised by fn propagate unchanged.
+        Raises ExecutorTimeout if the call takes longer than `timeout` (default: self.timeout);
+        the worker finishes the abandoned call in the background, and it counts against
+        max_pending until then. Raises ExecutorBusy when max_pending calls are unfinished.
+        """
+        if not self.offloading:
+            return fn(*args, **kwargs)
+        future = self._submit(fn, *args, **kwargs)
+        try:
+            return future.result(timeout=timeout if timeout is not None else self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise ExecutorTimeout(f"{getattr(fn, '__name__', 'call')} did not finish within the timeout.")
+
+    async def call_async(self, fn, *args, timeout: float = None, **kwargs):
+        """
+        asyncio counterpart of call() for the ASGI front end: the event loop awaits the
+        result instead of blocking. Inline executors use the loop's default thread pool so
+        the loop itself never runs the CPU-bound work.
+        """
+        loop = asyncio.get_running_loop()
+        if self.offloading:
+            future = asyncio.wrap_future(self._submit(fn, *args, **kwargs))
+        else:
+            future = loop.run_in_executor(None, functools.partial(fn, *args, **kwargs))
+        try:
+            return await asyncio.wait_for(future, timeout if timeout is not None else self.timeout)
+        except asyncio.TimeoutError:
+            raise ExecutorTimeout(f"{getattr(fn, '__name__', 'call')} did not finish within the timeout.")
+
+    def warm_up(self, fn, *args) -> list:
+        """
+        Starts every pool worker and runs fn(*args) on them: max_workers calls are submitted
+        at once, so the pool spawns all its processes, and a call that takes a moment (such as
+        run_warmup) lands on each of them. Inline executors run fn once. Returns the results;
+        no timeout applies.
+        """
+        if not self.offloading:
+            return [fn(*args)]
+        pool = self._get_pool()
+        futures = [pool.submit(fn, *args) for _ in range(self.max_workers)]
+        return [future.result() for future in futures]
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+
+
+def executor_config_from_env() -> dict:
+    """
+    EXECUTOR_WORKERS and EXECUTOR_TIMEOUT from BASE40_EXECUTOR_WORKERS / BASE40_EXECUTOR_TIMEOUT,
+    falling back to the module defaults. The single place these variables are read.
+    """
+    return {
+        'EXECUTOR_WORKERS': int(os.environ.get('BASE40_EXECUTOR_WORKERS', DEFAULT_EXECUTOR_WORKERS)),
+        'EXECUTOR_TIMEOUT': float(os.environ.get('BASE40_EXECUTOR_TIMEOUT', DEFAULT_EXECUTOR_TIMEOUT)),
+    }
+
+
+_executor_lock = threading.Lock()
+
+
+def get_crypto_executor(app) -> CryptoExecutor:
+    """
+    Returns the app's shared executor, created on first use from EXECUTOR_WORKERS and
+    EXECUTOR_TIMEOUT (create_app fills both in from executor_config_from_env).
+    """
+    executor = app.extensions.get('base40_executor')
+    if executor is None:
+        with _executor_lock:
+            executor = app.extensions.get('base40_executor')
+            if executor is None:
+                settings = executor_config_from_env()
+                settings.update((key, app.config[key]) for key in settings if key in app.config)
+                executor = CryptoExecutor(max_workers=settings['EXECUTOR_WORKERS'],
+                                          timeout=settings['EXECUTOR_TIMEOUT'])
+                app.extensions['base40_executor'] = executor
+    return executor
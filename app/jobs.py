@@ -0,0 +1,294 @@
+# app/jobs.py
+#
+# Asynchronous bulk jobs on top of the keypair pipeline. Jobs wait in a bounded in-process
+# queue and are executed chunk by chunk on a process pool, so long-running bulk work never
+# holds the GIL of the request threads serving the interactive endpoints.
+
+import atexit
+import json
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+from app.bulk import generate_chunk
+from app.crypto.addresses import check_public_key_bytes
+from app.crypto.keys import public_key_from_bytes
+from app.pipeline import (
+    build_keypair_bundle, build_address_records, parse_private_key, segwit_address_fields_many
+)
+
+JOB_TYPES = ('generate', 'derive', 'address')
+
+DEFAULT_JOB_WORKERS = 2 # Processes shared by all jobs
+DEFAULT_JOB_QUEUE_SIZE = 8 # Jobs waiting to run; further submissions are rejected
+DEFAULT_JOB_MAX_ITEMS = 100000 # Largest accepted job
+DEFAULT_JOB_CHUNK_SIZE = 64
+MAX_TRACKED_JOBS = 64 # Finished jobs (and their result files) kept for polling and download
+
+
+class JobQueueFull(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+def _derive_chunk(private_keys: list, include_steps: bool, segwit: bool = False) -> list:
+    # Keys are parsed like /api/derive's: hex (optional 0x) or Base40
+    records = []
+    for private_key_text in private_keys:
+        try:
+            private_key_int = parse_private_key(private_key_text)
+            records.append(build_keypair_bundle(private_key_int, include_steps=include_steps, segwit=segwit))
+        except (TypeError, ValueError) as ve:
+            records.append({"private_key_hex": private_key_text, "error": str(ve)})
+    return records
+
+
+def _address_chunk(public_keys: list, segwit: bool = False) -> list:
+    # The valid keys are hashed, and their SegWit fields computed, in one batch each
+    # (see app/address_stream.py)
+    records = []
+    valid_records, valid_keys, points = [], [], []
+    for public_key_hex in public_keys:
+        try:
+            public_key_bytes = bytes.fromhex(public_key_hex)
+            check_public_key_bytes(public_key_bytes)
+            point = public_key_from_bytes(public_key_bytes) if segwit else None
+        except (TypeError, ValueError) as ve:
+            records.append({"public_key_hex": public_key_hex, "error": str(ve)})
+            continue
+        record = {}
+        records.append(record)
+        valid_records.append(record)
+        valid_keys.append(public_key_bytes)
+        if segwit:
+            points.append(point)
+    for record, fields in zip(valid_records, build_address_records(valid_keys)):
+        record.update(fields)
+    if points:
+        for record, fields in zip(valid_records, segwit_address_fields_many(points)):
+            record.update(fields)
+    return records
+
+
+class Job:
+    """A submitted bulk job and its progress counters."""
+
+    def __init__(self, job_type: str, params: dict, total: int, result_path: str):
+        self.id = uuid.uuid4().hex
+        self.type = job_type
+        self.params = params
+        self.total = total
+        self.done = 0
+        self.state = 'queued' # queued -> running -> completed | failed | cancelled
+        self.error = None
+        self.result_path = result_path
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_requested = False
+
+    def chunks(self, chunk_size: int):
+        """Yields (task_function, args) pairs that together cover the whole job."""
+        include_steps = self.params.get('include_steps', False)
+        segwit = self.params.get('segwit', False)
+        if self.type == 'generate':
+            for start in range(0, self.total, chunk_size):
+                yield generate_chunk, (list(range(start, min(start + chunk_size, self.total))), include_steps, segwit)
+        elif self.type == 'derive':
+            keys = self.params['private_keys']
+            for start in range(0, self.total, chunk_size):
+                yield _derive_chunk, (keys[start:start + chunk_size], include_steps, segwit)
+        else:
+            keys = self.params['public_keys']
+            for start in range(0, self.total, chunk_size):
+                yield _address_chunk, (keys[start:start + chunk_size], segwit)
+
+    def status(self) -> dict:
+        if self.started_at is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+        return {
+            "job_id": self.id,
+            "type": self.type,
+            "state": self.state,
+            "total": self.total,
+            "done": self.done,
+            "progress": round(self.done / self.total, 4) if self.total else 1.0,
+            "elapsed_seconds": round(elapsed, 3),
+            "items_per_second": round(self.done / elapsed, 1) if elapsed > 0 else 0.0,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """
+    Owns the job queue, the runner thread and the process pool.
+
+    Admission control: at most `queue_size` jobs may wait, and each job may contain at most
+    `max_items` items; submit() raises JobQueueFull or ValueError otherwise. A cancelled job
+    stops counting against `queue_size` at once. Jobs run one at a time, with up to
+    2 * workers chunks in flight on the process pool.
+
+    shutdown() runs at interpreter exit unless it was called before.
+    """
+
+    def __init__(self, workers: int = DEFAULT_JOB_WORKERS, queue_size: int = DEFAULT_JOB_QUEUE_SIZE,
+                 max_items: int = DEFAULT_JOB_MAX_ITEMS, chunk_size: int = DEFAULT_JOB_CHUNK_SIZE,
+                 result_dir: str = None, mp_context=None):
+        self.workers = max(1, workers)
+        self.max_items = max_items
+        self.chunk_size = chunk_size
+        self._owns_result_dir = result_dir is None
+        self.result_dir = result_dir or tempfile.mkdtemp(prefix='base40-jobs-')
+        os.makedirs(self.result_dir, exist_ok=True)
+        # 'spawn' because the pool is created from a threaded server process
+        self._mp = mp_context or multiprocessing.get_context('spawn')
+
+        self.queue_size = queue_size
+        # Unbounded: admission is counted on the jobs still 'queued', so cancelled jobs left in
+        # the queue take no slot (the runner drops them) and the shutdown sentinel always fits
+        self._queue = queue.Queue()
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = None
+        self._closed = False
+        self._runner = threading.Thread(target=self._run, name='base40-job-runner', daemon=True)
+        self._runner.start()
+        atexit.register(self.shutdown)
+
+    # --- Submission and lookup ---
+
+    def submit(self, job_type: str, params: dict) -> Job:
+        """Validates and enqueues a job. Returns the Job."""
+        if self._closed:
+            raise RuntimeError("The job manager has been shut down.")
+        if job_type not in JOB_TYPES:
+            raise ValueError(f"Unknown job type '{job_type}'. Expected one of: {', '.join(JOB_TYPES)}.")
+
+        params = dict(params or {})
+        if job_type == 'generate':
+            total = params.get('count')
+            if not isinstance(total, int) or isinstance(total, bool) or total < 1:
+                raise ValueError("'count' must be a positive integer.")
+        else:
+            field = 'private_keys' if job_type == 'derive' else 'public_keys'
+            items = params.get(field)
+            if not isinstance(items, list) or not items or not all(isinstance(item, str) for item in items):
+                raise ValueError(f"'{field}' must be a non-empty list of strings.")
+            total = len(items)
+        if total > self.max_items:
+            raise ValueError(f"Job has {total} items; the maximum is {self.max_items}.")
+        params['include_steps'] = bool(params.get('include_steps', False))
+        params['segwit'] = bool(params.get('segwit', False)) # SegWit address fields are opt-in for bulk work
+
+        job = Job(job_type, params, total, None)
+        job.result_path = os.path.join(self.result_dir, f"{job.id}.ndjson")
+        with self._lock:
+            if sum(1 for queued in self._jobs.values() if queued.state == 'queued') >= self.queue_size:
+                raise JobQueueFull("The job queue is full, try again later.")
+            self._jobs[job.id] = job
+            self._queue.put_nowait(job)
+            self._evict_finished_jobs()
+        return job
+
+    def get(self, job_id: str):
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str):
+        """Requests cancellation. Queued jobs never start; running jobs stop after the current chunk."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.state in ('queued', 'running'):
+                job.cancel_requested = True
+                if job.state == 'queued': # Frees its queue slot; the runner skips it
+                    job.state = 'cancelled'
+                    job.finished_at = time.time()
+        return job
+
+    def stats(self) -> dict:
+        with self._lock:
+            states = [job.state for job in self._jobs.values()]
+        return {
+            "workers": self.workers,
+            "queued": states.count('queued'),
+            "running": states.count('running'),
+            "queue_capacity": self.queue_size,
+        }
+
+    def _evict_finished_jobs(self):
+        finished = [job for job in self._jobs.values() if job.state in ('completed', 'failed', 'cancelled')]
+        for job in finished[:max(0, len(self._jobs) - MAX_TRACKED_JOBS)]:
+            del self._jobs[job.id]
+            if os.path.exists(job.result_path):
+                os.remove(job.result_path)
+
+    # --- Execution ---
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=self._mp)
+        return self._executor
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None: # Shutdown sentinel
+                return
+            with self._lock: # Claims the job, unless cancel() got to it first
+                if job.state != 'queued':
+                    continue
+                job.state = 'running'
+            try:
+                self._execute(job)
+            except Exception as e:
+                job.state = 'failed'
+                job.error = str(e)
+                job.finished_at = time.time()
+
+    def _execute(self, job: Job):
+        job.started_at = time.time()
+        executor = self._get_executor()
+        max_in_flight = self.workers * 2
+        pending = deque()
+
+        with open(job.result_path, 'w', encoding='utf-8') as out:
+            def write(records):
+                out.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+                job.done += len(records)
+
+            for task, args in job.chunks(self.chunk_size):
+                if job.cancel_requested:
+                    break
+                pending.append(executor.submit(task, *args))
+                if len(pending) >= max_in_flight:
+                    write(pending.popleft().result())
+            while pending:
+                future = pending.popleft()
+                if job.cancel_requested:
+                    future.cancel()
+                    continue
+                write(future.result())
+
+        job.state = 'cancelled' if job.cancel_requested else 'completed'
+        job.finished_at = time.time()
+
+    def shutdown(self):
+        """Stops the runner thread and the process pool, and removes a temporary result directory."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        atexit.unregister(self.shutdown)
+        self._queue.put(None)
+        self._runner.join(timeout=5)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        if self._owns_result_dir:
+            shutil.rmtree(self.result_dir, ignore_errors=True)
@@ -0,0 +1,156 @@
+# app/keypool.py
+#
+# Optional pool of ready-made keypair bundles. Background producer threads keep up to `size`
+# bundles built by the regular pipeline, so `/` and /api/generate_keypair_detailed pop one in
+# O(1) instead of paying the full derivation on the request path. When the pool is empty the
+# request falls back to deriving synchronously and the miss is counted.
+#
+# Each bundle is handed out exactly once (it contains a private key).
+# Enable with BASE40_KEYPOOL_SIZE=N (KEYPOOL_SIZE); producers: BASE40_KEYPOOL_WORKERS (KEYPOOL_WORKERS).
+#
+# Producers only run in parallel when the shared executor has process workers
+# (BASE40_EXECUTOR_WORKERS > 0). With the inline executor every producer derives in this
+# process and holds the GIL while it does, so extra producers only slow the request threads
+# down; the pool then runs a single producer, whatever KEYPOOL_WORKERS says.
+
+import threading
+import time
+from collections import deque
+
+from app.core_logic.base40 import DEFAULT_SYMBOLS
+from app.pipeline import generate_keypair_bundle
+
+DEFAULT_KEYPOOL_WORKERS = 1
+
+
+class KeypairPool:
+    """A bounded, thread-safe pool of bundles refilled by `workers` producer threads."""
+
+    def __init__(self, produce, size: int, workers: int = DEFAULT_KEYPOOL_WORKERS, logger=None):
+        if size < 1 or workers < 1:
+            raise ValueError("Keypair pool size and workers must be at least 1.")
+        self.produce = produce
+        self.size = size
+        self.workers = workers
+        self.logger = logger
+        self.hits = 0
+        self.misses = 0
+        self.produced = 0
+        self.errors = 0
+        self._bundles = deque()
+        self._in_progress = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        self._threads = []
+
+    def start(self):
+        if not self._threads:
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f'base40-keypool-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        return self
+
+    def _run(self):
+        while True:
+            with self._condition:
+                # Claim a free slot; bundles being built count as filled so workers never overshoot
+                while not self._closed and len(self._bundles) + self._in_progress >= self.size:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                self._in_progress += 1
+            bundle = None
+            try:
+                bundle = self.produce()
+            except Exception as e:
+                self.errors += 1
+                if self.logger:
+                    self.logger.error(f"Keypair pool producer failed: {e}", exc_info=True)
+                time.sleep(1.0) # Back off instead of spinning on a persistent failure
+            with self._condition:
+                self._in_progress -= 1
+                if bundle is not None:
+                    self._bundles.append(bundle)
+                    self.produced += 1
+                self._condition.notify_all()
+
+    def pop(self):
+        """Returns a ready bundle, or None (counted as a miss) when the pool is empty."""
+        with self._condition:
+            if self._bundles:
+                self.hits += 1
+                bundle = self._bundles.popleft()
+                self._condition.notify()
+                return bundle
+            self.misses += 1
+            return None
+
+    def wait_until_full(self, timeout: float = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while len(self._bundles) < self.size:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+    def stats(self) -> dict:
+        with self._condition:
+            available = len(self._bundles)
+        requests = self.hits + self.misses
+        return {
+            "size": self.size,
+            "available": available,
+            "workers": self.workers,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / requests, 4) if requests else None,
+            "produced": self.produced,
+            "errors": self.errors,
+        }
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._bundles.clear()
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=5)
+
+
+def create_keypair_pool(app):
+    """
+    Creates and starts the app's pool from KEYPOOL_SIZE / KEYPOOL_WORKERS (None when the size
+    is 0). Bundles are produced through the shared executor, like the synchronous path; with
+    the inline executor the pool is limited to one producer thread.
+    """
+    size = app.config.get('KEYPOOL_SIZE', 0)
+    if not size:
+        return None
+    from app.executor import get_crypto_executor
+    executor = get_crypto_executor(app)
+    workers = app.config.get('KEYPOOL_WORKERS', DEFAULT_KEYPOOL_WORKERS)
+    if not executor.offloading and workers > DEFAULT_KEYPOOL_WORKERS:
+        app.logger.warning(f"KEYPOOL_WORKERS={workers} needs EXECUTOR_WORKERS > 0 to run in parallel; "
+                           f"using {DEFAULT_KEYPOOL_WORKERS} producer.")
+        workers = DEFAULT_KEYPOOL_WORKERS
+    pool = KeypairPool(lambda: executor.call(generate_keypair_bundle, True, DEFAULT_SYMBOLS), size,
+                       workers=workers, logger=app.logger)
+    app.extensions['base40_keypool'] = pool
+    return pool.start()
+
+
+def next_keypair_bundle(app, curve: str = None) -> dict:
+    """
+    A fresh bundle with steps: from the pool when one is ready, otherwise derived now.
+    The pool only holds secp256k1 bundles; other curves (by name) are always derived now.
+    """
+    pool = app.extensions.get('base40_keypool')
+    if pool is not None and curve is None:
+        bundle = pool.pop()
+        if bundle is not None:
+            return bundle
+    from app.executor import get_crypto_executor
+    return get_crypto_executor(app).call(generate_keypair_bundle, True, DEFAULT_SYMBOLS, curve)
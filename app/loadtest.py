@@ -0,0 +1,292 @@
+# app/loadtest.py
+#
+# Load generator for the web app: C concurrent clients request a mix of endpoints for a fixed
+# duration, then throughput, latency percentiles and CPU usage are reported and optionally
+# saved as JSON, so runs can be compared between versions and deployment settings.
+#
+# Usage:
+#   python -m app.loadtest --concurrency 8 --duration 30                  (in-process, Flask test client)
+#   python -m app.loadtest --url http://127.0.0.1:5000 --server-pid 1234  (running server)
+#   python -m app.loadtest ... --out after.json --compare before.json
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import threading
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_ENDPOINTS = ['/api/generate_keypair_detailed', '/', '/export/json', '/export/csv']
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list (0.0 for an empty list)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize_latencies(latencies: list, errors: int, duration: float) -> dict:
+    ordered = sorted(latencies)
+    summary = {
+        "requests": len(ordered) + errors,
+        "errors": errors,
+        "throughput_rps": round(len(ordered) / duration, 2) if duration > 0 else 0.0,
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2) if ordered else 0.0,
+        "max_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+    }
+    for pct in PERCENTILES:
+        summary[f"p{pct}_ms"] = round(percentile(ordered, pct) * 1000, 2)
+    return summary
+
+
+def process_cpu_seconds(pid: int):
+    """User + system CPU seconds consumed so far by a process (Linux /proc), or None."""
+    if pid == os.getpid():
+        times = os.times()
+        return times.user + times.system
+    try:
+        with open(f'/proc/{pid}/stat', 'r') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# --- Clients ---
+
+class FlaskClientTarget:
+    """Sends requests through Flask's test client (one client per worker thread)."""
+
+    def __init__(self, app=None):
+        if app is None:
+            from app.main import create_app
+            app = create_app()
+        self.app = app
+        self.description = "flask-test-client"
+
+    def client(self):
+        test_client = self.app.test_client()
+
+        def request(path):
+            response = test_client.get(path)
+            response.get_data() # Consume the body, as a real client would
+            return response.status_code
+        return request
+
+    def server_pids(self) -> list:
+        # This process plus the executor pool workers, if offloading is enabled
+        pids = [os.getpid()]
+        executor = self.app.extensions.get('base40_executor')
+        pool = getattr(executor, '_pool', None)
+        if pool is not None:
+            pids.extend(getattr(pool, '_processes', {}).keys())
+        return pids
+
+
+class HttpTarget:
+    """Sends requests to a running server over HTTP/1.1 keep-alive connections."""
+
+    def __init__(self, url: str, timeout: float = 60.0):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError("--url must start with http:// or https://")
+        self.scheme, self.netloc, self.base_path = parts.scheme, parts.netloc, parts.path.rstrip('/')
+        self.timeout = timeout
+        self.description = url
+
+    def client(self):
+        connection_class = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        state = {"connection": None}
+
+        def request(path):
+            if state["connection"] is None:
+                state["connection"] = connection_class(self.netloc, timeout=self.timeout)
+            try:
+                state["connection"].request('GET', self.base_path + path)
+                response = state["connection"].getresponse()
+                response.read()
+                return response.status
+            except (OSError, http.client.HTTPException):
+                state["connection"].close()
+                state["connection"] = None
+                raise
+        return request
+
+    def server_pids(self) -> list:
+        return []
+
+
+# --- Runner ---
+
+def run_load_test(target, endpoints: list = None, concurrency: int = 4, duration: float = 10.0,
+                  warmup: float = 0.0, server_pids: list = None) -> dict:
+    """
+    Runs `concurrency` client threads against `target` for `duration` seconds. Each thread
+    cycles through `endpoints` (staggered, so every endpoint gets load from the start).
+    Requests made during the first `warmup` seconds are not recorded.
+    Returns the results dictionary (see save/compare helpers).
+    """
+    endpoints = list(endpoints or DEFAULT_ENDPOINTS)
+    if concurrency < 1 or duration <= 0:
+        raise ValueError("concurrency must be >= 1 and duration > 0.")
+    pids = sorted(set((server_pids or []) + target.server_pids()))
+
+    latencies = {endpoint: [] for endpoint in endpoints}
+    errors = {endpoint: 0 for endpoint in endpoints}
+    status_counts = {}
+    worker_cpu = [0.0] * concurrency
+    worker_requests = [0] * concurrency
+    lock = threading.Lock()
+    start_at = time.perf_counter() + warmup
+    stop_at = start_at + duration
+    cpu_before = {}
+    started = threading.Event()
+
+    def worker(worker_id):
+        request = target.client()
+        position = worker_id
+        measured_cpu_start = None
+        while True:
+            now = time.perf_counter()
+            if now >= stop_at:
+                break
+            if measured_cpu_start is None and now >= start_at:
+                measured_cpu_start = time.thread_time()
+            endpoint = endpoints[position % len(endpoints)]
+            position += 1
+            sent_at = time.perf_counter()
+            try:
+                status = request(endpoint)
+            except Exception:
+                status = None
+            elapsed = time.perf_counter() - sent_at
+            if sent_at < start_at:
+                continue # Warm-up request
+            with lock:
+                status_counts[str(status)] = status_counts.get(str(status), 0) + 1
+                if status is not None and status < 400:
+                    latencies[endpoint].append(elapsed)
+                else:
+                    errors[endpoint] += 1
+            worker_requests[worker_id] += 1
+        if measured_cpu_start is not None:
+            worker_cpu[worker_id] = time.thread_time() - measured_cpu_start
+
+    def snapshot_cpu():
+        started.wait()
+        time.sleep(max(0.0, start_at - time.perf_counter()))
+        for pid in pids:
+            cpu_before[pid] = process_cpu_seconds(pid)
+
+    threads = [threading.Thread(target=worker, args=(i,), name=f'loadtest-{i}', daemon=True)
+               for i in range(concurrency)]
+    cpu_thread = threading.Thread(target=snapshot_cpu, daemon=True)
+    cpu_thread.start()
+    for thread in threads:
+        thread.start()
+    started.set()
+    for thread in threads:
+        thread.join()
+    cpu_thread.join()
+    measured = max(time.perf_counter(), stop_at) - start_at
+
+    # Pool workers may only appear once the first request has been offloaded
+    pids = sorted(set(pids + target.server_pids()))
+    server_cpu = {}
+    for pid in pids:
+        after = process_cpu_seconds(pid)
+        before = cpu_before.get(pid) or 0.0
+        if after is not None:
+            server_cpu[str(pid)] = {"cpu_seconds": round(after - before, 3),
+                                    "cpu_utilisation": round((after - before) / measured, 3)}
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "meta": {
+            "target": target.description,
+            "endpoints": endpoints,
+            "concurrency": concurrency,
+            "duration_seconds": round(measured, 3),
+            "warmup_seconds": warmup,
+            "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "overall": summarize_latencies(all_latencies, sum(errors.values()), measured),
+        "endpoints": {endpoint: summarize_latencies(latencies[endpoint], errors[endpoint], measured)
+                      for endpoint in endpoints},
+        "status_codes": status_counts,
+        "client_workers": [{"worker": i, "requests": worker_requests[i], "cpu_seconds": round(worker_cpu[i], 3)}
+                           for i in range(concurrency)],
+        "server_processes": server_cpu,
+    }
+
+
+def compare_results(baseline: dict, current: dict) -> list:
+    """Returns (scope, metric, baseline, current, change %) rows for throughput and latency."""
+    rows = []
+    scopes = [('overall', baseline.get('overall', {}), current.get('overall', {}))]
+    for endpoint, summary in current.get('endpoints', {}).items():
+        if endpoint in baseline.get('endpoints', {}):
+            scopes.append((endpoint, baseline['endpoints'][endpoint], summary))
+    for scope, old, new in scopes:
+        for metric in ['throughput_rps'] + [f"p{pct}_ms" for pct in PERCENTILES]:
+            if metric in old and metric in new:
+                change = (new[metric] - old[metric]) / old[metric] * 100 if old[metric] else 0.0
+                rows.append((scope, metric, old[metric], new[metric], round(change, 1)))
+    return rows
+
+
+def format_report(results: dict) -> str:
+    lines = [f"target={results['meta']['target']} concurrency={results['meta']['concurrency']} "
+             f"duration={results['meta']['duration_seconds']}s"]
+    header = f"{'endpoint':<32} {'req':>7} {'err':>5} {'rps':>8} " + " ".join(f"{'p%d' % p:>9}" for p in PERCENTILES)
+    lines.append(header)
+    for name, summary in [('overall', results['overall'])] + list(results['endpoints'].items()):
+        lines.append(f"{name:<32} {summary['requests']:>7} {summary['errors']:>5} {summary['throughput_rps']:>8.1f} "
+                     + " ".join(f"{summary[f'p{p}_ms']:>7.1f}ms" for p in PERCENTILES))
+    for pid, usage in results['server_processes'].items():
+        lines.append(f"server pid {pid}: {usage['cpu_seconds']}s CPU ({usage['cpu_utilisation'] * 100:.0f}% of one core)")
+    client_cpu = sum(worker['cpu_seconds'] for worker in results['client_workers'])
+    lines.append(f"client threads: {client_cpu:.2f}s CPU in total")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the Base40 web app.")
+    parser.add_argument('--url', default=None,
+                        help="Base URL of a running server (default: in-process Flask test client).")
+    parser.add_argument('--endpoint', action='append', default=None,
+                        help=f"Endpoint to request (repeatable; default: {', '.join(DEFAULT_ENDPOINTS)}).")
+    parser.add_argument('--concurrency', type=int, default=4, help="Concurrent client threads.")
+    parser.add_argument('--duration', type=float, default=10.0, help="Measured seconds.")
+    parser.add_argument('--warmup', type=float, default=0.0, help="Unmeasured seconds before the run.")
+    parser.add_argument('--server-pid', type=int, action='append', default=None,
+                        help="Server (worker) process id to report CPU for (repeatable; Linux).")
+    parser.add_argument('--out', default=None, help="Write the results as JSON to this file.")
+    parser.add_argument('--compare', default=None, help="Results JSON of an earlier run to compare against.")
+    args = parser.parse_args(argv)
+
+    target = HttpTarget(args.url) if args.url else FlaskClientTarget()
+    results = run_load_test(target, args.endpoint, args.concurrency, args.duration, args.warmup, args.server_pid)
+    print(format_report(results))
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\ncompared with {args.compare}:")
+        for scope, metric, old, new, change in compare_results(baseline, results):
+            print(f"{scope:<32} {metric:<15} {old:>10} -> {new:<10} ({change:+.1f}%)")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,4 +1,4 @@
-from flask import Flask
+from flask import Flask, jsonify
 import sys
 import os
 
@@ -7,12 +7,46 @@ import os
 # or 'app' is in PYTHONPATH. For 'python app/main.py', current dir is 'app'.
 # For Flask CLI 'flask run', it usually auto-detects 'app' or 'wsgi.py'.
 
-def create_app():
+def _env_flag(name, default=False):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+def create_app(config=None):
+    # config: optional mapping of settings applied on top of the defaults below, e.g.
+    # create_app({"WARMUP_ENABLED": True}). Unset keys fall back to BASE40_* environment variables.
+    #
     # __name__ resolves to 'app.main' if main.py is in 'app' package.
     # Explicitly set template_folder and static_folder relative to the app's root path.
-    # app.root_path is the 'app' directory (e.g. /app/app) if main.py is app/main.py.
-    # Templates/static are in /app/templates and /app/static, so use ../
-    app = Flask(__name__, template_folder='../templates', static_folder='../static')
+    # app.root_path is the 'app' directory (e.g. /app/app) if main.py is app/main.py,
+    # and templates/static live inside it (app/templates, app/static).
+    app = Flask(__name__, template_folder='templates', static_folder='static')
+
+    # Warm-up (see app/warmup.py) and CPU offload for request handlers (see app/executor.py;
+    # 0 workers = run inline). The ASGI front end reads the same helpers.
+    from app.executor import executor_config_from_env
+    from app.warmup import warmup_config_from_env
+    for key, value in {**warmup_config_from_env(), **executor_config_from_env()}.items():
+        app.config.setdefault(key, value)
+    # Watch-list address index for /api/addresses/lookup (see app/address_index.py)
+    app.config.setdefault('ADDRESS_INDEX_PATH', os.environ.get('BASE40_ADDRESS_INDEX'))
+    # Optional SQLite persistence of generated keypairs (see app/storage.py)
+    app.config.setdefault('STORAGE_PATH', os.environ.get('BASE40_STORAGE_PATH'))
+    app.config.setdefault('STORAGE_STEPS', _env_flag('BASE40_STORAGE_STEPS'))
+    # Pool of pre-generated bundles for the interactive endpoints (see app/keypool.py); 0 = off
+    app.config.setdefault('KEYPOOL_SIZE', int(os.environ.get('BASE40_KEYPOOL_SIZE', 0)))
+    app.config.setdefault('KEYPOOL_WORKERS', int(os.environ.get('BASE40_KEYPOOL_WORKERS', 1)))
+    # Per-peer window tables for /api/ecdh (see app/crypto/ecdh.py)
+    app.config.setdefault('ECDH_CACHE_PEERS', int(os.environ.get('BASE40_ECDH_CACHE_PEERS', 256)))
+    app.config.setdefault('ECDH_CACHE_BYTES', int(os.environ.get('BASE40_ECDH_CACHE_BYTES', 32 * 1024 * 1024)))
+    app.config.setdefault('ECDH_WINDOW_BITS', int(os.environ.get('BASE40_ECDH_WINDOW_BITS', 6)))
+    app.config.setdefault('ECDH_BUILD_AFTER', int(os.environ.get('BASE40_ECDH_BUILD_AFTER', 2)))
+    # Opt-in cache of public keys and traces for /api/derive (see app/derive_cache.py); 0 = off
+    app.config.setdefault('DERIVE_CACHE_SIZE', int(os.environ.get('BASE40_DERIVE_CACHE_SIZE', 0)))
+    app.config.setdefault('DERIVE_CACHE_TTL', float(os.environ.get('BASE40_DERIVE_CACHE_TTL', 300)))
+    if config:
+        app.config.update(config)
 
     # Ensure instance folder exists (if needed for SQLite etc., not currently used)
     try:
@@ -30,9 +64,37 @@ def create_app():
     from app.ui_routes import ui_bp
     app.register_blueprint(ui_bp, url_prefix='/') # UI will be at the root
 
+    from app.keypool import create_keypair_pool
+    keypool = create_keypair_pool(app)
+
+    from app.derive_cache import create_derivation_cache
+    create_derivation_cache(app)
+
     @app.route('/status')
     def status():
-        return "Base40 Cryptographic Suite Backend (and UI) is running!"
+        from app.crypto.field_backend import get_backend
+        body = {
+            "status": "Base40 Cryptographic Suite Backend (and UI) is running!",
+            "field_backend": get_backend().name
+        }
+        if keypool is not None:
+            body["keypair_pool"] = keypool.stats()
+        store = app.extensions.get('base40_storage')
+        if store is not None:
+            body["storage"] = store.stats()
+        return jsonify(body)
+
+    # Readiness (as opposed to liveness above): 503 until the optional warm-up has finished,
+    # so a load balancer only routes traffic to warm workers.
+    from app.warmup import WarmupState
+    from app.executor import get_crypto_executor
+    warmup = WarmupState(app.config['WARMUP_ENABLED'], app.config['WARMUP_DERIVATIONS'], logger=app.logger,
+                         executor=get_crypto_executor(app))
+    app.extensions['base40_warmup'] = warmup.start()
+
+    @app.route('/ready')
+    def ready():
+        return jsonify(warmup.status()), (200 if warmup.ready else 503)
 
     return app
 
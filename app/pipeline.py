@@ -0,0 +1,216 @@
+# app/pipeline.py
+#
+# The keypair pipeline shared by the API, the UI and the offline tools:
+# private key -> public key (+ optional scalar multiplication trace) -> Base40 / hash160 / addresses.
+
+import string
+
+from app.crypto.keys import generate_private_key_int, derive_public_key, public_key_to_bytes, public_key_from_bytes
+from app.crypto.curves import DEFAULT_CURVE, get_curve
+from app.crypto.addresses import hash_public_key_bytes, ripemd160_to_base40, base58check_encode_bitcoin
+from app.crypto.hash160 import hash160_many
+from app.crypto.segwit import p2wpkh_address, p2tr_address, p2wpkh_addresses, p2tr_addresses
+from app.core_logic.base40 import decimal_to_base40, base40_to_decimal, DEFAULT_SYMBOLS
+
+BASE40_ADDRESS_LENGTH = 31
+
+# Bundle fields in output order (scalar_multiplication_steps is only present when requested;
+# "curve" is added for curves other than secp256k1, which have no Bitcoin addresses)
+BUNDLE_FIELDS = [
+    "private_key_hex",
+    "private_key_base40",
+    "public_key_uncompressed_hex",
+    "public_key_x_base40",
+    "hashed_public_key_ripemd160_hex",
+    "address_base40",
+    "address_bitcoin_base58check",
+    "address_p2wpkh",
+    "address_p2tr",
+]
+# Only in bundles built with segwit=True (the default for single keypairs)
+SEGWIT_FIELDS = ["address_p2wpkh", "address_p2tr"]
+
+
+def build_keypair_bundle(private_key_int: int, include_steps: bool = True, symbols: list = DEFAULT_SYMBOLS,
+                         curve=None, derivation: tuple = None, segwit: bool = True) -> dict:
+    """
+    Runs the full pipeline for one private key.
+    Args:
+        private_key_int: The private key as an integer in [1, N-1].
+        include_steps: Whether to record the 256 scalar multiplication steps. Without them
+                       the public key is derived with the much faster scalar_multiply.
+        symbols: Base40 symbols list.
+        curve: Curve selector (see app/crypto/curves.py); default secp256k1. The hash160 is
+               computed from the SEC encoding on every curve, but the addresses (Base40,
+               Base58Check, SegWit) are Bitcoin's and only added on secp256k1.
+        derivation: Optional (public_key_hex, steps) already derived for this key and curve
+                    (e.g. from app/derive_cache.py); skips the traced multiplication.
+        segwit: Whether to add the SegWit address fields (secp256k1 only). The P2TR tweak
+                costs another fixed-base multiplication, so the bulk paths turn it off.
+    Returns:
+        The keypair bundle dictionary (see BUNDLE_FIELDS, plus "scalar_multiplication_steps"
+        when include_steps is True). The address fields are only present on secp256k1, and
+        the SegWit ones only with segwit=True.
+    Raises:
+        ValueError: If the private key is out of range.
+    """
+    curve = get_curve(curve)
+    public_key = _derive_public_key(private_key_int, include_steps, curve, derivation)
+    segwit_fields = segwit_address_fields(public_key[0]) if segwit and curve.name == DEFAULT_CURVE else None
+    return _assemble_bundle(private_key_int, public_key, hash_public_key_bytes(public_key[1]), symbols, curve,
+                            segwit_fields)
+
+
+def build_keypair_bundles(private_keys: list, include_steps: bool = False, symbols: list = DEFAULT_SYMBOLS,
+                          segwit: bool = False) -> list:
+    """
+    build_keypair_bundle for a batch of secp256k1 private keys, with the public keys hashed
+    by a single hash160_many call and, with segwit, one segwit_address_fields_many call.
+    Raises ValueError if any key is out of range.
+    """
+    curve = get_curve(None)
+    public_keys = [_derive_public_key(private_key_int, include_steps, curve) for private_key_int in private_keys]
+    hashes = hash160_many([public_key[1] for public_key in public_keys])
+    if segwit:
+        segwit_fields = segwit_address_fields_many([public_key[0] for public_key in public_keys])
+    else:
+        segwit_fields = [None] * len(public_keys)
+    return [_assemble_bundle(private_key_int, public_key, hash160_bytes, symbols, curve, fields)
+            for private_key_int, public_key, hash160_bytes, fields
+            in zip(private_keys, public_keys, hashes, segwit_fields)]
+
+
+def _derive_public_key(private_key_int: int, include_steps: bool, curve, derivation: tuple = None) -> tuple:
+    """Step 1 of the pipeline: (point, SEC bytes, hex, steps or None) of the public key."""
+    if not (1 <= private_key_int < curve.n):
+        raise ValueError(f"Private key integer value is out of the valid range [1, N-1]. Got {private_key_int}")
+    # The detailed trace only when it will be used
+    if include_steps:
+        if derivation is None:
+            derivation = derive_public_key(format(private_key_int, '064x'), curve)
+        public_key_hex, steps = derivation
+        public_key_bytes = bytes.fromhex(public_key_hex)
+        public_key_point = (int.from_bytes(public_key_bytes[1:33], 'big'), int.from_bytes(public_key_bytes[33:], 'big'))
+        return public_key_point, public_key_bytes, public_key_hex, steps
+    public_key_point = curve.multiply_generator(private_key_int)
+    public_key_bytes = public_key_to_bytes(public_key_point)
+    return public_key_point, public_key_bytes, public_key_bytes.hex(), None
+
+
+def _assemble_bundle(private_key_int: int, public_key: tuple, hash160_bytes: bytes, symbols: list, curve,
+                     segwit_fields: dict = None) -> dict:
+    _, public_key_bytes, public_key_hex, steps = public_key
+    # 2. Base40 renderings of the private key and the public key's X coordinate
+    bundle = {
+        "private_key_hex": format(private_key_int, '064x'),
+        "private_key_base40": decimal_to_base40(private_key_int, symbols),
+        "public_key_uncompressed_hex": public_key_hex,
+        "public_key_x_base40": decimal_to_base40(int.from_bytes(public_key_bytes[1:33], 'big'), symbols),
+    }
+    # 3. Hash160 and, on secp256k1, the derived addresses (31-symbol Base40, Base58Check
+    #    mainnet P2PKH, optionally SegWit)
+    if curve.name != DEFAULT_CURVE:
+        bundle["hashed_public_key_ripemd160_hex"] = hash160_bytes.hex()
+        bundle["curve"] = curve.name
+    else:
+        bundle.update(address_fields(hash160_bytes, symbols))
+        if segwit_fields:
+            bundle.update(segwit_fields)
+    if steps is not None:
+        bundle["scalar_multiplication_steps"] = steps
+    return bundle
+
+
+def generate_keypair_bundle(include_steps: bool = True, symbols: list = DEFAULT_SYMBOLS, curve=None) -> dict:
+    """Generates a fresh random private key and runs it through build_keypair_bundle."""
+    return build_keypair_bundle(generate_private_key_int(curve), include_steps=include_steps, symbols=symbols,
+                                curve=curve)
+
+
+def segwit_address_fields(public_key_point: tuple) -> dict:
+    """
+    Mainnet SegWit addresses of a secp256k1 public key: P2WPKH (bech32, hash160 of the
+    compressed key, so it differs from hashed_public_key_ripemd160_hex for uncompressed keys)
+    and key-path P2TR (bech32m, tweaked x-only key). See app/crypto/segwit.py.
+    """
+    return {
+        "address_p2wpkh": p2wpkh_address(public_key_point),
+        "address_p2tr": p2tr_address(public_key_point),
+    }
+
+
+def segwit_address_fields_many(public_key_points: list) -> list:
+    """segwit_address_fields for a batch, with one shared inversion for all the P2TR keys."""
+    return [{"address_p2wpkh": p2wpkh, "address_p2tr": p2tr}
+            for p2wpkh, p2tr in zip(p2wpkh_addresses(public_key_points), p2tr_addresses(public_key_points))]
+
+
+def parse_private_key(text: str, symbols: list = DEFAULT_SYMBOLS) -> int:
+    """
+    Parses a private key given as hex (up to 64 digits, optional 0x prefix) or as a Base40
+    string (private_key_base40). The two alphabets do not overlap. The range is checked by
+    build_keypair_bundle.
+    """
+    text = text.strip()
+    if text and all(symbol in symbols for symbol in text):
+        return base40_to_decimal(text, symbols)
+    digits = text[2:] if text.lower().startswith('0x') else text
+    if not (1 <= len(digits) <= 64):
+        raise ValueError("Private key must be up to 64 hex digits or a Base40 string.")
+    if any(char not in string.hexdigits for char in digits):
+        raise ValueError("Private key is neither valid hexadecimal nor Base40.")
+    return int(digits, 16)
+
+
+def address_fields(hash160_bytes: bytes, symbols: list = DEFAULT_SYMBOLS) -> dict:
+    """The hash160 and its addresses: 31-symbol Base40 and Base58Check mainnet P2PKH."""
+    return {
+        "hashed_public_key_ripemd160_hex": hash160_bytes.hex(),
+        "address_base40": ripemd160_to_base40(hash160_bytes, target_length=BASE40_ADDRESS_LENGTH, symbols=symbols),
+        "address_bitcoin_base58check": base58check_encode_bitcoin(hash160_bytes, version_byte=0x00),
+    }
+
+
+def build_address_record(public_key_bytes: bytes, symbols: list = DEFAULT_SYMBOLS, segwit: bool = False) -> dict:
+    """
+    Runs the address half of the pipeline for an existing SEC-encoded public key
+    (65-byte uncompressed or 33-byte compressed). segwit=True adds the SegWit address fields;
+    batches should use build_address_records and segwit_address_fields_many instead.
+    Raises:
+        ValueError: If the key is malformed, or (with segwit) not a point on secp256k1.
+    """
+    record = {"public_key_hex": public_key_bytes.hex()}
+    record.update(address_fields(hash_public_key_bytes(public_key_bytes), symbols))
+    if segwit:
+        record.update(segwit_address_fields(public_key_from_bytes(public_key_bytes)))
+    return record
+
+
+def build_address_records(public_keys: list, symbols: list = DEFAULT_SYMBOLS) -> list:
+    """
+    build_address_record (without SegWit) for a batch of keys already checked with
+    check_public_key_bytes, hashed with a single hash160_many call.
+    """
+    return [{"public_key_hex": public_key_bytes.hex(), **address_fields(hash160_bytes, symbols)}
+            for public_key_bytes, hash160_bytes in zip(public_keys, hash160_many(public_keys))]
+
+
+# Columns of the scalar multiplication steps CSV export
+STEPS_CSV_HEADERS = ['Step', 'Bit', 'Operation', 'Point_X_Hex', 'Point_Y_Hex', 'Base40_Angle', 'Base40_Symbol', 'Rodopios']
+
+
+def steps_to_csv_rows(steps: list) -> list:
+    """Flattens scalar multiplication steps into rows matching STEPS_CSV_HEADERS."""
+    rows = []
+    for step in steps:
+        point_hex = step.get('point_value_hex') or {}
+        infinity = 'Infinity' if step.get('point_value') is None else ''
+        rows.append([
+            step.get('step_number', ''), step.get('bit_value', ''), step.get('operation', ''),
+            point_hex.get('x', infinity),
+            point_hex.get('y', infinity),
+            step.get('base40_angle') if step.get('base40_angle') is not None else '',
+            step.get('base40_symbol') or '',
+            step.get('rodopios') if step.get('rodopios') is not None else ''
+        ])
+    return rows
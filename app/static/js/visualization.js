@@ -1,35 +1,60 @@
 // app/static/js/visualization.js
-// This script expects `animationSymbolList` to be available globally or passed to init function.
-// It also expects `DEFAULT_SYMBOLS_FOR_JS` to be available for mapping symbols to IDs.
+// Animates the Base40 circle from the payload built by encode_animation_frames (app/ui_utils.py):
+// `animationFrames` = {count, indices, rodopios}, where indices (spoke 0-39 per frame) and
+// rodopios (spoke delta from the previous frame) are base64-encoded Uint8Arrays.
+// It also expects `DEFAULT_SYMBOLS_FOR_JS` for the symbol shown in the centre.
+//
+// The line/text/dot elements of the 40 spokes are looked up once and cached. Each frame only
+// touches the spoke it leaves and the spoke it enters; frames with a rodopios delta of 0 change
+// nothing and are skipped. Frames run on requestAnimationFrame, and when a tick arrives late
+// the frames it missed are folded into a single update, so long animations do not fall behind.
 
-let animationTimeoutId = null;
+let animationFrameId = null;
 const baseHighlightColor = "#FFFF00"; // Yellow
 const defaultLineColor = "#00FF00";  // Green
 const defaultTextColor = "#00FF00"; // Green
 const defaultDotColor = "#00FF00";   // Green
-const animationSpeed = 75; // ms
+const animationSpeed = 75; // ms per frame
 
-function sanitizeForIdJS(symbolStr, symbolsArray) {
-    const index = symbolsArray.indexOf(symbolStr);
-    return index !== -1 ? `s${index}` : null;
-}
+let spokeCache = { svg: null, spokes: [] };
 
-function updateSvgHighlight(symbolIdSuffix, highlight, symbolsArray) {
-    if (!symbolIdSuffix) return;
+function decodeBase64Bytes(text) {
+    const binary = atob(text || "");
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+    }
+    return bytes;
+}
 
-    const lineElement = document.getElementById(`line-${symbolIdSuffix}`);
-    const textElement = document.getElementById(`text-${symbolIdSuffix}`);
-    const dotElement = document.getElementById(`dot-${symbolIdSuffix}`);
+function getSpokeElements(count) {
+    // Rebuilt only when the SVG element itself has been replaced
+    const svg = document.getElementById('base40-visualization-svg');
+    if (spokeCache.svg !== svg || spokeCache.spokes.length !== count) {
+        const spokes = [];
+        for (let index = 0; index < count; index++) {
+            spokes.push({
+                line: document.getElementById(`line-s${index}`),
+                text: document.getElementById(`text-s${index}`),
+                dot: document.getElementById(`dot-s${index}`),
+            });
+        }
+        spokeCache = { svg: svg, spokes: spokes };
+    }
+    return spokeCache.spokes;
+}
 
-    if (lineElement) {
-        lineElement.setAttribute('stroke', highlight ? baseHighlightColor : defaultLineColor);
-        lineElement.setAttribute('stroke-width', highlight ? '3' : '1.5');
+function setSpokeHighlight(spoke, highlight) {
+    if (!spoke) return;
+    if (spoke.line) {
+        spoke.line.setAttribute('stroke', highlight ? baseHighlightColor : defaultLineColor);
+        spoke.line.setAttribute('stroke-width', highlight ? '3' : '1.5');
     }
-    if (textElement) {
-        textElement.setAttribute('fill', highlight ? baseHighlightColor : defaultTextColor);
+    if (spoke.text) {
+        spoke.text.setAttribute('fill', highlight ? baseHighlightColor : defaultTextColor);
     }
-    if (dotElement) {
-        dotElement.setAttribute('fill', highlight ? baseHighlightColor : defaultDotColor);
+    if (spoke.dot) {
+        spoke.dot.setAttribute('fill', highlight ? baseHighlightColor : defaultDotColor);
     }
 }
 
@@ -42,73 +67,67 @@ function updateCenterText(symbolStr) {
     }
 }
 
-function animateRodopios(symbolsList, defaultSymbols) {
-    if (animationTimeoutId) {
-        clearTimeout(animationTimeoutId);
+function stopRodopiosAnimation() {
+    if (animationFrameId !== null) {
+        cancelAnimationFrame(animationFrameId);
+        animationFrameId = null;
     }
+}
 
-    let currentStepIndex = 0;
-    let lastSymbolIdSuffix = null;
+function runRodopiosAnimation(indices, deltas, defaultSymbols) {
+    stopRodopiosAnimation();
+    const spokes = getSpokeElements(defaultSymbols ? defaultSymbols.length : 0);
+    spokes.forEach(spoke => setSpokeHighlight(spoke, false));
 
-    function animateNext() {
-        // De-highlight previous symbol
-        if (lastSymbolIdSuffix) {
-            updateSvgHighlight(lastSymbolIdSuffix, false, defaultSymbols);
-        }
+    if (!indices.length || !spokes.length) {
+        updateCenterText(defaultSymbols && defaultSymbols.length > 0 ? defaultSymbols[0] : "N/A");
+        return;
+    }
 
-        if (currentStepIndex < symbolsList.length) {
-            const currentSymbol = symbolsList[currentStepIndex];
-            const currentSymbolIdSuffix = sanitizeForIdJS(currentSymbol, defaultSymbols);
+    const centerTextElement = document.getElementById('center-text-display');
+    updateCenterText(defaultSymbols[indices[0]]); // Sets the centre's style once
+    let shownSpoke = -1;
+    let appliedFrame = -1;
+    let startTime = null;
 
-            if (currentSymbolIdSuffix) {
-                updateSvgHighlight(currentSymbolIdSuffix, true, defaultSymbols);
-                updateCenterText(currentSymbol);
-                lastSymbolIdSuffix = currentSymbolIdSuffix;
-            } else {
-                // Symbol not found in default list, skip or log error
-                updateCenterText('?'); // Indicate unknown symbol
-                lastSymbolIdSuffix = null;
-            }
+    function showFrame(frame) {
+        const index = indices[frame];
+        if (index === shownSpoke) return;
+        if (shownSpoke >= 0) setSpokeHighlight(spokes[shownSpoke], false);
+        setSpokeHighlight(spokes[index], true);
+        if (centerTextElement) centerTextElement.textContent = defaultSymbols[index] || '?';
+        shownSpoke = index;
+    }
 
-            currentStepIndex++;
-            animationTimeoutId = setTimeout(animateNext, animationSpeed);
-        } else {
-            // Animation finished, keep last symbol highlighted if it was valid
-            if (lastSymbolIdSuffix) {
-                 // updateCenterText(symbolsList[symbolsList.length - 1]); // Already set
-            } else if (symbolsList.length > 0) {
-                // if last symbol was invalid, but list was not empty
-                updateCenterText(symbolsList[symbolsList.length - 1] || '?');
-            } else {
-                updateCenterText("N/A"); // No symbols in list
-                 // De-highlight all if list is empty (should be handled by initial SVG render)
+    function tick(timestamp) {
+        if (startTime === null) startTime = timestamp;
+        const target = Math.min(indices.length - 1, Math.floor((timestamp - startTime) / animationSpeed));
+        if (target > appliedFrame) {
+            // One frame ahead with no rotation: nothing changes. Otherwise jump straight to the
+            // latest due frame; the frames in between were never visible anyway.
+            if (!(target === appliedFrame + 1 && appliedFrame >= 0 && deltas[target] === 0)) {
+                showFrame(target);
             }
+            appliedFrame = target;
         }
+        // The last frame stays highlighted when the animation ends
+        animationFrameId = appliedFrame < indices.length - 1 ? requestAnimationFrame(tick) : null;
     }
 
-    if (symbolsList && symbolsList.length > 0 && defaultSymbols && defaultSymbols.length > 0) {
-        // Reset all to default before starting animation
-        defaultSymbols.forEach(s => {
-            const idSuffix = sanitizeForIdJS(s, defaultSymbols);
-            if (idSuffix) updateSvgHighlight(idSuffix, false, defaultSymbols);
-        });
-        animateNext();
-    } else {
-        // No symbols to animate, ensure center text is N/A or default
-        updateCenterText(defaultSymbols && defaultSymbols.length > 0 ? defaultSymbols[0] : "N/A");
-         // De-highlight all if list is empty
-        if (defaultSymbols) {
-            defaultSymbols.forEach(s => {
-                const idSuffix = sanitizeForIdJS(s, defaultSymbols);
-                if (idSuffix) updateSvgHighlight(idSuffix, false, defaultSymbols);
-            });
-        }
-    }
+    animationFrameId = requestAnimationFrame(tick);
+}
+
+function animateRodopiosFrames(frames, defaultSymbols) {
+    const indices = decodeBase64Bytes(frames && frames.indices);
+    const deltas = decodeBase64Bytes(frames && frames.rodopios);
+    runRodopiosAnimation(indices, deltas, defaultSymbols);
 }
 
-// Make init function available globally or via event listener
-// window.initRodopiosAnimation = animateRodopios;
-// Or, if script is loaded after DOM and data is ready:
-// if (window.animationSymbolList && window.DEFAULT_SYMBOLS_FOR_JS) {
-//     animateRodopios(window.animationSymbolList, window.DEFAULT_SYMBOLS_FOR_JS);
-// }
+// Older entry point taking a list of symbol strings; maps them to spoke indices once.
+function animateRodopios(symbolsList, defaultSymbols) {
+    const positions = new Map((defaultSymbols || []).map((symbol, index) => [symbol, index]));
+    const indices = Uint8Array.from((symbolsList || []).filter(symbol => positions.has(symbol)),
+                                    symbol => positions.get(symbol));
+    const deltas = indices.map((index, frame) => frame === 0 ? 0 : (index - indices[frame - 1] + 40) % 40);
+    runRodopiosAnimation(indices, deltas, defaultSymbols);
+}
@@ -0,0 +1,261 @@
+# app/storage.py
+#
+# Optional SQLite persistence for generated keypairs. Producers (request handlers, the bulk
+# generator) only put bundles on a bounded queue; a single writer thread drains it and inserts
+# them in batches with executemany, one transaction per batch. The database runs in WAL mode,
+# so lookups from request threads read concurrently with the writer.
+#
+# Enable for the web app with BASE40_STORAGE_PATH (STORAGE_PATH in the app config); step traces
+# are only stored with BASE40_STORAGE_STEPS=1 (STORAGE_STEPS), zlib-compressed.
+#
+# A batch that fails to insert is logged and counted in `dropped`; the error is raised from
+# the next flush() or close(), and shown in stats() (the app's /status) in the meantime.
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import zlib
+
+DEFAULT_STORAGE_BATCH_SIZE = 500
+DEFAULT_STORAGE_QUEUE_SIZE = 10000
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS keypairs (
+    id INTEGER PRIMARY KEY,
+    private_key_hex TEXT NOT NULL,
+    private_key_base40 TEXT NOT NULL,
+    public_key_uncompressed_hex TEXT NOT NULL,
+    public_key_x_base40 TEXT NOT NULL,
+    hash160 BLOB NOT NULL,
+    address_base40 TEXT NOT NULL,
+    address_bitcoin_base58check TEXT NOT NULL,
+    steps BLOB,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS keypairs_hash160 ON keypairs (hash160);
+CREATE INDEX IF NOT EXISTS keypairs_address_base40 ON keypairs (address_base40);
+CREATE INDEX IF NOT EXISTS keypairs_address_bitcoin ON keypairs (address_bitcoin_base58check);
+"""
+
+INSERT_SQL = """
+INSERT INTO keypairs (private_key_hex, private_key_base40, public_key_uncompressed_hex, public_key_x_base40,
+                      hash160, address_base40, address_bitcoin_base58check, steps, created_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SELECT_COLUMNS = ("private_key_hex, private_key_base40, public_key_uncompressed_hex, public_key_x_base40, "
+                  "hash160, address_base40, address_bitcoin_base58check, steps, created_at")
+
+
+def compress_steps(steps: list) -> bytes:
+    return zlib.compress(json.dumps(steps, separators=(',', ':')).encode('utf-8'), 6)
+
+
+def decompress_steps(blob: bytes) -> list:
+    return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL") # Durable at checkpoints; safe against corruption in WAL mode
+    return connection
+
+
+class KeypairStore:
+    """
+    Persists keypair bundles to SQLite through a single writer thread.
+
+    put() blocks while the queue is full, which throttles producers to the write rate instead
+    of growing memory. flush() waits until everything queued so far is committed, and raises
+    the sqlite3.Error of any batch dropped since the previous flush() or close().
+    The writer is a daemon thread, so close() is also registered to run at interpreter exit:
+    rows still queued then are written instead of lost.
+    """
+
+    def __init__(self, path: str, store_steps: bool = False, batch_size: int = DEFAULT_STORAGE_BATCH_SIZE,
+                 queue_size: int = DEFAULT_STORAGE_QUEUE_SIZE):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        self.path = path
+        self.store_steps = store_steps
+        self.batch_size = batch_size
+        self.written = 0
+        self.dropped = 0
+        self.error = None
+        self._unraised_error = None
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        connection = _connect(path)
+        with connection:
+            connection.executescript(SCHEMA)
+        connection.close()
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._readers = threading.local()
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name='base40-storage-writer', daemon=True)
+        self._writer.start()
+        atexit.register(self._close_at_exit)
+
+    # --- Writing ---
+
+    def _row(self, bundle: dict) -> tuple:
+        steps = bundle.get("scalar_multiplication_steps")
+        return (
+            bundle["private_key_hex"], bundle["private_key_base40"],
+            bundle["public_key_uncompressed_hex"], bundle["public_key_x_base40"],
+            bytes.fromhex(bundle["hashed_public_key_ripemd160_hex"]),
+            bundle["address_base40"], bundle["address_bitcoin_base58check"],
+            compress_steps(steps) if (self.store_steps and steps) else None,
+            time.time(),
+        )
+
+    def put(self, bundle: dict):
+        """Queues one keypair bundle (as built by app.pipeline) for writing."""
+        if self._closed:
+            raise RuntimeError("The keypair store has been closed.")
+        self._queue.put(self._row(bundle))
+
+    def put_many(self, bundles):
+        for bundle in bundles:
+            self.put(bundle)
+
+    def _run(self):
+        connection = _connect(self.path)
+        try:
+            while True:
+                rows = [self._queue.get()]
+                # Batch whatever else is already waiting, up to batch_size rows
+                while len(rows) < self.batch_size:
+                    try:
+                        rows.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = None in rows
+                batch = [row for row in rows if row is not None]
+                if batch:
+                    try:
+                        with connection:
+                            connection.executemany(INSERT_SQL, batch)
+                        self.written += len(batch)
+                    except sqlite3.Error as e:
+                        logger.error("Dropped a batch of %d keypairs writing to %s: %s", len(batch), self.path, e)
+                        self.dropped += len(batch)
+                        self.error = str(e)
+                        self._unraised_error = e
+                for _ in rows:
+                    self._queue.task_done()
+                if stop:
+                    return
+        finally:
+            connection.close()
+
+    def flush(self):
+        """Blocks until every queued bundle has been written (or dropped; see _raise_error)."""
+        self._queue.join()
+        self._raise_error()
+
+    def close(self):
+        """Writes what is queued, then stops the writer thread."""
+        if not self._closed:
+            self._closed = True
+            atexit.unregister(self._close_at_exit)
+            self._queue.put(None)
+            self._writer.join()
+        self._raise_error()
+
+    def _close_at_exit(self):
+        try:
+            self.close()
+        except sqlite3.Error:
+            pass # Already logged by the writer thread
+
+    def _raise_error(self):
+        """Raises the last write error not yet reported to a caller."""
+        error, self._unraised_error = self._unraised_error, None
+        if error is not None:
+            raise error
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "error": self.error,
+        }
+
+    # --- Reading ---
+
+    def _reader(self) -> sqlite3.Connection:
+        connection = getattr(self._readers, 'connection', None)
+        if connection is None:
+            connection = self._readers.connection = _connect(self.path)
+        return connection
+
+    def find_by_address(self, address: str, include_steps: bool = False) -> list:
+        """
+        Returns the stored keypairs whose Base40 address, Base58Check address or hash160 (hex)
+        equals `address`, newest first. Every lookup uses one of the column indexes.
+        """
+        address = address.strip()
+        if len(address) == 40:
+            try:
+                column, value = 'hash160', bytes.fromhex(address)
+            except ValueError:
+                column, value = 'address_base40', address
+        elif address.isascii():
+            column, value = 'address_bitcoin_base58check', address
+        else:
+            column, value = 'address_base40', address
+        cursor = self._reader().execute(
+            f"SELECT {SELECT_COLUMNS} FROM keypairs WHERE {column} = ? ORDER BY id DESC", (value,))
+        return [self._bundle(row, include_steps) for row in cursor.fetchall()]
+
+    def count(self) -> int:
+        return self._reader().execute("SELECT COUNT(*) FROM keypairs").fetchone()[0]
+
+    @staticmethod
+    def _bundle(row: tuple, include_steps: bool) -> dict:
+        bundle = {
+            "private_key_hex": row[0],
+            "private_key_base40": row[1],
+            "public_key_uncompressed_hex": row[2],
+            "public_key_x_base40": row[3],
+            "hashed_public_key_ripemd160_hex": row[4].hex(),
+            "address_base40": row[5],
+            "address_bitcoin_base58check": row[6],
+            "created_at": row[8],
+        }
+        if include_steps:
+            bundle["scalar_multiplication_steps"] = decompress_steps(row[7]) if row[7] else None
+        return bundle
+
+
+_store_lock = threading.Lock()
+
+
+def get_keypair_store(app):
+    """
+    Returns the app's shared KeypairStore, created on first use from STORAGE_PATH and
+    STORAGE_STEPS, or None when persistence is not configured.
+    """
+    if not app.config.get('STORAGE_PATH'):
+        return None
+    store = app.extensions.get('base40_storage')
+    if store is None:
+        with _store_lock:
+            store = app.extensions.get('base40_storage')
+            if store is None:
+                store = KeypairStore(app.config['STORAGE_PATH'], store_steps=app.config.get('STORAGE_STEPS', False))
+                app.extensions['base40_storage'] = store
+    return store
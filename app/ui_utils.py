@@ -1,6 +1,7 @@
 # app/ui_utils.py
+import base64
 import math
-import cgi # For escaping attributes if needed, though not strictly for class/id if simple
+import html # For escaping attributes if needed, though not strictly for class/id if simple
 from app.core_logic.base40 import DEFAULT_SYMBOLS
 
 def generate_base40_svg_circle(target_symbol_to_highlight=None, svg_size=320, for_animation=False):
@@ -49,7 +50,7 @@ def generate_base40_svg_circle(target_symbol_to_highlight=None, svg_size=320, fo
         svg_elements.append(
             f'<text id="text-{symbol_id_suffix}" class="base40-text-on-circle" '
             f'x="{symbol_coords["x"]}" y="{symbol_coords["y"]}" fill="{text_fill if not for_animation else "#00FF00"}" '
-            f'font-size="11" text-anchor="middle" dominant-baseline="middle" style="pointer-events: none; font-family: 'Consolas', 'Monaco', 'Courier New', Courier, monospace;">{cgi.escape(symbol_char)}</text>'
+            f'font-size="11" text-anchor="middle" dominant-baseline="middle" style="pointer-events: none; font-family: \'Consolas\', \'Monaco\', \'Courier New\', Courier, monospace;">{html.escape(symbol_char)}</text>'
         )
         svg_elements.append(
             f'<circle id="dot-{symbol_id_suffix}" class="base40-dot" '
@@ -63,6 +64,30 @@ def generate_base40_svg_circle(target_symbol_to_highlight=None, svg_size=320, fo
 
     svg_elements.append(
         f'<text id="center-text-display" x="{center}" y="{center}" fill="{central_display_fill}" font-size="{central_display_fontsize}" '
-        f'text-anchor="middle" dominant-baseline="central" font-weight="bold" style="font-family: 'Consolas', 'Monaco', 'Courier New', Courier, monospace;">{cgi.escape(central_display_text)}</text>'
+        f'text-anchor="middle" dominant-baseline="central" font-weight="bold" style="font-family: \'Consolas\', \'Monaco\', \'Courier New\', Courier, monospace;">{html.escape(central_display_text)}</text>'
     )
     return f'<svg id="base40-visualization-svg" width="{svg_size}" height="{svg_size}" xmlns="http://www.w3.org/2000/svg">{"".join(svg_elements)}</svg>'
+
+
+def encode_animation_frames(steps: list, symbols: list = DEFAULT_SYMBOLS) -> dict:
+    """
+    Compact animation payload for static/js/visualization.js: one frame per step that has a
+    symbol, sent as base64 Uint8Arrays instead of a JSON list of Unicode symbols.
+      indices  - spoke index (0-39) of each frame
+      rodopios - spoke delta from the previous frame, mod 40 (0 for the first frame); the client
+                 skips frames with delta 0, since nothing on the circle changes
+    """
+    digits = {symbol: index for index, symbol in enumerate(symbols)}
+    indices = bytearray()
+    for step in steps:
+        symbol = step.get('base40_symbol')
+        if symbol:
+            indices.append(digits[symbol])
+    rodopios = bytearray(len(indices))
+    for frame in range(1, len(indices)):
+        rodopios[frame] = (indices[frame] - indices[frame - 1]) % 40
+    return {
+        "count": len(indices),
+        "indices": base64.b64encode(bytes(indices)).decode('ascii'),
+        "rodopios": base64.b64encode(bytes(rodopios)).decode('ascii'),
+    }
@@ -0,0 +1,111 @@
+# app/warmup.py
+#
+# Optional warm-up for freshly started workers: maps (or builds) the precomputation tables,
+# primes the codec paths and runs a few full derivations, in a background thread. With an
+# offloading executor (app/executor.py) its pool processes are started and warmed the same
+# way. The app reports readiness at /ready separately from liveness at /status, so a load
+# balancer only routes traffic to warm workers.
+
+import os
+import threading
+import time
+
+from app.core_logic.base40 import decimal_to_base40, base40_to_decimal, DEFAULT_SYMBOLS
+from app.crypto.addresses import ripemd160_to_base40, base58check_encode_bitcoin
+from app.crypto.precomp import get_fixed_base_table
+from app.pipeline import generate_keypair_bundle
+
+DEFAULT_WARMUP_DERIVATIONS = 3
+
+
+def warmup_config_from_env() -> dict:
+    """WARMUP_ENABLED and WARMUP_DERIVATIONS from BASE40_WARMUP / BASE40_WARMUP_DERIVATIONS."""
+    return {
+        'WARMUP_ENABLED': os.environ.get('BASE40_WARMUP', '').strip().lower() in ('1', 'true', 'yes', 'on'),
+        'WARMUP_DERIVATIONS': int(os.environ.get('BASE40_WARMUP_DERIVATIONS', DEFAULT_WARMUP_DERIVATIONS)),
+    }
+
+
+def run_warmup(derivations: int = DEFAULT_WARMUP_DERIVATIONS, executor=None) -> dict:
+    """
+    Runs every warm-up stage in the calling thread, then, when `executor` offloads to a
+    process pool, on each of its workers ("executor_workers"). Returns the duration of each
+    stage in seconds.
+    """
+    timings = {}
+
+    started_at = time.monotonic()
+    get_fixed_base_table()
+    timings["tables"] = time.monotonic() - started_at
+
+    started_at = time.monotonic()
+    sample_hash = bytes(range(20))
+    base40_to_decimal(decimal_to_base40(int.from_bytes(sample_hash, 'big'), DEFAULT_SYMBOLS), DEFAULT_SYMBOLS)
+    ripemd160_to_base40(sample_hash, target_length=31, symbols=DEFAULT_SYMBOLS)
+    base58check_encode_bitcoin(sample_hash)
+    timings["codecs"] = time.monotonic() - started_at
+
+    started_at = time.monotonic()
+    for _ in range(derivations):
+        generate_keypair_bundle(include_steps=True)
+    timings["derivations"] = time.monotonic() - started_at
+
+    if executor is not None and executor.offloading:
+        # The pool is spawned lazily; start it now so the first requests do not pay for it
+        started_at = time.monotonic()
+        executor.warm_up(run_warmup, derivations)
+        timings["executor_workers"] = time.monotonic() - started_at
+
+    return {stage: round(seconds, 4) for stage, seconds in timings.items()}
+
+
+class WarmupState:
+    """Tracks the background warm-up of one app instance."""
+
+    def __init__(self, enabled: bool, derivations: int = DEFAULT_WARMUP_DERIVATIONS, logger=None, executor=None):
+        self.enabled = enabled
+        self.derivations = derivations
+        self.executor = executor # Its pool workers are warmed too (see run_warmup)
+        self.logger = logger
+        self.timings = None
+        self.error = None
+        self._ready = threading.Event()
+        self._thread = None
+        if not enabled:
+            self._ready.set()
+
+    def start(self):
+        """Starts the warm-up thread (no-op when disabled or already started)."""
+        if self.enabled and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='base40-warmup', daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self.timings = run_warmup(self.derivations, self.executor)
+            if self.logger:
+                self.logger.info(f"Warm-up finished: {self.timings}")
+        except Exception as e:
+            # A failed warm-up must not keep the worker out of rotation forever: it is
+            # still able to serve, only colder.
+            self.error = str(e)
+            if self.logger:
+                self.logger.error(f"Warm-up failed: {e}", exc_info=True)
+        finally:
+            self._ready.set()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready,
+            "warmup_enabled": self.enabled,
+            "warmup_timings": self.timings,
+            "warmup_error": self.error,
+        }
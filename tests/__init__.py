@@ -1 +1,11 @@
 # Main tests package
+import atexit
+import os
+import shutil
+import tempfile
+
+# The fixed-base tables (app/crypto/precomp.py) default to ~/.cache/base40; keep the suite's
+# copies in a temporary directory instead. Worker processes inherit the variable.
+_precomp_dir = tempfile.mkdtemp(prefix='base40-tests-precomp-')
+os.environ['BASE40_PRECOMP_PATH'] = os.path.join(_precomp_dir, 'secp256k1_fixed_base.bin')
+atexit.register(shutil.rmtree, _precomp_dir, ignore_errors=True)
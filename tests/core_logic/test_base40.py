@@ -6,7 +6,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..',
 
 from app.core_logic.base40 import (
     DEFAULT_SYMBOLS, number_to_angle, angle_to_symbol,
-    symbol_to_index, index_to_number, decimal_to_base40, base40_to_decimal
+    symbol_to_index, index_to_number, decimal_to_base40, base40_to_decimal,
+    packed_size, pack_base40, unpack_base40, pack_base40_many, unpack_base40_many
 )
 
 class TestBase40(unittest.TestCase):
@@ -115,5 +116,31 @@ class TestBase40(unittest.TestCase):
         self.assertEqual(base40_env_specific, expected_env_b40_val)
         self.assertEqual(base40_to_decimal(base40_env_specific), num_env_specific)
 
+    def test_pack_base40(self):
+        self.assertEqual(packed_size(31), 22)
+        self.assertEqual(pack_base40(decimal_to_base40(75)), (75).to_bytes(2, 'big')) # 'βҘ' -> 'αβҘ'
+        self.assertEqual(pack_base40('∂∂∂'), (63999).to_bytes(2, 'big'))
+        for num in [0, 39, 1600, 9876543210, 2**160 - 1]:
+            packed = pack_base40(decimal_to_base40(num), length=31)
+            self.assertEqual(len(packed), 22)
+            self.assertEqual(base40_to_decimal(unpack_base40(packed, 31)), num)
+        with self.assertRaises(ValueError):
+            pack_base40('ab')
+        with self.assertRaises(ValueError):
+            pack_base40('βββ', length=2)
+        with self.assertRaises(ValueError):
+            unpack_base40(b'\xff\xff')
+        with self.assertRaises(ValueError):
+            unpack_base40(pack_base40('βββ'), length=2)
+
+    def test_packed_bytes_sort_numerically(self):
+        numbers = [2**159, 0, 1234567890, 40, 39, 2**160 - 1, 1600, 75]
+        packed = pack_base40_many([decimal_to_base40(num) for num in numbers], 31)
+        records = sorted(packed[i:i + 22] for i in range(0, len(packed), 22))
+        self.assertEqual([base40_to_decimal(unpack_base40(record, 31)) for record in records], sorted(numbers))
+        self.assertEqual([base40_to_decimal(value) for value in unpack_base40_many(packed, 31)], numbers)
+        with self.assertRaises(ValueError):
+            unpack_base40_many(packed[:-1], 31)
+
 if __name__ == '__main__':
     unittest.main()
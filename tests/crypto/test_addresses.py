@@ -9,6 +9,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..',
 from app.crypto.addresses import (
     hash_public_key, ripemd160_to_base40,
     base58check_encode_bitcoin, base58_encode,
+    base58_decode, base58check_decode_bitcoin,
 )
 # DEFAULT_SYMBOLS is imported by app.crypto.addresses itself from app.core_logic.base40
 # If it were needed directly in tests, it would be: from app.core_logic.base40 import DEFAULT_SYMBOLS
@@ -103,5 +104,17 @@ class TestAddresses(unittest.TestCase):
         # We can check that it returns a string of typical address length.
         self.assertTrue(25 < len(actual_address) < 36, "Bitcoin address length seems off.")
 
+    def test_base58check_decode_bitcoin(self):
+        for payload in [bytes.fromhex(EXPECTED_RIPEMD160_HEX_K1), bytes(20), b'\x00\x01' + bytes(18)]:
+            address = base58check_encode_bitcoin(payload, version_byte=0x00)
+            self.assertEqual(base58check_decode_bitcoin(address), (0x00, payload))
+        self.assertEqual(base58_decode(base58_encode(b'\x00\x00\x01\x02')), b'\x00\x00\x01\x02')
+        address = base58check_encode_bitcoin(bytes(20))
+        corrupted = address[:-1] + ('3' if address[-1] != '3' else '4')
+        with self.assertRaises(ValueError):
+            base58check_decode_bitcoin(corrupted)
+        with self.assertRaises(ValueError):
+            base58_decode('0OIl')
+
 if __name__ == '__main__':
     unittest.main()
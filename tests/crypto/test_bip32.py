@@ -0,0 +1,84 @@
+import unittest
+import sys
+import os
+
+# Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from app.crypto.bip32 import HDNode, HDWallet, HARDENED, parse_path, derive_public_children
+from app.crypto.keys import public_key_to_bytes, public_key_from_bytes
+from app.crypto.secp256k1_utils import Gx, Gy
+
+# BIP32 test vector 1
+SEED_1 = bytes.fromhex('000102030405060708090a0b0c0d0e0f')
+VECTOR_1 = {
+    "m": ("xpub661MyMwAqRbcFtXgS5sYJABqqG9YLmC4Q1Rdap9gSE8NqtwybGhePY2gZ29ESFjqJoCu1Rupje8YtGqsefD265TMg7usUDFdp6W1EGMcet8",
+          "xprv9s21ZrQH143K3QTDL4LXw2F7HEK3wJUD2nW2nRk4stbPy6cq3jPPqjiChkVvvNKmPGJxWUtg6LnF5kejMRNNU3TGtRBeJgk33yuGBxrMPHi"),
+    "m/0'": ("xpub68Gmy5EdvgibQVfPdqkBBCHxA5htiqg55crXYuXoQRKfDBFA1WEjWgP6LHhwBZeNK1VTsfTFUHCdrfp1bgwQ9xv5ski8PX9rL2dZXvgGDnw",
+             "xprv9uHRZZhk6KAJC1avXpDAp4MDc3sQKNxDiPvvkX8Br5ngLNv1TxvUxt4cV1rGL5hj6KCesnDYUhd7oWgT11eZG7XnxHrnYeSvkzY7d2bhkJ7"),
+    "m/0'/1": ("xpub6ASuArnXKPbfEwhqN6e3mwBcDTgzisQN1wXN9BJcM47sSikHjJf3UFHKkNAWbWMiGj7Wf5uMash7SyYq527Hqck2AxYysAA7xmALppuCkwQ",
+               "xprv9wTYmMFdV23N2TdNG573QoEsfRrWKQgWeibmLntzniatZvR9BmLnvSxqu53Kw1UmYPxLgboyZQaXwTCg8MSY3H2EU4pWcQDnRnrVA1xe8fs"),
+}
+VECTOR_1_DEEP_XPUB = "xpub6H1LXWLaKsWFhvm6RVpEL9P4KfRZSW7abD2ttkWP3SSQvnyA8FSVqNTEcYFgJS2UaFcxupHiYkro49S8yGasTvXEYBVPamhGW6cFJodrTHy"
+
+class TestBip32(unittest.TestCase):
+
+    def test_vector_1(self):
+        wallet = HDWallet.from_seed(SEED_1)
+        for path, (xpub, xprv) in VECTOR_1.items():
+            node = wallet.derive(path)
+            self.assertEqual(node.to_xpub(), xpub)
+            self.assertEqual(node.to_xprv(), xprv)
+        self.assertEqual(wallet.derive("m/0'/1/2'/2/1000000000").to_xpub(), VECTOR_1_DEEP_XPUB)
+
+    def test_extended_key_roundtrip(self):
+        xpub, xprv = VECTOR_1["m/0'"]
+        self.assertEqual(HDNode.from_extended_key(xprv).to_xprv(), xprv)
+        public_node = HDNode.from_extended_key(xpub)
+        self.assertFalse(public_node.is_private)
+        # Non-hardened public derivation matches the private path
+        self.assertEqual(public_node.child(1).to_xpub(), VECTOR_1["m/0'/1"][0])
+        with self.assertRaises(ValueError):
+            public_node.child(HARDENED)
+        with self.assertRaises(ValueError):
+            public_node.to_xprv()
+        with self.assertRaises(ValueError):
+            HDNode.from_extended_key(xpub[:-1] + ('A' if xpub[-1] != 'A' else 'B'))
+
+    def test_batched_public_children(self):
+        wallet = HDWallet.from_seed(SEED_1)
+        account = wallet.derive("m/44'/0'/0'/0")
+        batch = derive_public_children(account.neuter(), 5, 20)
+        self.assertEqual([node.child_number for node in batch], list(range(5, 25)))
+        for node in batch:
+            self.assertEqual(node.to_xpub(), wallet.derive(f"m/44'/0'/0'/0/{node.child_number}").to_xpub())
+        with self.assertRaises(ValueError):
+            derive_public_children(account, HARDENED - 1, 2)
+
+    def test_node_cache(self):
+        wallet = HDWallet.from_seed(SEED_1, cache_size=8)
+        first = wallet.derive("m/44'/0'/0'/0/0")
+        self.assertIs(wallet.derive("m/44'/0'/0'/0/0"), first)
+        self.assertEqual(wallet.cache_hits, 1)
+        wallet.derive("m/44'/0'/0'/0/1") # Reuses the cached parent chain
+        self.assertEqual(wallet.derive((44 + HARDENED, HARDENED, HARDENED, 0)).child(1).to_xprv(),
+                         wallet.derive("m/44'/0'/0'/0/1").to_xprv())
+        for index in range(20):
+            wallet.derive(f"m/1/{index}")
+        self.assertLessEqual(len(wallet._cache), 8)
+
+    def test_parse_path(self):
+        self.assertEqual(parse_path("m/44'/0h/5"), (44 + HARDENED, HARDENED, 5))
+        self.assertEqual(parse_path("m"), ())
+        for invalid in ("44'/0", "m/x", f"m/{HARDENED}"):
+            with self.assertRaises(ValueError):
+                parse_path(invalid)
+
+    def test_public_key_from_bytes(self):
+        for compressed in (False, True):
+            self.assertEqual(public_key_from_bytes(public_key_to_bytes((Gx, Gy), compressed)), (Gx, Gy))
+        with self.assertRaises(ValueError):
+            public_key_from_bytes(b'\x04' + bytes(64))
+
+if __name__ == '__main__':
+    unittest.main()
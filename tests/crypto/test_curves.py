@@ -0,0 +1,114 @@
+import unittest
+import sys
+import os
+import tempfile
+from unittest import mock
+
+# Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from app.crypto.curves import get_curve, SECP256K1, SECP256R1, CURVES
+from app.crypto.keys import derive_public_key, public_key_to_bytes, public_key_from_bytes, generate_private_keys
+from app.crypto.precomp import FixedBaseTable
+from app.crypto.secp256k1_utils import scalar_multiplication, jacobian_double, to_jacobian, from_jacobian
+from app.pipeline import build_keypair_bundle
+
+# 2G and 3G on P-256 (NIST test values)
+P256_2G = (0x7CF27B188D034F7E8A52380304B51AC3C08969E277F21B35A60B48FC47669978,
+           0x07775510DB8ED040293D9AC69F7430DBBA7DADE63CE982299E04B79D227873D1)
+P256_3G = (0x5ECBE4D1A6330A44C8F7EF951D4BF165E6C6B721EFADA985FB41661BC6E7FD6C,
+           0x8734640C4998FF7E374B06CE1A64A2ECD82AB036384FB83D9A79B127A27D5032)
+
+class TestCurves(unittest.TestCase):
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        patcher = mock.patch.dict(os.environ, {'BASE40_PRECOMP_PATH': os.path.join(tmpdir.name, 'secp256k1.bin')})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        SECP256R1.reset_table()
+        self.addCleanup(SECP256R1.reset_table)
+
+    def test_get_curve(self):
+        self.assertIs(get_curve(None), SECP256K1)
+        self.assertIs(get_curve('P-256'), SECP256R1)
+        self.assertIs(get_curve('prime256v1'), SECP256R1)
+        self.assertIs(get_curve(SECP256R1), SECP256R1)
+        self.assertEqual(sorted(CURVES), ['secp256k1', 'secp256r1'])
+        with self.assertRaises(ValueError):
+            get_curve('secp384r1')
+
+    def test_p256_known_multiples(self):
+        self.assertEqual(SECP256R1.double(SECP256R1.G), P256_2G)
+        self.assertEqual(SECP256R1.add(SECP256R1.G, P256_2G), P256_3G)
+        self.assertEqual(from_jacobian(SECP256R1.jacobian_double(to_jacobian(SECP256R1.G)), SECP256R1.p), P256_2G)
+        self.assertEqual(SECP256R1.multiply_generator(3), P256_3G)
+        point, steps = SECP256R1.scalar_multiplication(3)
+        self.assertEqual(point, P256_3G)
+        self.assertEqual(len(steps), 256)
+
+    def test_order_is_checked_against_the_curve(self):
+        # n of P-256 is below n of secp256k1, so keys in between are only valid on secp256k1
+        k = SECP256R1.n + 1
+        self.assertLess(k, SECP256K1.n)
+        with self.assertRaises(ValueError):
+            scalar_multiplication(k, SECP256R1.G, a=SECP256R1.a, b=SECP256R1.b, p=SECP256R1.p, n=SECP256R1.n)
+        with self.assertRaises(ValueError):
+            derive_public_key(format(k, '064x'), 'secp256r1')
+        # (n - 1) * G = -G
+        self.assertEqual(SECP256R1.multiply_generator(SECP256R1.n - 1), (SECP256R1.G[0], SECP256R1.p - SECP256R1.G[1]))
+
+    def test_table_and_trace_agree(self):
+        for k in generate_private_keys(3, curve='secp256r1'):
+            self.assertLess(k, SECP256R1.n)
+            public_key_hex, _ = derive_public_key(format(k, '064x'), SECP256R1)
+            self.assertEqual(public_key_hex, public_key_to_bytes(SECP256R1.multiply_generator(k)).hex())
+        self.assertTrue(SECP256R1.fixed_base_table().source.endswith('.bin'))
+        self.assertIn('secp256r1', SECP256R1.fixed_base_table().source)
+
+    def test_table_for_other_curve_is_checked(self):
+        path = os.path.join(os.path.dirname(os.environ['BASE40_PRECOMP_PATH']), 'table.bin')
+        table = FixedBaseTable.load_or_create(path, SECP256R1.G, SECP256R1.a, SECP256R1.b, SECP256R1.p, SECP256R1.n)
+        table.close()
+        with self.assertRaises(ValueError): # Built for P-256, so stale for secp256k1
+            FixedBaseTable.open(path)
+
+    def test_doubling_fast_paths_match_general_formula(self):
+        for curve in (SECP256K1, SECP256R1):
+            z = 0x1234567890ABCDEF
+            x, y = curve.multiply_generator(5)
+            jacobian = (x * z * z % curve.p, y * z * z * z % curve.p, z)
+            # a + p is the same curve parameter but bypasses the a == 0 / a == -3 branches
+            general = jacobian_double(jacobian, curve.a + curve.p, curve.p)
+            self.assertEqual(from_jacobian(curve.jacobian_double(jacobian), curve.p), from_jacobian(general, curve.p))
+
+    def test_compressed_public_key_round_trip(self):
+        point = SECP256R1.multiply_generator(0xC0FFEE)
+        encoded = public_key_to_bytes(point, compressed=True)
+        self.assertEqual(public_key_from_bytes(encoded, 'p256'), point)
+        with self.assertRaises(ValueError):
+            public_key_from_bytes(public_key_to_bytes(point), 'secp256k1')
+
+    def test_bundle_for_p256(self):
+        bundle = build_keypair_bundle(3, include_steps=False, curve='secp256r1')
+        self.assertEqual(bundle["curve"], 'secp256r1')
+        self.assertEqual(bundle["public_key_uncompressed_hex"], public_key_to_bytes(P256_3G).hex())
+        self.assertIn("hashed_public_key_ripemd160_hex", bundle)
+        for field in ("address_base40", "address_bitcoin_base58check", "address_p2wpkh"): # Bitcoin addresses only
+            self.assertNotIn(field, bundle)
+        self.assertNotIn("curve", build_keypair_bundle(3, include_steps=False))
+
+    def test_api_curve_selector(self):
+        from app.main import create_app
+        client = create_app({'TESTING': True}).test_client()
+        bundle = client.get('/api/generate_keypair_detailed?curve=p256').get_json()
+        self.assertEqual(bundle["curve"], 'secp256r1')
+        point = public_key_from_bytes(bytes.fromhex(bundle["public_key_uncompressed_hex"]), SECP256R1)
+        self.assertEqual(SECP256R1.multiply_generator(int(bundle["private_key_hex"], 16)), point)
+        self.assertEqual(len(bundle["scalar_multiplication_steps"]), 256)
+        self.assertEqual(client.get('/api/generate_keypair_detailed?curve=ed25519').status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
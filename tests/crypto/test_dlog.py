@@ -0,0 +1,123 @@
+import unittest
+import sys
+import os
+import json
+import queue
+import tempfile
+
+# Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from app.crypto.dlog import BabyStepTable, BsgsSolver, KangarooSolver, bsgs_scan, kangaroo_jumps
+from app.crypto.curves import SECP256K1, SECP256R1
+from app.crypto.keys import public_key_to_bytes
+
+SECRET = 0x5A5A5A5A5A
+
+class TestDlog(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.public_point = SECP256K1.multiply_generator(SECRET)
+
+    def path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def test_baby_step_table(self):
+        table = BabyStepTable.load_or_create(self.path('baby.bin'), 100)
+        self.addCleanup(table.close)
+        self.assertEqual((table.baby_steps, table.capacity), (100, 256))
+        for j in (1, 2, 57, 100):
+            self.assertIn(j, table.lookup(SECP256K1.multiply_generator(j)[0]))
+        self.assertEqual(table.lookup(SECP256K1.multiply_generator(101)[0]), [])
+        with self.assertRaises(ValueError): # Built for secp256k1
+            BabyStepTable.open(self.path('baby.bin'), SECP256R1)
+
+    def test_bsgs_scan_covers_both_signs(self):
+        table = BabyStepTable.load_or_create(self.path('baby.bin'), 64)
+        self.addCleanup(table.close)
+        for k in (1, 63, 64, 65, 128, 1000, 4095):
+            self.assertEqual(bsgs_scan(table, SECP256K1.multiply_generator(k), 0, 32), k)
+        self.assertIsNone(bsgs_scan(table, SECP256K1.multiply_generator(5000), 0, 32))
+
+    def test_bsgs_solver(self):
+        solver = BsgsSolver(public_key_to_bytes(self.public_point).hex(), SECRET - 300000, SECRET + 5000,
+                            workers=1, chunk_giant_steps=64, checkpoint_path=self.path('bsgs.json')).start()
+        self.assertTrue(solver.wait(60))
+        status = solver.status()
+        self.assertEqual(status["state"], 'found')
+        self.assertEqual(int(status["private_key_hex"], 16), SECRET)
+        self.assertGreater(status["ops"], 0)
+        with open(self.path('bsgs.json')) as f:
+            self.assertEqual(json.load(f)["result"], SECRET)
+
+    def test_bsgs_exhausted_checkpoint_is_resumed(self):
+        low, high = SECRET + 1, SECRET + 20000
+        checkpoint = self.path('exhausted.json')
+        first = BsgsSolver(self.public_point, low, high, workers=1, chunk_giant_steps=16, checkpoint_path=checkpoint).start()
+        self.assertTrue(first.wait(60))
+        self.assertEqual(first.status()["state"], 'exhausted')
+        resumed = BsgsSolver(self.public_point, low, high, workers=1, chunk_giant_steps=16, checkpoint_path=checkpoint).start()
+        self.assertTrue(resumed.wait(5))
+        self.assertEqual(resumed.status()["state"], 'exhausted')
+        self.assertEqual(resumed.status()["ops"], first.status()["ops"])
+        with self.assertRaises(ValueError): # Same file, different search
+            BsgsSolver(self.public_point, low, high + 1, checkpoint_path=checkpoint).start()
+
+    def test_kangaroo_solver_and_checkpoint(self):
+        checkpoint = self.path('kangaroo.json')
+        solver = KangarooSolver(self.public_point, SECRET - (1 << 22), SECRET + (1 << 22), workers=1, herd_size=16,
+                                checkpoint_path=checkpoint).start()
+        self.assertTrue(solver.wait(120))
+        status = solver.status()
+        self.assertEqual(status["state"], 'found')
+        self.assertEqual(int(status["private_key_hex"], 16), SECRET)
+        self.assertGreaterEqual(status["tame_wild_collisions"], 1)
+        with open(checkpoint) as f:
+            state = json.load(f)
+        self.assertEqual((state["method"], state["dp_bits"], len(state["distinguished"])),
+                         ('kangaroo', status["dp_bits"], status["distinguished_points"]))
+
+    def test_kangaroo_same_kind_collisions(self):
+        low = SECRET - 1000
+        solver = KangarooSolver(self.public_point, low, SECRET + 1000, workers=1)
+        solver.state = 'running'
+        control = queue.Queue()
+        solver._controls = [control]
+        n = SECP256K1.n
+
+        # Two tame kangaroos on the same point at the same distance: the trails merged
+        x = SECP256K1.multiply_generator(500)[0]
+        solver._handle(('dps', 0, [(x, 500, 'tame')]))
+        solver._handle(('dps', 0, [(x, 500, 'tame')]))
+        self.assertEqual(control.get_nowait(), x)
+        # Tame kangaroos on opposite points: no restart and no information
+        solver._handle(('dps', 0, [(x, n - 500, 'tame')]))
+        self.assertTrue(control.empty())
+
+        # Wild kangaroos on opposite points: k' + d1 = -(k' + d2)
+        k, d1 = SECRET - low, 300
+        wild = SECP256K1.multiply_generator(k + d1)[0]
+        solver._handle(('dps', 0, [(wild, d1, 'wild')]))
+        solver._handle(('dps', 0, [(wild, (-2 * k - d1) % n, 'wild')]))
+        self.assertEqual((solver.state, solver.result), ('found', SECRET))
+        self.assertEqual(solver.collisions, 0)
+
+    def test_key_at_the_lower_bound(self):
+        solver = KangarooSolver(self.public_point, SECRET, SECRET + 1000, workers=1).start()
+        self.assertTrue(solver.wait(1))
+        self.assertEqual(solver.result, SECRET)
+
+    def test_validations(self):
+        with self.assertRaises(ValueError):
+            BsgsSolver(self.public_point, 10, 5)
+        with self.assertRaises(ValueError):
+            KangarooSolver(self.public_point, 1, SECP256K1.n)
+        with self.assertRaises(ValueError):
+            KangarooSolver(self.public_point, 1, 100, jump_count=12)
+        self.assertEqual(kangaroo_jumps(1 << 20, 4, seed=7), kangaroo_jumps(1 << 20, 4, seed=7))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import sys
+import os
+
+# Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from app.crypto.ecdh import PeerTable, PeerTableCache, ecdh_shared_secret
+from app.crypto.curves import SECP256K1, SECP256R1
+from app.crypto.keys import public_key_to_bytes
+
+ALICE = 0x1F2E3D4C5B6A79881F2E3D4C5B6A79881F2E3D4C5B6A79881F2E3D4C5B6A7988
+BOB = 0x00C0FFEE00C0FFEE00C0FFEE00C0FFEE00C0FFEE00C0FFEE00C0FFEE00C0FFEE
+
+def public_key(curve, k, compressed=False):
+    return public_key_to_bytes(curve.multiply_generator(k), compressed=compressed)
+
+class TestEcdh(unittest.TestCase):
+
+    def test_both_sides_agree_with_and_without_cache(self):
+        for curve in (SECP256K1, SECP256R1):
+            cache = PeerTableCache(window_bits=4)
+            alice_secret = ecdh_shared_secret(ALICE, public_key(curve, BOB), curve)
+            bob_secret = ecdh_shared_secret(format(BOB, '064x'), public_key(curve, ALICE, compressed=True).hex(), curve,
+                                            cache=cache)
+            self.assertEqual(alice_secret, bob_secret)
+            self.assertEqual(len(alice_secret), 32)
+            self.assertEqual(alice_secret, ecdh_shared_secret(ALICE, public_key(curve, BOB), curve, cache=cache))
+
+    def test_table_multiply_matches_plain_multiply(self):
+        point = SECP256K1.multiply_generator(12345)
+        table = PeerTable(point, SECP256K1, window_bits=5)
+        for k in (1, 31, 32, 0xDEADBEEF, SECP256K1.n - 1):
+            self.assertEqual(table.multiply(k), SECP256K1.multiply(k, point))
+
+    def test_lru_eviction_by_peers_and_bytes(self):
+        peers = [SECP256K1.multiply_generator(k) for k in (2, 3, 4)]
+        cache = PeerTableCache(max_peers=2, window_bits=2, build_after=1)
+        table_size = cache.get(peers[0]).nbytes
+        cache.get(peers[1])
+        cache.get(peers[0]) # peers[0] is now the most recently used
+        cache.get(peers[2]) # Evicts peers[1]
+        stats = cache.stats()
+        self.assertEqual((stats["peers"], stats["hits"], stats["misses"], stats["evictions"]), (2, 1, 3, 1))
+        self.assertEqual(stats["bytes"], 2 * table_size)
+        cache.get(peers[0])
+        self.assertEqual(cache.stats()["hits"], 2)
+
+        small = PeerTableCache(max_bytes=table_size, window_bits=2, build_after=1)
+        for point in peers:
+            small.get(point)
+        self.assertEqual((small.stats()["peers"], small.stats()["evictions"]), (1, 2))
+        tiny = PeerTableCache(max_bytes=table_size - 1, window_bits=2, build_after=1)
+        tiny.get(peers[0])
+        self.assertEqual(tiny.stats()["peers"], 0)
+
+    def test_tables_are_built_for_repeat_peers_only(self):
+        peers = [SECP256K1.multiply_generator(k) for k in (5, 6)]
+        cache = PeerTableCache(max_peers=1, window_bits=2)
+        self.assertIsNone(cache.get(peers[0])) # First exchange: plain multiplication
+        self.assertIsNotNone(cache.get(peers[0])) # The peer repeated: table built
+        self.assertIsNone(cache.get(peers[1])) # A one-off peer does not evict it
+        self.assertIsNotNone(cache.lookup(peers[0]))
+        stats = cache.stats()
+        self.assertEqual((stats["peers"], stats["tables_built"], stats["hits"], stats["misses"], stats["evictions"]),
+                         (1, 1, 1, 3, 0))
+        secret = ecdh_shared_secret(ALICE, public_key_to_bytes(peers[1]), cache=PeerTableCache())
+        self.assertEqual(secret, ecdh_shared_secret(ALICE, public_key_to_bytes(peers[1])))
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            ecdh_shared_secret(0, public_key(SECP256K1, BOB))
+        with self.assertRaises(ValueError):
+            ecdh_shared_secret(ALICE, b'\x04' + b'\x01' * 64)
+        with self.assertRaises(ValueError): # A secp256k1 key is not a P-256 point
+            ecdh_shared_secret(ALICE, public_key(SECP256K1, BOB), SECP256R1)
+        with self.assertRaises(ValueError):
+            ecdh_shared_secret('zz' * 32, public_key(SECP256K1, BOB))
+
+    def test_api(self):
+        from app.main import create_app
+        client = create_app({'TESTING': True, 'ECDH_WINDOW_BITS': 4}).test_client()
+        request = {"private_key": format(ALICE, '064x'), "peer_public_key": public_key(SECP256K1, BOB).hex()}
+        expected = ecdh_shared_secret(BOB, public_key(SECP256K1, ALICE)).hex()
+        for _ in range(3): # Plain multiplication, table build, cached table
+            response = client.post('/api/ecdh', json=request)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json()["shared_secret_hex"], expected)
+        stats = client.get('/api/ecdh/cache').get_json()
+        self.assertEqual((stats["peers"], stats["hits"], stats["misses"]), (1, 1, 2))
+        self.assertEqual(client.post('/api/ecdh', json={**request, "curve": "p256"}).status_code, 400)
+        self.assertEqual(client.post('/api/ecdh', json={"private_key": 1}).status_code, 400)
+        self.assertEqual(client.post('/api/ecdh', json=[1]).status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
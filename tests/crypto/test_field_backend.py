@@ -0,0 +1,42 @@
+import unittest
+import sys
+import os
+
+# Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from app.crypto import field_backend
+from app.crypto.secp256k1_utils import P, Gx, Gy, inverse_mod, scalar_multiplication
+
+G_POINT = (Gx, Gy)
+
+class TestFieldBackend(unittest.TestCase):
+
+    def test_python_backend_always_available(self):
+        self.assertIn('python', field_backend.available_backends())
+
+    def test_create_backend_validations(self):
+        with self.assertRaises(ValueError):
+            field_backend.create_backend('no-such-backend')
+        self.assertIn(field_backend.create_backend('auto').name, ('python', 'gmpy2'))
+
+    def test_backends_agree(self):
+        k = 0x1234567890ABCDEF1234567890ABCDEF
+        results = []
+        for name in field_backend.available_backends():
+            with field_backend.use_backend(name):
+                self.assertEqual(field_backend.get_backend().name, name)
+                inverse = inverse_mod(k, P)
+                self.assertEqual((inverse * k) % P, 1)
+                self.assertEqual(inverse_mod(-k, P), P - inverse)
+                results.append(scalar_multiplication(k, G_POINT)[0])
+        self.assertTrue(all(result == results[0] for result in results))
+
+    def test_use_backend_restores_previous(self):
+        previous = field_backend.get_backend()
+        with field_backend.use_backend('python'):
+            pass
+        self.assertIs(field_backend.get_backend(), previous)
+
+if __name__ == '__main__':
+    unittest.main()
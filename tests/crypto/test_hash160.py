@@ -0,0 +1,68 @@
+import unittest
+import hashlib
+import sys
+import os
+
+# Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from app.crypto import hash160 as h160
+from app.crypto.addresses import hash_public_key_bytes
+
+# Test vectors from the RIPEMD-160 reference (Dobbertin, Bosselaers, Preneel)
+RIPEMD160_VECTORS = [
+    (b'', '9c1185a5c5e9fc54612808977ee8f548b2258d31'),
+    (b'a', '0bdc9d2d256b3ee9daae347be6f4dc835a467ffe'),
+    (b'abc', '8eb208f7e05d987a9b044a8e98c6b087f15a0bfc'),
+    (b'message digest', '5d0689ef49d2fae572b881b123a85ffa21595f36'),
+    (b'abcdefghijklmnopqrstuvwxyz', 'f71c27109c692c1b56bbdceb5b9d2865b3708dbc'),
+    (b'abcdbcdecdefdefgefghfghighijhijkijkljklmklmnlmnomnopnopq', '12a053384a9c0c88e405a06c27dcf49ada62eb2b'),
+    (b'1234567890' * 8, '9b752e45573d4b39f4dbd3323cab82bf63326bfb'),
+]
+
+# Compressed public key of private key 1 and its HASH160 (address 1BgGZ9tcN4rm9KBzDn7KprQz87SZ26SAMH)
+PUBKEY_1_COMPRESSED = bytes.fromhex('0279be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798')
+HASH160_1_COMPRESSED = '751e76e8199196d454941c45d1b3a323f1433bd6'
+
+class TestHash160(unittest.TestCase):
+
+    def test_python_ripemd160_vectors(self):
+        for message, expected in RIPEMD160_VECTORS:
+            self.assertEqual(h160.python_ripemd160(message).hex(), expected, message)
+
+    def test_python_ripemd160_block_boundaries(self):
+        # Lengths around the 55/56/64-byte padding edges, plus the 32-byte single-block path
+        for length in (31, 32, 33, 55, 56, 63, 64, 65, 119, 120, 128):
+            message = bytes(range(length))
+            expected = h160.ripemd160(message) if h160.NATIVE_RIPEMD160 else None
+            digest = h160.python_ripemd160(message)
+            self.assertEqual(len(digest), 20)
+            if expected is not None:
+                self.assertEqual(digest, expected, length)
+
+    def test_hash160_known_key(self):
+        self.assertEqual(h160.hash160(PUBKEY_1_COMPRESSED).hex(), HASH160_1_COMPRESSED)
+        self.assertEqual(hash_public_key_bytes(PUBKEY_1_COMPRESSED).hex(), HASH160_1_COMPRESSED)
+
+    def test_hash160_many_fallback_matches(self):
+        buffers = [PUBKEY_1_COMPRESSED] + [bytes([2]) + os.urandom(32) for _ in range(20)]
+        fallback = h160.hash160_many(buffers, native=False)
+        self.assertEqual(fallback[0].hex(), HASH160_1_COMPRESSED)
+        for buffer, digest in zip(buffers, fallback):
+            self.assertEqual(digest, h160.python_ripemd160(hashlib.sha256(buffer).digest()))
+        self.assertEqual(h160.hash160_many(buffers), [h160.hash160(b) for b in buffers])
+        self.assertEqual(h160.hash160_many([]), [])
+
+    def test_fallback_when_native_missing(self):
+        original = h160.NATIVE_RIPEMD160
+        h160.NATIVE_RIPEMD160 = False
+        try:
+            self.assertEqual(h160.hash160(PUBKEY_1_COMPRESSED).hex(), HASH160_1_COMPRESSED)
+            self.assertEqual(h160.ripemd160(b'abc').hex(), RIPEMD160_VECTORS[2][1])
+            with self.assertRaises(ValueError):
+                h160.hash160_many([PUBKEY_1_COMPRESSED], native=True)
+        finally:
+            h160.NATIVE_RIPEMD160 = original
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,7 +5,9 @@ import os
 # Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
-from app.crypto.keys import generate_private_key, derive_public_key
+from app.crypto.keys import (
+    generate_private_key, derive_public_key, generate_private_keys, EntropyPool, _entropy_pool
+)
 from app.crypto.secp256k1_utils import N, Gx, Gy
 
 class TestKeys(unittest.TestCase):
@@ -66,5 +68,41 @@ class TestKeys(unittest.TestCase):
             self.assertIn('base40_symbol', step)
             self.assertIn('rodopios', step)
 
+    def test_generate_private_keys(self):
+        keys = generate_private_keys(1000)
+        self.assertEqual(len(set(keys)), 1000)
+        self.assertTrue(all(1 <= key < N for key in keys))
+        raw_keys = generate_private_keys(3, as_bytes=True)
+        self.assertTrue(all(len(key) == 32 and 1 <= int.from_bytes(key, 'big') < N for key in raw_keys))
+        self.assertEqual(generate_private_keys(0), [])
+
+    def test_rejection_sampling(self):
+        # Candidates outside [1, N-1] are skipped, never reduced (which would bias the keys)
+        pool = EntropyPool(chunk_size=64)
+        pool._buffer = b'\xff' * 32 + b'\x00' * 32 + (5).to_bytes(32, 'big')
+        pool._position = 0
+        self.assertEqual(pool.private_keys(1), [5])
+        pool._buffer = b'\x00' * 32 + (7).to_bytes(32, 'big')
+        pool._position = 0
+        self.assertEqual(pool.private_key(), 7)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "requires os.fork")
+    def test_fork_safety(self):
+        generate_private_keys(1) # Parent has a partly consumed buffer
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            os.write(write_fd, b''.join(generate_private_keys(4, as_bytes=True)))
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd, 'rb') as pipe:
+            child_keys = pipe.read()
+        os.waitpid(pid, 0)
+        parent_keys = b''.join(generate_private_keys(4, as_bytes=True))
+        self.assertEqual(len(child_keys), 128)
+        self.assertNotEqual(child_keys, parent_keys)
+        self.assertEqual(_entropy_pool._pid, os.getpid())
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from app.crypto.precomp import (
+    FixedBaseTable, write_table, write_atomically, HEADER_SIZE, PAYLOAD_SIZE, WINDOW_BITS,
+    PRECOMP_PATH_ENV_VAR, get_fixed_base_table, reset_fixed_base_table
+)
+from unittest import mock
+from app.crypto.secp256k1_utils import N, Gx, Gy, scalar_multiplication
+
+G_POINT = (Gx, Gy)
+
+class TestPrecomp(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, 'table.bin')
+
+    def test_entries_and_multiply(self):
+        table = FixedBaseTable.load_or_create(self.path)
+        self.addCleanup(table.close)
+        self.assertEqual(table.source, self.path)
+        self.assertEqual(os.path.getsize(self.path), HEADER_SIZE + PAYLOAD_SIZE)
+        self.assertEqual(table.entry(0, 1), G_POINT)
+        self.assertEqual(table.entry(1, 3), scalar_multiplication(3 << WINDOW_BITS, G_POINT)[0])
+        for k in (1, 255, 256, 0xDEADBEEFCAFE, N - 1):
+            self.assertEqual(table.multiply(k), scalar_multiplication(k, G_POINT)[0])
+        with self.assertRaises(ValueError):
+            table.multiply(0)
+
+    def test_corrupted_or_stale_file_is_regenerated(self):
+        write_table(self.path)
+        with open(self.path, 'r+b') as f:
+            f.seek(HEADER_SIZE + 10)
+            f.write(b'\xff\xff')
+        with self.assertRaisesRegex(ValueError, "checksum"):
+            FixedBaseTable.open(self.path)
+
+        with open(self.path, 'r+b') as f:
+            f.seek(8)
+            f.write(b'\x00\x63') # Another format version
+        with self.assertRaisesRegex(ValueError, "stale"):
+            FixedBaseTable.open(self.path)
+
+        table = FixedBaseTable.load_or_create(self.path)
+        self.addCleanup(table.close)
+        self.assertEqual(table.multiply(2), scalar_multiplication(2, G_POINT)[0])
+        FixedBaseTable.open(self.path).close() # The file itself was rewritten
+
+    def test_reset_keeps_tables_in_use_readable(self):
+        write_table(self.path)
+        reset_fixed_base_table()
+        self.addCleanup(reset_fixed_base_table)
+        with mock.patch.dict(os.environ, {PRECOMP_PATH_ENV_VAR: self.path}):
+            table = get_fixed_base_table()
+            reset_fixed_base_table() # Another thread may still hold `table`
+            self.assertIsNot(get_fixed_base_table(), table)
+        self.assertEqual(table.multiply(3), scalar_multiplication(3, G_POINT)[0])
+
+    def test_write_atomically(self):
+        path = os.path.join(self.tmpdir.name, 'sub', 'state.json')
+        write_atomically(path, b'first')
+        write_atomically(path, b'second', prefix='.state-')
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), b'second')
+        self.assertEqual(os.listdir(os.path.dirname(path)), ['state.json']) # No temporary files left
+        with self.assertRaises(TypeError):
+            write_atomically(path, 'not bytes')
+        self.assertEqual(os.listdir(os.path.dirname(path)), ['state.json'])
+
+    def test_unwritable_location_falls_back_to_memory(self):
+        blocker = os.path.join(self.tmpdir.name, 'not-a-dir')
+        open(blocker, 'w').close()
+        table = FixedBaseTable.load_or_create(os.path.join(blocker, 'table.bin'))
+        self.assertIsNone(table.source)
+        self.assertEqual(table.multiply(7), scalar_multiplication(7, G_POINT)[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,7 +7,9 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..',
 
 from app.crypto.secp256k1_utils import (
     P, A, B, Gx, Gy, N, POINT_INFINITY,
-    inverse_mod, is_on_curve, point_addition, point_doubling, scalar_multiplication
+    inverse_mod, is_on_curve, point_addition, point_doubling, scalar_multiplication,
+    scalar_multiply, to_jacobian, jacobian_add, jacobian_add_affine, jacobian_double,
+    batch_inverse, batch_to_affine, from_jacobian
 )
 from app.core_logic.base40 import number_to_angle, angle_to_symbol, DEFAULT_SYMBOLS
 
@@ -123,5 +125,30 @@ class TestSECP256K1Utils(unittest.TestCase):
         self.assertTrue(is_on_curve(pub_key_large[0], pub_key_large[1]))
         self.assertEqual(len(steps_large), 256)
 
+    def test_batch_inverse(self):
+        values = [1, 2, 3, P - 1, 0x1234567890ABCDEF]
+        self.assertEqual(batch_inverse(values), [inverse_mod(v, P) for v in values])
+        self.assertEqual(batch_inverse([]), [])
+        with self.assertRaises(ZeroDivisionError):
+            batch_inverse([1, P])
+
+    def test_jacobian_operations_match_affine(self):
+        p_2G = point_doubling(G_POINT)
+        p_3G = point_addition(p_2G, G_POINT)
+        jacobian_G = to_jacobian(G_POINT)
+        self.assertEqual(from_jacobian(jacobian_double(jacobian_G)), p_2G)
+        self.assertEqual(from_jacobian(jacobian_add_affine(jacobian_double(jacobian_G), G_POINT)), p_3G)
+        self.assertEqual(from_jacobian(jacobian_add(jacobian_double(jacobian_G), jacobian_G)), p_3G)
+        # Doubling and cancellation through the addition formulas
+        self.assertEqual(from_jacobian(jacobian_add_affine(jacobian_G, G_POINT)), p_2G)
+        self.assertEqual(jacobian_add_affine(jacobian_G, (Gx, P - Gy)), POINT_INFINITY)
+        self.assertEqual(batch_to_affine([POINT_INFINITY, jacobian_double(jacobian_G)]), [POINT_INFINITY, p_2G])
+
+    def test_scalar_multiply_matches_detailed(self):
+        for k in (1, 2, 3, 0xDEADBEEF, N - 1):
+            self.assertEqual(scalar_multiply(k), scalar_multiplication(k, G_POINT)[0])
+        with self.assertRaises(ValueError):
+            scalar_multiply(0)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+
+# Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from app.crypto import segwit
+from app.crypto.keys import public_key_from_bytes
+from app.crypto.secp256k1_utils import Gx, Gy, P
+
+G_POINT = (Gx, Gy)
+
+# BIP173 / BIP350 test vectors
+VALID_ADDRESSES = [
+    ('BC1QW508D6QEJXTDG4Y5R3ZARVARY0C5XW7KV8F3T4', 'bc', 0, '751e76e8199196d454941c45d1b3a323f1433bd6'),
+    ('tb1qrp33g0q5c5txsp9arysrx4k6zdkfs4nce4xj0gdcccefvpysxf3q0sl5k7', 'tb', 0,
+     '1863143c14c5166804bd19203356da136c985678cd4d27a1b8c6329604903262'),
+    ('bc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vqzk5jj0', 'bc', 1,
+     '79be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798'),
+    ('bc1zw508d6qejxtdg4y5r3zarvaryvaxxpcs', 'bc', 2, '751e76e8199196d454941c45d1b3a323'),
+]
+INVALID_ADDRESSES = [
+    'bc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vqh2y7hd', # v1 with a bech32 checksum
+    'bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3t5', # Bad checksum
+    'bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kV8f3t4', # Mixed case
+    'bc1zw508d6qejxtdg4y5r3zarvaryvqyzf3du', # Non-zero padding
+    'bc1gmk9yu', # Empty data section
+    'BC13W508D6QEJXTDG4Y5R3ZARVARY0C5XW7KN40WF2', # Invalid witness version
+]
+
+# BIP86 first receiving key (m/86'/0'/0'/0/0)
+BIP86_INTERNAL_KEY = '02cc8a4bc64d897bddc5fbc2f670f7a8ba0b386779106cf1223c6fc5d7cd6fc115'
+BIP86_OUTPUT_KEY = 'a60869f0dbcf1dc659c9cecbaf8050135ea9e8cdc487053f1dc6880949dc684c'
+BIP86_ADDRESS = 'bc1p5cyxnuxmeuwuvkwfem96lqzszd02n6xdcjrs20cac6yqjjwudpxqkedrcr'
+
+def reference_polymod(values):
+    # Bit-by-bit polymod from BIP173, to check the table-driven version
+    generators = [0x3b6a57b2, 0x26508e6d, 0x1ea119fa, 0x3d4233dd, 0x2a1462b3]
+    checksum = 1
+    for value in values:
+        top = checksum >> 25
+        checksum = (checksum & 0x1ffffff) << 5 ^ value
+        for i in range(5):
+            checksum ^= generators[i] if ((top >> i) & 1) else 0
+    return checksum
+
+class TestSegwit(unittest.TestCase):
+
+    def test_polymod_matches_reference(self):
+        values = [(i * 7 + 3) % 32 for i in range(80)]
+        self.assertEqual(segwit.bech32_polymod(values), reference_polymod(values))
+
+    def test_valid_addresses_round_trip(self):
+        for address, hrp, version, program_hex in VALID_ADDRESSES:
+            self.assertEqual(segwit.decode_segwit_address(address, hrp), (version, bytes.fromhex(program_hex)))
+            self.assertEqual(segwit.encode_segwit_address(version, bytes.fromhex(program_hex), hrp), address.lower())
+
+    def test_invalid_addresses(self):
+        for address in INVALID_ADDRESSES:
+            self.assertFalse(segwit.is_valid_segwit_address(address), address)
+        with self.assertRaises(ValueError):
+            segwit.decode_segwit_address(VALID_ADDRESSES[1][0], 'bc') # Wrong hrp
+        with self.assertRaises(ValueError):
+            segwit.encode_segwit_address(0, bytes(21))
+
+    def test_p2wpkh(self):
+        self.assertEqual(segwit.p2wpkh_address(G_POINT), 'bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3t4')
+
+    def test_p2tr_bip86_vector(self):
+        internal = public_key_from_bytes(bytes.fromhex(BIP86_INTERNAL_KEY))
+        self.assertEqual(segwit.taproot_output_key(internal).hex(), BIP86_OUTPUT_KEY)
+        self.assertEqual(segwit.p2tr_address(internal), BIP86_ADDRESS)
+        # Only x(P) matters: the odd-y point gives the same output key
+        self.assertEqual(segwit.p2tr_address((internal[0], P - internal[1])), BIP86_ADDRESS)
+
+    def test_batch_helpers_match_single(self):
+        points = [G_POINT, public_key_from_bytes(bytes.fromhex(BIP86_INTERNAL_KEY))]
+        self.assertEqual(segwit.p2wpkh_addresses(points), [segwit.p2wpkh_address(point) for point in points])
+        self.assertEqual(segwit.p2tr_addresses(points), [segwit.p2tr_address(point) for point in points])
+        addresses = [address for address, _, _, _ in VALID_ADDRESSES] + INVALID_ADDRESSES
+        self.assertEqual(segwit.validate_segwit_addresses(addresses), [True, False, True, True] + [False] * 6)
+        self.assertEqual(segwit.decode_segwit_addresses([BIP86_ADDRESS])[0], (1, bytes.fromhex(BIP86_OUTPUT_KEY)))
+
+if __name__ == '__main__':
+    unittest.main()
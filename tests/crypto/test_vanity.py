@@ -0,0 +1,85 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from app.crypto.vanity import VanityPattern, VanitySearch, iter_point_batches, scan_keys, build_vanity_result
+from app.crypto.secp256k1_utils import scalar_multiply
+from app.crypto.addresses import ripemd160_to_base40, base58check_encode_bitcoin
+from app.core_logic.base40 import DEFAULT_SYMBOLS
+
+
+class TestVanity(unittest.TestCase):
+
+    def test_base40_pattern_matches_encoded_address(self):
+        pattern = VanityPattern([DEFAULT_SYMBOLS[0] + DEFAULT_SYMBOLS[5], DEFAULT_SYMBOLS[1]])
+        for value in (0, 1, 40 ** 29 * 5, 40 ** 29 * 6 - 1, 40 ** 29 * 6, 40 ** 30, (1 << 160) - 1):
+            hash160_bytes = value.to_bytes(20, 'big')
+            address = ripemd160_to_base40(hash160_bytes)
+            self.assertEqual(pattern.matches(hash160_bytes), address.startswith(tuple(pattern.prefixes)), address)
+
+    def test_pattern_validations(self):
+        with self.assertRaises(ValueError):
+            VanityPattern([])
+        with self.assertRaises(ValueError):
+            VanityPattern('!')
+        with self.assertRaises(ValueError):
+            VanityPattern(DEFAULT_SYMBOLS[2]) # Above 2^160, can never match
+        with self.assertRaises(ValueError):
+            VanityPattern('1O', encoding='base58') # 'O' is not in the Base58 alphabet
+        with self.assertRaises(ValueError):
+            VanityPattern('3abc', encoding='base58')
+
+    def test_base58_pattern(self):
+        hash160_bytes = bytes(range(20))
+        address = base58check_encode_bitcoin(hash160_bytes)
+        self.assertTrue(VanityPattern(address[:3], encoding='base58').matches(hash160_bytes))
+        self.assertIsNone(VanityPattern('1', encoding='base58').match_probability())
+
+    def test_iter_point_batches_are_consecutive(self):
+        start_key = 0xC0FFEE
+        first_key, points = next(iter_point_batches(start_key, batch_size=8))
+        self.assertEqual(first_key, start_key)
+        self.assertEqual(points, [scalar_multiply(start_key + offset) for offset in range(8)])
+
+    def test_scan_keys_reports_valid_matches(self):
+        pattern = VanityPattern(DEFAULT_SYMBOLS[0]) # Roughly 80% of all addresses
+        matches = scan_keys(1000, 50, pattern, batch_size=16)
+        self.assertTrue(matches)
+        for private_key_int, hash160_bytes in matches:
+            self.assertTrue(1000 <= private_key_int < 1050)
+            result = build_vanity_result(private_key_int, hash160_bytes)
+            self.assertTrue(result['address_base40'].startswith(DEFAULT_SYMBOLS[0]))
+
+    def test_search_end_to_end(self):
+        search = VanitySearch(VanityPattern(DEFAULT_SYMBOLS[0]), workers=1, batch_size=16, max_results=2)
+        search.start()
+        self.assertTrue(search.wait(timeout=60))
+        status = search.status()
+        self.assertEqual(status['state'], 'completed')
+        self.assertEqual(len(status['results']), 2)
+        self.assertGreater(status['keys_checked'], 0)
+
+    def test_cancel_before_start(self):
+        search = VanitySearch(VanityPattern(DEFAULT_SYMBOLS[0]), workers=1)
+        search.cancel()
+        self.assertTrue(search.wait(timeout=1))
+        self.assertEqual(search.status()['state'], 'cancelled')
+
+    def test_api_validation(self):
+        from app.main import create_app
+        client = create_app({'TESTING': True}).test_client()
+        self.assertEqual(client.post('/api/vanity', json=[1]).status_code, 400)
+        self.assertEqual(client.post('/api/vanity', json={"prefix": "0OIl", "encoding": "base58"}).status_code, 400)
+        with mock.patch('app.api.routes.VanitySearch') as search_class:
+            search_class.return_value.start.return_value = search_class.return_value
+            search_class.return_value.status.return_value = {"state": 'running'}
+            response = client.post('/api/vanity', json={"prefix": DEFAULT_SYMBOLS[0], "workers": 0})
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(search_class.call_args.kwargs['workers'], 1) # Clamped to at least one worker
+
+if __name__ == '__main__':
+    unittest.main()
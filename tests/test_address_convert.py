@@ -0,0 +1,102 @@
+import unittest
+import sys
+import os
+import json
+from unittest import mock
+
+# Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.address_convert import convert_addresses, decode_address, encode_hash160, stream_address_conversions
+from app.crypto.addresses import ripemd160_to_base40, base58check_encode_bitcoin
+from app.executor import get_crypto_executor, ExecutorTimeout
+from app.main import create_app
+
+# hash160 of the uncompressed public key of private key 1
+G_HASH160 = bytes.fromhex("91b24bf9f5288532960ac687abb035127b1d28a5")
+G_BASE58 = "1EHNa6Q4Jz2uvNExL497mE43ikXhwF6kZm"
+G_BASE40 = ripemd160_to_base40(G_HASH160, target_length=31)
+
+def parse_ndjson(text):
+    return [json.loads(line) for line in text.splitlines() if line]
+
+class TestAddressConvert(unittest.TestCase):
+
+    def test_encoders_match_pipeline_functions(self):
+        for hash160 in (G_HASH160, bytes(20), b'\x00\x00' + bytes(range(18)), b'\xff' * 20):
+            self.assertEqual(encode_hash160(hash160, 'base40'), ripemd160_to_base40(hash160, target_length=31))
+            self.assertEqual(encode_hash160(hash160, 'base58'), base58check_encode_bitcoin(hash160))
+            for output_format in ('hash160', 'base40', 'base58', 'p2wpkh'):
+                self.assertEqual(decode_address(encode_hash160(hash160, output_format)), (output_format, hash160))
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            decode_address(G_BASE58[:-1] + 'n') # Checksum
+        with self.assertRaises(ValueError):
+            decode_address(G_BASE40[1:]) # 30 symbols
+        with self.assertRaises(ValueError):
+            decode_address('3J98t1WpEZ73CNmQviecrnyiWrnqRhWNLy') # P2SH version byte
+        with self.assertRaises(ValueError):
+            decode_address('bc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vqzk5jj0') # Not P2WPKH
+        with self.assertRaises(ValueError):
+            decode_address(G_HASH160.hex(), 'base58')
+        with self.assertRaises(ValueError):
+            convert_addresses([G_BASE58], ['base64'])
+
+    def test_convert_records(self):
+        records = convert_addresses([G_BASE58, G_BASE40, 'not-an-address'], ['hash160', 'base58'])
+        self.assertEqual(records[0], {"input": G_BASE58, "format": "base58", "hash160": G_HASH160.hex(), "base58": G_BASE58})
+        self.assertEqual(records[1]["format"], "base40")
+        self.assertEqual(records[1]["base58"], G_BASE58)
+        self.assertIn("error", records[2])
+
+    def test_stream_in_batches(self):
+        data = (G_BASE58 + "\n") * 5 + "\n" + G_BASE40
+        batches = list(stream_address_conversions([data.encode()[:17], data.encode()[17:]], ['base40'], batch_size=2))
+        self.assertEqual(len(batches), 3)
+        records = parse_ndjson("".join(batches))
+        self.assertEqual(len(records), 6)
+        self.assertTrue(all(record["base40"] == G_BASE40 for record in records))
+
+    def test_stream_line_limit(self):
+        records = parse_ndjson("".join(stream_address_conversions([G_BASE58.encode() + b"\n" + b"x" * 1000], ['hash160'])))
+        self.assertEqual(records[0]["hash160"], G_HASH160.hex())
+        self.assertEqual(list(records[1]), ["error"])
+
+class TestConvertRoute(unittest.TestCase):
+
+    def setUp(self):
+        self.client = create_app({'TESTING': True}).test_client()
+
+    def test_json_request(self):
+        response = self.client.post('/api/addresses/convert', json={"addresses": [G_BASE40], "to": ["base58", "p2wpkh"]})
+        self.assertEqual(response.status_code, 200)
+        result = response.get_json()["results"][0]
+        self.assertEqual(result["base58"], G_BASE58)
+        self.assertTrue(result["p2wpkh"].startswith("bc1q"))
+
+    def test_text_stream(self):
+        response = self.client.post('/api/addresses/convert?to=base40&from=base58', data=(G_BASE58 + "\n") * 3,
+                                    content_type='text/plain')
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        records = parse_ndjson(response.get_data(as_text=True))
+        self.assertEqual([record["base40"] for record in records], [G_BASE40] * 3)
+
+    def test_timeouts(self):
+        app = create_app({'TESTING': True})
+        client = app.test_client()
+        with mock.patch.object(get_crypto_executor(app), 'call', side_effect=ExecutorTimeout("too slow")):
+            response = client.post('/api/addresses/convert', json={"addresses": [G_BASE40], "to": ["base58"]})
+            self.assertEqual(response.status_code, 504)
+            response = client.post('/api/addresses/convert?to=base40', data=G_BASE58 + "\n", content_type='text/plain')
+            self.assertEqual(response.status_code, 200) # Streamed: the error is the last line
+            records = parse_ndjson(response.get_data(as_text=True))
+            self.assertEqual(records[-1]["error"], "Address conversion timed out")
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.client.post('/api/addresses/convert?to=base64', data='x').status_code, 400)
+        self.assertEqual(self.client.post('/api/addresses/convert?to=base58&from=wif', data='x').status_code, 400)
+        self.assertEqual(self.client.post('/api/addresses/convert', json={"addresses": [], "to": "base58"}).status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+import sys
+import os
+import json
+import random
+import tempfile
+
+# Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.address_index import AddressIndex, build_index, parse_watch_entry, bloom_parameters
+from app.bulk import run_bulk_generation
+from app.cli import main as cli_main
+from app.crypto.addresses import ripemd160_to_base40, base58check_encode_bitcoin
+from app.main import create_app
+
+G_HASH160 = bytes.fromhex("91b24bf9f5288532960ac687abb035127b1d28a5")
+
+class TestAddressIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, 'watch.idx')
+        rng = random.Random(7)
+        self.members = [rng.randbytes(20) for _ in range(500)]
+
+    def _open(self):
+        index = AddressIndex(self.path)
+        self.addCleanup(index.close)
+        return index
+
+    def test_parse_watch_entry(self):
+        self.assertEqual(parse_watch_entry(G_HASH160.hex()), G_HASH160)
+        self.assertEqual(parse_watch_entry(ripemd160_to_base40(G_HASH160)), G_HASH160)
+        self.assertEqual(parse_watch_entry(" 1EHNa6Q4Jz2uvNExL497mE43ikXhwF6kZm\n"), G_HASH160)
+        with self.assertRaises(ValueError):
+            parse_watch_entry("not an address")
+        for version in (0x05, 0x6F): # P2SH and testnet P2PKH of the same hash160
+            with self.assertRaises(ValueError):
+                parse_watch_entry(base58check_encode_bitcoin(G_HASH160, version_byte=version))
+
+    def test_exact_and_batch_membership(self):
+        # Small sort chunks force a multi-run external merge; duplicates are dropped
+        summary = build_index(self.path, self.members + self.members[:50], chunk_entries=64)
+        self.assertEqual(summary['entries'], 500)
+        index = self._open()
+        self.assertEqual(len(index), 500)
+        self.assertTrue(all(member in index for member in self.members))
+
+        rng = random.Random(8)
+        strangers = [rng.randbytes(20) for _ in range(500)]
+        self.assertFalse(any(index.contains(stranger) for stranger in strangers))
+        mixed = strangers[:100] + self.members[:100]
+        rng.shuffle(mixed)
+        self.assertEqual(index.contains_many(mixed), [value in self.members for value in mixed])
+
+    def test_bloom_filter_rejects_most_misses(self):
+        build_index(self.path, self.members, false_positive_rate=0.01)
+        index = self._open()
+        rng = random.Random(9)
+        false_positives = sum(index.might_contain(rng.randbytes(20)) for _ in range(5000))
+        self.assertLess(false_positives, 150)
+        self.assertEqual(bloom_parameters(1000, 0.01), (9592, 7))
+
+    def test_empty_and_invalid_files(self):
+        build_index(self.path, [])
+        self.assertFalse(self._open().contains(G_HASH160))
+        with open(self.path, 'r+b') as f:
+            f.truncate(10)
+        with self.assertRaises(ValueError):
+            AddressIndex(self.path)
+        with self.assertRaises(ValueError):
+            AddressIndex(os.path.join(self.tmpdir.name, 'missing.idx'))
+
+    def test_cli_build_and_query(self):
+        watchlist = os.path.join(self.tmpdir.name, 'watch.txt')
+        with open(watchlist, 'w', encoding='utf-8') as f:
+            f.write("# watch list\n1EHNa6Q4Jz2uvNExL497mE43ikXhwF6kZm\ngarbage\n")
+            f.write(ripemd160_to_base40(self.members[0]) + "\n" + self.members[1].hex() + "\n")
+        self.assertEqual(cli_main(['index', 'build', '--out', self.path, watchlist]), 0)
+        self.assertEqual(len(self._open()), 3)
+        self.assertEqual(cli_main(['index', 'query', '--index', self.path, G_HASH160.hex()]), 0)
+
+    def test_bulk_generation_watch_hits(self):
+        # Fresh random keys never hit a real index; a generated record's own hash160 does
+        class EveryOtherRecord:
+            def contains_many(self, hash160s):
+                return [i % 2 == 0 for i in range(len(hash160s))]
+
+        out_path = os.path.join(self.tmpdir.name, 'out.ndjson')
+        summary = run_bulk_generation(out_path, 6, workers=1, chunk_size=3, watch_index=EveryOtherRecord())
+        self.assertEqual(summary['watch_hits'], 4)
+        with open(out_path, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([record.get('watch_hit', False) for record in records], [True, False, True] * 2)
+
+        build_index(self.path, [bytes.fromhex(records[1]['hashed_public_key_ripemd160_hex'])] + self.members)
+        self.assertEqual(run_bulk_generation(out_path, 6, workers=1, watch_index=self._open())['watch_hits'], 0)
+
+class TestLookupRoute(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        path = os.path.join(self.tmpdir.name, 'watch.idx')
+        build_index(path, [G_HASH160])
+        self.app = create_app({'TESTING': True, 'ADDRESS_INDEX_PATH': path})
+        self.addCleanup(lambda: self.app.extensions['base40_address_index'].close()
+                        if 'base40_address_index' in self.app.extensions else None)
+        self.client = self.app.test_client()
+
+    def test_lookup(self):
+        other = base58check_encode_bitcoin(bytes(20))
+        response = self.client.post('/api/addresses/lookup',
+                                    json={"addresses": ["1EHNa6Q4Jz2uvNExL497mE43ikXhwF6kZm", other, "bad"]})
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()['results']
+        self.assertEqual([result.get('found') for result in results], [True, False, None])
+        self.assertIn('error', results[2])
+
+        response = self.client.get('/api/addresses/lookup?address=' + G_HASH160.hex())
+        self.assertTrue(response.get_json()['results'][0]['found'])
+
+    def test_validation_and_missing_index(self):
+        self.assertEqual(self.client.post('/api/addresses/lookup', json={}).status_code, 400)
+        self.assertEqual(self.client.post('/api/addresses/lookup', json=[1]).status_code, 400)
+        client = create_app({'TESTING': True, 'ADDRESS_INDEX_PATH': None}).test_client()
+        self.assertEqual(client.get('/api/addresses/lookup?address=x').status_code, 503)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+import sys
+import os
+import json
+from unittest import mock
+
+# Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.address_stream import address_batch, iter_hex_keys, iter_raw_keys, stream_address_records
+from app.pipeline import build_address_record
+from app.crypto.hash160 import hash160_many
+from app.crypto.secp256k1_utils import Gx, Gy
+from app.executor import get_crypto_executor, ExecutorTimeout
+from app.main import create_app
+
+G_UNCOMPRESSED = bytes.fromhex(f"04{Gx:064x}{Gy:064x}")
+G_COMPRESSED = bytes([0x02 + (Gy & 1)]) + Gx.to_bytes(32, 'big')
+G_HASH160_HEX = "91b24bf9f5288532960ac687abb035127b1d28a5"
+
+def split_bytes(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+def parse_ndjson(text):
+    return [json.loads(line) for line in text.splitlines()]
+
+class TestAddressStream(unittest.TestCase):
+
+    def test_hex_lines_across_chunk_boundaries(self):
+        data = (G_UNCOMPRESSED.hex() + "\n\n" + G_COMPRESSED.hex() + "\r\nzz\n" + G_UNCOMPRESSED.hex()).encode()
+        keys = list(iter_hex_keys(split_bytes(data, 7)))
+        self.assertEqual(keys, [G_UNCOMPRESSED, G_COMPRESSED, 'zz', G_UNCOMPRESSED])
+
+    def test_raw_keys_across_chunk_boundaries(self):
+        data = G_UNCOMPRESSED + G_COMPRESSED + G_UNCOMPRESSED
+        self.assertEqual(list(iter_raw_keys(split_bytes(data, 10))), [G_UNCOMPRESSED, G_COMPRESSED, G_UNCOMPRESSED])
+        with self.assertRaises(ValueError):
+            list(iter_raw_keys([G_COMPRESSED[:20]]))
+        with self.assertRaises(ValueError):
+            list(iter_raw_keys([b'\x05' + G_COMPRESSED[1:]]))
+
+    def test_hex_line_length_limit(self):
+        with self.assertRaises(ValueError):
+            list(iter_hex_keys([b'a' * 1000]))
+
+    def test_stream_records_in_batches(self):
+        data = (G_UNCOMPRESSED.hex() + "\n") * 5 + "nothex\n"
+        batches = list(stream_address_records([data.encode()], 'hex', batch_size=2))
+        self.assertEqual(len(batches), 3)
+        records = parse_ndjson("".join(batches))
+        self.assertEqual([record['index'] for record in records], list(range(6)))
+        self.assertEqual(records[0]['hashed_public_key_ripemd160_hex'], G_HASH160_HEX)
+        self.assertEqual(records[0]['address_bitcoin_base58check'], "1EHNa6Q4Jz2uvNExL497mE43ikXhwF6kZm")
+        self.assertIn('error', records[5])
+
+    def test_segwit_fields_are_opt_in(self):
+        not_on_curve = b'\x02' + b'\x05' * 32
+        self.assertNotIn('address_p2tr', address_batch([G_COMPRESSED], 0)[0])
+        records = address_batch([G_COMPRESSED, 'zz', not_on_curve, G_UNCOMPRESSED], 0, segwit=True)
+        self.assertEqual(records[0]['address_p2wpkh'], 'bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3t4')
+        self.assertEqual({key: records[3][key] for key in ('address_p2wpkh', 'address_p2tr')},
+                         {key: value for key, value in build_address_record(G_UNCOMPRESSED, segwit=True).items()
+                          if key in ('address_p2wpkh', 'address_p2tr')})
+        self.assertIn('error', records[1])
+        self.assertIn('error', records[2])
+        self.assertNotIn('address_base40', records[2])
+
+    def test_batch_is_hashed_once(self):
+        keys = [G_UNCOMPRESSED, b'\x05' * 33, G_COMPRESSED]
+        with mock.patch('app.pipeline.hash160_many', wraps=hash160_many) as batch_hash:
+            records = address_batch(keys, 10)
+        batch_hash.assert_called_once_with([G_UNCOMPRESSED, G_COMPRESSED]) # The malformed key is skipped
+        self.assertIn('error', records[1])
+        for record, key in ((records[0], G_UNCOMPRESSED), (records[2], G_COMPRESSED)):
+            self.assertEqual({field: value for field, value in record.items() if field != 'index'},
+                             build_address_record(key))
+
+    def test_parse_error_ends_stream(self):
+        records = parse_ndjson("".join(stream_address_records([G_COMPRESSED + b'\x07'], 'raw')))
+        self.assertEqual(records[0]['public_key_hex'], G_COMPRESSED.hex())
+        self.assertEqual(list(records[1]), ['error'])
+
+class TestBulkAddressesRoute(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app({'TESTING': True})
+        self.client = self.app.test_client()
+
+    def test_hex_upload(self):
+        response = self.client.post('/api/addresses/bulk', data=(G_UNCOMPRESSED.hex() + "\n") * 3, content_type='text/plain')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        records = parse_ndjson(response.get_data(as_text=True))
+        self.assertEqual(len(records), 3)
+        self.assertTrue(all(record['hashed_public_key_ripemd160_hex'] == G_HASH160_HEX for record in records))
+
+    def test_raw_upload(self):
+        response = self.client.post('/api/addresses/bulk', data=G_UNCOMPRESSED + G_COMPRESSED,
+                                    content_type='application/octet-stream')
+        records = parse_ndjson(response.get_data(as_text=True))
+        self.assertEqual([record['public_key_hex'] for record in records], [G_UNCOMPRESSED.hex(), G_COMPRESSED.hex()])
+        self.assertNotIn('address_p2tr', records[0])
+        response = self.client.post('/api/addresses/bulk?segwit=1', data=G_COMPRESSED,
+                                    content_type='application/octet-stream')
+        self.assertTrue(parse_ndjson(response.get_data(as_text=True))[0]['address_p2tr'].startswith('bc1p'))
+
+    def test_invalid_format(self):
+        response = self.client.post('/api/addresses/bulk?format=base64', data=b'')
+        self.assertEqual(response.status_code, 400)
+
+    def test_timeout_ends_stream(self):
+        with mock.patch.object(get_crypto_executor(self.app), 'call', side_effect=ExecutorTimeout("too slow")):
+            response = self.client.post('/api/addresses/bulk', data=G_UNCOMPRESSED.hex(), content_type='text/plain')
+            records = parse_ndjson(response.get_data(as_text=True))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(records[-1]), ["error", "details"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import sys
+import os
+import json
+import asyncio
+
+# Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.asgi import create_asgi_app
+from app.executor import ExecutorTimeout
+
+def call_app(app, path, method='GET', query=b'', body=b'', headers=()):
+    """Runs one request through the ASGI callable and returns (status, headers, body)."""
+    messages = []
+    requests = [{'type': 'http.request', 'body': body, 'more_body': False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await asyncio.sleep(3600) # No disconnect while the response is produced
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': method,
+             'scheme': 'http', 'path': path, 'raw_path': path.encode('latin-1'), 'query_string': query,
+             'root_path': '', 'headers': list(headers), 'server': ('testserver', 80), 'client': ('127.0.0.1', 1234)}
+    asyncio.run(app(scope, receive, send))
+    start = messages[0]
+    body = b''.join(message.get('body', b'') for message in messages[1:])
+    assert not messages[-1].get('more_body', False), "Response did not finish"
+    return start['status'], dict(start['headers']), body
+
+class TestAsgiApp(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_asgi_app({'TESTING': True, 'EXECUTOR_WORKERS': 0})
+
+    def test_status_and_ready(self):
+        status, _, body = call_app(self.app, '/status')
+        self.assertEqual(status, 200)
+        self.assertIn('field_backend', json.loads(body))
+        status, _, body = call_app(self.app, '/ready')
+        self.assertEqual(status, 200)
+        self.assertTrue(json.loads(body)['ready'])
+
+    def test_flask_routes_are_served(self):
+        status, _, body = call_app(self.app, '/api/derive', method='POST', body=b'{"private_key": "1"}',
+                                   headers=[(b'content-type', b'application/json'), (b'content-length', b'20')])
+        self.assertEqual(status, 200)
+        self.assertTrue(json.loads(body)['public_key_uncompressed_hex'].startswith('0479be667e'))
+        status, _, body = call_app(self.app, '/api/generate_keypair_detailed', query=b'curve=p256')
+        self.assertEqual(json.loads(body)['curve'], 'secp256r1')
+        self.assertEqual(call_app(self.app, '/')[0], 200)
+
+    def test_generate_keypair(self):
+        status, headers, body = call_app(self.app, '/api/generate_keypair_detailed')
+        self.assertEqual(status, 200)
+        self.assertEqual(headers[b'content-type'], b'application/json')
+        bundle = json.loads(body)
+        self.assertEqual(len(bundle['scalar_multiplication_steps']), 256)
+
+    def test_export_csv(self):
+        status, _, body = call_app(self.app, '/export/csv')
+        self.assertEqual(status, 200)
+        self.assertEqual(len(body.decode('utf-8').strip().splitlines()), 257) # Header + 256 steps
+
+    def test_stream_steps(self):
+        status, headers, body = call_app(self.app, '/api/stream/steps')
+        self.assertEqual(status, 200)
+        self.assertEqual(headers[b'content-type'], b'text/event-stream')
+        events = [block.split('\n')[0] for block in body.decode('utf-8').strip().split('\n\n')]
+        self.assertEqual(events[0], 'event: keypair')
+        self.assertEqual(events.count('event: step'), 256)
+        self.assertEqual(events[-1], 'event: end')
+
+    def test_stream_batch(self):
+        status, _, body = call_app(self.app, '/api/stream/batch', query=b'count=70')
+        self.assertEqual(status, 200)
+        records = [json.loads(line) for line in body.decode('utf-8').splitlines()]
+        self.assertEqual([record['index'] for record in records], list(range(70)))
+
+    def test_errors(self):
+        self.assertEqual(call_app(self.app, '/nope')[0], 404)
+        self.assertEqual(call_app(self.app, '/status', method='POST')[0], 405)
+        self.assertEqual(call_app(self.app, '/api/stream/batch', query=b'count=0')[0], 400)
+        self.assertEqual(call_app(self.app, '/api/stream/steps', query=b'interval_ms=x')[0], 400)
+
+    def test_error_after_stream_started(self):
+        calls = []
+        call_async = self.app.executor.call_async
+
+        async def flaky_call(fn, *args):
+            calls.append(fn)
+            if len(calls) > 1:
+                raise ExecutorTimeout("chunk timed out")
+            return await call_async(fn, *args)
+
+        self.app.executor.call_async = flaky_call
+        status, _, body = call_app(self.app, '/api/stream/batch', query=b'count=200')
+        self.assertEqual(status, 200) # Only one response start; the error ends the stream
+        lines = [json.loads(line) for line in body.decode('utf-8').splitlines()]
+        self.assertEqual(len(lines), 65)
+        self.assertEqual(lines[-1]['status'], 504)
+
+    def test_unexpected_error(self):
+        async def broken_call(fn, *args):
+            raise RuntimeError("boom")
+
+        self.app.executor.call_async = broken_call
+        status, _, body = call_app(self.app, '/api/stream/steps')
+        self.assertEqual(status, 500)
+        self.assertIn('error', json.loads(body))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import sys
+import os
+import csv
+import json
+import tempfile
+
+# Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.bulk import CSV_FIELDS, CSV_FIELDS_WITHOUT_SEGWIT, run_bulk_generation, scan_completed_indexes
+
+class TestBulkGeneration(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def _path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def test_ordered_ndjson(self):
+        path = self._path('out.ndjson')
+        summary = run_bulk_generation(path, 10, workers=2, chunk_size=3)
+        self.assertEqual(summary['written'], 10)
+        with open(path, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([record['index'] for record in records], list(range(10)))
+        self.assertEqual(len({record['private_key_hex'] for record in records}), 10)
+
+    def test_csv_header_and_rows(self):
+        path = self._path('out.csv')
+        run_bulk_generation(path, 4, workers=1, output_format='csv', ordered=False)
+        with open(path, encoding='utf-8', newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(sorted(int(row['index']) for row in rows), [0, 1, 2, 3])
+        self.assertEqual(list(rows[0]), CSV_FIELDS_WITHOUT_SEGWIT)
+
+        run_bulk_generation(path, 2, workers=1, output_format='csv', segwit=True)
+        with open(path, encoding='utf-8', newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(list(rows[0]), CSV_FIELDS)
+        self.assertTrue(rows[0]['address_p2tr'].startswith('bc1p'))
+
+    def test_resume_after_interrupted_run(self):
+        path = self._path('out.ndjson')
+        run_bulk_generation(path, 6, workers=1, chunk_size=2)
+        with open(path, encoding='utf-8') as f:
+            lines = f.readlines()
+        # Simulate an interruption: records 0, 2 and 5 survived, plus half of another line
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(lines[0] + lines[2] + lines[5] + lines[3][:20])
+
+        completed = scan_completed_indexes(path, 6, 'ndjson')
+        self.assertEqual([i for i in range(6) if completed[i >> 3] & (1 << (i & 7))], [0, 2, 5])
+
+        summary = run_bulk_generation(path, 6, workers=1, chunk_size=2, resume=True)
+        self.assertEqual((summary['written'], summary['skipped']), (3, 3))
+        with open(path, encoding='utf-8') as f:
+            indexes = sorted(json.loads(line)['index'] for line in f)
+        self.assertEqual(indexes, list(range(6)))
+
+    def test_resume_refuses_other_segwit_setting(self):
+        for output_format in ('csv', 'ndjson'):
+            path = self._path(f'segwit.{output_format}')
+            run_bulk_generation(path, 2, workers=1, output_format=output_format, segwit=True)
+            with open(path, 'rb') as f:
+                before = f.read()
+            with self.assertRaisesRegex(ValueError, "SegWit"):
+                run_bulk_generation(path, 4, workers=1, output_format=output_format, resume=True)
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), before) # Nothing appended
+            summary = run_bulk_generation(path, 4, workers=1, output_format=output_format, resume=True, segwit=True)
+            self.assertEqual((summary['written'], summary['skipped']), (2, 2))
+
+    def test_validations(self):
+        with self.assertRaises(ValueError):
+            run_bulk_generation(self._path('x'), 1, output_format='xml')
+        with self.assertRaises(ValueError):
+            run_bulk_generation(self._path('x'), 1, output_format='csv', include_steps=True)
+
+if __name__ == '__main__':
+    unittest.main()
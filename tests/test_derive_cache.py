@@ -0,0 +1,95 @@
+import unittest
+import sys
+import os
+import json
+
+# Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.derive_cache import DerivationCache
+from app.main import create_app
+from app.pipeline import build_keypair_bundle, parse_private_key
+from app.crypto.secp256k1_utils import N
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class TestDerivationCache(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        cache = DerivationCache(2, ttl=60)
+        cache.put(1, 'secp256k1', '04aa', [])
+        cache.put(2, 'secp256k1', '04bb', [])
+        self.assertEqual(cache.get(1, 'secp256k1'), ('04aa', [])) # 1 becomes most recent
+        cache.put(3, 'secp256k1', '04cc', [])
+        self.assertIsNone(cache.get(2, 'secp256k1'))
+        self.assertIsNotNone(cache.get(1, 'secp256k1'))
+        self.assertIsNone(cache.get(1, 'secp256r1')) # The curve is part of the key
+        stats = cache.stats()
+        self.assertEqual((stats["entries"], stats["evictions"], stats["hits"]), (2, 1, 2))
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = DerivationCache(10, ttl=5, clock=clock)
+        cache.put(7, 'secp256k1', '04aa', [])
+        clock.now += 4
+        self.assertIsNotNone(cache.get(7, 'secp256k1'))
+        clock.now += 2
+        self.assertIsNone(cache.get(7, 'secp256k1'))
+        self.assertEqual(cache.stats()["expirations"], 1)
+
+    def test_salted_digests(self):
+        self.assertNotEqual(DerivationCache(1)._digest(5, 'secp256k1'), DerivationCache(1)._digest(5, 'secp256k1'))
+        with self.assertRaises(ValueError):
+            DerivationCache(0)
+
+    def test_parse_private_key(self):
+        bundle = build_keypair_bundle(0xABC, include_steps=False)
+        self.assertEqual(parse_private_key('0xabc'), 0xABC)
+        self.assertEqual(parse_private_key(bundle['private_key_hex']), 0xABC)
+        self.assertEqual(parse_private_key(bundle['private_key_base40']), 0xABC)
+        for invalid in ('', 'xyz', '1' * 65, '1_0'):
+            with self.assertRaises(ValueError):
+                parse_private_key(invalid)
+
+class TestDeriveRoute(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app({'TESTING': True, 'DERIVE_CACHE_SIZE': 4})
+        self.client = self.app.test_client()
+
+    def test_derive_matches_pipeline_and_caches(self):
+        expected = json.loads(json.dumps(build_keypair_bundle(0x1D2C3B4A))) # Tuples become lists in JSON
+        first = self.client.post('/api/derive', json={"private_key": expected['private_key_hex']})
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.get_json(), expected)
+        second = self.client.post('/api/derive', json={"private_key": expected['private_key_base40']})
+        self.assertEqual(second.get_json(), expected)
+        stats = self.client.get('/api/derive/cache').get_json()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 1, 1))
+
+    def test_without_steps_and_other_curve(self):
+        response = self.client.post('/api/derive', json={"private_key": "1", "include_steps": False, "curve": "p256"})
+        bundle = response.get_json()
+        self.assertEqual(bundle['curve'], 'secp256r1')
+        self.assertNotIn('scalar_multiplication_steps', bundle)
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.client.post('/api/derive', json={}).status_code, 400)
+        self.assertEqual(self.client.post('/api/derive', json=[1]).status_code, 400)
+        self.assertEqual(self.client.post('/api/derive', data='x').status_code, 400)
+        self.assertEqual(self.client.post('/api/derive', json={"private_key": "0"}).status_code, 400)
+        self.assertEqual(self.client.post('/api/derive', json={"private_key": format(N, 'x')}).status_code, 400)
+        self.assertEqual(self.client.post('/api/derive', json={"private_key": "1", "curve": "ed25519"}).status_code, 400)
+
+    def test_cache_is_opt_in(self):
+        client = create_app({'TESTING': True}).test_client()
+        self.assertEqual(client.get('/api/derive/cache').status_code, 404)
+        self.assertEqual(client.post('/api/derive', json={"private_key": "2", "include_steps": False}).status_code, 200)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import threading
+import time
+
+# Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.distributed import ScanCoordinator, load_targets, run_worker, scan_range
+from app.crypto.addresses import hash_public_key_bytes, ripemd160_to_base40
+from app.crypto.keys import public_key_to_bytes
+from app.crypto.secp256k1_utils import scalar_multiply
+
+def hash160_of(k):
+    return hash_public_key_bytes(public_key_to_bytes(scalar_multiply(k)))
+
+class TestDistributedScan(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.checkpoint = os.path.join(self.tmpdir.name, 'scan.json')
+        # One target as hash160 hex, one as address_base40
+        self.targets = load_targets([hash160_of(1000).hex(), ripemd160_to_base40(hash160_of(4321), target_length=31)])
+
+    def test_scan_range(self):
+        self.assertEqual(scan_range(1, 5000, self.targets, batch_size=100),
+                         [(1000, hash160_of(1000)), (4321, hash160_of(4321))])
+        self.assertEqual(scan_range(1001, 4321, self.targets), [])
+
+    def test_workers_over_tcp(self):
+        coordinator = ScanCoordinator(self.targets, 1, 6000, lease_size=700, checkpoint_path=self.checkpoint)
+        host, port = coordinator.serve('127.0.0.1', 0)
+        self.addCleanup(coordinator.close)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(run_worker(host, port))) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        self.assertTrue(coordinator.wait(60))
+        for thread in threads:
+            thread.join(10)
+        status = coordinator.status()
+        self.assertEqual(status["state"], 'completed')
+        self.assertEqual(status["keys_scanned"], 5999)
+        self.assertEqual(sorted(int(m["private_key_hex"], 16) for m in status["matches"]), [1000, 4321])
+        self.assertEqual(sum(r["leases"] for r in results), coordinator.lease_count)
+        with open(self.checkpoint) as f:
+            self.assertEqual(json.load(f)["completed_floor"], coordinator.lease_count)
+
+    def test_expired_lease_is_reissued_from_last_heartbeat(self):
+        coordinator = ScanCoordinator(self.targets, 1, 2001, lease_size=1000, lease_timeout=0.05,
+                                      checkpoint_path=self.checkpoint)
+        lease = coordinator.handle({"op": "lease", "worker": "crashed"})["lease"]
+        self.assertEqual((lease["start"], lease["end"]), (1, 1001))
+        beat = coordinator.handle({"op": "heartbeat", "worker": "crashed", "lease": 0, "token": lease["token"], "next": 400})
+        self.assertFalse(beat["cancel"])
+        time.sleep(0.1)
+        reissued = coordinator.handle({"op": "lease", "worker": "other"})["lease"]
+        self.assertEqual((reissued["lease"], reissued["start"]), (0, 400))
+        # The crashed worker's token is no longer valid
+        self.assertTrue(coordinator.handle({"op": "heartbeat", "lease": 0, "token": lease["token"], "next": 500})["cancel"])
+        coordinator.handle({"op": "complete", "worker": "other", "lease": 0, "token": reissued["token"]})
+        self.assertEqual(coordinator.status()["keys_scanned"], 1000)
+
+        # Restart from the checkpoint: lease 1 was never issued, lease 0 is done
+        resumed = ScanCoordinator(self.targets, 1, 2001, lease_size=1000, checkpoint_path=self.checkpoint)
+        self.assertEqual(resumed.handle({"op": "lease", "worker": "w"})["lease"]["start"], 1001)
+        with self.assertRaises(ValueError):
+            ScanCoordinator(self.targets, 1, 3001, lease_size=1000, checkpoint_path=self.checkpoint)
+
+    def test_match_reports_are_verified(self):
+        coordinator = ScanCoordinator(self.targets, 1, 2001, lease_size=1000)
+        bogus = {"op": "match", "lease": 0, "private_key_hex": format(999, '064x'), "hash160_hex": hash160_of(1000).hex()}
+        self.assertIn("error", coordinator.handle(bogus))
+        genuine = dict(bogus, private_key_hex=format(1000, '064x'))
+        coordinator.handle(genuine)
+        coordinator.handle(genuine)
+        self.assertEqual(len(coordinator.status()["matches"]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+import time
+from unittest import mock
+
+# Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.executor import (
+    CryptoExecutor, ExecutorBusy, ExecutorTimeout, DEFAULT_EXECUTOR_TIMEOUT, executor_config_from_env, get_crypto_executor
+)
+from app.main import create_app
+from app.pipeline import build_keypair_bundle
+
+class TestCryptoExecutor(unittest.TestCase):
+
+    def test_inline_by_default(self):
+        executor = CryptoExecutor()
+        self.assertFalse(executor.offloading)
+        self.assertEqual(executor.call(divmod, 7, 2), (3, 1))
+
+    def test_offloaded_call_matches_inline(self):
+        executor = CryptoExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        self.assertEqual(executor.call(build_keypair_bundle, 12345, False), build_keypair_bundle(12345, False))
+        with self.assertRaises(ValueError): # Exceptions from the worker propagate
+            executor.call(build_keypair_bundle, 0)
+
+    def test_warm_up_starts_every_worker(self):
+        executor = CryptoExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        self.assertEqual(executor.warm_up(time.sleep, 0.2), [None, None])
+        self.assertEqual(len(executor._pool._processes), 2)
+        self.assertEqual(CryptoExecutor().warm_up(divmod, 7, 2), [(3, 1)])
+
+    def test_timeout(self):
+        executor = CryptoExecutor(max_workers=1, timeout=0.05)
+        self.addCleanup(executor.shutdown)
+        with self.assertRaises(ExecutorTimeout):
+            executor.call(time.sleep, 2)
+
+    def test_abandoned_calls_are_bounded(self):
+        executor = CryptoExecutor(max_workers=1, timeout=0.05, max_pending=2)
+        self.addCleanup(executor.shutdown)
+        for _ in range(2):
+            with self.assertRaises(ExecutorTimeout):
+                executor.call(time.sleep, 1)
+        with self.assertRaises(ExecutorBusy): # Both sleeps still hold or wait for the worker
+            executor.call(divmod, 7, 2)
+        deadline = time.time() + 10
+        while executor._pending and time.time() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(executor.call(divmod, 7, 2, timeout=10), (3, 1))
+
+    def test_config_from_env(self):
+        with mock.patch.dict(os.environ):
+            os.environ.pop('BASE40_EXECUTOR_WORKERS', None)
+            os.environ.pop('BASE40_EXECUTOR_TIMEOUT', None)
+            self.assertEqual(create_app({'TESTING': True}).config['EXECUTOR_TIMEOUT'], DEFAULT_EXECUTOR_TIMEOUT)
+            os.environ['BASE40_EXECUTOR_TIMEOUT'] = '7.5'
+            self.assertEqual(executor_config_from_env(), {'EXECUTOR_WORKERS': 0, 'EXECUTOR_TIMEOUT': 7.5})
+            app = create_app({'TESTING': True})
+        self.assertEqual(get_crypto_executor(app).timeout, 7.5)
+
+    def test_validations(self):
+        with self.assertRaises(ValueError):
+            CryptoExecutor(max_workers=-1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+import sys
+import os
+import json
+import time
+import threading
+from unittest import mock
+import tempfile
+
+# Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.jobs import JobManager, JobQueueFull
+from app.pipeline import build_keypair_bundle
+from app.main import create_app
+from app.crypto.secp256k1_utils import Gx, Gy
+
+G_PUBLIC_KEY_HEX = f"04{Gx:064x}{Gy:064x}"
+
+class TestJobManager(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.manager = JobManager(workers=1, queue_size=2, max_items=50, chunk_size=4, result_dir=self.tmpdir.name)
+        self.addCleanup(self.manager.shutdown)
+
+    def _wait(self, job, timeout=60):
+        deadline = time.time() + timeout
+        while job.state in ('queued', 'running') and time.time() < deadline:
+            time.sleep(0.05)
+        return job.status()
+
+    def _records(self, job):
+        with open(job.result_path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def test_generate_job(self):
+        job = self.manager.submit('generate', {'count': 10})
+        status = self._wait(job)
+        self.assertEqual(status['state'], 'completed')
+        self.assertEqual((status['done'], status['progress']), (10, 1.0))
+        self.assertEqual([record['index'] for record in self._records(job)], list(range(10)))
+
+    def test_derive_and_address_jobs_report_item_errors(self):
+        derive_job = self.manager.submit('derive', {'private_keys': [format(1, '064x'), 'not-hex']})
+        address_job = self.manager.submit('address', {'public_keys': [G_PUBLIC_KEY_HEX, 'zz'], 'segwit': True})
+        self._wait(derive_job)
+        self._wait(address_job)
+
+        derived = self._records(derive_job)
+        self.assertEqual(derived[0]['public_key_uncompressed_hex'], G_PUBLIC_KEY_HEX)
+        self.assertIn('error', derived[1])
+        addresses = self._records(address_job)
+        self.assertEqual(addresses[0]['hashed_public_key_ripemd160_hex'], derived[0]['hashed_public_key_ripemd160_hex'])
+        self.assertNotIn('address_p2tr', derived[0]) # SegWit fields are opt-in for jobs
+        self.assertTrue(addresses[0]['address_p2tr'].startswith('bc1p'))
+        self.assertIn('error', addresses[1])
+
+    def test_derive_job_parses_keys_like_the_derive_endpoint(self):
+        base40_key = build_keypair_bundle(1)['private_key_base40']
+        job = self.manager.submit('derive', {'private_keys': ['0x1', base40_key, '0_1', ' ', '1' * 65]})
+        self._wait(job)
+        records = self._records(job)
+        self.assertEqual([record.get('public_key_uncompressed_hex') for record in records[:2]], [G_PUBLIC_KEY_HEX] * 2)
+        for record in records[2:]: # int(text, 16) would have accepted '0_1'
+            self.assertIn('error', record)
+
+    def test_admission_control(self):
+        with self.assertRaises(ValueError):
+            self.manager.submit('generate', {'count': 51})
+        with self.assertRaises(ValueError):
+            self.manager.submit('unknown', {})
+        with self.assertRaises(ValueError):
+            self.manager.submit('address', {'public_keys': []})
+
+        jobs = []
+        with self.assertRaises(JobQueueFull):
+            for _ in range(10):
+                jobs.append(self.manager.submit('generate', {'count': 50}))
+        for job in jobs:
+            self.manager.cancel(job.id)
+        for job in jobs:
+            self.assertIn(self._wait(job)['state'], ('cancelled', 'completed'))
+
+    def test_cancelled_jobs_free_their_queue_slot(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        with mock.patch.object(self.manager, '_execute', side_effect=lambda job: release.wait(10)):
+            running = self.manager.submit('generate', {'count': 1})
+            deadline = time.time() + 10
+            while running.state != 'running' and time.time() < deadline:
+                time.sleep(0.01)
+            first, second = (self.manager.submit('generate', {'count': 1}) for _ in range(2))
+            with self.assertRaises(JobQueueFull):
+                self.manager.submit('generate', {'count': 1})
+
+            self.manager.cancel(first.id)
+            self.assertEqual(first.state, 'cancelled')
+            replacement = self.manager.submit('generate', {'count': 1}) # The cancelled job's slot
+            self.assertEqual(self.manager.stats()['queued'], 2)
+            release.set()
+            deadline = time.time() + 10
+            while replacement.state == 'queued' and time.time() < deadline:
+                time.sleep(0.01)
+        # The patched _execute never finishes a job, so the claimed ones stay 'running'
+        self.assertEqual((first.state, second.state, replacement.state), ('cancelled', 'running', 'running'))
+
+    def test_shutdown_is_idempotent(self):
+        manager = JobManager(workers=1, queue_size=1)
+        manager.submit('generate', {'count': 1})
+        manager.shutdown()
+        manager.shutdown() # Also what the atexit hook would do
+        self.assertFalse(os.path.exists(manager.result_dir))
+        with self.assertRaises(RuntimeError):
+            manager.submit('generate', {'count': 1})
+
+class TestJobRoutes(unittest.TestCase):
+
+    def test_body_must_be_an_object(self):
+        client = create_app({'TESTING': True}).test_client()
+        self.assertEqual(client.post('/api/jobs', json=[1]).status_code, 400)
+        self.assertEqual(client.post('/api/jobs', data='x').status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import sys
+import os
+import itertools
+import threading
+
+# Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.keypool import KeypairPool
+from app.main import create_app
+
+class TestKeypairPool(unittest.TestCase):
+
+    def _pool(self, produce, size, workers=1):
+        pool = KeypairPool(produce, size, workers=workers)
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_fills_and_hands_out_each_bundle_once(self):
+        counter = itertools.count()
+        lock = threading.Lock()
+
+        def produce():
+            with lock:
+                return {"n": next(counter)}
+
+        pool = self._pool(produce, size=5, workers=3).start()
+        self.assertTrue(pool.wait_until_full(timeout=5))
+        self.assertEqual(pool.stats()['available'], 5)
+        seen = [pool.pop()["n"] for _ in range(5)]
+        self.assertEqual(len(set(seen)), 5)
+        self.assertTrue(pool.wait_until_full(timeout=5)) # Refilled in the background
+        self.assertLessEqual(pool.stats()['produced'], 10 + 3)
+
+    def test_misses_are_counted(self):
+        release = threading.Event()
+        pool = self._pool(lambda: release.wait() and {"n": 1}, size=2).start()
+        self.assertIsNone(pool.pop())
+        self.assertIsNone(pool.pop())
+        release.set()
+        self.assertTrue(pool.wait_until_full(timeout=5))
+        self.assertIsNotNone(pool.pop())
+        stats = pool.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['hit_rate']), (1, 2, 0.3333))
+
+    def test_producer_errors_do_not_stop_the_pool(self):
+        attempts = itertools.count()
+
+        def produce():
+            if next(attempts) == 0:
+                raise RuntimeError("boom")
+            return {}
+
+        pool = self._pool(produce, size=1).start()
+        self.assertTrue(pool.wait_until_full(timeout=5))
+        self.assertEqual(pool.stats()['errors'], 1)
+
+    def test_validations(self):
+        with self.assertRaises(ValueError):
+            KeypairPool(dict, size=0)
+
+class TestKeypairPoolInApp(unittest.TestCase):
+
+    def test_endpoints_use_the_pool(self):
+        app = create_app({'TESTING': True, 'KEYPOOL_SIZE': 2})
+        pool = app.extensions['base40_keypool']
+        self.addCleanup(pool.close)
+        self.assertTrue(pool.wait_until_full(timeout=30))
+        client = app.test_client()
+        bundle = client.get('/api/generate_keypair_detailed').get_json()
+        self.assertEqual(len(bundle['scalar_multiplication_steps']), 256)
+        self.assertEqual(client.get('/').status_code, 200)
+        stats = client.get('/status').get_json()['keypair_pool']
+        self.assertEqual(stats['hits'] + stats['misses'], 2)
+        self.assertGreaterEqual(stats['hits'], 1)
+
+    def test_inline_executor_uses_one_producer(self):
+        app = create_app({'TESTING': True, 'KEYPOOL_SIZE': 1, 'KEYPOOL_WORKERS': 4, 'EXECUTOR_WORKERS': 0})
+        pool = app.extensions['base40_keypool']
+        self.addCleanup(pool.close)
+        self.assertEqual(pool.workers, 1)
+
+    def test_disabled_by_default(self):
+        app = create_app({'TESTING': True})
+        self.assertNotIn('base40_keypool', app.extensions)
+        self.assertNotIn('keypair_pool', app.test_client().get('/status').get_json())
+
+if __name__ == '__main__':
+    unittest.main()
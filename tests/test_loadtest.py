@@ -0,0 +1,49 @@
+import unittest
+import sys
+import os
+import json
+
+# Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.loadtest import (
+    percentile, summarize_latencies, run_load_test, compare_results, process_cpu_seconds, FlaskClientTarget,
+    HttpTarget
+)
+from app.main import create_app
+
+class TestLoadTest(unittest.TestCase):
+
+    def test_percentile(self):
+        values = [i / 1000 for i in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 0.05)
+        self.assertEqual(percentile(values, 99), 0.099)
+        self.assertEqual(percentile([0.2], 95), 0.2)
+        self.assertEqual(percentile([], 50), 0.0)
+        summary = summarize_latencies([0.01, 0.02, 0.03, 0.04], errors=1, duration=2.0)
+        self.assertEqual((summary['requests'], summary['errors'], summary['throughput_rps']), (5, 1, 2.0))
+        self.assertEqual((summary['p50_ms'], summary['p99_ms']), (20.0, 40.0))
+
+    def test_in_process_run(self):
+        target = FlaskClientTarget(create_app({'TESTING': True}))
+        results = run_load_test(target, ['/status', '/missing'], concurrency=2, duration=0.3)
+        json.dumps(results) # Serialisable as-is
+        self.assertGreater(results['endpoints']['/status']['requests'], 0)
+        self.assertEqual(results['endpoints']['/missing']['errors'], results['endpoints']['/missing']['requests'])
+        self.assertIn('404', results['status_codes'])
+        self.assertIn(str(os.getpid()), results['server_processes'])
+        self.assertEqual(len(results['client_workers']), 2)
+
+        rows = compare_results(results, results)
+        self.assertIn(('overall', 'throughput_rps', results['overall']['throughput_rps'],
+                       results['overall']['throughput_rps'], 0.0), rows)
+
+    def test_cpu_and_validation(self):
+        self.assertIsNotNone(process_cpu_seconds(os.getpid()))
+        with self.assertRaises(ValueError):
+            HttpTarget('ftp://example.com')
+        with self.assertRaises(ValueError):
+            run_load_test(FlaskClientTarget(create_app({'TESTING': True})), concurrency=0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import sys
+import os
+
+# Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.pipeline import BUNDLE_FIELDS, build_keypair_bundle, build_keypair_bundles, generate_keypair_bundle
+from app.crypto.keys import derive_public_key
+from app.crypto.addresses import hash_public_key, ripemd160_to_base40, base58check_encode_bitcoin
+from app.crypto.secp256k1_utils import N
+
+class TestPipeline(unittest.TestCase):
+
+    def test_bundle_matches_individual_functions(self):
+        private_key_int = 0x1D2C3B4A
+        bundle = build_keypair_bundle(private_key_int)
+        public_key_hex, steps = derive_public_key(format(private_key_int, '064x'))
+        hash160_bytes = hash_public_key(public_key_hex)
+
+        self.assertEqual(bundle['public_key_uncompressed_hex'], public_key_hex)
+        self.assertEqual(bundle['scalar_multiplication_steps'], steps)
+        self.assertEqual(bundle['hashed_public_key_ripemd160_hex'], hash160_bytes.hex())
+        self.assertEqual(bundle['address_base40'], ripemd160_to_base40(hash160_bytes, target_length=31))
+        self.assertEqual(bundle['address_bitcoin_base58check'], base58check_encode_bitcoin(hash160_bytes))
+
+    def test_bundle_without_steps_is_identical(self):
+        with_steps = build_keypair_bundle(N - 2)
+        without_steps = build_keypair_bundle(N - 2, include_steps=False)
+        self.assertNotIn('scalar_multiplication_steps', without_steps)
+        self.assertEqual(list(without_steps), BUNDLE_FIELDS)
+        for field in BUNDLE_FIELDS:
+            self.assertEqual(with_steps[field], without_steps[field])
+
+    def test_segwit_addresses(self):
+        bundle = build_keypair_bundle(1, include_steps=False)
+        self.assertEqual(bundle['address_p2wpkh'], 'bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3t4')
+        self.assertTrue(bundle['address_p2tr'].startswith('bc1p'))
+        self.assertEqual(len(bundle['address_p2tr']), 62)
+        self.assertNotIn('address_p2tr', build_keypair_bundle(1, include_steps=False, curve='p256'))
+
+    def test_batch_matches_single_bundles(self):
+        keys = [1, 2, 0xDEADBEEF, N - 1]
+        for include_steps, segwit in ((False, False), (False, True), (True, False)):
+            self.assertEqual(build_keypair_bundles(keys, include_steps=include_steps, segwit=segwit),
+                             [build_keypair_bundle(k, include_steps=include_steps, segwit=segwit) for k in keys])
+        with self.assertRaises(ValueError):
+            build_keypair_bundles([1, N])
+
+    def test_validations(self):
+        with self.assertRaises(ValueError):
+            build_keypair_bundle(0)
+        with self.assertRaises(ValueError):
+            build_keypair_bundle(N)
+
+    def test_generate_keypair_bundle(self):
+        bundle = generate_keypair_bundle(include_steps=False)
+        self.assertTrue(1 <= int(bundle['private_key_hex'], 16) < N)
+        self.assertEqual(len(bundle['address_base40']), 31)
+
+if __name__ == '__main__':
+    unittest.main()
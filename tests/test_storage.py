@@ -0,0 +1,124 @@
+import unittest
+import sys
+import os
+import json
+import sqlite3
+import subprocess
+import tempfile
+
+# Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.storage import KeypairStore, compress_steps, decompress_steps
+from app.pipeline import build_keypair_bundle
+from app.bulk import run_bulk_generation
+from app.main import create_app
+
+class TestKeypairStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, 'keypairs.db')
+
+    def _store(self, **kwargs):
+        store = KeypairStore(self.path, **kwargs)
+        self.addCleanup(store.close)
+        return store
+
+    def test_batched_writes_and_lookups(self):
+        store = self._store(batch_size=7)
+        bundles = [build_keypair_bundle(k, include_steps=False) for k in range(1, 31)]
+        store.put_many(bundles)
+        store.flush()
+        self.assertEqual((store.written, store.count(), store.error), (30, 30, None))
+
+        bundle = bundles[4]
+        for key in ('address_base40', 'address_bitcoin_base58check', 'hashed_public_key_ripemd160_hex'):
+            found = store.find_by_address(bundle[key])
+            self.assertEqual(len(found), 1)
+            self.assertEqual(found[0]['private_key_hex'], bundle['private_key_hex'])
+        self.assertEqual(store.find_by_address('1BoatSLRHtKNngkdXEeobR76b53LETtpyT'), [])
+
+        connection = sqlite3.connect(self.path)
+        self.addCleanup(connection.close)
+        self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+
+    def test_step_traces(self):
+        bundle = build_keypair_bundle(12345, include_steps=True)
+        steps_as_json = json.loads(json.dumps(bundle['scalar_multiplication_steps'])) # Points become lists
+        self.assertEqual(decompress_steps(compress_steps(bundle['scalar_multiplication_steps'])), steps_as_json)
+
+        store = self._store(store_steps=True)
+        store.put(bundle)
+        store.flush()
+        found = store.find_by_address(bundle['address_base40'], include_steps=True)[0]
+        self.assertEqual(found['scalar_multiplication_steps'], steps_as_json)
+        self.assertNotIn('scalar_multiplication_steps', store.find_by_address(bundle['address_base40'])[0])
+
+    def test_close_drains_queue(self):
+        store = KeypairStore(self.path)
+        store.put(build_keypair_bundle(1, include_steps=False))
+        store.close()
+        with self.assertRaises(RuntimeError):
+            store.put(build_keypair_bundle(2, include_steps=False))
+        self.assertEqual(store.written, 1)
+
+    def test_queued_rows_are_written_at_exit(self):
+        script = ("from app.storage import KeypairStore\n"
+                  "from app.pipeline import build_keypair_bundle\n"
+                  "store = KeypairStore(%r, batch_size=1)\n"
+                  "store.put_many(build_keypair_bundle(k, include_steps=False) for k in range(1, 201))\n"
+                  % self.path) # Exits without close() or flush()
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        subprocess.run([sys.executable, '-c', script], cwd=root, check=True, timeout=120)
+        with sqlite3.connect(self.path) as connection:
+            self.assertEqual(connection.execute("SELECT COUNT(*) FROM keypairs").fetchone()[0], 200)
+
+    def test_write_errors_are_counted_and_raised(self):
+        store = self._store(batch_size=4)
+        connection = sqlite3.connect(self.path)
+        with connection:
+            connection.execute("DROP TABLE keypairs")
+        connection.close()
+        bundles = [build_keypair_bundle(k, include_steps=False) for k in range(1, 4)]
+        with self.assertLogs('app.storage', level='ERROR'):
+            store.put_many(bundles)
+            with self.assertRaises(sqlite3.Error):
+                store.flush()
+        self.assertEqual((store.written, store.dropped), (0, 3))
+        self.assertIn('keypairs', store.stats()["error"])
+        store.flush() # Each error is raised once
+
+    def test_bulk_generation_persists(self):
+        store = self._store()
+        out_path = os.path.join(self.tmpdir.name, 'out.ndjson')
+        run_bulk_generation(out_path, 8, workers=1, chunk_size=3, store=store)
+        self.assertEqual(store.count(), 8)
+
+class TestStoredKeypairsRoute(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.app = create_app({'TESTING': True, 'STORAGE_PATH': os.path.join(self.tmpdir.name, 'k.db')})
+        self.addCleanup(lambda: self.app.extensions['base40_storage'].close()
+                        if 'base40_storage' in self.app.extensions else None)
+        self.client = self.app.test_client()
+
+    def test_generated_keypairs_are_stored(self):
+        bundle = self.client.get('/api/generate_keypair_detailed').get_json()
+        self.app.extensions['base40_storage'].flush()
+        response = self.client.get('/api/keypairs/' + bundle['address_bitcoin_base58check'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['keypairs'][0]['private_key_hex'], bundle['private_key_hex'])
+        self.assertEqual(self.client.get('/api/keypairs/1BoatSLRHtKNngkdXEeobR76b53LETtpyT').status_code, 404)
+        storage = self.client.get('/status').get_json()['storage']
+        self.assertEqual((storage['written'], storage['dropped'], storage['error']), (1, 0, None))
+
+    def test_storage_disabled(self):
+        client = create_app({'TESTING': True, 'STORAGE_PATH': None}).test_client()
+        self.assertEqual(client.get('/api/keypairs/anything').status_code, 503)
+
+if __name__ == '__main__':
+    unittest.main()
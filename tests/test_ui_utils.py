@@ -0,0 +1,50 @@
+import unittest
+import sys
+import os
+import base64
+import json
+
+# Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.ui_utils import encode_animation_frames
+from app.pipeline import build_keypair_bundle
+from app.core_logic.base40 import DEFAULT_SYMBOLS
+from app.main import create_app
+
+class TestAnimationFrames(unittest.TestCase):
+
+    def test_indices_and_rodopios_match_steps(self):
+        steps = build_keypair_bundle(0xC0FFEE << 200)['scalar_multiplication_steps']
+        frames = encode_animation_frames(steps)
+        indices = base64.b64decode(frames['indices'])
+        rodopios = base64.b64decode(frames['rodopios'])
+        symbol_steps = [step for step in steps if step['base40_symbol']]
+        self.assertEqual(frames['count'], len(symbol_steps))
+        self.assertEqual([DEFAULT_SYMBOLS[index] for index in indices], [step['base40_symbol'] for step in symbol_steps])
+        self.assertEqual(list(rodopios), [step['rodopios'] for step in symbol_steps])
+
+    def test_payload_is_smaller_than_symbol_list(self):
+        steps = build_keypair_bundle((1 << 255) + 12345)['scalar_multiplication_steps']
+        symbols_json = json.dumps([step['base40_symbol'] for step in steps if step['base40_symbol']])
+        self.assertLess(3 * len(json.dumps(encode_animation_frames(steps))), len(symbols_json))
+
+    def test_empty(self):
+        self.assertEqual(encode_animation_frames([]), {"count": 0, "indices": "", "rodopios": ""})
+
+    def test_index_page_embeds_frames(self):
+        page = create_app({'TESTING': True}).test_client().get('/').get_data(as_text=True)
+        self.assertIn('var animationFrames = {"count": ', page)
+        self.assertIn('animateRodopiosFrames(animationFrames', page)
+
+    def test_templates_and_static_files_are_served_from_the_package(self):
+        client = create_app({'TESTING': True}).test_client()
+        page = client.get('/').get_data(as_text=True)
+        self.assertIn('/static/css/style.css', page)
+        for path in ('/static/css/style.css', '/static/js/visualization.js'):
+            response = client.get(path)
+            self.assertEqual(response.status_code, 200, path)
+            response.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add parent directory of 'app' to Python path (i.e., /app directory itself, which is the project root)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import warmup
+from app.warmup import WarmupState, run_warmup
+
+class TestWarmup(unittest.TestCase):
+
+    def test_disabled_is_ready_immediately(self):
+        state = WarmupState(enabled=False).start()
+        self.assertTrue(state.ready)
+        self.assertIsNone(state.status()['warmup_timings'])
+
+    def test_enabled_becomes_ready_with_timings(self):
+        state = WarmupState(enabled=True, derivations=1).start()
+        self.assertTrue(state.wait(timeout=60))
+        status = state.status()
+        self.assertTrue(status['ready'])
+        self.assertEqual(set(status['warmup_timings']), {'tables', 'codecs', 'derivations'})
+        self.assertIsNone(status['warmup_error'])
+
+    def test_failed_warmup_still_becomes_ready(self):
+        with mock.patch.object(warmup, 'run_warmup', side_effect=RuntimeError("boom")):
+            state = WarmupState(enabled=True).start()
+            self.assertTrue(state.wait(timeout=10))
+        self.assertEqual(state.status()['warmup_error'], "boom")
+
+    def test_executor_workers_are_warmed_before_ready(self):
+        executor = mock.Mock(offloading=True)
+        state = WarmupState(enabled=True, derivations=0, executor=executor).start()
+        self.assertTrue(state.wait(timeout=60))
+        executor.warm_up.assert_called_once_with(run_warmup, 0)
+        self.assertIn('executor_workers', state.status()['warmup_timings'])
+        self.assertNotIn('executor_workers', run_warmup(0, mock.Mock(offloading=False)))
+
+    def test_run_warmup_without_derivations(self):
+        self.assertGreaterEqual(run_warmup(derivations=0)['derivations'], 0)
+
+if __name__ == '__main__':
+    unittest.main()